@@ -874,13 +874,15 @@ def json_default(value):
 
 
 def poll(endpoint, timeout=30, step=0.5):
-
+    # Long poll: the API answers as soon as the job is finished or after the wait has passed
     start_time = time.perf_counter()
     while time.perf_counter() - start_time < timeout:
-        response = requests.get(endpoint)
+        wait = max(timeout - (time.perf_counter() - start_time), 0)
+        response = requests.get(endpoint, params={'wait': wait})
         if response.status_code == 200 and response.json()['processStatus'] != "Processing":
             return response
-        sleep(step)
+        if response.status_code != 200:
+            sleep(step)
 
     raise RuntimeError(f"Timeout reached while polling endpoint: {endpoint}")
 
@@ -1,5 +1,10 @@
 import logging
 
+from erica.api_server import prepare_prometheus_multiprocess_mode
+
+# Has to run before the first metric is created, see prepare_prometheus_multiprocess_mode
+prepare_prometheus_multiprocess_mode()
+
 from fastapi import FastAPI, Request
 from fastapi_sqlalchemy import DBSessionMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
@@ -7,6 +12,9 @@ from prometheus_fastapi_instrumentator import Instrumentator
 from erica.api.exception_handling import generate_exception_handlers
 from erica.api.v2.api_v2 import api_router_02
 from erica.config import get_settings
+from erica.domain.job_completion.job_completion_listener import get_job_completion_listener
+from erica.domain.result_cache.result_cache import get_result_cache
+from erica.domain.sqlalchemy.async_database import dispose_async_engine
 from erica.domain.sqlalchemy.database import engine_args
 
 # Import this here to make it available for the huey TaskRegistry https://huey.readthedocs.io/en/latest/imports.html#imports
@@ -28,6 +36,17 @@ app.include_router(api_router_02)
 app.add_middleware(DBSessionMiddleware, db_url=get_settings().database_url, engine_args=engine_args)
 
 
+@app.on_event("shutdown")
+async def close_async_database_connections():
+    await dispose_async_engine()
+    job_completion_listener = get_job_completion_listener()
+    if job_completion_listener is not None:
+        await job_completion_listener.close()
+    result_cache = get_result_cache()
+    if result_cache is not None and result_cache.redis_client is not None:
+        await result_cache.redis_client.aclose()
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     # TODO Remove the split once v1 is no longer in use
@@ -2,9 +2,9 @@ import logging
 from logging.config import dictConfig
 
 import sentry_sdk
-import uvicorn
 
 from erica import get_settings
+from erica.api_server import run_api_server
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.starlette import StarletteIntegration
 
@@ -52,4 +52,4 @@ except Exception as e:
     logging.getLogger().warning(f"Sentry integration failed to load: {e}")
     pass
 
-uvicorn.run("erica:app", host="0.0.0.0", port=8000, log_config=None)
+run_api_server()
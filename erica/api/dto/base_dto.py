@@ -1,5 +1,7 @@
 from humps import camelize
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, validator, conlist
+
+from erica.config import get_settings
 
 
 class CamelCaseModel(BaseModel):
@@ -25,3 +27,8 @@ class CamelCaseModel(BaseModel):
 
 class BaseDto(CamelCaseModel):
     pass
+
+
+def batch_of(item_type):
+    """List type of the payloads of a batch submission, which holds at least one and at most `batch_max_size` items."""
+    return conlist(item_type, min_items=1, max_items=get_settings().batch_max_size)
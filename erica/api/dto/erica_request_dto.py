@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from erica.api.dto.base_dto import BaseDto
@@ -17,3 +17,9 @@ class EricaRequestDto(BaseDto):
     result: Optional[object]
     error_code: Optional[str]
     error_message: Optional[str]
+    batch_id: Optional[UUID]
+
+
+class EricaRequestBatchDto(BaseDto):
+    batch_id: UUID
+    request_ids: List[UUID]
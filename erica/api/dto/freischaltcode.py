@@ -3,7 +3,7 @@ from datetime import date
 from typing import Optional
 
 from erica.api.dto.response_dto import ResponseBaseDto
-from erica.api.dto.base_dto import BaseDto
+from erica.api.dto.base_dto import BaseDto, batch_of
 
 
 # Input
@@ -32,6 +32,16 @@ class FreischaltCodeActivateDto(BaseDto):
     client_identifier: str
 
 
+class FreischaltCodeRequestBatchDto(BaseDto):
+    payloads: batch_of(FreischaltCodeRequestPayloadDto)
+    client_identifier: str
+
+
+class FreischaltCodeActivateBatchDto(BaseDto):
+    payloads: batch_of(FreischaltCodeActivatePayloadDto)
+    client_identifier: str
+
+
 class FreischaltCodeRevocatePayloadDto(BaseDto):
     tax_id_number: Optional[TaxIdNumber]
     elster_request_id: str
@@ -42,6 +52,11 @@ class FreischaltCodeRevocateDto(BaseDto):
     client_identifier: str
 
 
+class FreischaltCodeRevocateBatchDto(BaseDto):
+    payloads: batch_of(FreischaltCodeRevocatePayloadDto)
+    client_identifier: str
+
+
 # Output
 
 class TransferticketAndIdnrResponseDto(BaseDto):
@@ -4,7 +4,7 @@ from erica.api.dto.response_dto import ResponseBaseDto, ResultTransferPdfRespons
     ResultValidationErrorResponseDto
 from erica.api.dto.grundsteuer_input_eigentuemer import Eigentuemer
 
-from erica.api.dto.base_dto import CamelCaseModel
+from erica.api.dto.base_dto import CamelCaseModel, batch_of
 from erica.api.dto.grundsteuer_input_gebaeude import Gebaeude
 from erica.api.dto.grundsteuer_input_grundstueck import Grundstueck
 
@@ -26,6 +26,11 @@ class GrundsteuerDto(CamelCaseModel):
     client_identifier: str
 
 
+class GrundsteuerBatchDto(CamelCaseModel):
+    payloads: batch_of(GrundsteuerPayload)
+    client_identifier: str
+
+
 # Output
 
 class GrundsteuerResponseDto(ResponseBaseDto):
@@ -1,5 +1,8 @@
 from enum import Enum
 from typing import Optional, List
+from uuid import UUID, uuid4
+
+from pydantic import PrivateAttr
 
 from erica.api.dto.base_dto import BaseDto
 
@@ -25,6 +28,21 @@ class ResponseErrorDto(BaseDto):
 class ResultTransferPdfResponseDto(BaseDto):
     transferticket: str
     pdf: str
+    _pdf_key: Optional[str] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_result(cls, result: dict):
+        """Creates the DTO from the result of a job. If the PDF is kept in the blob store, `pdf` is a unique
+        placeholder that is replaced by the base64-encoded PDF while the response is streamed."""
+        if result.get('pdf_key') is None:
+            return cls(transferticket=result['transferticket'], pdf=result['pdf'])
+        result_dto = cls(transferticket=result['transferticket'], pdf=f"pdf-placeholder-{uuid4()}")
+        result_dto._pdf_key = result['pdf_key']
+        return result_dto
+
+    @property
+    def pdf_key(self) -> Optional[str]:
+        return self._pdf_key
 
 
 class ResultTransferTicketResponseDto(BaseDto):
@@ -37,3 +55,35 @@ class ResultValidationErrorResponseDto(BaseDto):
 
 class ResultMessageResponseDto(BaseDto):
     message: str
+
+
+class BatchRequestStatusDto(BaseDto):
+    request_id: UUID
+    process_status: JobState
+
+
+class BatchResponseDto(BaseDto):
+    """Progress of all requests of a batch. The batch is processing until all of its requests are finished, and
+    succeeded only if all of them succeeded."""
+    batch_id: UUID
+    process_status: JobState
+    total: int
+    processing: int
+    success: int
+    failure: int
+    requests: List[BatchRequestStatusDto]
+
+
+class IngestionAckDto(BaseDto):
+    """Acknowledgement of one line of an NDJSON upload, with either the id of the created request or an error."""
+    line: int
+    request_id: Optional[UUID]
+    error_code: Optional[str]
+    error_message: Optional[str]
+
+
+class IngestionSummaryDto(BaseDto):
+    batch_id: UUID
+    accepted: int
+    rejected: int
+
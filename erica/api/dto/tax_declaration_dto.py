@@ -2,7 +2,7 @@ from typing import Optional, Union
 
 from erica.api.dto.response_dto import ResponseBaseDto, ResultTransferPdfResponseDto, \
     ResultValidationErrorResponseDto
-from erica.api.dto.base_dto import BaseDto
+from erica.api.dto.base_dto import BaseDto, batch_of
 from erica.worker.request_processing.erica_input.v1.erica_input import FormDataEst, MetaDataEst
 
 
@@ -26,6 +26,11 @@ class TaxDeclarationDto(BaseDto):
     client_identifier: str
 
 
+class TaxDeclarationBatchDto(BaseDto):
+    payloads: batch_of(TaxDeclarationPayloadDto)
+    client_identifier: str
+
+
 # Output
 
 class EstResponseDto(ResponseBaseDto):
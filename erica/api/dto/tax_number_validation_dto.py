@@ -1,7 +1,7 @@
 from typing import Optional
 
 from erica.api.dto.response_dto import ResponseBaseDto
-from erica.api.dto.base_dto import BaseDto
+from erica.api.dto.base_dto import BaseDto, batch_of
 from erica.domain.payload.tax_number_validation import StateAbbreviation
 
 
@@ -17,6 +17,11 @@ class CheckTaxNumberDto(BaseDto):
     client_identifier: str
 
 
+class CheckTaxNumberBatchDto(BaseDto):
+    payloads: batch_of(CheckTaxNumberPayloadDto)
+    client_identifier: str
+
+
 # Output
 
 class ResultTaxResponseDto(BaseDto):
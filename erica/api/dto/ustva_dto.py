@@ -1,7 +1,7 @@
 from datetime import date
 from typing import Optional
 
-from erica.api.dto.base_dto import BaseDto
+from erica.api.dto.base_dto import BaseDto, batch_of
 from erica.api.dto.response_dto import ResponseBaseDto, ResultTransferTicketResponseDto
 from erica.domain.model.base_domain_model import BasePayload
 
@@ -107,5 +107,10 @@ class UstvaDto(BaseDto):
     client_identifier: str
 
 
+class UstvaBatchDto(BaseDto):
+    payloads: batch_of(UstvaPayload)
+    client_identifier: str
+
+
 class UstvaResponseDto(ResponseBaseDto):
     result: Optional[ResultTransferTicketResponseDto]
@@ -8,3 +8,10 @@ class RequestTypeDoesNotMatchEndpointError(Exception):
     def __init__(self, actual_type: RequestType, requested_type: RequestType):
         self.actual_type = actual_type
         self.requested_type = requested_type
+
+
+class PdfNotAvailableError(Exception):
+    """ Raised in case the PDF of a request is requested, but the request did not finish successfully (yet). """
+
+    def __init__(self, request_id):
+        self.request_id = request_id
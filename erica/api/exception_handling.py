@@ -6,7 +6,7 @@ from fastapi.exceptions import RequestValidationError, HTTPException
 from fastapi.responses import JSONResponse
 from starlette.responses import RedirectResponse
 
-from erica.api.errors import RequestTypeDoesNotMatchEndpointError
+from erica.api.errors import RequestTypeDoesNotMatchEndpointError, PdfNotAvailableError
 from erica.domain.model.erica_request import RequestType
 from erica.domain.sqlalchemy.repositories.base_repository import EntityNotFoundError
 
@@ -23,7 +23,7 @@ job_type_to_endpoint = {
 
 def generate_exception_handlers(app):
     async def entity_not_found_error(request: Request, exc: EntityNotFoundError):
-        request_id = request.path_params.get('request_id')
+        request_id = request.path_params.get('request_id', request.path_params.get('batch_id'))
         logging.getLogger().info(f"The requested entity {request_id} is not present in the database.")
 
         return JSONResponse(
@@ -43,6 +43,14 @@ def generate_exception_handlers(app):
             status_code=404,
         )
 
+    async def pdf_not_available_error(request: Request, exc: PdfNotAvailableError):
+        logging.getLogger().info(f"The PDF of entity {exc.request_id} was requested, but is not available.")
+        return JSONResponse(
+            {"errorCode": exc.__class__.__name__,
+             "errorMessage": f"The request with id {exc.request_id} has no PDF, because it did not finish successfully."},
+            status_code=404,
+        )
+
     async def internal_server_error(request: Request, exc: Exception):
         request_id = request.path_params.get('request_id')
         logging.getLogger().error(f"Request for entity {request_id} produced unexpected error: {str(exc)}")
@@ -79,6 +87,7 @@ def generate_exception_handlers(app):
         HTTPException: request_http_error,
         EntityNotFoundError: entity_not_found_error,
         RequestTypeDoesNotMatchEndpointError: jop_type_mismatch_error,
+        PdfNotAvailableError: pdf_not_available_error,
         Exception: internal_server_error,
     }
 
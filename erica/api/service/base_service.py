@@ -1,7 +1,13 @@
+import asyncio
 from uuid import UUID
 from erica.api.service.erica_request_service import EricaRequestService
+from erica.api.dto.response_dto import BatchResponseDto, BatchRequestStatusDto, JobState
 from erica.api.errors import RequestTypeDoesNotMatchEndpointError
-from erica.domain.model.erica_request import RequestType
+from erica.api.service.response_state_mapper import map_status
+from erica.config import get_settings
+from erica.domain.job_completion.job_completion_listener import job_completion_waiter, get_job_completion_listener
+from erica.domain.model.erica_request import RequestType, FINISHED_STATUSES
+from erica.domain.sqlalchemy.repositories.base_repository import EntityNotFoundError
 
 
 class BaseService:
@@ -11,8 +17,51 @@ class BaseService:
         super().__init__()
         self.erica_request_service = service
 
-    def get_erica_request(self, request_id: UUID, request_type: RequestType):
-        erica_request = self.erica_request_service.get_request_by_request_id(request_id)
+    async def get_erica_request(self, request_id: UUID, request_type: RequestType, wait: float = 0):
+        """
+        Returns the erica request. If it is not finished yet, waits up to `wait` seconds (at most
+        `job_max_wait_in_sec`) for the worker to report its completion and returns the request as it is then.
+        """
+        if wait <= 0:
+            return await self._get_erica_request(request_id, request_type)
+
+        settings = get_settings()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + min(wait, settings.job_max_wait_in_sec)
+        recheck_interval = settings.job_wait_recheck_interval_in_sec if get_job_completion_listener() is not None \
+            else settings.job_wait_recheck_interval_without_notifications_in_sec
+        # Subscribe before reading the request, so that a completion in between is not missed
+        with job_completion_waiter(request_id) as waiter:
+            while True:
+                erica_request = await self._get_erica_request(request_id, request_type)
+                remaining = deadline - loop.time()
+                if erica_request.status in FINISHED_STATUSES or remaining <= 0:
+                    return erica_request
+                await waiter.wait(min(remaining, recheck_interval))
+
+    async def _get_erica_request(self, request_id: UUID, request_type: RequestType):
+        erica_request = await self.erica_request_service.get_request_by_request_id(request_id)
         if erica_request.type != request_type:
             raise RequestTypeDoesNotMatchEndpointError(erica_request.type, request_type)
         return erica_request
+
+    async def get_response_batch(self, batch_id: UUID, request_type: RequestType) -> BatchResponseDto:
+        """Returns the progress of all requests of the batch, which must have been submitted at the endpoint of
+        `request_type`."""
+        statuses = await self.erica_request_service.get_statuses_by_batch_id(batch_id, request_type)
+        if not statuses:
+            raise EntityNotFoundError
+        requests = [BatchRequestStatusDto(request_id=request_id, process_status=map_status(status))
+                    for request_id, status in statuses]
+        counts = {job_state: 0 for job_state in JobState}
+        for request in requests:
+            counts[request.process_status] += 1
+        if counts[JobState.PROCESSING]:
+            process_status = JobState.PROCESSING
+        elif counts[JobState.FAILURE]:
+            process_status = JobState.FAILURE
+        else:
+            process_status = JobState.SUCCESS
+        return BatchResponseDto(batch_id=batch_id, process_status=process_status, total=len(requests),
+                                processing=counts[JobState.PROCESSING], success=counts[JobState.SUCCESS],
+                                failure=counts[JobState.FAILURE], requests=requests)
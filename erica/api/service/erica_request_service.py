@@ -4,7 +4,9 @@ from abc import abstractmethod, ABCMeta
 from uuid import UUID
 from opyoid import Injector, Module
 from erica.domain.infrastructure_module import InfrastructureModule
-from erica.domain.sqlalchemy.repositories.erica_request_repository import EricaRequestRepository
+from erica.domain.model.erica_request import RequestType
+from erica.domain.repositories.async_erica_request_repository_interface import AsyncEricaRequestRepositoryInterface
+from erica.domain.result_cache.result_cache import get_result_cache
 
 injector = Injector([InfrastructureModule()])
 
@@ -13,26 +15,44 @@ class EricaRequestServiceInterface:
     __metaclass__ = ABCMeta
 
     @abstractmethod
-    def get_request_by_request_id(self, request_id: UUID):
+    async def get_request_by_request_id(self, request_id: UUID):
         pass
 
     @abstractmethod
-    def get_all_by_skip_and_limit(self, skip: int, limit: int):
+    async def get_statuses_by_batch_id(self, batch_id: UUID, request_type: RequestType):
+        pass
+
+    @abstractmethod
+    async def get_all_by_skip_and_limit(self, skip: int, limit: int):
         pass
 
 
 class EricaRequestService(EricaRequestServiceInterface):
-    erica_request_repository: EricaRequestRepository
+    erica_request_repository: AsyncEricaRequestRepositoryInterface
 
-    def __init__(self, repository: EricaRequestRepository) -> None:
+    def __init__(self, repository: AsyncEricaRequestRepositoryInterface) -> None:
         super().__init__()
         self.erica_request_repository = repository
 
-    def get_request_by_request_id(self, request_id: UUID):
-        return self.erica_request_repository.get_by_job_request_id(request_id)
-
-    def get_all_by_skip_and_limit(self, skip: int, limit: int):
-        return self.erica_request_repository.get(skip, limit)
+    async def get_request_by_request_id(self, request_id: UUID):
+        result_cache = get_result_cache()
+        if result_cache is None:
+            return await self.erica_request_repository.get_by_job_request_id(request_id)
+        erica_request = await result_cache.get(request_id)
+        if erica_request is None:
+            erica_request = await self.erica_request_repository.get_by_job_request_id(request_id)
+            await result_cache.put(erica_request)
+        elif erica_request.has_inline_pdf:
+            # The cached request is shared between all reads, so the PDF is added to a copy
+            pdf = await self.erica_request_repository.get_pdf_by_job_request_id(request_id)
+            erica_request = erica_request.copy(update={'result': {**erica_request.result, 'pdf': pdf}})
+        return erica_request
+
+    async def get_statuses_by_batch_id(self, batch_id: UUID, request_type: RequestType):
+        return await self.erica_request_repository.get_statuses_by_batch_id(batch_id, request_type)
+
+    async def get_all_by_skip_and_limit(self, skip: int, limit: int):
+        return await self.erica_request_repository.get(skip, limit)
 
 
 class EricaRequestServiceModule(Module):
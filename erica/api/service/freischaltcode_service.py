@@ -15,30 +15,31 @@ class FreischaltCodeServiceInterface(BaseService):
     __metaclass__ = ABCMeta
 
     @abstractmethod
-    def get_response_freischaltcode_request(self,
-                                            request_id: UUID) -> FreischaltcodeRequestAndActivationResponseDto:
+    async def get_response_freischaltcode_request(self, request_id: UUID,
+                                                  wait: float = 0) -> FreischaltcodeRequestAndActivationResponseDto:
         pass
 
     @abstractmethod
-    def get_response_freischaltcode_activation(self,
-                                               request_id: UUID) -> FreischaltcodeRequestAndActivationResponseDto:
+    async def get_response_freischaltcode_activation(self, request_id: UUID,
+                                                     wait: float = 0) -> FreischaltcodeRequestAndActivationResponseDto:
         pass
 
     @abstractmethod
-    def get_response_freischaltcode_revocation(self, request_id: UUID) -> FreischaltcodeRevocationResponseDto:
+    async def get_response_freischaltcode_revocation(self, request_id: UUID,
+                                                     wait: float = 0) -> FreischaltcodeRevocationResponseDto:
         pass
 
 
 class FreischaltCodeService(FreischaltCodeServiceInterface):
 
-    def get_response_freischaltcode_request(self, request_id: UUID):
-        return self._get_base_response_freischaltcode(request_id, RequestType.freischalt_code_request)
+    async def get_response_freischaltcode_request(self, request_id: UUID, wait: float = 0):
+        return await self._get_base_response_freischaltcode(request_id, RequestType.freischalt_code_request, wait)
 
-    def get_response_freischaltcode_activation(self, request_id: UUID):
-        return self._get_base_response_freischaltcode(request_id, RequestType.freischalt_code_activate)
+    async def get_response_freischaltcode_activation(self, request_id: UUID, wait: float = 0):
+        return await self._get_base_response_freischaltcode(request_id, RequestType.freischalt_code_activate, wait)
 
-    def _get_base_response_freischaltcode(self, request_id: UUID, request_type: RequestType):
-        erica_request = self.get_erica_request(request_id, request_type)
+    async def _get_base_response_freischaltcode(self, request_id: UUID, request_type: RequestType, wait: float = 0):
+        erica_request = await self.get_erica_request(request_id, request_type, wait)
         process_status = map_status(erica_request.status)
         if process_status == JobState.SUCCESS:
             result = ResultFreischaltcodeRequestAndActivationDto(
@@ -55,8 +56,8 @@ class FreischaltCodeService(FreischaltCodeServiceInterface):
             return FreischaltcodeRequestAndActivationResponseDto(
                 process_status=map_status(erica_request.status))
 
-    def get_response_freischaltcode_revocation(self, request_id: UUID):
-        erica_request = self.get_erica_request(request_id, RequestType.freischalt_code_revocate)
+    async def get_response_freischaltcode_revocation(self, request_id: UUID, wait: float = 0):
+        erica_request = await self.get_erica_request(request_id, RequestType.freischalt_code_revocate, wait)
         process_status = map_status(erica_request.status)
         if process_status == JobState.SUCCESS:
             result = TransferticketAndIdnrResponseDto(
@@ -14,19 +14,17 @@ class GrundsteuerServiceInterface(BaseService):
     __metaclass__ = ABCMeta
 
     @abstractmethod
-    def get_response_grundsteuer(self, request_id: UUID) -> GrundsteuerResponseDto:
+    async def get_response_grundsteuer(self, request_id: UUID, wait: float = 0) -> GrundsteuerResponseDto:
         pass
 
 
 class GrundsteuerService(GrundsteuerServiceInterface):
 
-    def get_response_grundsteuer(self, request_id: UUID):
-        erica_request = self.get_erica_request(request_id, RequestType.grundsteuer)
+    async def get_response_grundsteuer(self, request_id: UUID, wait: float = 0):
+        erica_request = await self.get_erica_request(request_id, RequestType.grundsteuer, wait)
         process_status = map_status(erica_request.status)
         if process_status == JobState.SUCCESS:
-            result = ResultTransferPdfResponseDto(
-                transferticket=erica_request.result["transferticket"],
-                pdf=erica_request.result["pdf"])
+            result = ResultTransferPdfResponseDto.from_result(erica_request.result)
             return GrundsteuerResponseDto(
                 process_status=map_status(erica_request.status), result=result)
         elif process_status == JobState.FAILURE:
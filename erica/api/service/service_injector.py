@@ -1,3 +1,6 @@
+from functools import lru_cache
+from types import MappingProxyType
+
 from opyoid import Injector
 
 from erica.job_service.application_module import ApplicationModule
@@ -9,20 +12,31 @@ from erica.api.service.tax_number_validition_service import TaxNumberValiditySer
 from erica.api.service.ustva_service import UstvaServiceInterface
 from erica.domain.model.erica_request import RequestType
 
+service_interfaces = MappingProxyType({
+    RequestType.freischalt_code_request: FreischaltCodeServiceInterface,
+    RequestType.freischalt_code_activate: FreischaltCodeServiceInterface,
+    RequestType.freischalt_code_revocate: FreischaltCodeServiceInterface,
+    RequestType.check_tax_number: TaxNumberValidityServiceInterface,
+    RequestType.send_est: TaxDeclarationServiceInterface,
+    RequestType.grundsteuer: GrundsteuerServiceInterface,
+    RequestType.send_ustva: UstvaServiceInterface
+})
 
-def get_service(request_type: RequestType) -> BaseService:
 
-    injector = Injector([
+@lru_cache()
+def _get_injector() -> Injector:
+    return Injector([
         ApplicationModule(),
     ])
 
-    switcher = {
-        RequestType.freischalt_code_request: injector.inject(FreischaltCodeServiceInterface),
-        RequestType.freischalt_code_activate: injector.inject(FreischaltCodeServiceInterface),
-        RequestType.freischalt_code_revocate: injector.inject(FreischaltCodeServiceInterface),
-        RequestType.check_tax_number: injector.inject(TaxNumberValidityServiceInterface),
-        RequestType.send_est: injector.inject(TaxDeclarationServiceInterface),
-        RequestType.grundsteuer: injector.inject(GrundsteuerServiceInterface),
-        RequestType.send_ustva: injector.inject(UstvaServiceInterface)
-    }
-    return switcher.get(request_type)
+
+@lru_cache(maxsize=None)
+def get_service(request_type: RequestType) -> BaseService:
+    """
+    Returns the API service for the request type. The services are wired on first use and reused for all requests;
+    they resolve the database session of the current request on every call.
+    """
+    service_interface = service_interfaces.get(request_type)
+    if service_interface is None:
+        return None
+    return _get_injector().inject(service_interface)
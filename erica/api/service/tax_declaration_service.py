@@ -14,19 +14,17 @@ class TaxDeclarationServiceInterface(BaseService):
     __metaclass__ = ABCMeta
 
     @abstractmethod
-    def get_response_send_est(self, request_id: UUID) -> EstResponseDto:
+    async def get_response_send_est(self, request_id: UUID, wait: float = 0) -> EstResponseDto:
         pass
 
 
 class TaxDeclarationService(TaxDeclarationServiceInterface):
 
-    def get_response_send_est(self, request_id: UUID):
-        erica_request = self.get_erica_request(request_id, RequestType.send_est)
+    async def get_response_send_est(self, request_id: UUID, wait: float = 0):
+        erica_request = await self.get_erica_request(request_id, RequestType.send_est, wait)
         process_status = map_status(erica_request.status)
         if process_status == JobState.SUCCESS:
-            result = ResultTransferPdfResponseDto(
-                transferticket=erica_request.result["transferticket"],
-                pdf=erica_request.result["pdf"])
+            result = ResultTransferPdfResponseDto.from_result(erica_request.result)
             return EstResponseDto(
                 process_status=map_status(erica_request.status), result=result)
         elif process_status == JobState.FAILURE:
@@ -14,14 +14,14 @@ class TaxNumberValidityServiceInterface(BaseService):
     __metaclass__ = ABCMeta
 
     @abstractmethod
-    def get_response_tax_number_validity(self, request_id: UUID) -> TaxResponseDto:
+    async def get_response_tax_number_validity(self, request_id: UUID, wait: float = 0) -> TaxResponseDto:
         pass
 
 
 class TaxNumberValidityService(TaxNumberValidityServiceInterface):
 
-    def get_response_tax_number_validity(self, request_id: UUID):
-        erica_request = self.get_erica_request(request_id, RequestType.check_tax_number)
+    async def get_response_tax_number_validity(self, request_id: UUID, wait: float = 0):
+        erica_request = await self.get_erica_request(request_id, RequestType.check_tax_number, wait)
         process_status = map_status(erica_request.status)
         if process_status == JobState.SUCCESS:
             result = ResultTaxResponseDto(
@@ -15,14 +15,14 @@ class UstvaServiceInterface(BaseService):
     __metaclass__ = ABCMeta
 
     @abstractmethod
-    def get_response_send_ustva(self, request_id: UUID) -> UstvaResponseDto:
+    async def get_response_send_ustva(self, request_id: UUID, wait: float = 0) -> UstvaResponseDto:
         pass
 
 
 class UstvaService(UstvaServiceInterface):
 
-    def get_response_send_ustva(self, request_id: UUID) -> UstvaResponseDto:
-        erica_request = self.get_erica_request(request_id, RequestType.send_ustva)
+    async def get_response_send_ustva(self, request_id: UUID, wait: float = 0) -> UstvaResponseDto:
+        erica_request = await self.get_erica_request(request_id, RequestType.send_ustva, wait)
         process_status = map_status(erica_request.status)
         if process_status == JobState.SUCCESS:
             result_payload: Optional[dict] = erica_request.result
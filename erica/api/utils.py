@@ -46,6 +46,6 @@ injector = Injector([
 ])
 
 
-def get_erica_request(request_id: UUID):
+async def get_erica_request(request_id: UUID):
     erica_request_service: EricaRequestServiceInterface = injector.inject(EricaRequestServiceInterface)
-    return erica_request_service.get_request_by_request_id(request_id)
+    return await erica_request_service.get_request_by_request_id(request_id)
@@ -1,13 +1,20 @@
 from uuid import UUID
 
 from fastapi import status, APIRouter
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
 
-from erica.api.dto.tax_declaration_dto import TaxDeclarationDto
+from erica.api.dto.tax_declaration_dto import TaxDeclarationDto, TaxDeclarationBatchDto
+from erica.api.errors import PdfNotAvailableError
+from erica.api.dto.response_dto import JobState
 from erica.api.service.service_injector import get_service
 from erica.api.service.tax_declaration_service import TaxDeclarationServiceInterface
-from erica.api.v2.responses.model import response_model_get_send_est_from_queue, response_model_post_to_queue
+from erica.api.v2.responses.batch import batch_created_response
+from erica.api.v2.responses.job_events import job_events_response
+from erica.api.v2.responses.pdf_streaming import negotiate_job_response, pdf_file_response
+from erica.api.v2.responses.model import response_model_get_send_est_from_queue, response_model_post_to_queue, \
+    response_model_post_batch_to_queue, response_model_get_batch_from_queue
 from erica.domain.model.erica_request import RequestType
 from erica.job_service.job_service_factory import get_job_service
 
@@ -30,10 +37,61 @@ async def send_est(est_data_client_identifier: TaxDeclarationDto, request: Reque
 
 
 @router.get('/ests/{request_id}', status_code=status.HTTP_200_OK, responses=response_model_get_send_est_from_queue)
-async def get_send_est_job(request_id: UUID):
+async def get_send_est_job(request_id: UUID, request: Request = None, wait: float = 0):
     """
     Route for retrieving job status of a sent tax declaration from the queue.
     :param request_id: the id of the job.
+    :param request: API request object. Its Accept header selects JSON, application/pdf or multipart/mixed.
+    :param wait: seconds to wait for the job to finish before answering, at most job_max_wait_in_sec.
     """
     tax_declaration_service: TaxDeclarationServiceInterface = get_service(RequestType.send_est)
-    return tax_declaration_service.get_response_send_est(request_id)
+    response_dto = await tax_declaration_service.get_response_send_est(request_id, wait)
+    return await run_in_threadpool(negotiate_job_response, response_dto, request)
+
+
+@router.get('/ests/{request_id}/events', status_code=status.HTTP_200_OK)
+async def get_send_est_job_events(request_id: UUID, request: Request):
+    """
+    Route for following the job status of a sent tax declaration as Server-Sent Events until the job is finished.
+    :param request_id: the id of the job.
+    :param request: API request object.
+    """
+    tax_declaration_service: TaxDeclarationServiceInterface = get_service(RequestType.send_est)
+    return await job_events_response(
+        request, lambda wait: tax_declaration_service.get_response_send_est(request_id, wait))
+
+
+@router.get('/ests/{request_id}/pdf', status_code=status.HTTP_200_OK)
+async def get_send_est_pdf(request_id: UUID, request: Request):
+    """
+    Route for retrieving the PDF of a sent tax declaration as a file. Supports single byte ranges.
+    :param request_id: the id of the job.
+    :param request: API request object.
+    """
+    tax_declaration_service: TaxDeclarationServiceInterface = get_service(RequestType.send_est)
+    response_dto = await tax_declaration_service.get_response_send_est(request_id)
+    if response_dto.process_status != JobState.SUCCESS:
+        raise PdfNotAvailableError(request_id)
+    return await run_in_threadpool(pdf_file_response, response_dto, request.headers.get('range'))
+
+
+@router.post('/ests/batch', status_code=status.HTTP_201_CREATED, responses=response_model_post_batch_to_queue)
+async def send_est_batch(est_data_client_identifier: TaxDeclarationBatchDto, request: Request):
+    """
+    Route for sending tax declarations in one batch using the job queue.
+    :param request: API request object.
+    :param est_data_client_identifier: client identifier and the JSON input data for each tax declaration.
+    """
+    result = get_job_service(RequestType.send_est).add_batch_to_queue(
+        est_data_client_identifier.payloads, est_data_client_identifier.client_identifier, RequestType.send_est)
+    return batch_created_response(result, request, "get_send_est_batch")
+
+
+@router.get('/ests/batch/{batch_id}', status_code=status.HTTP_200_OK, responses=response_model_get_batch_from_queue)
+async def get_send_est_batch(batch_id: UUID):
+    """
+    Route for retrieving the progress of a batch of tax declarations from the queue.
+    :param batch_id: the id of the batch.
+    """
+    tax_declaration_service: TaxDeclarationServiceInterface = get_service(RequestType.send_est)
+    return await tax_declaration_service.get_response_batch(batch_id, RequestType.send_est)
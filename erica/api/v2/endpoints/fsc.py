@@ -5,12 +5,16 @@ from starlette.requests import Request
 from starlette.responses import RedirectResponse
 
 from erica.api.dto.freischaltcode import FreischaltCodeRequestDto, FreischaltCodeActivateDto, \
-    FreischaltCodeRevocateDto
+    FreischaltCodeRevocateDto, FreischaltCodeRequestBatchDto, FreischaltCodeActivateBatchDto, \
+    FreischaltCodeRevocateBatchDto
 from erica.api.service.freischaltcode_service import FreischaltCodeService, FreischaltCodeServiceInterface
 from erica.api.service.service_injector import get_service
+from erica.api.v2.responses.batch import batch_created_response
+from erica.api.v2.responses.job_events import job_events_response
+from erica.api.v2.responses.ndjson_ingestion import ndjson_ingestion_response, ndjson_ingestion_request_body
 from erica.api.v2.responses.model import response_model_get_unlock_code_request_from_queue, \
     response_model_get_unlock_code_activation_from_queue, response_model_get_unlock_code_revocation_from_queue, \
-    response_model_post_to_queue
+    response_model_post_to_queue, response_model_post_batch_to_queue, response_model_get_batch_from_queue
 from erica.domain.model.erica_request import RequestType
 from erica.job_service.job_service_factory import get_job_service
 
@@ -34,13 +38,26 @@ async def request_fsc(request_fsc_client_identifier: FreischaltCodeRequestDto, r
 
 @router.get('/request/{request_id}', status_code=status.HTTP_200_OK,
             responses=response_model_get_unlock_code_request_from_queue)
-async def get_fsc_request_job(request_id: UUID):
+async def get_fsc_request_job(request_id: UUID, wait: float = 0):
     """
     Route for retrieving job status from an fsc request from the queue.
     :param request_id: the id of the job.
+    :param wait: seconds to wait for the job to finish before answering, at most job_max_wait_in_sec.
     """
     freischaltcode_service: FreischaltCodeServiceInterface = get_service(RequestType.freischalt_code_request)
-    return freischaltcode_service.get_response_freischaltcode_request(request_id)
+    return await freischaltcode_service.get_response_freischaltcode_request(request_id, wait)
+
+
+@router.get('/request/{request_id}/events', status_code=status.HTTP_200_OK)
+async def get_fsc_request_job_events(request_id: UUID, request: Request):
+    """
+    Route for following the job status of an fsc request as Server-Sent Events until the job is finished.
+    :param request_id: the id of the job.
+    :param request: API request object.
+    """
+    freischaltcode_service: FreischaltCodeServiceInterface = get_service(RequestType.freischalt_code_request)
+    return await job_events_response(
+        request, lambda wait: freischaltcode_service.get_response_freischaltcode_request(request_id, wait))
 
 
 @router.post('/activation', status_code=status.HTTP_201_CREATED, responses=response_model_post_to_queue)
@@ -61,13 +78,26 @@ async def activate_fsc(activation_fsc_client_identifier: FreischaltCodeActivateD
 
 @router.get('/activation/{request_id}', status_code=status.HTTP_200_OK,
             responses=response_model_get_unlock_code_activation_from_queue)
-async def get_fsc_activation_job(request_id: UUID):
+async def get_fsc_activation_job(request_id: UUID, wait: float = 0):
     """
     Route for retrieving job status from an fsc activation from the queue.
     :param request_id: the id of the job.
+    :param wait: seconds to wait for the job to finish before answering, at most job_max_wait_in_sec.
+    """
+    freischaltcode_service: FreischaltCodeService = get_service(RequestType.freischalt_code_activate)
+    return await freischaltcode_service.get_response_freischaltcode_activation(request_id, wait)
+
+
+@router.get('/activation/{request_id}/events', status_code=status.HTTP_200_OK)
+async def get_fsc_activation_job_events(request_id: UUID, request: Request):
+    """
+    Route for following the job status of an fsc activation as Server-Sent Events until the job is finished.
+    :param request_id: the id of the job.
+    :param request: API request object.
     """
     freischaltcode_service: FreischaltCodeService = get_service(RequestType.freischalt_code_activate)
-    return freischaltcode_service.get_response_freischaltcode_activation(request_id)
+    return await job_events_response(
+        request, lambda wait: freischaltcode_service.get_response_freischaltcode_activation(request_id, wait))
 
 
 @router.post('/revocation', status_code=status.HTTP_201_CREATED, responses=response_model_post_to_queue)
@@ -88,10 +118,106 @@ async def revocate_fsc(revocation_fsc_client_identifier: FreischaltCodeRevocateD
 
 @router.get('/revocation/{request_id}', status_code=status.HTTP_200_OK,
             responses=response_model_get_unlock_code_revocation_from_queue)
-async def get_fsc_revocation_job(request_id: UUID):
+async def get_fsc_revocation_job(request_id: UUID, wait: float = 0):
     """
     Route for retrieving job status from an fsc revocation from the queue.
     :param request_id: the id of the job.
+    :param wait: seconds to wait for the job to finish before answering, at most job_max_wait_in_sec.
     """
     freischaltcode_service: FreischaltCodeService = get_service(RequestType.freischalt_code_revocate)
-    return freischaltcode_service.get_response_freischaltcode_revocation(request_id)
+    return await freischaltcode_service.get_response_freischaltcode_revocation(request_id, wait)
+
+
+@router.get('/revocation/{request_id}/events', status_code=status.HTTP_200_OK)
+async def get_fsc_revocation_job_events(request_id: UUID, request: Request):
+    """
+    Route for following the job status of an fsc revocation as Server-Sent Events until the job is finished.
+    :param request_id: the id of the job.
+    :param request: API request object.
+    """
+    freischaltcode_service: FreischaltCodeService = get_service(RequestType.freischalt_code_revocate)
+    return await job_events_response(
+        request, lambda wait: freischaltcode_service.get_response_freischaltcode_revocation(request_id, wait))
+
+
+@router.post('/request/batch', status_code=status.HTTP_201_CREATED, responses=response_model_post_batch_to_queue)
+async def request_fsc_batch(request_fsc_client_identifier: FreischaltCodeRequestBatchDto, request: Request):
+    """
+    Route for requesting new fscs in one batch using the job queue.
+    :param request: API request object.
+    :param request_fsc_client_identifier: client identifier and the JSON input data for each fsc request.
+    """
+    result = get_job_service(RequestType.freischalt_code_request).add_batch_to_queue(
+        request_fsc_client_identifier.payloads, request_fsc_client_identifier.client_identifier,
+        RequestType.freischalt_code_request)
+    return batch_created_response(result, request, "get_fsc_request_batch")
+
+
+@router.get('/request/batch/{batch_id}', status_code=status.HTTP_200_OK, responses=response_model_get_batch_from_queue)
+async def get_fsc_request_batch(batch_id: UUID):
+    """
+    Route for retrieving the progress of a batch of fsc requests from the queue.
+    :param batch_id: the id of the batch.
+    """
+    freischaltcode_service: FreischaltCodeServiceInterface = get_service(RequestType.freischalt_code_request)
+    return await freischaltcode_service.get_response_batch(batch_id, RequestType.freischalt_code_request)
+
+
+@router.post('/request/stream', status_code=status.HTTP_200_OK, openapi_extra=ndjson_ingestion_request_body)
+async def request_fsc_stream(request: Request):
+    """
+    Route for requesting one new fsc per line of an NDJSON upload using the job queue, all in the same batch.
+    :param request: API request object, whose body contains one fsc request in the format of a single submission per
+     line.
+    """
+    return await ndjson_ingestion_response(request, FreischaltCodeRequestDto,
+                                           get_job_service(RequestType.freischalt_code_request),
+                                           RequestType.freischalt_code_request, "get_fsc_request_batch")
+
+
+@router.post('/activation/batch', status_code=status.HTTP_201_CREATED, responses=response_model_post_batch_to_queue)
+async def activate_fsc_batch(activation_fsc_client_identifier: FreischaltCodeActivateBatchDto, request: Request):
+    """
+    Route for requesting activations of fscs in one batch using the job queue.
+    :param request: API request object.
+    :param activation_fsc_client_identifier: client identifier and the JSON input data for each fsc activation.
+    """
+    result = get_job_service(RequestType.freischalt_code_activate).add_batch_to_queue(
+        activation_fsc_client_identifier.payloads, activation_fsc_client_identifier.client_identifier,
+        RequestType.freischalt_code_activate)
+    return batch_created_response(result, request, "get_fsc_activation_batch")
+
+
+@router.get('/activation/batch/{batch_id}', status_code=status.HTTP_200_OK,
+            responses=response_model_get_batch_from_queue)
+async def get_fsc_activation_batch(batch_id: UUID):
+    """
+    Route for retrieving the progress of a batch of fsc activations from the queue.
+    :param batch_id: the id of the batch.
+    """
+    freischaltcode_service: FreischaltCodeServiceInterface = get_service(RequestType.freischalt_code_activate)
+    return await freischaltcode_service.get_response_batch(batch_id, RequestType.freischalt_code_activate)
+
+
+@router.post('/revocation/batch', status_code=status.HTTP_201_CREATED, responses=response_model_post_batch_to_queue)
+async def revocate_fsc_batch(revocation_fsc_client_identifier: FreischaltCodeRevocateBatchDto, request: Request):
+    """
+    Route for requesting revocations of fscs in one batch using the job queue.
+    :param request: API request object.
+    :param revocation_fsc_client_identifier: client identifier and the JSON input data for each fsc revocation.
+    """
+    result = get_job_service(RequestType.freischalt_code_revocate).add_batch_to_queue(
+        revocation_fsc_client_identifier.payloads, revocation_fsc_client_identifier.client_identifier,
+        RequestType.freischalt_code_revocate)
+    return batch_created_response(result, request, "get_fsc_revocation_batch")
+
+
+@router.get('/revocation/batch/{batch_id}', status_code=status.HTTP_200_OK,
+            responses=response_model_get_batch_from_queue)
+async def get_fsc_revocation_batch(batch_id: UUID):
+    """
+    Route for retrieving the progress of a batch of fsc revocations from the queue.
+    :param batch_id: the id of the batch.
+    """
+    freischaltcode_service: FreischaltCodeServiceInterface = get_service(RequestType.freischalt_code_revocate)
+    return await freischaltcode_service.get_response_batch(batch_id, RequestType.freischalt_code_revocate)
@@ -2,13 +2,20 @@ import uuid
 
 from fastapi import APIRouter
 from starlette import status
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
 
-from erica.api.dto.grundsteuer_dto import GrundsteuerDto
+from erica.api.dto.grundsteuer_dto import GrundsteuerDto, GrundsteuerBatchDto
 from erica.api.service.grundsteuer_service import GrundsteuerServiceInterface
+from erica.api.errors import PdfNotAvailableError
+from erica.api.dto.response_dto import JobState
 from erica.api.service.service_injector import get_service
-from erica.api.v2.responses.model import response_model_post_to_queue, response_model_get_send_grundsteuer_from_queue
+from erica.api.v2.responses.batch import batch_created_response
+from erica.api.v2.responses.job_events import job_events_response
+from erica.api.v2.responses.pdf_streaming import negotiate_job_response, pdf_file_response
+from erica.api.v2.responses.model import response_model_post_to_queue, response_model_get_send_grundsteuer_from_queue, \
+    response_model_post_batch_to_queue, response_model_get_batch_from_queue
 from erica.domain.model.erica_request import RequestType
 from erica.job_service.job_service_factory import get_job_service
 
@@ -31,10 +38,62 @@ async def send_grundsteuer(grundsteuer: GrundsteuerDto, request: Request):
 
 @router.get('/grundsteuer/{request_id}', status_code=status.HTTP_200_OK,
             responses=response_model_get_send_grundsteuer_from_queue)
-async def get_grundsteuer_job(request_id: uuid.UUID):
+async def get_grundsteuer_job(request_id: uuid.UUID, request: Request = None, wait: float = 0):
     """
     Route for retrieving job status of a grundsteuer tax declaration validation from the queue.
     :param request_id: the id of the job.
+    :param request: API request object. Its Accept header selects JSON, application/pdf or multipart/mixed.
+    :param wait: seconds to wait for the job to finish before answering, at most job_max_wait_in_sec.
     """
     grundsteuer_service: GrundsteuerServiceInterface = get_service(RequestType.grundsteuer)
-    return grundsteuer_service.get_response_grundsteuer(request_id)
+    response_dto = await grundsteuer_service.get_response_grundsteuer(request_id, wait)
+    return await run_in_threadpool(negotiate_job_response, response_dto, request)
+
+
+@router.get('/grundsteuer/{request_id}/events', status_code=status.HTTP_200_OK)
+async def get_grundsteuer_job_events(request_id: uuid.UUID, request: Request):
+    """
+    Route for following the job status of a grundsteuer tax declaration as Server-Sent Events until the job is finished.
+    :param request_id: the id of the job.
+    :param request: API request object.
+    """
+    grundsteuer_service: GrundsteuerServiceInterface = get_service(RequestType.grundsteuer)
+    return await job_events_response(
+        request, lambda wait: grundsteuer_service.get_response_grundsteuer(request_id, wait))
+
+
+@router.get('/grundsteuer/{request_id}/pdf', status_code=status.HTTP_200_OK)
+async def get_grundsteuer_pdf(request_id: uuid.UUID, request: Request):
+    """
+    Route for retrieving the PDF of a grundsteuer tax declaration as a file. Supports single byte ranges.
+    :param request_id: the id of the job.
+    :param request: API request object.
+    """
+    grundsteuer_service: GrundsteuerServiceInterface = get_service(RequestType.grundsteuer)
+    response_dto = await grundsteuer_service.get_response_grundsteuer(request_id)
+    if response_dto.process_status != JobState.SUCCESS:
+        raise PdfNotAvailableError(request_id)
+    return await run_in_threadpool(pdf_file_response, response_dto, request.headers.get('range'))
+
+
+@router.post('/grundsteuer/batch', status_code=status.HTTP_201_CREATED, responses=response_model_post_batch_to_queue)
+async def send_grundsteuer_batch(grundsteuer: GrundsteuerBatchDto, request: Request):
+    """
+    Route for sending grundsteuer tax declarations in one batch using the job queue.
+    :param request: API request object.
+    :param grundsteuer: client identifier and the JSON input data for each grundsteuer tax declaration.
+    """
+    result = get_job_service(RequestType.grundsteuer).add_batch_to_queue(
+        grundsteuer.payloads, grundsteuer.client_identifier, RequestType.grundsteuer)
+    return batch_created_response(result, request, "get_grundsteuer_batch")
+
+
+@router.get('/grundsteuer/batch/{batch_id}', status_code=status.HTTP_200_OK,
+            responses=response_model_get_batch_from_queue)
+async def get_grundsteuer_batch(batch_id: uuid.UUID):
+    """
+    Route for retrieving the progress of a batch of grundsteuer tax declarations from the queue.
+    :param batch_id: the id of the batch.
+    """
+    grundsteuer_service: GrundsteuerServiceInterface = get_service(RequestType.grundsteuer)
+    return await grundsteuer_service.get_response_batch(batch_id, RequestType.grundsteuer)
@@ -1,15 +1,21 @@
 from uuid import UUID
 
 from fastapi import status, APIRouter
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
 from starlette.responses import FileResponse, RedirectResponse
 
-from erica.api.dto.tax_number_validation_dto import CheckTaxNumberDto
+from erica.api.dto.tax_number_validation_dto import CheckTaxNumberDto, CheckTaxNumberBatchDto
 from erica.api.service.service_injector import get_service
 from erica.api.service.tax_number_validition_service import TaxNumberValidityServiceInterface
-from erica.api.v2.responses.model import response_model_get_tax_number_validity_from_queue, response_model_post_to_queue
+from erica.api.v2.responses.batch import batch_created_response
+from erica.api.v2.responses.job_events import job_events_response
+from erica.api.v2.responses.ndjson_ingestion import ndjson_ingestion_response, ndjson_ingestion_request_body
+from erica.api.v2.responses.model import response_model_get_tax_number_validity_from_queue, \
+    response_model_post_to_queue, response_model_post_batch_to_queue, response_model_get_batch_from_queue
 from erica.domain.model.erica_request import RequestType
 from erica.job_service.job_service_factory import get_job_service
+from erica.worker.request_processing.requests_controller import CheckTaxNumberRequestController
 
 router = APIRouter()
 
@@ -17,13 +23,23 @@ router = APIRouter()
 @router.post('/tax_number_validity', status_code=status.HTTP_201_CREATED, responses=response_model_post_to_queue)
 async def is_valid_tax_number(tax_validity_client_identifier: CheckTaxNumberDto, request: Request):
     """
-    Route for validation of a tax number using the job queue.
+    Route for validation of a tax number using the job queue. Tax numbers that are invalid for sure or that were
+    already checked with the current ERiC version are answered without a job, their result can be retrieved right away.
     :param request: API request object.
     :param tax_validity_client_identifier: payload with client identifier and the JSON input data for the tax number validity check.
     """
-    result = get_job_service(RequestType.check_tax_number).add_to_queue(
-        tax_validity_client_identifier.payload, tax_validity_client_identifier.client_identifier,
-        RequestType.check_tax_number)
+    job_service = get_job_service(RequestType.check_tax_number)
+    # The cache of the results is read from Redis synchronously
+    result_without_eric = await run_in_threadpool(CheckTaxNumberRequestController.get_result_without_eric,
+                                                  tax_validity_client_identifier.payload)
+    if result_without_eric is not None:
+        result = await run_in_threadpool(
+            job_service.add_finished_request, tax_validity_client_identifier.payload,
+            tax_validity_client_identifier.client_identifier, RequestType.check_tax_number, result_without_eric)
+    else:
+        result = job_service.add_to_queue(
+            tax_validity_client_identifier.payload, tax_validity_client_identifier.client_identifier,
+            RequestType.check_tax_number)
     return RedirectResponse(
         str(request.url_for("get_valid_tax_number_job", request_id=str(result.request_id))).removeprefix(
             str(request.base_url)),
@@ -32,13 +48,61 @@ async def is_valid_tax_number(tax_validity_client_identifier: CheckTaxNumberDto,
 
 @router.get('/tax_number_validity/{request_id}', status_code=status.HTTP_200_OK,
             responses=response_model_get_tax_number_validity_from_queue)
-async def get_valid_tax_number_job(request_id: UUID):
+async def get_valid_tax_number_job(request_id: UUID, wait: float = 0):
     """
     Route for retrieving job status of a tax number validity from the queue.
     :param request_id: the id of the job.
+    :param wait: seconds to wait for the job to finish before answering, at most job_max_wait_in_sec.
+    """
+    tax_number_validity_service: TaxNumberValidityServiceInterface = get_service(RequestType.check_tax_number)
+    return await tax_number_validity_service.get_response_tax_number_validity(request_id, wait)
+
+
+@router.get('/tax_number_validity/{request_id}/events', status_code=status.HTTP_200_OK)
+async def get_valid_tax_number_job_events(request_id: UUID, request: Request):
+    """
+    Route for following the job status of a tax number validity as Server-Sent Events until the job is finished.
+    :param request_id: the id of the job.
+    :param request: API request object.
     """
     tax_number_validity_service: TaxNumberValidityServiceInterface = get_service(RequestType.check_tax_number)
-    return tax_number_validity_service.get_response_tax_number_validity(request_id)
+    return await job_events_response(
+        request, lambda wait: tax_number_validity_service.get_response_tax_number_validity(request_id, wait))
+
+
+@router.post('/tax_number_validity/batch', status_code=status.HTTP_201_CREATED,
+             responses=response_model_post_batch_to_queue)
+async def is_valid_tax_number_batch(tax_validity_client_identifier: CheckTaxNumberBatchDto, request: Request):
+    """
+    Route for validation of tax numbers in one batch using the job queue.
+    :param request: API request object.
+    :param tax_validity_client_identifier: client identifier and the JSON input data for each tax number validity check.
+    """
+    result = get_job_service(RequestType.check_tax_number).add_batch_to_queue(
+        tax_validity_client_identifier.payloads, tax_validity_client_identifier.client_identifier,
+        RequestType.check_tax_number)
+    return batch_created_response(result, request, "get_valid_tax_number_batch")
+
+
+@router.get('/tax_number_validity/batch/{batch_id}', status_code=status.HTTP_200_OK,
+            responses=response_model_get_batch_from_queue)
+async def get_valid_tax_number_batch(batch_id: UUID):
+    """
+    Route for retrieving the progress of a batch of tax number validity checks from the queue.
+    :param batch_id: the id of the batch.
+    """
+    tax_number_validity_service: TaxNumberValidityServiceInterface = get_service(RequestType.check_tax_number)
+    return await tax_number_validity_service.get_response_batch(batch_id, RequestType.check_tax_number)
+
+
+@router.post('/tax_number_validity/stream', status_code=status.HTTP_200_OK, openapi_extra=ndjson_ingestion_request_body)
+async def is_valid_tax_number_stream(request: Request):
+    """
+    Route for validation of one tax number per line of an NDJSON upload using the job queue, all in the same batch.
+    :param request: API request object, whose body contains one check in the format of a single submission per line.
+    """
+    return await ndjson_ingestion_response(request, CheckTaxNumberDto, get_job_service(RequestType.check_tax_number),
+                                           RequestType.check_tax_number, "get_valid_tax_number_batch")
 
 
 @router.get('/tax_offices/', status_code=status.HTTP_200_OK)
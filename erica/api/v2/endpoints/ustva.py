@@ -4,10 +4,14 @@ from fastapi import APIRouter, status
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
 
-from erica.api.dto.ustva_dto import UstvaDto
+from erica.api.dto.ustva_dto import UstvaDto, UstvaBatchDto
 from erica.api.service.service_injector import get_service
 from erica.api.service.ustva_service import UstvaServiceInterface
-from erica.api.v2.responses.model import response_model_get_send_ustva_from_queue, response_model_post_to_queue
+from erica.api.v2.responses.batch import batch_created_response
+from erica.api.v2.responses.job_events import job_events_response
+from erica.api.v2.responses.ndjson_ingestion import ndjson_ingestion_response, ndjson_ingestion_request_body
+from erica.api.v2.responses.model import response_model_get_send_ustva_from_queue, response_model_post_to_queue, \
+    response_model_post_batch_to_queue, response_model_get_batch_from_queue
 from erica.domain.model.erica_request import RequestType
 from erica.job_service.job_service_factory import get_job_service
 
@@ -29,7 +33,39 @@ async def send_ustva(payload: UstvaDto, request: Request):
 
 
 @router.get('/ustva/{request_id}', status_code=status.HTTP_200_OK, responses=response_model_get_send_ustva_from_queue)
-async def get_send_ustva_job(request_id: UUID):
-    """Retrieve the processing status for a queued UStVA submission."""
+async def get_send_ustva_job(request_id: UUID, wait: float = 0):
+    """Retrieve the processing status for a queued UStVA submission, waiting up to `wait` seconds for it."""
     ustva_service: UstvaServiceInterface = get_service(RequestType.send_ustva)
-    return ustva_service.get_response_send_ustva(request_id)
+    return await ustva_service.get_response_send_ustva(request_id, wait)
+
+
+@router.get('/ustva/{request_id}/events', status_code=status.HTTP_200_OK)
+async def get_send_ustva_job_events(request_id: UUID, request: Request):
+    """Follow the processing status of a queued UStVA submission as Server-Sent Events until it is finished."""
+    ustva_service: UstvaServiceInterface = get_service(RequestType.send_ustva)
+    return await job_events_response(request, lambda wait: ustva_service.get_response_send_ustva(request_id, wait))
+
+
+@router.post('/ustva/batch', status_code=status.HTTP_201_CREATED, responses=response_model_post_batch_to_queue)
+async def send_ustva_batch(payload: UstvaBatchDto, request: Request):
+    """Queue a batch of UStVA submissions."""
+    result = get_job_service(RequestType.send_ustva).add_batch_to_queue(
+        payload.payloads,
+        payload.client_identifier,
+        RequestType.send_ustva,
+    )
+    return batch_created_response(result, request, "get_send_ustva_batch")
+
+
+@router.get('/ustva/batch/{batch_id}', status_code=status.HTTP_200_OK, responses=response_model_get_batch_from_queue)
+async def get_send_ustva_batch(batch_id: UUID):
+    """Retrieve the progress of a batch of queued UStVA submissions."""
+    ustva_service: UstvaServiceInterface = get_service(RequestType.send_ustva)
+    return await ustva_service.get_response_batch(batch_id, RequestType.send_ustva)
+
+
+@router.post('/ustva/stream', status_code=status.HTTP_200_OK, openapi_extra=ndjson_ingestion_request_body)
+async def send_ustva_stream(request: Request):
+    """Queue one UStVA submission per line of an NDJSON upload, all in the same batch."""
+    return await ndjson_ingestion_response(request, UstvaDto, get_job_service(RequestType.send_ustva),
+                                           RequestType.send_ustva, "get_send_ustva_batch")
@@ -0,0 +1,19 @@
+from fastapi.encoders import jsonable_encoder
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from erica.api.dto.erica_request_dto import EricaRequestBatchDto
+
+
+def batch_created_response(batch: EricaRequestBatchDto, request: Request, batch_endpoint: str) -> JSONResponse:
+    """
+    Answers a batch submission with the batch id and the request ids of its jobs, in the order of the payloads. The
+    Location header points to the progress of the batch.
+
+    :param batch: the submitted batch.
+    :param request: API request object.
+    :param batch_endpoint: name of the route that returns the progress of the batch.
+    """
+    location = str(request.url_for(batch_endpoint, batch_id=str(batch.batch_id))).removeprefix(str(request.base_url))
+    return JSONResponse(jsonable_encoder(batch), status_code=status.HTTP_201_CREATED, headers={'Location': location})
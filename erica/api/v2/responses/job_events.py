@@ -0,0 +1,55 @@
+from typing import AsyncIterator, Awaitable, Callable
+
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from erica.api.dto.response_dto import ResponseBaseDto, JobState
+from erica.api.v2.responses.pdf_streaming import render_json_body
+from erica.config import get_settings
+from erica.domain.sqlalchemy.database import session_scope
+
+EVENT_STREAM_MEDIA_TYPE = 'text/event-stream'
+_KEEP_ALIVE = b': keep-alive\n\n'
+
+
+def _format_event(body: bytes) -> bytes:
+    return b'event: status\ndata: ' + body + b'\n\n'
+
+
+def _render_event_in_own_session(response_dto: ResponseBaseDto) -> bytes:
+    """Renders the event of a later poll. The session of the request has been closed once the stream started, so the
+    blob of the PDF is read in a session of its own, which is closed again right after."""
+    with session_scope():
+        return _format_event(render_json_body(response_dto))
+
+
+async def job_events_response(request: Request, get_response: Callable[[float], Awaitable[ResponseBaseDto]]) \
+        -> StreamingResponse:
+    """
+    Streams the state of a job as Server-Sent Events. The current state is sent right away. While the job is
+    processing, the stream waits for its completion and sends a comment now and then to keep the connection open.
+    The final state is sent as the last event, then the stream ends.
+
+    :param request: API request object.
+    :param get_response: returns the response of the job, waiting up to the given seconds for its completion.
+    """
+    # Read the job and render its state before the response starts, so that an unknown job is answered with the usual
+    # error response and the blob of the PDF is read while the session of the request is still open
+    response = await get_response(0)
+    first_event = _format_event(await run_in_threadpool(render_json_body, response))
+
+    async def generate_events() -> AsyncIterator[bytes]:
+        current_response = response
+        yield first_event
+        while current_response.process_status == JobState.PROCESSING:
+            if await request.is_disconnected():
+                return
+            current_response = await get_response(get_settings().job_max_wait_in_sec)
+            if current_response.process_status == JobState.PROCESSING:
+                yield _KEEP_ALIVE
+            else:
+                yield await run_in_threadpool(_render_event_in_own_session, current_response)
+
+    return StreamingResponse(generate_events(), media_type=EVENT_STREAM_MEDIA_TYPE,
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
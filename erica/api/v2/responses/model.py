@@ -1,6 +1,7 @@
 from erica.api.dto.freischaltcode import FreischaltcodeRequestAndActivationResponseDto, \
     FreischaltcodeRevocationResponseDto
-from erica.api.dto.response_dto import ResponseErrorDto
+from erica.api.dto.erica_request_dto import EricaRequestBatchDto
+from erica.api.dto.response_dto import ResponseErrorDto, BatchResponseDto
 from erica.api.dto.grundsteuer_dto import GrundsteuerResponseDto
 from erica.api.dto.tax_declaration_dto import EstResponseDto
 from erica.api.dto.ustva_dto import UstvaResponseDto
@@ -26,14 +27,32 @@ response_model_post_to_queue = {
     422: model_422_error_queue,
     500: model_500_error_get_from_queue}
 
+response_model_post_batch_to_queue = {
+    201: {"model": EricaRequestBatchDto,
+          "description": "Jobs were successfully submitted to the queue and the batch id and request ids were returned."},
+    422: model_422_error_queue,
+    500: model_500_error_get_from_queue}
+
+response_model_get_batch_from_queue = {
+    200: {"model": BatchResponseDto,
+          "description": "Progress of the jobs of a batch was successfully retrieved from the queue."},
+    **base_response_get_from_queue}
+
+pdf_content = {"application/pdf": {"schema": {"type": "string", "format": "binary"}},
+               "multipart/mixed": {"schema": {"type": "string", "format": "binary"}}}
+
 response_model_get_send_est_from_queue = {
     200: {"model": EstResponseDto,
-          "description": "Job status of a sent est was successfully retrieved from the queue."},
+          "description": "Job status of a sent est was successfully retrieved from the queue. Successful jobs "
+                         "return the PDF as binary if requested with Accept: application/pdf or multipart/mixed.",
+          "content": pdf_content},
     **base_response_get_from_queue}
 
 response_model_get_send_grundsteuer_from_queue = {
     200: {"model": GrundsteuerResponseDto,
-          "description": "Job status of a sent grundsteuer was successfully retrieved from the queue."},
+          "description": "Job status of a sent grundsteuer was successfully retrieved from the queue. Successful jobs "
+                         "return the PDF as binary if requested with Accept: application/pdf or multipart/mixed.",
+          "content": pdf_content},
     **base_response_get_from_queue}
 
 response_model_get_send_ustva_from_queue = {
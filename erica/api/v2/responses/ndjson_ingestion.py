@@ -0,0 +1,170 @@
+import logging
+from collections import defaultdict
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator, IO, Iterator, List, Optional, Tuple, Type
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
+from starlette import status
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from erica.api.dto.base_dto import BaseDto
+from erica.api.dto.response_dto import IngestionAckDto, IngestionSummaryDto
+from erica.config import get_settings
+from erica.domain.model.erica_request import RequestType
+from erica.job_service.job_service import JobServiceInterface
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+# Acknowledgements are kept in memory up to this size and spill over to a temporary file beyond it
+_ACKS_MAX_MEMORY_SIZE = 1024 * 1024
+_ACKS_READ_SIZE = 64 * 1024
+
+ndjson_ingestion_request_body = {
+    'requestBody': {
+        'required': True,
+        'description': "One JSON object per line, each one in the format of a single submission.",
+        'content': {NDJSON_MEDIA_TYPE: {'schema': {'type': 'string'}}},
+    },
+    'responses': {
+        '200': {
+            'description': "One JSON object per non-empty line of the upload, with the request id of the line or the "
+                           "reason it was rejected, followed by a summary with the batch id. The response is only "
+                           "sent after the whole upload has been read and all lines have been processed, no "
+                           "acknowledgement is sent while the upload is still running. Send the whole body before "
+                           "reading the response.",
+            'content': {NDJSON_MEDIA_TYPE: {'schema': {'type': 'string'}}},
+        },
+    },
+}
+
+
+async def _read_lines(request: Request, max_line_bytes: int) -> AsyncIterator[Optional[bytes]]:
+    """Yields the lines of the request body as they arrive, without line breaks. A line that is longer than
+    `max_line_bytes` is dropped while it is read and yielded as None, so that no line grows beyond the limit."""
+    line = bytearray()
+    too_long = False
+    async for chunk in request.stream():
+        start = 0
+        while start <= len(chunk):
+            end = chunk.find(b'\n', start)
+            if not too_long:
+                line += chunk[start:end if end != -1 else len(chunk)]
+                if len(line) > max_line_bytes:
+                    too_long = True
+                    line.clear()
+            if end == -1:
+                break
+            yield None if too_long else bytes(line).rstrip(b'\r')
+            line.clear()
+            too_long = False
+            start = end + 1
+    if too_long:
+        yield None
+    elif line:
+        yield bytes(line).rstrip(b'\r')
+
+
+def _render(dto: BaseDto) -> bytes:
+    return dto.json(by_alias=True, exclude_none=True).encode() + b'\n'
+
+
+def _ingest_chunk(lines: List[Tuple[int, Optional[bytes]]], item_dto: Type[BaseDto], job_service: JobServiceInterface,
+                  request_type: RequestType, batch_id: UUID, acks: IO[bytes]) -> int:
+    """Validates the lines of one chunk, creates the requests of all valid ones and writes an acknowledgement per line.
+    Returns the number of created requests."""
+    acks_by_line = {}
+    items_by_client_identifier = defaultdict(list)
+    for line_number, line in lines:
+        if line is None:
+            acks_by_line[line_number] = IngestionAckDto(
+                line=line_number, error_code="LineTooLong",
+                error_message=f"The line is longer than {get_settings().ndjson_max_line_bytes} bytes.")
+            continue
+        try:
+            item = item_dto.parse_raw(line)
+        except ValidationError as e:
+            acks_by_line[line_number] = IngestionAckDto(line=line_number, error_code=e.__class__.__name__,
+                                                        error_message=str(e))
+            continue
+        items_by_client_identifier[item.client_identifier].append((line_number, item))
+
+    for client_identifier, items in items_by_client_identifier.items():
+        result = job_service.add_batch_to_queue([item.payload for _, item in items], client_identifier, request_type,
+                                                batch_id=batch_id)
+        for (line_number, _), request_id in zip(items, result.request_ids):
+            acks_by_line[line_number] = IngestionAckDto(line=line_number, request_id=request_id)
+
+    for line_number in sorted(acks_by_line):
+        acks.write(_render(acks_by_line[line_number]))
+    return sum(len(items) for items in items_by_client_identifier.values())
+
+
+def _read_acks(acks: IO[bytes]) -> Iterator[bytes]:
+    try:
+        acks.seek(0)
+        while chunk := acks.read(_ACKS_READ_SIZE):
+            yield chunk
+    finally:
+        acks.close()
+
+
+async def ndjson_ingestion_response(request: Request, item_dto: Type[BaseDto], job_service: JobServiceInterface,
+                                    request_type: RequestType, batch_endpoint: str) -> StreamingResponse:
+    """
+    Creates one request per line of an NDJSON upload. The body is read as it arrives and processed in chunks of
+    `ndjson_chunk_size` lines: each chunk is validated with `item_dto`, stored with one INSERT and enqueued, so memory
+    does not grow with the size of the upload and the first jobs already run while the upload continues. All requests
+    of an upload belong to the same batch.
+
+    The response is NDJSON as well: one acknowledgement per non-empty line with its request id or the reason it was
+    rejected, followed by a summary with the batch id. The acknowledgements are not streamed per chunk: they are
+    spooled, in memory up to `_ACKS_MAX_MEMORY_SIZE` and in a temporary file beyond it, and the response is only
+    returned after the last line has been processed. The chunks are stored with the database session of the request,
+    which ends when the response is returned, and the `Location` header depends on whether any line was accepted.
+    Clients therefore have to send the whole body before they read the response, which the API description says.
+
+    :param request: API request object.
+    :param item_dto: the DTO of a single submission, which every line has to match.
+    :param job_service: the job service of the request type.
+    :param request_type: the type of the created requests.
+    :param batch_endpoint: name of the route that returns the progress of the batch.
+    """
+    settings = get_settings()
+    batch_id = uuid4()
+    acks = SpooledTemporaryFile(max_size=_ACKS_MAX_MEMORY_SIZE)
+    accepted = 0
+    rejected = 0
+    chunk = []
+
+    async def ingest_chunk():
+        nonlocal accepted, rejected, chunk
+        created = await run_in_threadpool(_ingest_chunk, chunk, item_dto, job_service, request_type, batch_id, acks)
+        accepted += created
+        rejected += len(chunk) - created
+        chunk = []
+
+    try:
+        line_number = 0
+        async for line in _read_lines(request, settings.ndjson_max_line_bytes):
+            line_number += 1
+            if line is not None and not line.strip():
+                continue
+            chunk.append((line_number, line))
+            if len(chunk) == settings.ndjson_chunk_size:
+                await ingest_chunk()
+        if chunk:
+            await ingest_chunk()
+        acks.write(_render(IngestionSummaryDto(batch_id=batch_id, accepted=accepted, rejected=rejected)))
+    except BaseException:
+        acks.close()
+        raise
+    logging.getLogger().info(f"{accepted} lines accepted and {rejected} lines rejected in batch with id {batch_id}")
+
+    headers = {}
+    if accepted:
+        headers['Location'] = str(request.url_for(batch_endpoint, batch_id=str(batch_id))).removeprefix(
+            str(request.base_url))
+    return StreamingResponse(_read_acks(acks), status_code=status.HTTP_200_OK, media_type=NDJSON_MEDIA_TYPE,
+                             headers=headers)
@@ -0,0 +1,208 @@
+import base64
+import re
+from typing import Iterator, Optional, Union
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from erica.api.dto.response_dto import ResponseBaseDto, ResultTransferPdfResponseDto, JobState
+from erica.domain.blob_store.blob_store_factory import get_blob_store
+
+# Multiple of 3, so that the base64 encoding of each chunk can be concatenated without padding in between
+_PDF_CHUNK_SIZE = 3 * 64 * 1024
+_RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+JSON_MEDIA_TYPE = 'application/json'
+PDF_MEDIA_TYPE = 'application/pdf'
+MULTIPART_MEDIA_TYPE = 'multipart/mixed'
+
+
+def _get_pdf_result(response_dto: ResponseBaseDto) -> Optional[ResultTransferPdfResponseDto]:
+    if isinstance(response_dto.result, ResultTransferPdfResponseDto):
+        return response_dto.result
+    return None
+
+
+def stream_pdf_result(response_dto: ResponseBaseDto) -> Union[ResponseBaseDto, Response]:
+    """
+    Prepares the response of a job. If the PDF of the result is kept in the blob store, the JSON around it is rendered
+    as usual and the PDF is read from the blob store and base64-encoded chunk by chunk while the response is sent. The
+    body is the same as if the PDF had been part of the result. Any other response is returned unchanged.
+
+    The blob is opened before the response is returned, while the session of the request is still open. The blob
+    store is accessed synchronously, so call this in the threadpool from async code.
+    """
+    pdf_result = _get_pdf_result(response_dto)
+    if pdf_result is None or pdf_result.pdf_key is None:
+        return response_dto
+
+    blob_store = get_blob_store()
+    pdf_size = blob_store.size(pdf_result.pdf_key)
+    pdf_chunks = blob_store.read_chunks(pdf_result.pdf_key, chunk_size=_PDF_CHUNK_SIZE)
+    prefix, suffix = _split_json_body(response_dto, pdf_result)
+    encoded_pdf_size = 4 * ((pdf_size + 2) // 3)
+    return StreamingResponse(_generate_json_body(prefix, suffix, pdf_chunks),
+                             media_type='application/json',
+                             headers={'Content-Length': str(len(prefix) + encoded_pdf_size + 2 + len(suffix))})
+
+
+def render_json_body(response_dto: ResponseBaseDto) -> bytes:
+    """Returns the JSON body of the response of a job in one piece, with the PDF included wherever it is kept."""
+    pdf_result = _get_pdf_result(response_dto)
+    if pdf_result is None or pdf_result.pdf_key is None:
+        return JSONResponse(jsonable_encoder(response_dto)).body
+    pdf_chunks = get_blob_store().read_chunks(pdf_result.pdf_key, chunk_size=_PDF_CHUNK_SIZE)
+    prefix, suffix = _split_json_body(response_dto, pdf_result)
+    return b''.join(_generate_json_body(prefix, suffix, pdf_chunks))
+
+
+def _split_json_body(response_dto: ResponseBaseDto, pdf_result: ResultTransferPdfResponseDto):
+    """Returns the JSON body of the response before and after the placeholder of the PDF."""
+    body = JSONResponse(jsonable_encoder(response_dto)).body
+    prefix, suffix = body.split(f'"{pdf_result.pdf}"'.encode(), 1)
+    return prefix, suffix
+
+
+def _generate_json_body(prefix: bytes, suffix: bytes, pdf_chunks: Iterator[bytes]) -> Iterator[bytes]:
+    yield prefix + b'"'
+    for chunk in _reblock(pdf_chunks, _PDF_CHUNK_SIZE):
+        yield base64.b64encode(chunk)
+    yield b'"' + suffix
+
+
+def _reblock(chunks: Iterator[bytes], block_size: int) -> Iterator[bytes]:
+    """Re-slices the chunks of a blob so that every chunk but the last one has exactly `block_size` bytes."""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= block_size:
+            yield bytes(buffer[:block_size])
+            del buffer[:block_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def _parse_range(range_header: Optional[str], size: int):
+    """Returns the first and last byte of the requested range, None for the whole file, or raises ValueError if the
+    range cannot be satisfied. Multiple ranges are not supported and answered with the whole file."""
+    if not range_header:
+        return None
+    match = _RANGE_PATTERN.match(range_header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range, e.g. the last 500 bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError(range_header)
+        return max(size - length, 0), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if first >= size or first > last:
+        raise ValueError(range_header)
+    return first, last
+
+
+def _open_pdf(pdf_result: ResultTransferPdfResponseDto):
+    """Returns the size of the PDF and a function that reads the bytes from start to end of it in chunks."""
+    if pdf_result.pdf_key is None:
+        pdf = base64.b64decode(pdf_result.pdf)
+
+        def read_chunks(start, end):
+            return iter([pdf[start:end + 1]])
+        return len(pdf), read_chunks
+
+    blob_store = get_blob_store()
+
+    def read_chunks(start, end):
+        return blob_store.read_chunks(pdf_result.pdf_key, start, end)
+    return blob_store.size(pdf_result.pdf_key), read_chunks
+
+
+def pdf_file_response(response_dto: ResponseBaseDto, range_header: Optional[str] = None) -> Response:
+    """Returns the PDF of the result of a job as a file. Single byte ranges are answered with partial content. The
+    blob store is accessed synchronously, so call this in the threadpool from async code."""
+    size, read_chunks = _open_pdf(_get_pdf_result(response_dto))
+    headers = {'Accept-Ranges': 'bytes'}
+    try:
+        requested_range = _parse_range(range_header, size)
+    except ValueError:
+        headers['Content-Range'] = f'bytes */{size}'
+        return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+
+    if requested_range is None:
+        first, last, status_code = 0, size - 1, status.HTTP_200_OK
+    else:
+        (first, last), status_code = requested_range, status.HTTP_206_PARTIAL_CONTENT
+        headers['Content-Range'] = f'bytes {first}-{last}/{size}'
+    headers['Content-Length'] = str(last - first + 1)
+    content = read_chunks(first, last) if size else iter([])
+    return StreamingResponse(content, status_code=status_code, media_type=PDF_MEDIA_TYPE, headers=headers)
+
+
+def _preferred_media_type(accept_header: Optional[str]) -> str:
+    """Returns the media type of the job response that the client prefers. Anything else falls back to JSON."""
+    if not accept_header:
+        return JSON_MEDIA_TYPE
+    accepted = []
+    for position, media_range in enumerate(accept_header.split(',')):
+        media_type, *parameters = [part.strip() for part in media_range.split(';')]
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.append((-quality, position, media_type.lower()))
+    for _, _, media_type in sorted(accepted):
+        if media_type in (PDF_MEDIA_TYPE, MULTIPART_MEDIA_TYPE, JSON_MEDIA_TYPE):
+            return media_type
+        if media_type in ('*/*', 'application/*'):
+            return JSON_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def multipart_pdf_response(response_dto: ResponseBaseDto) -> Response:
+    """Returns the response of a job as multipart/mixed: the JSON response without the PDF, followed by the PDF as
+    binary part. The blob store is accessed synchronously, so call this in the threadpool from async code."""
+    pdf_result = _get_pdf_result(response_dto)
+    boundary = uuid4().hex
+    json_part = JSONResponse(jsonable_encoder(response_dto, exclude={'result': {'pdf'}})).body
+    pdf_size, read_chunks = _open_pdf(pdf_result)
+    # The blob is opened before the response is returned, while the session of the request is still open
+    pdf_chunks = read_chunks(0, pdf_size - 1) if pdf_size else iter([])
+
+    def generate_body() -> Iterator[bytes]:
+        yield (f"--{boundary}\r\nContent-Type: {JSON_MEDIA_TYPE}\r\n\r\n").encode() + json_part
+        yield (f"\r\n--{boundary}\r\nContent-Type: {PDF_MEDIA_TYPE}\r\n"
+               f"Content-Disposition: attachment; filename=\"{pdf_result.transferticket}.pdf\"\r\n"
+               f"Content-Length: {pdf_size}\r\n\r\n").encode()
+        yield from pdf_chunks
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    return StreamingResponse(generate_body(), media_type=f"{MULTIPART_MEDIA_TYPE}; boundary={boundary}")
+
+
+def negotiate_job_response(response_dto: ResponseBaseDto, request: Optional[Request]) \
+        -> Union[ResponseBaseDto, Response]:
+    """
+    Returns the response of a job in the representation the client asks for with its Accept header. Successful jobs
+    with a PDF can be fetched as `application/pdf` or as `multipart/mixed`, which transfer the PDF as binary. All
+    other requests and jobs get the JSON response. The blob store is accessed synchronously, so call this in the
+    threadpool from async code.
+    """
+    media_type = _preferred_media_type(request.headers.get('accept') if request is not None else None)
+    if media_type != JSON_MEDIA_TYPE and response_dto.process_status == JobState.SUCCESS \
+            and _get_pdf_result(response_dto) is not None:
+        if media_type == PDF_MEDIA_TYPE:
+            return pdf_file_response(response_dto, request.headers.get('range'))
+        return multipart_pdf_response(response_dto)
+    return stream_pdf_result(response_dto)
@@ -0,0 +1,88 @@
+import glob
+import os
+
+import uvicorn
+
+from erica.config import get_settings
+
+APP = "erica:app"
+PROMETHEUS_MULTIPROC_DIR_VARIABLE = 'PROMETHEUS_MULTIPROC_DIR'
+
+
+def uses_multiple_workers():
+    return get_settings().api_workers > 1
+
+
+def prepare_prometheus_multiprocess_mode():
+    """
+    Lets all API worker processes write their metrics to a shared directory, from which the metrics endpoint of every
+    worker collects the metrics of all of them. prometheus_client chooses the mode when the first metric is created, so
+    this has to run before any module with metrics is imported.
+    """
+    if uses_multiple_workers():
+        directory = os.environ.setdefault(PROMETHEUS_MULTIPROC_DIR_VARIABLE, get_settings().prometheus_multiproc_dir)
+        os.makedirs(directory, exist_ok=True)
+
+
+def clear_prometheus_multiprocess_dir():
+    """Removes the metrics of a previous run of the server, which would otherwise be added to the current ones."""
+    directory = os.environ.get(PROMETHEUS_MULTIPROC_DIR_VARIABLE)
+    if directory:
+        for metrics_file in glob.glob(os.path.join(directory, '*.db')):
+            os.remove(metrics_file)
+
+
+def post_fork(server, worker):
+    from erica.api.service.service_injector import get_service
+    from erica.domain.sqlalchemy.async_database import reset_async_engine_after_fork
+    from erica.job_service.job_service_factory import get_job_service
+    # Every worker opens its own database connections instead of sharing the ones of the master process. Services
+    # that were wired in the master hold its session maker, so they are wired again as well.
+    reset_async_engine_after_fork()
+    get_service.cache_clear()
+    get_job_service.cache_clear()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def get_gunicorn_options(settings):
+    return {
+        'bind': f"{settings.api_host}:{settings.api_port}",
+        'workers': settings.api_workers,
+        'worker_class': 'uvicorn.workers.UvicornWorker',
+        # Import the app once in the master process, so that the workers are forked with the app already loaded
+        'preload_app': True,
+        'graceful_timeout': settings.api_graceful_timeout_in_sec,
+        'post_fork': post_fork,
+        'child_exit': child_exit,
+    }
+
+
+def run_api_server():
+    """
+    Runs the API. With one worker, uvicorn serves it in the current process. With more workers, a gunicorn master
+    process supervises uvicorn worker processes. Sending SIGHUP to the master replaces the workers gracefully: new
+    workers are started and the old ones finish their open requests within the graceful timeout.
+    """
+    settings = get_settings()
+    if not uses_multiple_workers():
+        uvicorn.run(APP, host=settings.api_host, port=settings.api_port, log_config=None)
+        return
+
+    from gunicorn.app.base import BaseApplication
+
+    class ApiServer(BaseApplication):
+
+        def load_config(self):
+            for key, value in get_gunicorn_options(settings).items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from erica import app
+            return app
+
+    clear_prometheus_multiprocess_dir()
+    ApiServer().run()
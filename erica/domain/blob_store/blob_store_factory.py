@@ -0,0 +1,23 @@
+from functools import lru_cache
+from typing import Optional
+
+from erica.config import get_settings
+from erica.domain.blob_store.blob_store_interface import BlobStoreInterface
+
+
+@lru_cache()
+def get_blob_store() -> Optional[BlobStoreInterface]:
+    """Returns the configured blob store, or None if PDFs are stored inline in the request results."""
+    settings = get_settings()
+    if settings.blob_store_backend == 'local':
+        from erica.domain.blob_store.local_blob_store import LocalBlobStore
+        return LocalBlobStore(settings.blob_store_directory)
+    elif settings.blob_store_backend == 's3':
+        from erica.domain.blob_store.s3_blob_store import S3BlobStore
+        return S3BlobStore(settings.blob_store_bucket_name, settings.blob_store_endpoint_url)
+    elif settings.blob_store_backend == 'database':
+        from erica.domain.blob_store.database_blob_store import DatabaseBlobStore
+        return DatabaseBlobStore()
+    elif settings.blob_store_backend == 'inline':
+        return None
+    raise ValueError(f"Unknown blob store backend {settings.blob_store_backend}")
@@ -0,0 +1,36 @@
+from abc import ABCMeta, abstractmethod
+from datetime import timedelta
+from typing import Iterator, Optional
+
+
+class BlobNotFoundError(Exception):
+    """Raised in case a blob is requested that is not present in the blob store"""
+    pass
+
+
+class BlobStoreInterface:
+    """Stores large binary results, such as the PDFs of sent declarations, outside of the database."""
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def put(self, key: str, data: bytes, content_type: str = 'application/octet-stream'):
+        pass
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        pass
+
+    @abstractmethod
+    def read_chunks(self, key: str, start: int = 0, end: Optional[int] = None,
+                    chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Yields the bytes of the blob from `start` up to and including `end`, in chunks of at most `chunk_size`."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def delete_older_than(self, age: timedelta) -> int:
+        """Deletes all blobs that were stored longer ago than `age` and returns their number."""
+        pass
@@ -0,0 +1,61 @@
+import datetime as dt
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from erica.domain.blob_store.blob_store_interface import BlobStoreInterface, BlobNotFoundError
+from erica.domain.sqlalchemy.database import DatabaseSessionProvider
+from erica.domain.sqlalchemy.erica_request_artifact_schema import EricaRequestArtifactSchema
+
+
+class DatabaseBlobStore(BlobStoreInterface):
+    """
+    Keeps blobs as raw bytes in the erica_request_artifact table. Unlike base64 text in the JSONB result, the bytes are
+    neither inflated by a third nor parsed as JSON whenever the result is loaded.
+
+    The requested range of a blob is fetched in one query and only then handed out in chunks, so that no query runs
+    after the session of the request has been closed while a response is still being streamed.
+    """
+
+    def __init__(self, get_session: Callable[[], Session] = DatabaseSessionProvider().get):
+        self._get_session = get_session
+
+    def put(self, key: str, data: bytes, content_type: str = 'application/octet-stream'):
+        session = self._get_session()
+        session.add(EricaRequestArtifactSchema(key=key, content=bytes(data), content_type=content_type))
+        session.commit()
+
+    def size(self, key: str) -> int:
+        size = self._get_session().execute(
+            select(func.length(EricaRequestArtifactSchema.content)).where(EricaRequestArtifactSchema.key == key)
+        ).scalar_one_or_none()
+        if size is None:
+            raise BlobNotFoundError(key)
+        return size
+
+    def read_chunks(self, key: str, start: int = 0, end: Optional[int] = None,
+                    chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        if end is None:
+            content_column = func.substr(EricaRequestArtifactSchema.content, start + 1)
+        else:
+            content_column = func.substr(EricaRequestArtifactSchema.content, start + 1, end - start + 1)
+        content = self._get_session().execute(
+            select(content_column).where(EricaRequestArtifactSchema.key == key)
+        ).scalar_one_or_none()
+        if content is None:
+            raise BlobNotFoundError(key)
+        content = memoryview(content)
+        return (bytes(content[offset:offset + chunk_size]) for offset in range(0, len(content), chunk_size))
+
+    def delete(self, key: str):
+        session = self._get_session()
+        session.execute(EricaRequestArtifactSchema.__table__.delete().where(EricaRequestArtifactSchema.key == key))
+        session.commit()
+
+    def delete_older_than(self, age: dt.timedelta) -> int:
+        session = self._get_session()
+        deleted = session.execute(EricaRequestArtifactSchema.__table__.delete().where(
+            EricaRequestArtifactSchema.created_at < dt.datetime.now(dt.timezone.utc) - age))
+        session.commit()
+        return deleted.rowcount
@@ -0,0 +1,76 @@
+import os
+import time
+from datetime import timedelta
+from typing import Iterator, Optional
+
+from erica.domain.blob_store.blob_store_interface import BlobStoreInterface, BlobNotFoundError
+
+
+class LocalBlobStore(BlobStoreInterface):
+    """Keeps blobs as files in a directory. The directory has to be shared by the API and the worker."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def put(self, key: str, data: bytes, content_type: str = 'application/octet-stream'):
+        path = self._get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first, so that readers never see a partially written blob
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as blob_file:
+            blob_file.write(data)
+        os.replace(temporary_path, path)
+
+    def size(self, key: str) -> int:
+        try:
+            return os.path.getsize(self._get_path(key))
+        except FileNotFoundError:
+            raise BlobNotFoundError(key)
+
+    def read_chunks(self, key: str, start: int = 0, end: Optional[int] = None,
+                    chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        try:
+            blob_file = open(self._get_path(key), 'rb')
+        except FileNotFoundError:
+            raise BlobNotFoundError(key)
+        return self._read_file_chunks(blob_file, start, end, chunk_size)
+
+    @staticmethod
+    def _read_file_chunks(blob_file, start, end, chunk_size):
+        with blob_file:
+            blob_file.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = blob_file.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    return
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._get_path(key))
+        except FileNotFoundError:
+            pass
+
+    def delete_older_than(self, age: timedelta) -> int:
+        threshold = time.time() - age.total_seconds()
+        deleted = 0
+        for directory, _, file_names in os.walk(self.directory):
+            for file_name in file_names:
+                path = os.path.join(directory, file_name)
+                try:
+                    if os.path.getmtime(path) < threshold:
+                        os.remove(path)
+                        deleted += 1
+                except FileNotFoundError:
+                    pass
+        return deleted
+
+    def _get_path(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.directory, key))
+        if not path.startswith(os.path.normpath(self.directory) + os.sep):
+            raise ValueError(f"Invalid blob key {key}")
+        return path
@@ -0,0 +1,56 @@
+from datetime import timedelta, datetime, timezone
+from typing import Iterator, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+from erica.domain.blob_store.blob_store_interface import BlobStoreInterface, BlobNotFoundError
+
+_NOT_FOUND_ERROR_CODES = {'404', 'NoSuchKey', 'NotFound'}
+
+
+class S3BlobStore(BlobStoreInterface):
+    """Keeps blobs in a bucket of an S3-compatible object storage, e.g. MinIO."""
+
+    def __init__(self, bucket_name: str, endpoint_url: Optional[str] = None, client=None):
+        self.bucket_name = bucket_name
+        self.client = client or boto3.session.Session().client(service_name='s3', endpoint_url=endpoint_url)
+
+    def put(self, key: str, data: bytes, content_type: str = 'application/octet-stream'):
+        self.client.put_object(Bucket=self.bucket_name, Key=key, Body=bytes(data), ContentType=content_type)
+
+    def size(self, key: str) -> int:
+        try:
+            return self.client.head_object(Bucket=self.bucket_name, Key=key)['ContentLength']
+        except ClientError as e:
+            raise self._translate_error(e, key)
+
+    def read_chunks(self, key: str, start: int = 0, end: Optional[int] = None,
+                    chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        arguments = {'Bucket': self.bucket_name, 'Key': key}
+        if start or end is not None:
+            arguments['Range'] = f"bytes={start}-{'' if end is None else end}"
+        try:
+            body = self.client.get_object(**arguments)['Body']
+        except ClientError as e:
+            raise self._translate_error(e, key)
+        return body.iter_chunks(chunk_size)
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket_name, Key=key)
+
+    def delete_older_than(self, age: timedelta) -> int:
+        threshold = datetime.now(timezone.utc) - age
+        deleted = 0
+        for page in self.client.get_paginator('list_objects_v2').paginate(Bucket=self.bucket_name):
+            keys = [{'Key': blob['Key']} for blob in page.get('Contents', []) if blob['LastModified'] < threshold]
+            if keys:
+                self.client.delete_objects(Bucket=self.bucket_name, Delete={'Objects': keys, 'Quiet': True})
+                deleted += len(keys)
+        return deleted
+
+    @staticmethod
+    def _translate_error(error: ClientError, key: str):
+        if error.response.get('Error', {}).get('Code') in _NOT_FOUND_ERROR_CODES:
+            return BlobNotFoundError(key)
+        return error
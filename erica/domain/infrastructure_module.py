@@ -1,11 +1,15 @@
 from opyoid import Module
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import Session
 
 from erica.domain.domain_module import DomainModule
+from erica.domain.repositories.async_erica_request_repository_interface import AsyncEricaRequestRepositoryInterface
 from erica.domain.repositories.base_repository_interface import BaseRepositoryInterface
 from erica.domain.repositories.erica_request_repository_interface import EricaRequestRepositoryInterface
 from erica.domain.sqlalchemy.erica_request_schema import EricaRequestSchema
+from erica.domain.sqlalchemy.async_database import AsyncSessionMakerProvider
 from erica.domain.sqlalchemy.database import DatabaseSessionProvider
+from erica.domain.sqlalchemy.repositories.async_erica_request_repository import AsyncEricaRequestRepository
 from erica.domain.sqlalchemy.repositories.erica_request_repository import EricaRequestRepository
 
 
@@ -15,3 +19,5 @@ class InfrastructureModule(Module):
         self.bind(Session, to_provider=DatabaseSessionProvider)
         self.bind(EricaRequestRepositoryInterface, to_class=EricaRequestRepository)
         self.bind(BaseRepositoryInterface[EricaRequestSchema], to_class=EricaRequestRepository)
+        self.bind(async_sessionmaker, to_provider=AsyncSessionMakerProvider)
+        self.bind(AsyncEricaRequestRepositoryInterface, to_class=AsyncEricaRequestRepository)
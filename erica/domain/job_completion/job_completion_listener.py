@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, Optional, Set
+from uuid import UUID
+
+import redis.asyncio
+from redis import RedisError
+
+from erica.config import get_settings
+
+_RECONNECT_DELAY_IN_SEC = 1
+
+
+class JobCompletionWaiter(object):
+    """Is woken up when the job it waits for is reported as finished."""
+
+    def __init__(self):
+        self._completed = asyncio.Event()
+
+    def set(self):
+        self._completed.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Waits until the job is reported as finished or the timeout has passed. Returns whether it was reported."""
+        try:
+            await asyncio.wait_for(self._completed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._completed.clear()
+        return True
+
+
+class JobCompletionListener(object):
+    """
+    Subscribes once per process to the channel on which the worker reports finished jobs and wakes up all waiters of a
+    job when it is reported. The subscription is started with the first waiter and reconnects if Redis goes away.
+    """
+
+    def __init__(self, create_client: Callable[[], redis.asyncio.Redis], channel: str):
+        self.create_client = create_client
+        self.channel = channel
+        self._waiters: Dict[str, Set[JobCompletionWaiter]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def waiter(self, request_id: UUID) -> Iterator[JobCompletionWaiter]:
+        self._ensure_listening()
+        waiter = JobCompletionWaiter()
+        key = str(request_id)
+        self._waiters[key].add(waiter)
+        try:
+            yield waiter
+        finally:
+            self._waiters[key].discard(waiter)
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _ensure_listening(self):
+        # The task is bound to the event loop it was started in, e.g. to the one of a test
+        if self._task is None or self._task.done() or self._task.get_loop() is not asyncio.get_running_loop():
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+
+    def _notify(self, request_id: str):
+        for waiter in self._waiters.get(request_id, ()):
+            waiter.set()
+
+    async def _listen(self):
+        while True:
+            try:
+                client = self.create_client()
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message['type'] == 'message':
+                            data = message['data']
+                            self._notify(data.decode() if isinstance(data, bytes) else data)
+            except (RedisError, OSError):
+                logging.getLogger().warning("Lost subscription to job completions, reconnecting", exc_info=True)
+                await asyncio.sleep(_RECONNECT_DELAY_IN_SEC)
+
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+
+@lru_cache()
+def get_job_completion_listener() -> Optional[JobCompletionListener]:
+    settings = get_settings()
+    if not settings.notify_job_completion:
+        return None
+    return JobCompletionListener(lambda: redis.asyncio.Redis.from_url(settings.queue_url),
+                                 settings.job_completion_channel)
+
+
+@contextmanager
+def job_completion_waiter(request_id: UUID) -> Iterator[JobCompletionWaiter]:
+    """
+    Returns a waiter for the completion of the job. Without completion notifications, the waiter is never woken up
+    and only its timeout ends a wait.
+    """
+    listener = get_job_completion_listener()
+    if listener is None:
+        yield JobCompletionWaiter()
+        return
+    with listener.waiter(request_id) as waiter:
+        yield waiter
@@ -0,0 +1,41 @@
+import logging
+from functools import lru_cache
+from typing import Optional
+from uuid import UUID
+
+import redis
+from redis import RedisError
+
+from erica.config import get_settings
+
+
+class JobCompletionNotifier(object):
+    """
+    Publishes the request id of every finished job on a Redis pub/sub channel, so that the API can answer long polls
+    and event streams as soon as the job is done instead of on the next poll.
+    """
+
+    def __init__(self, client: redis.Redis, channel: str):
+        self.client = client
+        self.channel = channel
+
+    def notify(self, request_id: UUID):
+        try:
+            self.client.publish(self.channel, str(request_id))
+        except RedisError:
+            # Waiting clients fall back to re-checking the job, so a lost signal only delays their response
+            logging.getLogger().warning(f"Could not publish completion of job {request_id}", exc_info=True)
+
+
+@lru_cache()
+def get_job_completion_notifier() -> Optional[JobCompletionNotifier]:
+    settings = get_settings()
+    if not settings.notify_job_completion:
+        return None
+    return JobCompletionNotifier(redis.Redis.from_url(settings.queue_url), settings.job_completion_channel)
+
+
+def notify_job_completion(request_id: UUID):
+    notifier = get_job_completion_notifier()
+    if notifier is not None:
+        notifier.notify(request_id)
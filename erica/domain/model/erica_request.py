@@ -23,6 +23,10 @@ class Status(int, Enum):
     success = 4
 
 
+# A request in one of these states is not changed anymore until it is deleted
+FINISHED_STATUSES = (Status.failed, Status.success)
+
+
 class EricaRequest(BaseDomainModel[UUID]):
     type: RequestType
     status: Status = Status.new
@@ -31,6 +35,7 @@ class EricaRequest(BaseDomainModel[UUID]):
     result: Optional[object]
     error_code: Optional[str]
     error_message: Optional[str]
+    batch_id: Optional[UUID]
 
     class Config:
         orm_mode = True
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+
+
+class AsyncEricaRequestRepositoryInterface(ABC):
+    """Read access to erica requests for the API, which must not block the event loop while waiting for the
+    database."""
+
+    @abstractmethod
+    async def get_by_job_request_id(self, request_id: UUID) -> EricaRequest:
+        pass
+
+    @abstractmethod
+    async def get_pdf_by_job_request_id(self, request_id: UUID) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def get(self, skip: int = 0, limit: int = 100) -> List[EricaRequest]:
+        pass
+
+    @abstractmethod
+    async def get_statuses_by_batch_id(self, batch_id: UUID, request_type: RequestType) -> List[Tuple[UUID, Status]]:
+        pass
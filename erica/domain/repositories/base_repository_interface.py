@@ -25,6 +25,10 @@ class BaseRepositoryInterface(Generic[ClassT]):
     def update(self, model_id, model: ClassT) -> ClassT:
         pass
 
+    @abstractmethod
+    def update_columns(self, model_id, changes: dict) -> ClassT:
+        pass
+
     @abstractmethod
     def delete(self, request_id) -> bool:
         pass
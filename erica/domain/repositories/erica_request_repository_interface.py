@@ -1,14 +1,19 @@
 from abc import ABC, abstractmethod
+from typing import List
 from uuid import UUID
 
 from pydantic import BaseModel
 
-from erica.domain.model.erica_request import EricaRequest
+from erica.domain.model.erica_request import EricaRequest, Status
 from erica.domain.repositories.base_repository_interface import BaseRepositoryInterface
 
 
 class EricaRequestRepositoryInterface(BaseRepositoryInterface[EricaRequest], ABC):
 
+    @abstractmethod
+    def create_many(self, models: List[EricaRequest]) -> List[EricaRequest]:
+        pass
+
     @abstractmethod
     def get_by_job_request_id(self, request_id: UUID) -> EricaRequest:
         pass
@@ -21,6 +26,14 @@ class EricaRequestRepositoryInterface(BaseRepositoryInterface[EricaRequest], ABC
     def update_by_job_request_id(self, request_id: UUID, model: BaseModel) -> EricaRequest:
         pass
 
+    @abstractmethod
+    def update_columns_by_job_request_id(self, request_id: UUID, changes: dict) -> EricaRequest:
+        pass
+
+    @abstractmethod
+    def bulk_update_status(self, request_ids: List[UUID], status: Status, **changes) -> int:
+        pass
+
     @abstractmethod
     def delete_by_job_request_id(self, request_id: UUID):
         pass
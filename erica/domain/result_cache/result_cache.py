@@ -0,0 +1,198 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, Optional
+from uuid import UUID
+
+import redis
+import redis.asyncio
+from prometheus_client import Counter
+from pydantic import BaseModel
+from redis import RedisError
+
+from erica.config import get_settings
+from erica.domain.model.erica_request import EricaRequest, FINISHED_STATUSES, RequestType, Status
+from erica.domain.result_cache.expiring_lru_cache import ExpiringLruCache
+
+RESULT_CACHE_HITS = Counter('erica_result_cache_hits', 'Number of finished requests read from the result cache',
+                            ['tier'])
+RESULT_CACHE_MISSES = Counter('erica_result_cache_misses', 'Number of requests not found in the result cache')
+
+_KEY_PREFIX = 'erica-finished-request:'
+
+# The responses to these requests contain data of the payload if they succeeded, which is not cached
+_TYPES_WITH_PAYLOAD_IN_RESPONSE = (RequestType.freischalt_code_request, RequestType.freischalt_code_activate,
+                                   RequestType.freischalt_code_revocate)
+
+
+class CachedRequest(BaseModel):
+    """
+    The fields of a finished request that the API needs to respond to it. The payload is not cached, and neither is a
+    PDF that is part of the result: `has_inline_pdf` is set instead and the PDF has to be read from the database with
+    `AsyncEricaRequestRepositoryInterface.get_pdf_by_job_request_id`.
+    """
+    request_id: UUID
+    type: RequestType
+    status: Status
+    result: Optional[object]
+    error_code: Optional[str]
+    error_message: Optional[str]
+    updated_at: Optional[datetime]
+    has_inline_pdf: bool = False
+
+    @classmethod
+    def from_erica_request(cls, erica_request: EricaRequest):
+        result = erica_request.result
+        has_inline_pdf = isinstance(result, dict) and 'pdf' in result
+        if has_inline_pdf:
+            result = {key: value for key, value in result.items() if key != 'pdf'}
+        return cls(request_id=erica_request.request_id, type=erica_request.type, status=erica_request.status,
+                   result=result, error_code=erica_request.error_code, error_message=erica_request.error_message,
+                   updated_at=erica_request.updated_at, has_inline_pdf=has_inline_pdf)
+
+
+def _is_cacheable(erica_request: EricaRequest) -> bool:
+    """Only finished requests are cached, and only if their response can be built from a `CachedRequest`."""
+    if erica_request.status not in FINISHED_STATUSES:
+        return False
+    return not (erica_request.status == Status.success and erica_request.type in _TYPES_WITH_PAYLOAD_IN_RESPONSE)
+
+
+def _key(request_id: UUID) -> str:
+    return f"{_KEY_PREFIX}{request_id}"
+
+
+def _remaining_ttl_in_sec(erica_request: CachedRequest, ttl: timedelta) -> float:
+    """The cron deletes finished requests `ttl` after their last update, so they must not be cached any longer."""
+    if erica_request.updated_at is None:
+        return ttl.total_seconds()
+    # The database returns updated_at with its time zone
+    return (erica_request.updated_at + ttl - datetime.now(timezone.utc)).total_seconds()
+
+
+class ResultCache(object):
+    """
+    Read-through cache of finished requests for the API. A request does not change anymore once it succeeded or failed,
+    so it is read from the database only once per process: later reads are answered from an in-process LRU cache, which
+    is backed by Redis if `redis_client` is set. The worker fills Redis as soon as a job finishes, see
+    `ResultCacheWriter`.
+
+    Only the fields of `CachedRequest` are cached, see `_is_cacheable` for the requests that are read from the database
+    every time. Callers must not change the returned requests, they are shared between all reads of the process.
+    """
+
+    def __init__(self, max_entries: int, ttl: timedelta, redis_client: Optional[redis.asyncio.Redis] = None):
+        self.ttl = ttl
+        self.redis_client = redis_client
+        self._lru_cache = ExpiringLruCache[CachedRequest](max_entries) if max_entries > 0 else None
+
+    async def get(self, request_id: UUID) -> Optional[CachedRequest]:
+        if self._lru_cache is not None:
+            erica_request = self._lru_cache.get(str(request_id))
+            if erica_request is not None:
+                RESULT_CACHE_HITS.labels(tier='memory').inc()
+                return erica_request
+
+        if self.redis_client is not None:
+            try:
+                serialised_request = await self.redis_client.get(_key(request_id))
+            except RedisError:
+                logging.getLogger().warning(f"Could not read request {request_id} from the result cache", exc_info=True)
+                serialised_request = None
+            if serialised_request is not None:
+                RESULT_CACHE_HITS.labels(tier='redis').inc()
+                erica_request = CachedRequest.parse_raw(serialised_request)
+                self._put_in_lru_cache(erica_request)
+                return erica_request
+
+        RESULT_CACHE_MISSES.inc()
+        return None
+
+    async def put(self, erica_request: EricaRequest):
+        """Caches the request if it is finished and cacheable. Requests that are still processing are ignored."""
+        if not _is_cacheable(erica_request):
+            return
+        erica_request = CachedRequest.from_erica_request(erica_request)
+        self._put_in_lru_cache(erica_request)
+        ttl_in_sec = _remaining_ttl_in_sec(erica_request, self.ttl)
+        if self.redis_client is not None and ttl_in_sec >= 1:
+            try:
+                await self.redis_client.set(_key(erica_request.request_id), erica_request.json(), ex=int(ttl_in_sec))
+            except RedisError:
+                logging.getLogger().warning(f"Could not write request {erica_request.request_id} to the result cache",
+                                            exc_info=True)
+
+    def _put_in_lru_cache(self, erica_request: CachedRequest):
+        ttl_in_sec = _remaining_ttl_in_sec(erica_request, self.ttl)
+        if self._lru_cache is not None and ttl_in_sec > 0:
+            self._lru_cache.put(str(erica_request.request_id), erica_request, ttl_in_sec)
+
+
+class ResultCacheWriter(object):
+    """
+    Writes finished requests to the Redis tier of the result cache from the worker and removes them again when the cron
+    deletes them. The in-process tiers of the API cannot be reached from here, their entries expire on their own when
+    the cron deletes the request.
+    """
+
+    def __init__(self, client: redis.Redis, ttl: timedelta):
+        self.client = client
+        self.ttl = ttl
+
+    def add(self, erica_request: EricaRequest) -> bool:
+        """Caches the request for the whole time to live. Expects it to be finished just now. Returns whether the
+        request was written, which it is not if it cannot be cached."""
+        if not _is_cacheable(erica_request):
+            return False
+        try:
+            self.client.set(_key(erica_request.request_id), CachedRequest.from_erica_request(erica_request).json(),
+                            ex=int(self.ttl.total_seconds()))
+            return True
+        except RedisError:
+            # The API falls back to the database, so a missing entry only costs one query
+            logging.getLogger().warning(f"Could not write request {erica_request.request_id} to the result cache",
+                                        exc_info=True)
+            return False
+
+    def remove(self, request_ids: Iterable[UUID]):
+        keys = [_key(request_id) for request_id in request_ids]
+        if not keys:
+            return
+        try:
+            self.client.delete(*keys)
+        except RedisError:
+            logging.getLogger().warning(f"Could not remove {len(keys)} requests from the result cache", exc_info=True)
+
+
+@lru_cache()
+def get_result_cache() -> Optional[ResultCache]:
+    settings = get_settings()
+    if settings.result_cache_max_entries <= 0 and not settings.result_cache_redis:
+        return None
+    redis_client = redis.asyncio.Redis.from_url(settings.queue_url) if settings.result_cache_redis else None
+    return ResultCache(settings.result_cache_max_entries,
+                       timedelta(minutes=settings.ttl_finished_request_entities_in_min), redis_client)
+
+
+@lru_cache()
+def get_result_cache_writer() -> Optional[ResultCacheWriter]:
+    settings = get_settings()
+    if not settings.result_cache_redis:
+        return None
+    return ResultCacheWriter(redis.Redis.from_url(settings.queue_url),
+                             timedelta(minutes=settings.ttl_finished_request_entities_in_min))
+
+
+def cache_finished_request(erica_request: EricaRequest) -> bool:
+    """Writes the finished request to the Redis tier, where all API processes find it. Returns whether it was
+    written."""
+    writer = get_result_cache_writer()
+    if writer is None or erica_request.status not in FINISHED_STATUSES:
+        return False
+    return writer.add(erica_request)
+
+
+def remove_finished_requests_from_cache(request_ids: Iterable[UUID]):
+    writer = get_result_cache_writer()
+    if writer is not None:
+        writer.remove(request_ids)
@@ -0,0 +1,115 @@
+import hashlib
+import logging
+import time
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional
+
+import redis
+from prometheus_client import Counter
+from redis import RedisError
+
+from erica.config import get_settings
+from erica.domain.result_cache.expiring_lru_cache import ExpiringLruCache
+
+TAX_NUMBER_VALIDITY_CACHE_HITS = Counter('erica_tax_number_validity_cache_hits',
+                                         'Number of tax number checks answered from the validity cache', ['tier'])
+TAX_NUMBER_VALIDITY_CACHE_MISSES = Counter('erica_tax_number_validity_cache_misses',
+                                           'Number of tax number checks not found in the validity cache')
+
+_KEY_PREFIX = 'erica-tax-number-validity:'
+_ERIC_VERSION_KEY = 'erica-tax-number-validity-eric-version'
+# The API reads the ERiC version of the worker at most this often
+_ERIC_VERSION_REFRESH_IN_SEC = 60
+
+
+def _key(electronic_steuernummer: str, eric_version: str) -> str:
+    """Tax numbers are only stored hashed. The ERiC version is part of the hash, so that results of other ERiC
+    versions are never found."""
+    return hashlib.sha256(f"{eric_version}\n{electronic_steuernummer}".encode()).hexdigest()
+
+
+class TaxNumberValidityCache(object):
+    """
+    Remembers whether ERiC considered an electronic steuernummer valid. The result only depends on the tax number and
+    the version of the ERiC libraries, so it can be reused by every check of the same number until the ERiC version
+    changes. The results are kept in an in-process LRU cache, which is backed by Redis if `redis_client` is set.
+
+    Only the worker knows the ERiC version, the API never loads ERiC. The worker therefore publishes its version with
+    every result, and the API looks results up under the version published last.
+    """
+
+    def __init__(self, max_entries: int, ttl: timedelta, redis_client: Optional[redis.Redis] = None):
+        self.ttl = ttl
+        self.redis_client = redis_client
+        self._lru_cache = ExpiringLruCache[bool](max_entries) if max_entries > 0 else None
+        self._eric_version = None
+        self._eric_version_read_at = None
+
+    def get(self, electronic_steuernummer: str, eric_version: str) -> Optional[bool]:
+        key = _key(electronic_steuernummer, eric_version)
+        if self._lru_cache is not None:
+            is_valid = self._lru_cache.get(key)
+            if is_valid is not None:
+                TAX_NUMBER_VALIDITY_CACHE_HITS.labels(tier='memory').inc()
+                return is_valid
+
+        if self.redis_client is not None:
+            try:
+                cached_value = self.redis_client.get(_KEY_PREFIX + key)
+            except RedisError:
+                logging.getLogger().warning("Could not read from the tax number validity cache", exc_info=True)
+                cached_value = None
+            if cached_value is not None:
+                TAX_NUMBER_VALIDITY_CACHE_HITS.labels(tier='redis').inc()
+                is_valid = cached_value == b'1'
+                self._put_in_lru_cache(key, is_valid)
+                return is_valid
+
+        TAX_NUMBER_VALIDITY_CACHE_MISSES.inc()
+        return None
+
+    def put(self, electronic_steuernummer: str, eric_version: str, is_valid: bool):
+        """Caches the result of ERiC and publishes `eric_version` as the version to look results up with."""
+        key = _key(electronic_steuernummer, eric_version)
+        self._put_in_lru_cache(key, is_valid)
+        if self.redis_client is None:
+            return
+        try:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            pipeline.set(_KEY_PREFIX + key, b'1' if is_valid else b'0', ex=int(self.ttl.total_seconds()))
+            pipeline.set(_ERIC_VERSION_KEY, eric_version)
+            pipeline.execute()
+        except RedisError:
+            logging.getLogger().warning("Could not write to the tax number validity cache", exc_info=True)
+
+    def get_published_eric_version(self) -> Optional[str]:
+        """Returns the ERiC version the worker published last, read from Redis at most every
+        `_ERIC_VERSION_REFRESH_IN_SEC` seconds. Without Redis, no version is known outside of the worker."""
+        if self.redis_client is None:
+            return None
+        now = time.monotonic()
+        if self._eric_version_read_at is None or now - self._eric_version_read_at >= _ERIC_VERSION_REFRESH_IN_SEC:
+            try:
+                eric_version = self.redis_client.get(_ERIC_VERSION_KEY)
+            except RedisError:
+                logging.getLogger().warning("Could not read the ERiC version of the tax number validity cache",
+                                            exc_info=True)
+                return self._eric_version
+            self._eric_version = eric_version.decode() if eric_version is not None else None
+            self._eric_version_read_at = now
+        return self._eric_version
+
+    def _put_in_lru_cache(self, key: str, is_valid: bool):
+        if self._lru_cache is not None:
+            self._lru_cache.put(key, is_valid, self.ttl.total_seconds())
+
+
+@lru_cache()
+def get_tax_number_validity_cache() -> Optional[TaxNumberValidityCache]:
+    settings = get_settings()
+    if settings.tax_number_validity_cache_max_entries <= 0 and not settings.result_cache_redis:
+        return None
+    redis_client = redis.Redis.from_url(settings.queue_url) if settings.result_cache_redis else None
+    return TaxNumberValidityCache(settings.tax_number_validity_cache_max_entries,
+                                  timedelta(minutes=settings.tax_number_validity_cache_ttl_in_min), redis_client)
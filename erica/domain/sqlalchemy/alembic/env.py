@@ -9,6 +9,7 @@ from alembic import context
 # access to the values within the .ini file in use.
 from erica.config import get_settings
 from erica.domain.sqlalchemy.erica_request_schema import EricaRequestSchema
+from erica.domain.sqlalchemy.erica_request_artifact_schema import EricaRequestArtifactSchema  # noqa: F401
 
 config = context.config
 
@@ -0,0 +1,38 @@
+"""add erica request indexes
+
+Revision ID: 3a7e9c2d5f1b
+Revises: 8f2c4e1a9b7d
+Create Date: 2026-10-18 11:03:17.214553
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3a7e9c2d5f1b'
+down_revision = '8f2c4e1a9b7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Build the indexes without locking the table against writes of the running workers
+    with op.get_context().autocommit_block():
+        op.create_index('ix_erica_request_request_id', 'erica_request', ['request_id'], unique=True,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_erica_request_unfinished_status_updated_at', 'erica_request', ['status', 'updated_at'],
+                        postgresql_where="status IN ('new', 'scheduled', 'processing')",
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_erica_request_finished_updated_at', 'erica_request', ['updated_at'],
+                        postgresql_where="status IN ('success', 'failed')",
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_erica_request_finished_updated_at', table_name='erica_request',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_erica_request_unfinished_status_updated_at', table_name='erica_request',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_erica_request_request_id', table_name='erica_request',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,29 @@
+"""add erica request batch id
+
+Revision ID: 6b1d8e4f2a9c
+Revises: 3a7e9c2d5f1b
+Create Date: 2026-10-18 16:42:08.531907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '6b1d8e4f2a9c'
+down_revision = '3a7e9c2d5f1b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('erica_request', sa.Column('batch_id', postgresql.UUID(as_uuid=True), nullable=True))
+    # No request has a batch id yet, so the partial index starts out empty
+    op.create_index('ix_erica_request_batch_id', 'erica_request', ['batch_id'],
+                    postgresql_where="batch_id IS NOT NULL")
+
+
+def downgrade():
+    op.drop_index('ix_erica_request_batch_id', table_name='erica_request')
+    op.drop_column('erica_request', 'batch_id')
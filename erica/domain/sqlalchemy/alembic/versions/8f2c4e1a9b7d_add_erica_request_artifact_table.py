@@ -0,0 +1,36 @@
+"""add erica request artifact table
+
+Revision ID: 8f2c4e1a9b7d
+Revises: d57d4d27a115
+Create Date: 2026-10-18 10:12:41.527310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f2c4e1a9b7d'
+down_revision = 'd57d4d27a115'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('erica_request_artifact',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('key', sa.String(), nullable=False),
+                    sa.Column('content_type', sa.String(), nullable=False),
+                    sa.Column('content', sa.LargeBinary(), nullable=False),
+                    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+                    sa.PrimaryKeyConstraint('id'),
+                    sa.UniqueConstraint('key')
+                    )
+    op.create_index('ix_erica_request_artifact_created_at', 'erica_request_artifact', ['created_at'])
+    # The PDFs are already compressed, so compressing them again in TOAST only costs CPU
+    op.execute("ALTER TABLE erica_request_artifact ALTER COLUMN content SET STORAGE EXTERNAL")
+
+
+def downgrade():
+    op.drop_index('ix_erica_request_artifact_created_at', table_name='erica_request_artifact')
+    op.drop_table('erica_request_artifact')
@@ -0,0 +1,46 @@
+from functools import lru_cache
+
+from opyoid import Provider
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from erica.config import get_settings
+from erica.domain.sqlalchemy.database import engine_args
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Returns the database url with the asyncpg driver, which is the only async driver for PostgreSQL supported by
+    SQLAlchemy that is installed."""
+    return make_url(database_url).set(drivername='postgresql+asyncpg').render_as_string(hide_password=False)
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    return create_async_engine(get_async_database_url(get_settings().database_url), **engine_args)
+
+
+@lru_cache()
+def get_async_session_maker() -> async_sessionmaker:
+    return async_sessionmaker(get_async_engine(), expire_on_commit=False)
+
+
+async def dispose_async_engine():
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+    get_async_session_maker.cache_clear()
+    get_async_engine.cache_clear()
+
+
+def reset_async_engine_after_fork():
+    """Drops the engine inherited from the parent process without closing its connections, which still belong to
+    the parent. The forked process creates its own engine and pool on first use."""
+    if get_async_engine.cache_info().currsize:
+        get_async_engine().sync_engine.dispose(close=False)
+    get_async_session_maker.cache_clear()
+    get_async_engine.cache_clear()
+
+
+class AsyncSessionMakerProvider(Provider[async_sessionmaker]):
+
+    def get(self) -> async_sessionmaker:
+        return get_async_session_maker()
@@ -1,12 +1,14 @@
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from logging.config import dictConfig
 
 import click
 from opyoid import Injector
 
 from erica.config import get_settings
+from erica.domain.blob_store.blob_store_factory import get_blob_store
 from erica.domain.infrastructure_module import InfrastructureModule
+from erica.domain.result_cache.result_cache import remove_finished_requests_from_cache
 from erica.domain.sqlalchemy.database import session_scope
 from erica.domain.sqlalchemy.repositories.erica_request_repository import EricaRequestRepository
 
@@ -20,10 +22,17 @@ def cli():
 def delete_success_fail_entities():
     injector = Injector([InfrastructureModule()])
     eric_request_repo = injector.inject(EricaRequestRepository)
-    entities_deleted = eric_request_repo.delete_success_fail_old_entities(
+    deleted_request_ids = eric_request_repo.delete_success_fail_old_entities_returning_request_ids(
         get_settings().ttl_finished_request_entities_in_min)
+    remove_finished_requests_from_cache(deleted_request_ids)
     logging.getLogger().debug(
-        str(entities_deleted) + " success/fail entities deleted at " + datetime.now().strftime("%H:%M:%S"))
+        str(len(deleted_request_ids)) + " success/fail entities deleted at " + datetime.now().strftime("%H:%M:%S"))
+    blob_store = get_blob_store()
+    if blob_store is not None:
+        # Blobs are only referenced by finished entities, so they expire together with them
+        blobs_deleted = blob_store.delete_older_than(
+            timedelta(minutes=get_settings().ttl_finished_request_entities_in_min))
+        logging.getLogger().debug(f"{blobs_deleted} blobs deleted at {datetime.now().strftime('%H:%M:%S')}")
 
 
 @cli.command()
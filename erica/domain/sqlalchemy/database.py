@@ -31,16 +31,30 @@ def get_engine():
         get_settings().database_url, **engine_args)
 
 
+class CurrentSession(object):
+    """
+    Stands in for the session of the current request or job. Objects that are wired once and then reused, such as the
+    repositories of the cached services, hold this proxy, and every call on it goes to the session of the
+    `session_scope` in which the call is made.
+    """
+
+    def __getattr__(self, name):
+        return getattr(db.session, name)
+
+
+current_session = CurrentSession()
+
+
 class DatabaseSessionProvider(Provider[Session]):
 
     def get(self) -> Session:
-        return db.session
+        return current_session
 
 
 session_scope = db
 
 engine_args = dict(json_serializer=orjson_serializer,
                    json_deserializer=orjson_deserializer,
-                   pool_size=30,
-                   max_overflow=90,
+                   pool_size=get_settings().database_pool_size,
+                   max_overflow=get_settings().database_max_overflow,
                    hide_parameters=True)
@@ -0,0 +1,19 @@
+import sqlalchemy
+from sqlalchemy import Column, Integer, String, LargeBinary
+from sqlalchemy.sql.functions import current_timestamp
+
+from erica.domain.sqlalchemy.erica_request_schema import BaseDbSchema
+
+
+class EricaRequestArtifactSchema(BaseDbSchema):
+    """Binary results of requests, e.g. PDFs, stored as raw bytes instead of base64 text in the JSONB result."""
+    __tablename__ = 'erica_request_artifact'
+    id = Column(Integer,
+                primary_key=True)
+    key = Column(String, nullable=False, unique=True)
+    content_type = Column(String, nullable=False)
+    content = Column(LargeBinary, nullable=False)
+    created_at = Column(sqlalchemy.types.DateTime(timezone=True),
+                        default=current_timestamp(),
+                        nullable=False,
+                        index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import MetaData, Column, String, Enum, Integer
+from sqlalchemy import MetaData, Column, String, Enum, Integer, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -8,9 +8,23 @@ from erica.domain.sqlalchemy.base_schema import AuditedSchemaMixin
 metadata = MetaData()
 BaseDbSchema = declarative_base()
 
+UNFINISHED_STATUS_CONDITION = text("status IN ('new', 'scheduled', 'processing')")
+FINISHED_STATUS_CONDITION = text("status IN ('success', 'failed')")
+BATCH_CONDITION = text("batch_id IS NOT NULL")
+
 
 class EricaRequestSchema(AuditedSchemaMixin, BaseDbSchema):
     __tablename__ = 'erica_request'
+    __table_args__ = (
+        # Each poll looks up one request by its request_id
+        Index('ix_erica_request_request_id', 'request_id', unique=True),
+        # The cron jobs only scan unfinished requests, respectively finished requests, by their last update
+        Index('ix_erica_request_unfinished_status_updated_at', 'status', 'updated_at',
+              postgresql_where=UNFINISHED_STATUS_CONDITION),
+        Index('ix_erica_request_finished_updated_at', 'updated_at', postgresql_where=FINISHED_STATUS_CONDITION),
+        # The status of a batch is aggregated over its requests
+        Index('ix_erica_request_batch_id', 'batch_id', postgresql_where=BATCH_CONDITION),
+    )
     id = Column(Integer,
                 primary_key=True)
     type = Column(Enum(RequestType))
@@ -20,3 +34,4 @@ class EricaRequestSchema(AuditedSchemaMixin, BaseDbSchema):
     status = Column(Enum(Status))
     error_code = Column(String, nullable=True)
     error_message = Column(String, nullable=True)
+    batch_id = Column(UUID(as_uuid=True), nullable=True)
@@ -0,0 +1,54 @@
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.domain.repositories.async_erica_request_repository_interface import AsyncEricaRequestRepositoryInterface
+from erica.domain.sqlalchemy.erica_request_schema import EricaRequestSchema
+from erica.domain.sqlalchemy.repositories.base_repository import EntityNotFoundError
+
+
+class AsyncEricaRequestRepository(AsyncEricaRequestRepositoryInterface):
+    """
+    Reads erica requests with the asyncio database engine. Every call uses its own short-lived session, so the
+    connection goes back to the pool as soon as the row is loaded and is not held while the response is sent.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker):
+        self.session_maker = session_maker
+        self.DatabaseEntity = EricaRequestSchema
+        self.DomainModel = EricaRequest
+
+    async def get_by_job_request_id(self, request_id: UUID) -> EricaRequest:
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(self.DatabaseEntity).where(self.DatabaseEntity.request_id == request_id))
+            entity = result.scalars().first()
+        if entity is None:
+            raise EntityNotFoundError
+        return self.DomainModel.from_orm(entity)
+
+    async def get_pdf_by_job_request_id(self, request_id: UUID) -> Optional[str]:
+        """Returns the base64 encoded PDF that is part of the result of the request, without loading anything else."""
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(self.DatabaseEntity.result['pdf'].astext).where(self.DatabaseEntity.request_id == request_id))
+            return result.scalars().first()
+
+    async def get(self, skip: int = 0, limit: int = 100) -> List[EricaRequest]:
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(self.DatabaseEntity).order_by(self.DatabaseEntity.id).offset(skip).limit(limit))
+            entities = result.scalars().all()
+        return [self.DomainModel.from_orm(entity) for entity in entities]
+
+    async def get_statuses_by_batch_id(self, batch_id: UUID, request_type: RequestType) -> List[Tuple[UUID, Status]]:
+        """Returns the request id and status of every request of the batch, without loading payloads or results."""
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(self.DatabaseEntity.request_id, self.DatabaseEntity.status)
+                .where(self.DatabaseEntity.batch_id == batch_id, self.DatabaseEntity.type == request_type)
+                .order_by(self.DatabaseEntity.id))
+            return [(request_id, status) for request_id, status in result.all()]
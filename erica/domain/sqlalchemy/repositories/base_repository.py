@@ -48,22 +48,36 @@ class BaseRepository(BaseRepositoryInterface[T], Generic[T, D]):
         return entity
 
     @staticmethod
-    def _get_changed_data(old_entity: BaseModel, updated_entity: BaseModel):
+    def _get_changed_data(old_entity, updated_entity: BaseModel):
+        # Reads the fields directly instead of via dict(), which would deep-copy the whole payload just to compare it
         updated_data = {}
-        for key, value in updated_entity.dict().items():
+        for key in updated_entity.__fields__:
+            value = getattr(updated_entity, key)
             if hasattr(old_entity, key) and value != getattr(old_entity, key):
-                updated_data[key] = value
+                updated_data[key] = value.dict() if isinstance(value, BaseModel) else value
 
         return updated_data
 
     def update(self, request_id: Integer, model: BaseModel) -> T:
-        current = self._get_by_id(request_id)
-        if current.first() is None:
+        current = self._get_by_id(request_id).first()
+        if current is None:
+            raise EntityNotFoundError
+        changes = self._get_changed_data(old_entity=current, updated_entity=model)
+        if not changes:
+            return self.DomainModel.from_orm(current)
+        return self.update_columns(request_id, changes)
+
+    def update_columns(self, request_id: Integer, changes: dict) -> T:
+        """Sets the given columns of the entity and returns the updated entity, in a single round trip."""
+        return self._update_returning(self.DatabaseEntity.id == request_id, changes)
+
+    def _update_returning(self, condition, changes: dict) -> T:
+        table = self.DatabaseEntity.__table__
+        updated = self.db_connection.execute(
+            table.update().where(condition).values(**changes).returning(*table.columns)).first()
+        if updated is None:
             raise EntityNotFoundError
-        current.update(self._get_changed_data(old_entity=current.first(), updated_entity=model))
         self.db_connection.commit()
-
-        updated = self.get_by_id(request_id)
         return self.DomainModel.from_orm(updated)
 
     def delete(self, request_id: Integer):
@@ -1,4 +1,5 @@
 from abc import ABC
+from typing import List
 from uuid import UUID
 import datetime as dt
 
@@ -22,6 +23,19 @@ class EricaRequestRepository(
         self.DatabaseEntity = EricaRequestSchema
         self.DomainModel = EricaRequest
 
+    def create_many(self, models: List[EricaRequest]) -> List[EricaRequest]:
+        """Creates all requests with one multi-row INSERT and returns them in the given order."""
+        if not models:
+            return []
+        table = self.DatabaseEntity.__table__
+        # The database sets the id and the audit timestamps
+        rows = [model.dict(exclude={'id', 'created_at', 'updated_at'}) for model in models]
+        created = self.db_connection.execute(table.insert().values(rows).returning(*table.columns)).all()
+        self.db_connection.commit()
+        # RETURNING of a multi-row INSERT does not guarantee the order of the rows
+        created_by_request_id = {entity.request_id: entity for entity in created}
+        return [self.DomainModel.from_orm(created_by_request_id[model.request_id]) for model in models]
+
     def get_by_job_request_id(self, request_id: UUID) -> EricaRequest:
         entity = self._get_by_job_request_id(request_id).first()
         if entity is None:
@@ -33,17 +47,30 @@ class EricaRequestRepository(
         return entity
 
     def update_by_job_request_id(self, request_id: UUID, model: BaseModel) -> EricaRequest:
-        current_query = self._get_by_job_request_id(request_id)
-        current_entity = current_query.first()
+        current_entity = self._get_by_job_request_id(request_id).first()
         if current_entity is None:
             raise EntityNotFoundError
 
         # We only want to run update with changed data
-        current_query.update(self._get_changed_data(current_query.first(), model))
-        self.db_connection.commit()
+        changes = self._get_changed_data(current_entity, model)
+        if not changes:
+            return self.DomainModel.from_orm(current_entity)
+        return self.update_columns_by_job_request_id(request_id, changes)
 
-        updated = self.get_by_job_request_id(request_id)
-        return self.DomainModel.from_orm(updated)
+    def update_columns_by_job_request_id(self, request_id: UUID, changes: dict) -> EricaRequest:
+        return self._update_returning(self.DatabaseEntity.request_id == request_id, changes)
+
+    def bulk_update_status(self, request_ids: List[UUID], status: Status, **changes) -> int:
+        """Sets the status, and optionally further columns, of all given requests in one statement and returns the
+        number of updated requests."""
+        if not request_ids:
+            return 0
+        stmt = self.DatabaseEntity.__table__.update() \
+            .where(self.DatabaseEntity.request_id.in_(request_ids)) \
+            .values(status=status, **changes)
+        updated = self.db_connection.execute(stmt)
+        self.db_connection.commit()
+        return updated.rowcount
 
     def delete_by_job_request_id(self, request_id: UUID):
         entity = self._get_by_job_request_id(request_id).first()
@@ -54,12 +81,18 @@ class EricaRequestRepository(
         self.db_connection.commit()
 
     def delete_success_fail_old_entities(self, ttl) -> int:
+        return len(self.delete_success_fail_old_entities_returning_request_ids(ttl))
+
+    def delete_success_fail_old_entities_returning_request_ids(self, ttl) -> List[UUID]:
+        """Deletes all finished requests that were not updated within the last `ttl` minutes and returns their
+        request ids."""
         stmt = self.DatabaseEntity.__table__.delete().where(
             or_(self.DatabaseEntity.status == Status.success, self.DatabaseEntity.status == Status.failed),
-            self.DatabaseEntity.updated_at < dt.datetime.now() - dt.timedelta(minutes=ttl))
-        deleted = self.db_connection.execute(stmt)
+            self.DatabaseEntity.updated_at < dt.datetime.now() - dt.timedelta(minutes=ttl)) \
+            .returning(self.DatabaseEntity.request_id)
+        deleted_request_ids = self.db_connection.execute(stmt).scalars().all()
         self.db_connection.commit()
-        return deleted.rowcount
+        return deleted_request_ids
 
     def set_not_processed_entities_to_failed(self, ttl) -> int:
         from erica import get_settings
@@ -1,12 +1,15 @@
 import logging
 from abc import abstractmethod, ABCMeta
-from typing import Type, Callable
-from uuid import uuid4
+from typing import Type, Callable, List, Optional
+from uuid import UUID, uuid4
 from erica.api.dto.base_dto import BaseDto
-from erica.api.dto.erica_request_dto import EricaRequestDto
+from erica.api.dto.erica_request_dto import EricaRequestDto, EricaRequestBatchDto
 from erica.domain.model.base_domain_model import BasePayload
-from erica.domain.model.erica_request import EricaRequest, RequestType
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
 from erica.domain.repositories.erica_request_repository_interface import EricaRequestRepositoryInterface
+from erica.domain.result_cache.result_cache import cache_finished_request
+from erica.worker.huey import enqueue_for_each
+from erica.worker.pyeric.eric import eric_session
 from erica.worker.request_processing.requests_controller import EricaRequestController
 
 
@@ -19,6 +22,16 @@ class JobServiceInterface:
     def add_to_queue(self, payload_dto: BasePayload, client_identifier: str, job_type: RequestType) -> EricaRequestDto:
         pass
 
+    @abstractmethod
+    def add_batch_to_queue(self, payload_dtos: List[BasePayload], client_identifier: str, job_type: RequestType,
+                           batch_id: Optional[UUID] = None) -> EricaRequestBatchDto:
+        pass
+
+    @abstractmethod
+    def add_finished_request(self, payload_dto: BasePayload, client_identifier: str, job_type: RequestType,
+                             result: dict) -> EricaRequestDto:
+        pass
+
     @abstractmethod
     def apply_to_elster(self, payload_data: BasePayload, include_elster_responses: bool):
         pass
@@ -53,7 +66,48 @@ class JobService(JobServiceInterface):
 
         return EricaRequestDto.parse_obj(created)
 
+    def add_finished_request(self, payload_dto: BaseDto, client_identifier: str, job_type: RequestType,
+                             result: dict) -> EricaRequestDto:
+        """Stores a request whose result is already known, without enqueueing a job for it. Like every other request,
+        it is stored in the database, so it can be retrieved for as long as finished requests are kept. If the result
+        cache is shared between the API processes, the request is also written to it, so that it is not read from the
+        database when it is retrieved."""
+        request_entity = EricaRequest(request_id=uuid4(),
+                                      payload=self.payload_type.parse_obj(payload_dto),
+                                      creator_id=client_identifier,
+                                      type=job_type,
+                                      status=Status.success,
+                                      result=result
+                                      )
+        created = self.repository.create(request_entity)
+        logging.getLogger().info(f"Finished EricaRequest created with id: {created.request_id}")
+        cache_finished_request(created)
+
+        return EricaRequestDto.parse_obj(created)
+
+    def add_batch_to_queue(self, payload_dtos: List[BaseDto], client_identifier: str, job_type: RequestType,
+                           batch_id: Optional[UUID] = None) -> EricaRequestBatchDto:
+        """Creates one request per payload, all in the same batch, and enqueues a job for each of them. Without a
+        `batch_id`, a new batch is started."""
+        batch_id = batch_id or uuid4()
+        request_entities = [EricaRequest(request_id=uuid4(),
+                                         payload=self.payload_type.parse_obj(payload_dto),
+                                         creator_id=client_identifier,
+                                         type=job_type,
+                                         batch_id=batch_id)
+                            for payload_dto in payload_dtos]
+
+        created = self.repository.create_many(request_entities)
+        request_ids = [entity.request_id for entity in created]
+        logging.getLogger().info(f"{len(created)} EricaRequests created in batch with id: {batch_id}")
+
+        enqueue_for_each(self.job_method, request_ids)
+        logging.getLogger().info(f"Jobs created for EricaRequests in batch with id {batch_id}")
+
+        return EricaRequestBatchDto(batch_id=batch_id, request_ids=request_ids)
+
     def apply_to_elster(self, payload_data, include_elster_responses: bool = False):
         controller = self.request_controller(payload_data,
                                              include_elster_responses)
-        return controller.process()
+        with eric_session():
+            return controller.process()
@@ -1,3 +1,5 @@
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Callable, Type
 from opyoid import Injector
 
@@ -106,7 +108,7 @@ def _send_grundsteuer():
     ])
 
 # Register injector
-injectors = {
+injectors = MappingProxyType({
     RequestType.freischalt_code_request: _freischalt_code_request_injector,
     RequestType.freischalt_code_activate: _freischalt_code_activation_injector,
     RequestType.freischalt_code_revocate: _freischalt_code_revocation_injector,
@@ -114,12 +116,15 @@ injectors = {
     RequestType.send_est: _send_est_injector,
     RequestType.grundsteuer: _send_grundsteuer,
     RequestType.send_ustva: _send_ustva_injector,
-}
+})
 
 
+@lru_cache(maxsize=None)
 def get_job_service(request_type: RequestType) -> JobServiceInterface:
     """
     This is a factory to get a corretly wired job service. Use that function to get any JobServiceInterface instance.
+    The service is wired on the first call per request type and reused afterwards. Its repository resolves the database
+    session of the current scope on every call, so the service can be shared between requests and jobs.
 
     :param request_type: The request type. The JobServiceInterface is chosen and wired based on this type.
     :return: Correctly wired JobServiceInterface
@@ -0,0 +1,158 @@
+import re
+import xml.etree.ElementTree as ET
+
+_INDENT = " " * 4
+_NEWLINE = "\n"
+_DECLARATION = '<?xml version="1.0" ?>' + _NEWLINE
+_LOCAL_NAME = re.compile(r'[A-Za-z_][\w.\-]*', re.ASCII)
+_INVALID_CHARACTERS = re.compile('[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]')
+_RESERVED_NAMESPACES = {'http://www.w3.org/XML/1998/namespace', 'http://www.w3.org/2000/xmlns/'}
+# The prefix of a namespace that is not registered, `tostring` numbers them in the order they appear in the tree
+_GENERATED_PREFIX = re.compile(r'ns\d+')
+
+
+class XmlNotSupportedError(ValueError):
+    """Raised for trees that cannot be written as the XML parser would read them back, e.g. with comments, names the
+    parser rejects or characters that are not allowed in XML."""
+
+
+def _escape(data: str) -> str:
+    """Escapes the data as minidom does."""
+    if '&' in data:
+        data = data.replace('&', '&amp;')
+    if '<' in data:
+        data = data.replace('<', '&lt;')
+    if '"' in data:
+        data = data.replace('"', '&quot;')
+    if '>' in data:
+        data = data.replace('>', '&gt;')
+    return data
+
+
+def _checked(data) -> str:
+    if not isinstance(data, str):
+        raise XmlNotSupportedError(f"Only text can be written, not {type(data).__name__}")
+    if _INVALID_CHARACTERS.search(data):
+        raise XmlNotSupportedError(f"{data!r} contains characters that are not allowed in XML")
+    return data
+
+
+def _namespace(uri) -> str:
+    # The parser separates namespaces and names by spaces
+    if ' ' in _checked(uri) or uri in _RESERVED_NAMESPACES:
+        raise XmlNotSupportedError(f"The namespace {uri!r} cannot be declared")
+    return uri
+
+
+def _registered_prefix(uri: str):
+    """Returns the prefix `tostring` writes for the namespace, or None if it is not registered. The prefixes are read
+    from the serialisation of a single element, so that those of `ET.register_namespace` are found without relying on
+    the internals of ElementTree."""
+    serialised_element = ET.tostring(ET.Element(f'{{{uri}}}a')).decode()
+    qname = serialised_element[1:serialised_element.index(' ')]
+    prefix = qname[:-len(':a')] if qname.endswith(':a') else ''
+    return None if _GENERATED_PREFIX.fullmatch(prefix) else prefix
+
+
+def _text(data) -> str:
+    """The text as the parser returns it: line breaks in text are normalised, unlike the ones in attribute values
+    that ElementTree writes as character references."""
+    data = _checked(data)
+    if '\r' in data:
+        data = data.replace('\r\n', '\n').replace('\r', '\n')
+    return data
+
+
+class _PrettyPrinter(object):
+    """Writes the tree as `tostring` followed by `minidom.parseString(...).toprettyxml()` would, in a single pass."""
+
+    def __init__(self, xml: ET.Element):
+        # The qualified names with the prefixes `tostring` uses and the namespaces it declares in the root element
+        self.qnames = {}
+        self.namespaces = {}
+        for element in xml.iter():
+            self._add_qname(element.tag)
+            for key in element.keys():
+                self._add_qname(key)
+        self.prefixes = set(self.namespaces.values()) | {'xml'}
+        self.parts = []
+
+    def _add_qname(self, name):
+        if not isinstance(name, str):
+            raise XmlNotSupportedError(f"Only elements with a name can be written, not {name!r}")
+        if name in self.qnames:
+            return
+        if name[:1] != '{':
+            self.qnames[name] = name
+            return
+        if '}' not in name:
+            raise XmlNotSupportedError(f"The namespace of {name!r} is not closed")
+        uri, local_name = name[1:].rsplit('}', 1)
+        prefix = self.namespaces.get(uri)
+        if prefix is None:
+            prefix = _registered_prefix(_checked(uri))
+            if prefix is None:
+                prefix = f'ns{len(self.namespaces)}'
+            if prefix != 'xml':
+                self.namespaces[uri] = prefix
+        self.qnames[name] = f'{prefix}:{local_name}' if prefix else local_name
+
+    def _name(self, name) -> str:
+        qname = self.qnames[name]
+        prefix, _, local_name = qname.rpartition(':')
+        if not _LOCAL_NAME.fullmatch(local_name) or (prefix and prefix not in self.prefixes) or \
+                qname.startswith('xmlns'):
+            raise XmlNotSupportedError(f"The name {qname!r} is not allowed in XML or has an unknown prefix")
+        return qname
+
+    def write_root(self, xml: ET.Element):
+        if xml.tail and xml.tail.strip():
+            raise XmlNotSupportedError("Text after the root element is not allowed in XML")
+        namespace_declarations = ''.join(
+            f' xmlns{":" + prefix if prefix else ""}="{_escape(_namespace(uri))}"'
+            for uri, prefix in sorted(self.namespaces.items(), key=lambda item: item[1]))
+        self.write_element(xml, '', namespace_declarations)
+
+    def write_element(self, element: ET.Element, indent: str, namespace_declarations=''):
+        parts = self.parts
+        tag = self._name(element.tag)
+        parts.append(indent + '<' + tag + namespace_declarations)
+        default_namespace = element.get('xmlns')
+        if default_namespace is not None:
+            if ' xmlns="' in namespace_declarations:
+                raise XmlNotSupportedError(f"The default namespace of {tag!r} is declared twice")
+            # The parser reports namespace declarations before all other attributes
+            parts.append(f' xmlns="{_escape(_namespace(default_namespace))}"')
+        for key, value in element.items():
+            if key != 'xmlns':
+                parts.append(f' {self._name(key)}="{_escape(_checked(value))}"')
+
+        text = _text(element.text) if element.text else None
+        if len(element) == 0:
+            parts.append(f'>{_escape(text)}</{tag}>{_NEWLINE}' if text else '/>' + _NEWLINE)
+            return
+
+        parts.append('>' + _NEWLINE)
+        child_indent = indent + _INDENT
+        if text:
+            parts.append(child_indent + _escape(text) + _NEWLINE)
+        for child in element:
+            self.write_element(child, child_indent)
+            if child.tail:
+                parts.append(child_indent + _escape(_text(child.tail)) + _NEWLINE)
+        parts.append(f'{indent}</{tag}>{_NEWLINE}')
+
+
+def pretty_print(xml: ET.Element, remove_decl=True) -> str:
+    """
+    Pretty prints an etree xml object, indented by four spaces. The result is the one of minidom's `toprettyxml` for
+    the serialised tree, but the tree is written directly instead of being serialised, parsed into a DOM and
+    serialised again. Namespaces get the prefixes `tostring` gives them: the registered prefix or ns0, ns1, ... in the
+    order they appear in the tree.
+
+    Raises XmlNotSupportedError for trees the XML parser would change or reject, e.g. with comments, invalid names,
+    characters that are not allowed in XML or namespace URIs with spaces.
+    """
+    printer = _PrettyPrinter(xml)
+    printer.write_root(xml)
+    return ('' if remove_decl else _DECLARATION) + ''.join(printer.parts)
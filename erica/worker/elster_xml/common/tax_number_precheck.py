@@ -0,0 +1,81 @@
+from functools import partial
+from typing import Optional
+
+from erica.worker.elster_xml.common.electronic_steuernummer import BUNDESLAND_BUFANR_MAPPING, \
+    BUNDESLAENDER_WITH_PREPENDED_NUMBER
+from erica.worker.elster_xml.est_validation import is_valid_bufa
+
+# The "bundeseinheitliche" steuernummer has 12 digits, the electronic one adds a 0 at the 5th position
+_BUNDESSCHEMA_STEUERNUMMER_LENGTH = 12
+
+# Weights of the 11er-Verfahren for the 11 digits of the bundesschema steuernummer in front of the check digit
+_ELEVEN_WEIGHTS = (0, 5, 4, 3, 2, 7, 6, 5, 4, 3, 2)
+_ELEVEN_WEIGHTS_HB = (0, 0, 4, 3, 2, 7, 6, 5, 4, 3, 2)
+_ELEVEN_WEIGHTS_NW = (0, 3, 2, 1, 7, 2, 6, 5, 4, 3, 2)
+_ELEVEN_WEIGHTS_RP = (0, 0, 2, 1, 7, 2, 6, 5, 4, 3, 2)
+# Summands and factors of the 2er-Verfahren for the last 9 digits in front of the check digit
+_TWO_SUMMANDS = (9, 8, 7, 6, 5, 4, 3, 2, 1)
+_TWO_FACTORS = (512, 256, 128, 64, 32, 16, 8, 4, 2)
+
+
+def _eleven_check_digit(digits, weights) -> Optional[int]:
+    """11er-Verfahren. Returns None if the remainder is 1: no check digit matches, such numbers are not issued."""
+    check_digit = (11 - sum(digit * weight for digit, weight in zip(digits, weights)) % 11) % 11
+    return None if check_digit == 10 else check_digit
+
+
+def _two_check_digit(digits) -> int:
+    """2er-Verfahren."""
+    total = 0
+    for digit, summand, factor in zip(digits[-9:], _TWO_SUMMANDS, _TWO_FACTORS):
+        summed_digit = (digit + summand) % 10
+        if summed_digit:
+            total += (summed_digit * factor) % 9 or 9
+    return (10 - total % 10) % 10
+
+
+# Only the states whose method is confirmed by tests/worker/samples/tax_number_corpus.json. Berlin issues tax numbers
+# with two different methods, depending on the tax office, and is left to ERiC like all other states.
+_CHECK_DIGIT_METHODS = {
+    'BB': partial(_eleven_check_digit, weights=_ELEVEN_WEIGHTS),
+    'BY': partial(_eleven_check_digit, weights=_ELEVEN_WEIGHTS),
+    'MV': partial(_eleven_check_digit, weights=_ELEVEN_WEIGHTS),
+    'SL': partial(_eleven_check_digit, weights=_ELEVEN_WEIGHTS),
+    'TH': partial(_eleven_check_digit, weights=_ELEVEN_WEIGHTS),
+    'HB': partial(_eleven_check_digit, weights=_ELEVEN_WEIGHTS_HB),
+    'NW': partial(_eleven_check_digit, weights=_ELEVEN_WEIGHTS_NW),
+    'RP': partial(_eleven_check_digit, weights=_ELEVEN_WEIGHTS_RP),
+    'BW': _two_check_digit,
+    'HE': _two_check_digit,
+    'ND': _two_check_digit,
+    'SH': _two_check_digit,
+}
+
+
+def tax_number_is_certainly_invalid(steuernummer: str, bundesland: str, use_testmerker=False):
+    """
+    Checks the steuernummer without ERiC. Returns True if ERiC would reject it for sure: because it does not have the
+    format of the federal state, because its bufa does not exist or because its check digit is wrong. Returns False if
+    only ERiC can tell, a steuernummer is never known to be valid without ERiC. The check digit of states without a
+    confirmed method is left to ERiC, as are federal states that are not known here.
+
+    :param steuernummer: Steuernummer that is specific to one state (10-11 numbers)
+    :param bundesland: The federal state the steuernummer comes from as abbreviation, such as 'BE'
+    :param use_testmerker: Allows test_bufas even if the settings do not accept test bufas.
+    """
+    if bundesland not in BUNDESLAND_BUFANR_MAPPING:
+        return False
+    raw_steuernummer = steuernummer[1:] if bundesland in BUNDESLAENDER_WITH_PREPENDED_NUMBER else steuernummer
+    bundesschema_steuernummer = BUNDESLAND_BUFANR_MAPPING[bundesland] + raw_steuernummer
+    if len(bundesschema_steuernummer) != _BUNDESSCHEMA_STEUERNUMMER_LENGTH or \
+            not (bundesschema_steuernummer.isascii() and bundesschema_steuernummer.isdigit()):
+        return True
+    if not is_valid_bufa(bundesschema_steuernummer[:4], use_testmerker):
+        return True
+
+    check_digit_method = _CHECK_DIGIT_METHODS.get(bundesland)
+    if check_digit_method is None:
+        return False
+    digits = [int(digit) for digit in bundesschema_steuernummer]
+    check_digit = check_digit_method(digits[:-1])
+    return check_digit is not None and check_digit != digits[-1]
@@ -1,6 +1,114 @@
+import re
+from typing import Optional
+from xml.sax.saxutils import escape
+
+from erica.worker.elster_xml.common.electronic_steuernummer import BUNDESLAND_BUFANR_MAPPING
 from erica.worker.elster_xml.transfer_header_fields import TransferHeaderFields
 from erica.worker.pyeric.eric import get_eric_wrapper
 
+_ELSTER_NAMESPACE = "http://www.elster.de/elsterxml/schema/v11"
+_XML_DECLARATION = re.compile(r'\s*<\?xml[^>]*\?>')
+_ELSTER_START_TAG = re.compile(r'\s*<Elster(\s[^>]*)?>')
+_NUTZDATEN_EMPFAENGER = re.compile(r'<NutzdatenHeader\b.*?<Empfaenger id="([FL])">\s*([^<\s]+)\s*</Empfaenger>',
+                                   re.DOTALL)
+
+# `insert_transfer_header` builds the TransferHeader without ERiC. `add_transfer_header` does not use it until the
+# TransferHeader of a Verfahren is confirmed by ERiC output recorded with scripts/record_transfer_header_corpus.py, see
+# tests/worker/samples/transfer_header_corpus.json. None is recorded yet.
+# The Vorgang `add_transfer_header` lets ERiC write, the default of `EricWrapper.create_th`. The data is signed with the
+# certificate, which ERiC announces with the <SigUser> element.
+_VORGANG = 'send-Auth'
+# The abbreviations of the federal states in <Ziel> that differ from those of BUNDESLAND_BUFANR_MAPPING
+_ZIEL_OF_BUNDESLAND = {'ND': 'NI'}
+
+
+def get_ziel(base_xml: str) -> Optional[str]:
+    """ Returns the <Ziel> of the TransferHeader, which ERiC derives from the <Empfaenger> of the NutzdatenHeader: the
+    federal state of the tax office if it is a bufa (id="F"), else the given Land (id="L"). Returns None if the XML
+    has no such Empfaenger or the bufa belongs to no federal state.
+
+    :param base_xml: the xml the transfer header is added to
+    """
+    empfaenger = _NUTZDATEN_EMPFAENGER.search(base_xml)
+    if empfaenger is None:
+        return None
+    empfaenger_id, empfaenger_value = empfaenger.groups()
+    if empfaenger_id == 'L':
+        return empfaenger_value
+    for bundesland, bufa_prefix in BUNDESLAND_BUFANR_MAPPING.items():
+        if empfaenger_value.startswith(bufa_prefix):
+            return _ZIEL_OF_BUNDESLAND.get(bundesland, bundesland)
+    return None
+
+
+def build_transfer_header(th_fields: TransferHeaderFields, ziel: str, eric_version: str, vorgang=_VORGANG) -> str:
+    """ Returns the <TransferHeader> element ERiC creates for the th_fields, indented as ERiC does.
+
+    :param th_fields: the transfer header fields to include
+    :param ziel: the federal state the data is sent to, see `get_ziel`
+    :param eric_version: the version ERiC writes into the <Erstellung> element
+    :param vorgang: the Vorgang, only the one of `add_transfer_header` is supported
+    """
+    if vorgang != _VORGANG:
+        raise ValueError(f"Only the TransferHeader of the Vorgang {_VORGANG} can be built without ERiC")
+    lines = [
+        '\t<TransferHeader version="11">',
+        f'\t\t<Verfahren>{escape(th_fields.verfahren)}</Verfahren>',
+        f'\t\t<DatenArt>{escape(th_fields.datenart)}</DatenArt>',
+        f'\t\t<Vorgang>{escape(vorgang)}</Vorgang>',
+    ]
+    if th_fields.testmerker:
+        lines.append(f'\t\t<Testmerker>{escape(th_fields.testmerker)}</Testmerker>')
+    lines += [
+        '\t\t<SigUser>',
+        '\t\t\t<Sig/>',
+        '\t\t</SigUser>',
+        '\t\t<Empfaenger id="L">',
+        f'\t\t\t<Ziel>{escape(ziel)}</Ziel>',
+        '\t\t</Empfaenger>',
+        f'\t\t<HerstellerID>{escape(th_fields.herstellerId)}</HerstellerID>',
+        f'\t\t<DatenLieferant>{escape(th_fields.datenLieferant)}</DatenLieferant>',
+        '\t\t<Datei>',
+        '\t\t\t<Verschluesselung>CMSEncryptedData</Verschluesselung>',
+        '\t\t\t<Kompression>GZIP</Kompression>',
+        '\t\t\t<Erstellung>',
+        '\t\t\t\t<Eric>',
+        f'\t\t\t\t\t<Version>{escape(eric_version)}</Version>',
+        '\t\t\t\t</Eric>',
+        '\t\t\t</Erstellung>',
+        '\t\t</Datei>',
+        '\t\t<VersionClient>1</VersionClient>',
+        '\t</TransferHeader>',
+    ]
+    return '\n'.join(lines)
+
+
+def insert_transfer_header(base_xml: str, th_fields: TransferHeaderFields, eric_version: str) -> str:
+    """ Adds a <TransferHeader> to base_xml without ERiC. As ERiC does, an XML without <Elster> root is wrapped in
+    one and the declaration is replaced by one with UTF-8 encoding. Raises a ValueError if the <Ziel> cannot be derived
+    from the NutzdatenHeader.
+
+    :param base_xml: the xml to add the transfer header to
+    :param th_fields: the transfer header fields to include
+    :param eric_version: the version ERiC writes into the <Erstellung> element
+    """
+    ziel = get_ziel(base_xml)
+    if ziel is None:
+        raise ValueError("The Ziel of the TransferHeader cannot be derived without an Empfaenger of a federal state")
+    declaration = _XML_DECLARATION.match(base_xml)
+    content = base_xml[declaration.end():] if declaration else base_xml
+    elster_start_tag = _ELSTER_START_TAG.match(content)
+    if elster_start_tag:
+        start_tag = elster_start_tag.group().lstrip()
+        content = content[elster_start_tag.end():].lstrip()
+        end = ''
+    else:
+        start_tag = f'<Elster xmlns="{_ELSTER_NAMESPACE}">'
+        content = content.strip()
+        end = '\n</Elster>\n'
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + start_tag + '\n' + \
+        build_transfer_header(th_fields, ziel, eric_version) + '\n\t' + content + end
+
 
 def add_transfer_header(base_xml: str, th_fields: TransferHeaderFields):
     """ Lets ERiC add a <TransferHeader> field with the according th_fields for xml_top.
@@ -1,10 +1,19 @@
 import copy
-from dataclasses import asdict
+from dataclasses import asdict, fields, is_dataclass
+from functools import lru_cache
+from typing import List, Tuple
+from xml.sax.saxutils import escape, quoteattr
 
 import xmltodict as xmltodict
 
 from erica.worker.elster_xml.common.basic_xml_data_representation import EXml
 
+_XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>\n'
+
+_CHILD = 0
+_ATTRIBUTE = 1
+_TEXT = 2
+
 
 class CustomDictParser(dict):
     """
@@ -27,7 +36,140 @@ class CustomDictParser(dict):
         super().__init__(new_data)
 
 
-def convert_object_to_xml(grundsteuer_object: EXml):
-    """ Parses the given object to its XML representation. """
+class _NotCompilable(Exception):
+    """Raised for objects whose XML only the generic conversion produces correctly."""
+
+
+@lru_cache(maxsize=None)
+def _field_plan(cls) -> Tuple[Tuple[str, int, str], ...]:
+    """The fields of the dataclass in order with their kind (child element, attribute or text) and XML name, in the
+    way `CustomDictParser` interprets them."""
+    plan = []
+    for field in fields(cls):
+        if field.name.startswith('xml_attr_'):
+            attribute_name = field.name.replace('xml_attr_', '', 1)
+            if not attribute_name or 'xml_attr_' in attribute_name:
+                raise _NotCompilable()
+            plan.append((field.name, _ATTRIBUTE, attribute_name))
+        elif field.name.startswith('xml_text'):
+            plan.append((field.name, _TEXT, '#text'))
+        else:
+            plan.append((field.name, _CHILD, field.name))
+    return tuple(plan)
+
+
+def _is_dataclass_instance(value):
+    return is_dataclass(value) and not isinstance(value, type)
+
+
+def _leaf_text(value) -> str:
+    """The text xmltodict writes for a value that is neither an object nor a list."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (dict, bytes)) or hasattr(value, '__iter__'):
+        raise _NotCompilable()
+    return str(value)
+
+
+def _write_list_item(parts: List[str], tag: str, item):
+    if item is None:
+        parts.append(f'<{tag}></{tag}>')
+    elif _is_dataclass_instance(item):
+        # Unlike fields, list items are written even if all their fields are empty
+        if not _write_element(parts, tag, item):
+            parts.append(f'<{tag}></{tag}>')
+    elif isinstance(item, (list, tuple)):
+        raise _NotCompilable()
+    else:
+        parts.append(f'<{tag}>{escape(_leaf_text(item))}</{tag}>')
+
+
+def _write_element(parts: List[str], tag: str, obj) -> bool:
+    """
+    Appends the element of the dataclass to `parts`. Returns False and appends nothing if all fields of the object
+    are empty, as such objects are left out of their parent.
+    """
+    start_tag_index = len(parts)
+    parts.append('')
+    attributes = []
+    text = None
+    has_content = False
+    has_removed_field = False
+    for name, kind, xml_name in _field_plan(type(obj)):
+        value = getattr(obj, name)
+        if value is None:
+            has_removed_field = True
+            continue
+        if kind != _CHILD:
+            # CustomDictParser renames fields by their original index, which is off once a field was removed
+            if has_removed_field or _is_dataclass_instance(value) or isinstance(value, (list, tuple)):
+                raise _NotCompilable()
+            if kind == _ATTRIBUTE:
+                if isinstance(value, (dict, bytes)):
+                    raise _NotCompilable()
+                attributes.append((xml_name, value if isinstance(value, str) else str(value)))
+            else:
+                text = _leaf_text(value)
+            has_content = True
+        elif _is_dataclass_instance(value):
+            if _write_element(parts, xml_name, value):
+                has_content = True
+            else:
+                has_removed_field = True
+        elif isinstance(value, (list, tuple)):
+            if isinstance(value, tuple) and hasattr(value, '_fields'):
+                raise _NotCompilable()
+            for item in value:
+                _write_list_item(parts, xml_name, item)
+            has_content = True
+        else:
+            parts.append(f'<{xml_name}>{escape(_leaf_text(value))}</{xml_name}>')
+            has_content = True
+
+    if not has_content:
+        del parts[start_tag_index:]
+        return False
+    parts[start_tag_index] = '<' + tag + ''.join(f' {name}={quoteattr(value)}' for name, value in attributes) + '>'
+    if text:
+        parts.append(escape(text))
+    parts.append(f'</{tag}>')
+    return True
+
+
+def _convert_object_to_xml_with_field_plans(grundsteuer_object) -> str:
+    root_fields = [(name, kind, getattr(grundsteuer_object, name))
+                   for name, kind, _ in _field_plan(type(grundsteuer_object))]
+    root_fields = [(name, kind, value) for name, kind, value in root_fields if value is not None]
+    # The document needs exactly one root element, all other cases are left to xmltodict and its errors
+    if len(root_fields) != 1 or root_fields[0][1] != _CHILD or isinstance(root_fields[0][2], (list, tuple)):
+        raise _NotCompilable()
+    name, _, value = root_fields[0]
+    parts = [_XML_DECLARATION]
+    if _is_dataclass_instance(value):
+        if not _write_element(parts, name, value):
+            raise _NotCompilable()
+    else:
+        parts.append(f'<{name}>{escape(_leaf_text(value))}</{name}>')
+    return ''.join(parts)
+
+
+def _convert_object_to_xml_with_xmltodict(grundsteuer_object) -> str:
     grundsteuer_dict = asdict(grundsteuer_object, dict_factory=CustomDictParser)
     return xmltodict.unparse(grundsteuer_dict)
+
+
+def convert_object_to_xml(grundsteuer_object: EXml):
+    """
+    Parses the given object to its XML representation.
+
+    The objects are written in a single pass, driven by a plan of the fields per dataclass that is built on first
+    use. The result is the same as the one of `asdict` with `CustomDictParser` and `xmltodict.unparse`, without
+    copying every nested list. Objects that only these produce correctly, e.g. with dicts or with an attribute after
+    an empty field, are still converted with them.
+    """
+    try:
+        return _convert_object_to_xml_with_field_plans(grundsteuer_object)
+    except _NotCompilable:
+        return _convert_object_to_xml_with_xmltodict(grundsteuer_object)
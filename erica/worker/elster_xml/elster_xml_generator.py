@@ -1,18 +1,18 @@
 import datetime as dt
 from collections import namedtuple
-from xml.etree.ElementTree import Element, SubElement, tostring, XML
-from xml.dom import minidom
+from xml.etree.ElementTree import Element, SubElement, XML
 
 import xml.etree.ElementTree as ET
 
 from erica.config import get_settings
+from erica.worker.elster_xml.common.pretty_xml import pretty_print
+from erica.worker.elster_xml.common.transfer_header import add_transfer_header
 from erica.worker.elster_xml.elster_xml_tree import TOP_ELEMENT_ESTA1A, TOP_ELEMENT_SA, TOP_ELEMENT_AGB, TOP_ELEMENT_HA35A, \
-    TOP_ELEMENT_VOR, ElsterXmlTreeNode
-from erica.worker.elster_xml.est_mapping import PersonSpecificFieldId
+    TOP_ELEMENT_VOR
+from erica.worker.elster_xml.elster_xml_tree_plan import ElsterXmlTreePlan
 from erica.worker.elster_xml.transfer_header_fields import get_vast_request_th_fields, get_vast_activation_th_fields, \
     get_vast_list_th_fields, get_vast_beleg_ids_request_th_fields, get_abrufcode_th_fields, \
     get_vast_beleg_request_th_fields, get_est_th_fields, get_vast_revocation_th_fields
-from erica.worker.pyeric.eric import get_eric_wrapper
 
 # TODO: Refactor how the xml is generated.
 #       The current structure does not have an easy entrypoint and we currently have quite similar functions
@@ -83,6 +83,7 @@ _SUPPORTED_STERKL = [
     TOP_ELEMENT_HA35A,
     TOP_ELEMENT_VOR
 ]
+_SUPPORTED_STERKL_PLAN = ElsterXmlTreePlan(_SUPPORTED_STERKL, PERSONS)
 
 
 ##### General Generation Methods #####
@@ -123,8 +124,7 @@ def generate_full_xml(th_fields, nutzdaten_header_generator, nutzdaten_generator
     else:
         nutzdaten_generator(nutzdaten_block_xml)
 
-    with get_eric_wrapper() as eric_wrapper:
-        xml_string_with_th = _generate_transfer_header(daten_teil_xml, th_fields, eric_wrapper)
+    xml_string_with_th = _generate_transfer_header(daten_teil_xml, th_fields)
 
     return xml_string_with_th
 
@@ -147,8 +147,7 @@ def generate_full_est_xml(form_data, vorsatz, year, empfaenger, nutzdaten_ticket
 
     if not th_fields:
         th_fields = get_est_th_fields(use_testmerker)
-    with get_eric_wrapper() as eric_wrapper:
-        xml_string_with_th = _generate_transfer_header(base_xml, th_fields, eric_wrapper)
+    xml_string_with_th = _generate_transfer_header(base_xml, th_fields)
 
     return xml_string_with_th
 
@@ -229,8 +228,7 @@ def generate_full_vast_beleg_request_xml(form_data, beleg_ids, th_fields=None, u
     if not th_fields:
         th_fields = get_vast_beleg_request_th_fields(use_testmerker)
 
-    with get_eric_wrapper() as eric_wrapper:
-        xml_string_with_th = _generate_transfer_header(daten_teil_xml, th_fields, eric_wrapper=eric_wrapper)
+    xml_string_with_th = _generate_transfer_header(daten_teil_xml, th_fields)
 
     return xml_string_with_th
 
@@ -362,9 +360,12 @@ def _generate_transfer_header(xml_top, th_fields, eric_wrapper=None):
 
     :param xml_top: the xml to add the transfer header to
     :param th_fields: the transfer header fields to include
-    :param eric_wrapper: an optional *initialised* api to use for the request
+    :param eric_wrapper: an optional *initialised* api to use for the request. Without it,
+        `add_transfer_header` initialises its own one.
     """
     xml_string = _pretty(xml_top)
+    if eric_wrapper is None:
+        return add_transfer_header(xml_string, th_fields)
 
     xml_string_with_th = eric_wrapper.create_th(
             xml_string,
@@ -379,10 +380,7 @@ def _generate_transfer_header(xml_top, th_fields, eric_wrapper=None):
 
 def _pretty(xml, remove_decl=True):
     """Pretty prints a etree xml object."""
-    xml = minidom.parseString(tostring(xml))
-    if remove_decl:
-        xml = xml.childNodes[0]
-    return xml.toprettyxml(indent=" " * 4)
+    return pretty_print(xml, remove_decl)
 
 
 ##### Specific Helper Methods #####
@@ -410,78 +408,7 @@ def _add_xml_vorsatz(xml_top, vorsatz, bescheid=2):
 
 
 def _add_xml_fields(xml_top, fields):
-    for sterkl in _SUPPORTED_STERKL:
-        _add_sterkl_fields(xml_top, fields, sterkl)
-
-
-def _add_sterkl_fields(xml_parent, fields, sterkl):
-    """
-        Recursive function to add all xml elements of a given StErkl(sub)Element to the given result xml.
-
-        :param xml_parent: the xml to add the sub-elements to
-        :param fields: data given by the user in all forms that has been elsterified
-        :param sterkl: current StErklSubElement/list with StErkl data
-    """
-    if isinstance(sterkl, ElsterXmlTreeNode):
-        for repetition in range(sterkl.repetitions):
-            sterkl_xml = Element(sterkl.name)
-            if sterkl.is_person_specific:
-                person = PERSONS[repetition]
-                SubElement(sterkl_xml, 'Person').text = person
-                for sub_element in sterkl.sub_elements:
-                    _add_person_specific_sterkl_fields(sterkl_xml, fields, sub_element, person)
-            elif sterkl.is_repeatable and \
-                    any([isinstance(fields[sub_element], list) and len(fields[sub_element]) > 1
-                         if sub_element in fields.keys() else False for sub_element in sterkl.sub_elements]):
-                for sub_element in sterkl.sub_elements:
-                    _add_sterkl_fields(sterkl_xml, fields, sub_element)
-                _add_sterkl_fields(xml_parent, fields, sterkl)
-            else:
-                for sub_element in sterkl.sub_elements:
-                    _add_sterkl_fields(sterkl_xml, fields, sub_element)
-            _add_if_not_empty(xml_parent, sterkl_xml)
-    elif isinstance(sterkl, str):  # Reached a leaf node of the tree
-        if sterkl in fields.keys():
-            if isinstance(fields[sterkl], list):
-                SubElement(xml_parent, sterkl).text = fields[sterkl].pop()
-            else:
-                SubElement(xml_parent, sterkl).text = fields[sterkl]
-
-
-def _add_person_specific_sterkl_fields(xml_parent, input_fields, sterkl, person):
-    """
-        Recursive function to handle StErklSubElements that are person-specific.
-        In that case we need to find the correct input field that matches the current sterkl field AND the person.
-        Just as _add_sterkl_fields() the method adds all filled input_fields that match to xml_parent.
-
-        :param xml_parent: the xml to add the sub-element to
-        :param input_fields: data given by the user in all forms that has been elsterified
-        :param sterkl: the current StErklSubElement to be added to xml_parent
-        :param person: the person for which the fields shall be added
-    """
-    if isinstance(sterkl, ElsterXmlTreeNode):
-        sterkl_xml = Element(sterkl.name)
-        for sub_element in sterkl.sub_elements:
-            _add_person_specific_sterkl_fields(sterkl_xml, input_fields, sub_element, person)
-        _add_if_not_empty(xml_parent, sterkl_xml)
-    elif isinstance(sterkl, str):  # Reached a leaf node of the tree
-        for input_field_id in input_fields.keys():
-            if isinstance(input_field_id, PersonSpecificFieldId) \
-                    and input_field_id.identifier == sterkl \
-                    and input_field_id.person == person:
-                SubElement(xml_parent, sterkl).text = input_fields[PersonSpecificFieldId(sterkl, person)]
-
-
-def _add_if_not_empty(xml_parent, sterkl_xml):
-    """
-        This method adds the given sterkl_xml to the xml_parent only if sterkl_xml is non-empty.
-        Having only a 'Person' tag is considered empty.
-
-        :param xml_parent: the xml to add the sub-element to
-        :param sterkl_xml: sub_element to be added to xml_parent
-    """
-    if [elem.tag for elem in sterkl_xml.iter() if elem is not sterkl_xml and elem.tag != 'Person']:
-        xml_parent.append(sterkl_xml)
+    _SUPPORTED_STERKL_PLAN.add_fields(xml_top, fields)
 
 
 def _compute_valid_until_date():
@@ -0,0 +1,109 @@
+from collections import namedtuple
+from xml.etree.ElementTree import SubElement
+
+from erica.worker.elster_xml.elster_xml_tree import ElsterXmlTreeNode
+from erica.worker.elster_xml.est_mapping import PersonSpecificFieldId
+
+# An element of the tree: key identifies it within the plan, person is set for the elements of person-specific nodes
+_PlannedElement = namedtuple('_PlannedElement', ['key', 'name', 'person'])
+# A leaf of the tree: position is its position in document order, path the elements from the top down to its parent
+_PlannedLeaf = namedtuple('_PlannedLeaf', ['position', 'name', 'path', 'repeat_group'])
+# A repeatable node: element is repeated once for each value of the leaves, which have to be lists of the same length
+_RepeatGroup = namedtuple('_RepeatGroup', ['element', 'leaves'])
+
+
+class ElsterXmlTreePlan(object):
+    """
+        The ElsterXmlTreeNode trees compiled into a flat plan: every leaf knows the path of elements it is added to.
+        Adding the fields then only touches the filled fields, instead of walking the whole tree for every request.
+        It replaces the recursive walk the generator used before and returns the same XML. Other than the recursion,
+        it does not empty the lists in the fields and a leaf may only be part of the trees once.
+    """
+
+    def __init__(self, top_elements, persons):
+        self._persons = persons
+        self._leaves = {}
+        for index, top_element in enumerate(top_elements):
+            self._compile_node(top_element, (), (index,))
+
+    def _compile_node(self, node, path, key, person=None):
+        if person is None and node.is_person_specific:
+            for repetition in range(node.repetitions):
+                element = _PlannedElement(key + (repetition,), node.name, self._persons[repetition])
+                self._compile_sub_elements(node, path + (element,), element.key, element.person)
+            return
+
+        element = _PlannedElement(key, node.name, None)
+        repeat_group = None
+        if person is None:
+            if node.repetitions != 1:
+                raise ValueError(f"Repetitions are only supported for person-specific nodes, not for '{node.name}'")
+            if node.is_repeatable:
+                if not all(isinstance(sub_element, str) for sub_element in node.sub_elements):
+                    raise ValueError(f"The repeatable node '{node.name}' may only contain leaves")
+                repeat_group = _RepeatGroup(element, tuple(node.sub_elements))
+        self._compile_sub_elements(node, path + (element,), key, person, repeat_group)
+
+    def _compile_sub_elements(self, node, path, key, person, repeat_group=None):
+        for index, sub_element in enumerate(node.sub_elements):
+            if isinstance(sub_element, ElsterXmlTreeNode):
+                self._compile_node(sub_element, path, key + (index,), person)
+            elif isinstance(sub_element, str):
+                field_id = PersonSpecificFieldId(sub_element, person) if person else sub_element
+                if field_id in self._leaves:
+                    raise ValueError(f"The field '{sub_element}' is part of the tree more than once")
+                self._leaves[field_id] = _PlannedLeaf(len(self._leaves), sub_element, path, repeat_group)
+
+    def _get_leaf(self, field_id):
+        if isinstance(field_id, str) or isinstance(field_id, PersonSpecificFieldId):
+            return self._leaves.get(field_id)
+        return None
+
+    def add_fields(self, xml_parent, fields):
+        """
+            Adds all fields that are part of the tree to xml_parent, in the order of the tree.
+
+            :param xml_parent: the xml to add the top elements to
+            :param fields: data given by the user in all forms that has been elsterified
+        """
+        filled_leaves = sorted(((leaf, field_id) for field_id in fields if (leaf := self._get_leaf(field_id))),
+                               key=lambda filled_leaf: filled_leaf[0].position)
+        elements = {}
+        added_repeat_groups = set()
+        for leaf, field_id in filled_leaves:
+            if leaf.repeat_group:
+                if leaf.repeat_group.element.key not in added_repeat_groups:
+                    added_repeat_groups.add(leaf.repeat_group.element.key)
+                    parent = _get_element(elements, xml_parent, leaf.path[:-1])
+                    _add_repetitions(parent, fields, leaf.repeat_group)
+                continue
+
+            value = fields[field_id]
+            if isinstance(field_id, str) and isinstance(value, list):
+                value = value[-1]
+            SubElement(_get_element(elements, xml_parent, leaf.path), leaf.name).text = value
+
+
+def _get_element(elements, xml_parent, path):
+    """ Returns the element at the end of path, adding the elements on the way that do not exist yet. """
+    element = xml_parent
+    for planned_element in path:
+        parent = element
+        element = elements.get(planned_element.key)
+        if element is None:
+            element = elements[planned_element.key] = SubElement(parent, planned_element.name)
+            if planned_element.person:
+                SubElement(element, 'Person').text = planned_element.person
+    return element
+
+
+def _add_repetitions(xml_parent, fields, repeat_group):
+    values = [(name, fields[name]) for name in repeat_group.leaves if name in fields]
+    lengths = {len(value) for _, value in values if isinstance(value, list)}
+    repetitions = max(lengths, default=1)
+    if repetitions == 0 or len(lengths) > 1:
+        raise IndexError(f"The lists of '{repeat_group.element.name}' differ in length")
+    for repetition in range(repetitions):
+        repetition_xml = SubElement(xml_parent, repeat_group.element.name)
+        for name, value in values:
+            SubElement(repetition_xml, name).text = value[repetition] if isinstance(value, list) else value
@@ -1,4 +1,4 @@
-from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import get_elements_from_xml, get_elements_text_from_xml_element, _get_element_from_xml, remove_declaration_and_namespace
+from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import get_elements_from_xml, get_elements_text_from_xml_element, _get_element_from_xml, parse_eric_response
 
 
 def get_state_ids(xml_string):
@@ -25,24 +25,24 @@ def get_tax_offices(xml_string):
     return tax_offices
 
 
-def get_antrag_id_from_xml(xml_string):
-    return _get_element_from_xml(xml_string, 'AntragsID')
+def get_antrag_id_from_xml(xml):
+    return _get_element_from_xml(xml, 'AntragsID')
 
 
-def get_idnr_from_xml(xml_string):
-    return _get_element_from_xml(xml_string, 'DateninhaberIdNr')
+def get_idnr_from_xml(xml):
+    return _get_element_from_xml(xml, 'DateninhaberIdNr')
 
 
-def get_transferticket_from_xml(xml_string):
-    return _get_element_from_xml(xml_string, 'TransferTicket')
+def get_transferticket_from_xml(xml):
+    return _get_element_from_xml(xml, 'TransferTicket')
 
 
-def get_address_from_xml(xml_string):
-    return _get_element_from_xml(xml_string, 'AdrKette')
+def get_address_from_xml(xml):
+    return _get_element_from_xml(xml, 'AdrKette')
 
 
-def get_relevant_beleg_ids(xml_string, beleg_types):
-    beleg_id_xml = remove_declaration_and_namespace(xml_string)
+def get_relevant_beleg_ids(xml, beleg_types):
+    beleg_id_xml = parse_eric_response(xml).xml_tree
     beleg_id_elements = beleg_id_xml.findall('.//Id')
     beleg_ids = []
     for beleg_id_element in beleg_id_elements:
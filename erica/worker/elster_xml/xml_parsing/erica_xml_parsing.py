@@ -1,13 +1,6 @@
 import re
 import xml.etree.ElementTree as ET
-
-
-def _get_element_from_xml(xml_string: str, element_xpath: str):
-    xml_tree = remove_declaration_and_namespace(xml_string)
-    element = xml_tree.find('.//' + element_xpath)
-    if list(element):  # element has children
-        return ET.tostring(element, encoding='utf-8', method='xml')
-    return element.text
+from functools import cached_property
 
 
 def remove_declaration_and_namespace(xml_string):
@@ -16,6 +9,45 @@ def remove_declaration_and_namespace(xml_string):
     return ET.fromstring(xml_string)
 
 
+class ParsedEricResponse(object):
+    """
+        An XML returned by ERiC or the ELSTER server, parsed once with its first default namespace removed when the
+        first value is extracted. All values are extracted from this one tree, so the functions below accept it instead
+        of the XML string to avoid parsing the same response for every value.
+    """
+
+    def __init__(self, xml_string: str):
+        self.xml_string = xml_string
+
+    @cached_property
+    def xml_tree(self):
+        return remove_declaration_and_namespace(self.xml_string)
+
+    def get_element(self, element_xpath: str):
+        """ Returns the text of the first element at element_xpath or, if it has children, the serialised element. """
+        element = self.xml_tree.find('.//' + element_xpath)
+        if list(element):  # element has children
+            return ET.tostring(element, encoding='utf-8', method='xml')
+        return element.text
+
+    def get_elements(self, element):
+        return get_elements_from_xml_element(self.xml_tree, element)
+
+    def get_elements_text(self, element):
+        return [el.text for el in self.get_elements(element)]
+
+
+def parse_eric_response(xml) -> ParsedEricResponse:
+    """ Returns the xml string parsed, or xml itself if it has already been parsed. """
+    if isinstance(xml, ParsedEricResponse):
+        return xml
+    return ParsedEricResponse(xml)
+
+
+def _get_element_from_xml(xml, element_xpath: str):
+    return parse_eric_response(xml).get_element(element_xpath)
+
+
 def get_elements_from_xml_element(xml_element, tag_name):
     matched_elements = xml_element.findall('.//' + tag_name)
     result = []
@@ -26,28 +58,26 @@ def get_elements_from_xml_element(xml_element, tag_name):
     return result
 
 
-def get_elements_from_xml(xml_string, element):
-    xml_tree = remove_declaration_and_namespace(xml_string)
-    return get_elements_from_xml_element(xml_tree, element)
+def get_elements_from_xml(xml, element):
+    return parse_eric_response(xml).get_elements(element)
 
 
 def get_elements_text_from_xml_element(xml_element, searched_child_element):
     return [el.text for el in get_elements_from_xml_element(xml_element, searched_child_element)]
 
 
-def get_elements_text_from_xml(xml_string, element):
-    return [el.text for el in get_elements_from_xml(xml_string, element)]
+def get_elements_text_from_xml(xml, element):
+    return parse_eric_response(xml).get_elements_text(element)
 
 
 def get_elements_key_value_from_xml(input_xml, element, key):
-    xml_string = ET.tostring(input_xml).decode()
-    xml_tree = remove_declaration_and_namespace(xml_string)
-    matched_elements = xml_tree.findall('.//' + element)
+    # The element is searched in any namespace instead of serialising and parsing the tree again without namespace
+    matched_elements = input_xml.findall('.//{*}' + element)
     result = []
     for el in matched_elements:
         value = el.get(key)
         if value:
             result.append(value)
-    if xml_tree.tag == element:  # also consider the element itself
-        result.append(xml_tree.get(key))
+    if input_xml.tag.rpartition('}')[2] == element:  # also consider the element itself
+        result.append(input_xml.get(key))
     return result
@@ -1,14 +1,34 @@
 import logging
-import tempfile
-from threading import local
+from typing import Iterable
+from uuid import UUID
 
 import sentry_sdk
 
 from erica.config import get_settings
 from huey import RedisHuey
+from huey.api import TaskWrapper
 
 huey = RedisHuey('erica-huey-queue', url=get_settings().queue_url, immediate=get_settings().use_immediate_worker)
-eric_wrapper = local()
+
+
+def enqueue_for_each(task: TaskWrapper, request_ids: Iterable[UUID]):
+    """
+    Enqueues the task once for every request id. The tasks are pushed to Redis in one pipeline instead of one round trip
+    per task. In immediate mode every task runs right away, as it would when called directly.
+    """
+    if task.huey.immediate:
+        for request_id in request_ids:
+            task(request_id)
+        return
+
+    storage = task.huey.storage
+    pipeline = storage.conn.pipeline(transaction=False)
+    for request_id in request_ids:
+        task_instance = task.s(request_id)
+        if task_instance.expires:
+            task_instance.resolve_expires(task.huey.utc)
+        pipeline.lpush(storage.queue_key, task.huey.serialize_task(task_instance))
+    pipeline.execute()
 
 
 @huey.on_startup()
@@ -40,20 +60,25 @@ def init_sentry():
 
 
 def eric_wrapper_init():
-    global eric_wrapper
-    from erica.worker.pyeric.eric import EricWrapper
-    eric_wrapper.wrapper_instance = EricWrapper()
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        eric_wrapper.wrapper_instance.initialise(log_path=tmp_dir)
-
-
-def get_initialised_eric_wrapper():
-    return eric_wrapper.wrapper_instance
+    """ Every worker thread adds one initialised ERiC instance to the pool, such that the first jobs do not have to
+    wait for the initialisation of the native library. In process mode the ERiC worker processes are started instead.
+    """
+    if get_settings().eric_execution_mode == 'process':
+        from erica.worker.pyeric.eric_process_pool import get_eric_process_pool
+        get_eric_process_pool().warm_up()
+    else:
+        from erica.worker.pyeric.eric import get_eric_wrapper_pool
+        get_eric_wrapper_pool().add_idle_instance()
 
 
 @huey.on_shutdown()
 def shutdown_eric_wrapper():
-    get_initialised_eric_wrapper().shutdown()
+    if get_settings().eric_execution_mode == 'process':
+        from erica.worker.pyeric.eric_process_pool import get_eric_process_pool
+        get_eric_process_pool().close()
+    else:
+        from erica.worker.pyeric.eric import get_eric_wrapper_pool
+        get_eric_wrapper_pool().close()
 
 
 @huey.pre_execute()
@@ -6,12 +6,31 @@ from uuid import UUID
 from pydantic import ValidationError
 
 from erica.job_service.job_service import JobServiceInterface
+from erica.domain.job_completion.job_completion_notifier import notify_job_completion
 from erica.domain.repositories import base_repository_interface
-from erica.domain.model.erica_request import EricaRequest, Status
+from erica.domain.result_cache.result_cache import cache_finished_request
+from erica.domain.model.erica_request import EricaRequest, Status, FINISHED_STATUSES
 from erica.domain.model.base_domain_model import BasePayload
 from erica.worker.pyeric.eric_errors import EricProcessNotSuccessful, get_error_codes_from_server_err_msg, \
     EricTransferError
 from erica.domain.sqlalchemy.repositories.base_repository import EntityNotFoundError
+from erica.worker.pyeric.token_scheduler import token_request_context
+
+
+def _update_entity(repository: base_repository_interface, entity: EricaRequest, **changes):
+    """Writes only the changed columns to the database and takes over the updated row, incl. the columns the database
+    sets itself such as updated_at, into the entity."""
+    for name, value in changes.items():
+        setattr(entity, name, value)
+    updated_entity = repository.update_columns(entity.id, changes)
+    for name, value in updated_entity:
+        setattr(entity, name, value)
+
+
+def _report_finished_job(entity: EricaRequest):
+    """Caches the finished request before the API is told about it, so that woken up clients read it from the cache."""
+    cache_finished_request(entity)
+    notify_job_completion(entity.request_id)
 
 
 def perform_job(request_id: UUID, repository: base_repository_interface, service: JobServiceInterface,
@@ -31,10 +50,9 @@ def perform_job(request_id: UUID, repository: base_repository_interface, service
     try:
         request_payload: payload_type = payload_type.parse_obj(entity.payload)
     except ValidationError as e:
-        entity.error_code = "ParsingError"
-        entity.error_message = "Failed to parse payload"
-        entity.status = Status.failed
-        repository.update(entity.id, entity)
+        _update_entity(repository, entity, error_code="ParsingError", error_message="Failed to parse payload",
+                       status=Status.failed)
+        _report_finished_job(entity)
         raise
 
     try:
@@ -42,13 +60,12 @@ def perform_job(request_id: UUID, repository: base_repository_interface, service
         logger.info(f"Job started: {entity}")
 
         try:
-            response = service.apply_to_elster(request_payload, True)
+            with token_request_context(entity.type, entity.creator_id):
+                response = service.apply_to_elster(request_payload, True)
             # We do not want to send the server_response or eric_response to the clients in the success case
             response.pop('server_response', None)
             response.pop('eric_response', None)
-            entity.result = response
-            entity.status = Status.success
-            repository.update(entity.id, entity)
+            _update_entity(repository, entity, result=response, status=Status.success)
         except EricProcessNotSuccessful as e:
             error_response = e.generate_error_response(True)
             transfer_errors_xml = error_response.get('server_err_msg').get('NDH_ERR_XML') if error_response.get('server_err_msg') else None
@@ -65,24 +82,23 @@ def perform_job(request_id: UUID, repository: base_repository_interface, service
                     f"Job failed: {entity}. Got error: {error_response.get('code')}.",
                     exc_info=True
                 )
-            entity.error_code = error_response.get('message')
-            entity.error_message = error_response.get('message')
             validation_problems = error_response.get('validation_problems')
-            entity.result = {"validation_errors": validation_problems} if validation_problems else None
-            entity.status = Status.failed
-            repository.update(entity.id, entity)
+            _update_entity(repository, entity, error_code=error_response.get('message'),
+                           error_message=error_response.get('message'),
+                           result={"validation_errors": validation_problems} if validation_problems else None,
+                           status=Status.failed)
 
         # TODO: NF 2022-07-06: this should be logged at info level, but huey doesn't yet log properly.
         # setting the level to warning is the quickest way to get this into our production logs.
         logger.warning(f"Job finished: {entity}")
     except Exception as e:
         # Intentional bare except because this should be a catch-all
-        entity.error_code = "UnkownException"
-        entity.error_message = "An unknown error occurred"
-        entity.status = Status.failed
-        repository.update(entity.id, entity)
+        _update_entity(repository, entity, error_code="UnkownException", error_message="An unknown error occurred",
+                       status=Status.failed)
         raise
     finally:
         end_time = datetime.now()
         elapsed_time = end_time - start_time
         logger.info(f"Job running time for {entity}: {elapsed_time}")
+        if entity.status in FINISHED_STATUSES:
+            _report_finished_job(entity)
@@ -1,14 +1,26 @@
+import atexit
 import logging
 import os
 import tempfile
-from contextlib import contextmanager
+import time
+from contextlib import contextmanager, ExitStack
+from contextvars import ContextVar
 from ctypes import Structure, c_int, c_uint32, c_char_p, c_void_p, pointer, CDLL, RTLD_GLOBAL
 from dataclasses import dataclass
-from typing import ByteString
+from functools import lru_cache
+from threading import Lock
+from typing import ByteString, Optional
+from weakref import WeakKeyDictionary
+
+from prometheus_client import Counter
 
 from erica.config import get_settings, Settings
-from erica.worker.pyeric.eric_errors import check_result, check_handle, check_xml, EricWrongTaxNumberError
-from erica.worker.huey import huey, get_initialised_eric_wrapper
+from erica.worker.pyeric.eric_errors import check_result, check_handle, check_xml, EricWrongTaxNumberError, \
+    EricProcessNotSuccessful, EricCryptError, EricGlobalValidationError, EricTransferError, InvalidBufaNumberError
+from erica.worker.pyeric.eric_pool import EricWrapperPool
+from erica.worker.pyeric.pdf_capture import InMemoryPdfFile
+from erica.worker.pyeric.token_scheduler import token_bound
+from erica.worker.huey import huey
 
 logger = logging.getLogger('eric')
 
@@ -38,25 +50,209 @@ class EricVerschluesselungsParameterT(Structure):
                 ("abrufCode", c_char_p)]
 
 
+# Signatures (argtypes, restype) of all ERiC functions used by the wrapper, as declared in ericapi.h
+_ERIC_PROTOTYPES = {
+    'EricMtInstanzErzeugen': ([c_char_p, c_char_p], c_void_p),
+    'EricMtInstanzFreigeben': ([c_void_p], c_int),
+    'EricMtVersion': ([c_void_p, c_void_p], c_int),
+    'EricMtGetHandleToCertificate': ([c_void_p, c_void_p, c_void_p, c_char_p], c_int),
+    'EricMtCloseHandleToCertificate': ([c_void_p, c_int], c_int),
+    'EricMtHoleZertifikatEigenschaften': ([c_void_p, c_int, c_char_p, c_void_p], c_int),
+    'EricMtBearbeiteVorgang': ([c_void_p, c_char_p, c_char_p, c_uint32,
+                                c_void_p, c_void_p, c_void_p,
+                                c_void_p, c_void_p], c_int),
+    'EricMtRueckgabepufferErzeugen': ([c_void_p], c_void_p),
+    'EricMtRueckgabepufferInhalt': ([c_void_p, c_void_p], c_char_p),
+    'EricMtRueckgabepufferFreigeben': ([c_void_p, c_void_p], c_int),
+    'EricMtCreateTH': ([c_void_p, c_char_p, c_char_p, c_char_p, c_char_p,
+                        c_char_p, c_char_p, c_char_p, c_char_p,
+                        c_char_p, c_void_p], c_int),
+    'EricMtPruefeSteuernummer': ([c_void_p, c_char_p], c_int),
+    'EricMtDekodiereDaten': ([c_void_p, c_int, c_char_p, c_char_p, c_void_p], c_int),
+    'EricMtHoleFinanzaemter': ([c_void_p, c_char_p, c_void_p], c_int),
+    'EricMtHoleFinanzamtLandNummern': ([c_void_p, c_void_p], c_int),
+    'EricMtMakeElsterEWAz': ([c_void_p, c_char_p, c_char_p, c_void_p], c_int),
+    'EricMtGetErrormessagesFromXMLAnswer': ([c_void_p, c_void_p, c_void_p, c_void_p, c_void_p, c_void_p], c_int),
+}
+
+
+class EricPrototypes(object):
+    """The typed ERiC functions of one loaded library. Each function is looked up and gets its `argtypes` and
+    `restype` assigned on first access only; afterwards it is a plain attribute of this table. Use
+    `get_eric_prototypes` to get the table that is shared by all wrappers using the same library.
+    """
+
+    def __init__(self, library):
+        self._library = library
+
+    def __getattr__(self, name):
+        try:
+            argtypes, restype = _ERIC_PROTOTYPES[name]
+        except KeyError:
+            raise AttributeError(f"No prototype declared for ERiC function {name}")
+        function = getattr(self._library, name)
+        function.argtypes = argtypes
+        function.restype = restype
+        setattr(self, name, function)
+        return function
+
+
+_eric_prototypes = WeakKeyDictionary()
+_eric_prototypes_lock = Lock()
+
+
+def get_eric_prototypes(library) -> EricPrototypes:
+    """Returns the prototype table for the given library. There is exactly one table per loaded library."""
+    with _eric_prototypes_lock:
+        prototypes = _eric_prototypes.get(library)
+        if prototypes is None:
+            prototypes = EricPrototypes(library)
+            _eric_prototypes[library] = prototypes
+        return prototypes
+
+
+@lru_cache()
+def load_eric_library():
+    """Loads the native ERiC library once per process; all wrappers share the loaded library."""
+    return CDLL(Settings.get_eric_dll_path(), RTLD_GLOBAL)
+
+
+ERIC_LIFECYCLE_EVENTS = Counter('erica_eric_lifecycle_events', 'Number of ERiC instance lifecycle calls', ['event'])
+
+
+class EricSession(object):
+    """A job-scoped ERiC session. The first `get_eric_wrapper` call inside the session checks out an instance from
+    the pool; all further calls inside the session reuse that instance. It is handed back when the session ends."""
+
+    def __init__(self):
+        self._checkout = None
+        self._eric_wrapper = None
+
+    def get_wrapper(self):
+        if self._eric_wrapper is None:
+            self._checkout = ExitStack()
+            self._eric_wrapper = self._checkout.enter_context(_checkout_eric_wrapper())
+        return self._eric_wrapper
+
+    def release(self, exc_info=(None, None, None)):
+        """Hands the instance back to the pool. The exception that ended its use decides whether it is recycled."""
+        checkout = self._checkout
+        self._checkout = None
+        self._eric_wrapper = None
+        if checkout is not None:
+            checkout.__exit__(*exc_info)
+
+
+_current_eric_session: ContextVar[Optional[EricSession]] = ContextVar('eric_session', default=None)
+
+
+@contextmanager
+def eric_session():
+    """Opens a job-scoped ERiC session in which all nested `get_eric_wrapper` calls share one ERiC instance. The
+    instance is only checked out once it is needed. Nested sessions join the session that is already open."""
+    if _current_eric_session.get() is not None:
+        yield _current_eric_session.get()
+        return
+
+    session = EricSession()
+    token = _current_eric_session.set(session)
+    try:
+        yield session
+    except BaseException as e:
+        session.release((type(e), e, e.__traceback__))
+        raise
+    else:
+        session.release()
+    finally:
+        _current_eric_session.reset(token)
+
+
 # TODO: Unify usage of EricWrapper; rethink having eric_wrapper as a parameter
 @contextmanager
 def get_eric_wrapper():
-    """This context manager returns an initialised eric wrapper; it will ensure that the ERiC API is shutdown after
-    use. """
-    if get_settings().run_with_huey:
-        yield get_initialised_eric_wrapper()
-    else:
-        eric = EricWrapper()
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            eric.initialise(log_path=tmp_dir)
+    """This context manager returns an initialised eric wrapper from the process-wide pool; it will ensure that the
+    wrapper is handed back to the pool after use. Inside an `eric_session` the wrapper of the session is returned
+    instead."""
+    session = _current_eric_session.get()
+    if session is None:
+        with _checkout_eric_wrapper() as eric:
+            yield eric
+        return
+
+    try:
+        yield session.get_wrapper()
+    except Exception as e:
+        if _is_instance_error(e):
+            # Do not hand a possibly broken instance to the following steps of the job
+            session.release((type(e), e, e.__traceback__))
+        raise
 
-            try:
-                yield eric
-            finally:
-                eric.shutdown()
-                with open(os.path.join(tmp_dir, 'eric.log'), "r") as eric_log:
-                    eric_log_data = eric_log.read()
-                    logger.debug(eric_log_data)
+
+@contextmanager
+def _checkout_eric_wrapper():
+    if get_settings().eric_execution_mode == 'process':
+        from erica.worker.pyeric.eric_process_pool import get_eric_process_pool_wrapper
+        yield get_eric_process_pool_wrapper()
+        return
+
+    with get_eric_wrapper_pool().checkout() as eric:
+        ERIC_LIFECYCLE_EVENTS.labels(event='checkout').inc()
+        yield eric
+
+
+@lru_cache()
+def get_eric_wrapper_pool() -> EricWrapperPool:
+    """Returns the process-wide pool of initialised ERiC instances. It is shut down when the process exits."""
+    settings = get_settings()
+    pool = EricWrapperPool(
+        create_instance=_create_pooled_eric_wrapper,
+        destroy_instance=_destroy_pooled_eric_wrapper,
+        max_size=settings.eric_pool_max_size,
+        max_uses=settings.eric_pool_max_uses,
+        checkout_timeout=settings.eric_pool_checkout_timeout_in_sec,
+        health_check=lambda eric: eric.eric_instance is not None,
+        should_recycle=_is_instance_error)
+    atexit.register(pool.close)
+    return pool
+
+
+def _create_pooled_eric_wrapper():
+    log_dir = tempfile.TemporaryDirectory()
+    try:
+        eric = EricWrapper()
+        eric.initialise(log_path=log_dir.name)
+    except Exception:
+        log_dir.cleanup()
+        raise
+    eric.log_dir = log_dir
+    return eric
+
+
+def _destroy_pooled_eric_wrapper(eric):
+    try:
+        eric.shutdown()
+    finally:
+        eric_log_path = os.path.join(eric.log_dir.name, 'eric.log')
+        if os.path.exists(eric_log_path):
+            with open(eric_log_path, "r") as eric_log:
+                eric_log_data = eric_log.read()
+                logger.debug(eric_log_data)
+        eric.log_dir.cleanup()
+
+
+def _is_instance_error(exception):
+    """Errors caused by the processed data or by the ELSTER server leave the ERiC instance intact. Any other ERiC
+    error might have left it in an inconsistent state, so it must not be reused."""
+    return isinstance(exception, EricProcessNotSuccessful) and not isinstance(
+        exception, (EricGlobalValidationError, EricTransferError, InvalidBufaNumberError))
+
+
+@lru_cache()
+def get_eric_version():
+    """Returns the versions of the ERiC libraries of this process. The libraries are loaded once per process, see
+    `load_eric_library`, so the versions only change with a restart."""
+    with get_eric_wrapper() as eric_wrapper:
+        return eric_wrapper.get_version()
 
 
 def verify_using_stick():
@@ -97,18 +293,27 @@ class EricWrapper(object):
     def __init__(self):
         """Creates a new instance of the pyeric wrapper.
         """
-        self.eric = CDLL(Settings.get_eric_dll_path(), RTLD_GLOBAL)
+        self.eric = load_eric_library()
         self.eric_instance = None
+        self._cert_handle = None
+        self._cert_handle_opened_at = None
         logger.debug(f"eric: {self.eric}")
 
+    @property
+    def eric(self):
+        return self._eric
+
+    @eric.setter
+    def eric(self, library):
+        self._eric = library
+        self.functions = get_eric_prototypes(library)
+
     def initialise(self, log_path=None):
         """Initialises ERiC and a successful return from this method shall indicate
         that the .so file was found and loaded successfully. Where `initialise` is called,
         `shutdown` shall be called when done.
         """
-        fun_init = self.eric.EricMtInstanzErzeugen
-        fun_init.argtypes = [c_char_p, c_char_p]
-        fun_init.restype = c_void_p
+        fun_init = self.functions.EricMtInstanzErzeugen
 
         curr_dir = os.path.dirname(os.path.realpath(__file__))
         plugin_path = c_char_p(os.path.join(curr_dir, "../lib/plugins2").encode())
@@ -116,22 +321,21 @@ class EricWrapper(object):
         log_path = c_char_p(log_path.encode() if log_path else None)
 
         self.eric_instance = fun_init(plugin_path, log_path)
+        ERIC_LIFECYCLE_EVENTS.labels(event='initialise').inc()
         logger.info(f"fun_init instance: {self.eric_instance}")
 
     def shutdown(self):
         """Shuts down ERiC and releases resources. One must not use the object afterwards."""
-        fun_shutdown = self.eric.EricMtInstanzFreigeben
-        fun_shutdown.argtypes = [c_void_p]
-        fun_shutdown.restype = c_int
+        self.release_cert_handle()
+        fun_shutdown = self.functions.EricMtInstanzFreigeben
         res = fun_shutdown(self.eric_instance)
+        ERIC_LIFECYCLE_EVENTS.labels(event='shutdown').inc()
         check_result(res)
         logger.info(f"fun_shutdown res: {res}")
 
     def get_version(self):
         """Get the currently used library versions."""
-        fun_get_version = self.eric.EricMtVersion
-        fun_get_version.argtypes = [c_void_p, c_void_p]
-        fun_get_version.restype = c_int
+        fun_get_version = self.functions.EricMtVersion
 
         eric_response_buffer = self.create_buffer()
         res = fun_get_version(self.eric_instance, eric_response_buffer)
@@ -144,18 +348,17 @@ class EricWrapper(object):
         """Validate the given XML using the built-in plausibility checks."""
         return self.process(xml, data_type_version, EricWrapper.ERIC_VALIDIERE)
 
+    @token_bound
     def validate_and_send(self, xml, data_type_version):
         """Validate and (more importantly) send the given XML using the built-in
         plausibility checks. For this a test certificate and pin must be provided and the
         `data_type_version` shall match the XML data. When a `print_path` is given, a PDF
         will be created under that path."""
 
-        with tempfile.NamedTemporaryFile() as temporary_pdf_file:
-            print_params = self.alloc_eric_druck_parameter_t(temporary_pdf_file.name)
+        with InMemoryPdfFile() as pdf_file:
+            print_params = self.alloc_eric_druck_parameter_t(pdf_file.name)
 
-            cert_handle = self.get_cert_handle()
-
-            try:
+            with self.cached_cert_handle() as cert_handle:
                 cert_params = self.alloc_eric_verschluesselungs_parameter_t(cert_handle)
                 flags = EricWrapper.ERIC_SENDE | EricWrapper.ERIC_DRUCKE
 
@@ -164,11 +367,8 @@ class EricWrapper(object):
                     flags,
                     cert_params=pointer(cert_params),
                     print_params=pointer(print_params))
-                temporary_pdf_file.seek(0)
-                eric_result.pdf = temporary_pdf_file.read()
+                eric_result.pdf = pdf_file.read()
                 return eric_result
-            finally:
-                self.close_cert_handle(cert_handle)
 
     @staticmethod
     def alloc_eric_druck_parameter_t(print_path):
@@ -191,9 +391,7 @@ class EricWrapper(object):
         )
 
     def get_cert_handle(self):
-        fun_get_cert_handle = self.eric.EricMtGetHandleToCertificate
-        fun_get_cert_handle.argtypes = [c_void_p, c_void_p, c_void_p, c_char_p]
-        fun_get_cert_handle.restype = c_int
+        fun_get_cert_handle = self.functions.EricMtGetHandleToCertificate
 
         cert_handle_out = c_int()
         res = fun_get_cert_handle(self.eric_instance, pointer(cert_handle_out), None, EricWrapper.cert_path)
@@ -202,27 +400,54 @@ class EricWrapper(object):
         return cert_handle_out
 
     def close_cert_handle(self, cert_handle):
-        fun_close_cert_handle = self.eric.EricMtCloseHandleToCertificate
-        fun_close_cert_handle.argtypes = [c_void_p, c_int]
-        fun_close_cert_handle.restype = c_int
+        fun_close_cert_handle = self.functions.EricMtCloseHandleToCertificate
 
         res = fun_close_cert_handle(self.eric_instance, cert_handle)
         check_result(res)
         logger.debug(f"fun_close_cert_handle res: {res}")
 
-    def get_cert_properties(self):
-        fun_get_cert_properties = self.eric.EricMtHoleZertifikatEigenschaften
-        fun_get_cert_properties.argtypes = [c_void_p, c_int, c_char_p, c_void_p]
-        fun_get_cert_properties.restype = c_int
+    @contextmanager
+    def cached_cert_handle(self):
+        """Yields the certificate handle of this instance. Opening a handle is a slow round trip to the token,
+        so the handle stays open for `cert_handle_ttl_in_sec` and is reused by subsequent calls. A crypt error
+        drops the handle, so that the next call opens a fresh one. A TTL of 0 closes the handle after every call.
+        """
+        ttl = get_settings().cert_handle_ttl_in_sec
+        if self._cert_handle is not None and time.monotonic() - self._cert_handle_opened_at >= ttl:
+            self.release_cert_handle()
+        if self._cert_handle is None:
+            self._cert_handle = self.get_cert_handle()
+            self._cert_handle_opened_at = time.monotonic()
 
         try:
-            cert_handle = self.get_cert_handle()
+            yield self._cert_handle
+        except EricCryptError:
+            logger.warning("Dropping cached certificate handle after crypt error")
+            self.release_cert_handle()
+            raise
+        finally:
+            if ttl <= 0:
+                self.release_cert_handle()
+
+    def release_cert_handle(self):
+        """Closes the cached certificate handle, if there is one."""
+        cert_handle = self._cert_handle
+        if cert_handle is None:
+            return
+        self._cert_handle = None
+        self._cert_handle_opened_at = None
+        try:
+            self.close_cert_handle(cert_handle)
+        except EricProcessNotSuccessful as e:
+            logger.warning(f"Closing cached certificate handle failed: {e}")
 
+    @token_bound
+    def get_cert_properties(self):
+        fun_get_cert_properties = self.functions.EricMtHoleZertifikatEigenschaften
+
+        with self.cached_cert_handle() as cert_handle:
             return self._call_and_return_buffer_contents_and_decode(fun_get_cert_properties, cert_handle,
                                                          EricWrapper.cert_pin.encode())
-        finally:
-            if cert_handle:
-                self.close_cert_handle(cert_handle)
 
     def process(self,
                 xml, data_type_version, flags,
@@ -235,11 +460,7 @@ class EricWrapper(object):
             eric_response_buffer = self.create_buffer()
             server_response_buffer = self.create_buffer()
 
-            fun_process = self.eric.EricMtBearbeiteVorgang
-            fun_process.argtypes = [c_void_p, c_char_p, c_char_p, c_uint32,
-                                    c_void_p, c_void_p, c_void_p,
-                                    c_void_p, c_void_p]
-            fun_process.restype = c_int
+            fun_process = self.functions.EricMtBearbeiteVorgang
 
             res = fun_process(self.eric_instance, xml, data_type_version, flags,
                               print_params, cert_params, transfer_handle,
@@ -272,9 +493,7 @@ class EricWrapper(object):
             self.close_buffer(server_response_buffer)
 
     def create_buffer(self):
-        fun_create_buffer = self.eric.EricMtRueckgabepufferErzeugen
-        fun_create_buffer.argtypes = [c_void_p]
-        fun_create_buffer.restype = c_void_p
+        fun_create_buffer = self.functions.EricMtRueckgabepufferErzeugen
 
         handle = fun_create_buffer(self.eric_instance)
         check_handle(handle)
@@ -282,16 +501,12 @@ class EricWrapper(object):
         return handle
 
     def read_buffer(self, buffer):
-        fun_read_buffer = self.eric.EricMtRueckgabepufferInhalt
-        fun_read_buffer.argtypes = [c_void_p, c_void_p]
-        fun_read_buffer.restype = c_char_p
+        fun_read_buffer = self.functions.EricMtRueckgabepufferInhalt
 
         return fun_read_buffer(self.eric_instance, buffer)
 
     def close_buffer(self, buffer):
-        fun_close_buffer = self.eric.EricMtRueckgabepufferFreigeben
-        fun_close_buffer.argtypes = [c_void_p, c_void_p]
-        fun_close_buffer.restype = int
+        fun_close_buffer = self.functions.EricMtRueckgabepufferFreigeben
 
         res = fun_close_buffer(self.eric_instance, buffer)
         check_result(res)
@@ -302,33 +517,25 @@ class EricWrapper(object):
                   testmerker='700000004', hersteller_id=get_settings().hersteller_id,
                   daten_lieferant='Softwaretester ERiC',
                   version_client='1'):
-        fun_create_th = self.eric.EricMtCreateTH
-        fun_create_th.argtypes = [c_void_p, c_char_p, c_char_p, c_char_p, c_char_p,
-                                  c_char_p, c_char_p, c_char_p, c_char_p,
-                                  c_char_p, c_void_p]
-        fun_create_th.restype = int
+        fun_create_th = self.functions.EricMtCreateTH
 
         return self._call_and_return_buffer_contents(
             fun_create_th, xml.encode(), verfahren.encode(), datenart.encode(),
             vorgang.encode(), testmerker.encode(), hersteller_id.encode(), daten_lieferant.encode(),
             version_client.encode(), None)
 
+    @token_bound
     def process_verfahren(self, xml_string, verfahren, abruf_code=None, transfer_handle=None) \
             -> EricResponse:
         """ Send the xml_string to Elster with given verfahren and certificate parameters. """
-        cert_handle = self.get_cert_handle()
-        cert_params = self.alloc_eric_verschluesselungs_parameter_t(cert_handle, abruf_code=abruf_code)
+        with self.cached_cert_handle() as cert_handle:
+            cert_params = self.alloc_eric_verschluesselungs_parameter_t(cert_handle, abruf_code=abruf_code)
 
-        try:
             return self.process(xml_string, verfahren, EricWrapper.ERIC_SENDE | EricWrapper.ERIC_VALIDIERE,
                                 transfer_handle=transfer_handle, cert_params=pointer(cert_params))
-        finally:
-            self.close_cert_handle(cert_handle)
 
     def check_tax_number(self, tax_number):
-        fun_check_tax_number = self.eric.EricMtPruefeSteuernummer
-        fun_check_tax_number.argtypes = [c_void_p, c_char_p]
-        fun_check_tax_number.restype = c_int
+        fun_check_tax_number = self.functions.EricMtPruefeSteuernummer
 
         try:
             res = fun_check_tax_number(self.eric_instance, tax_number.encode())
@@ -337,22 +544,16 @@ class EricWrapper(object):
         except EricWrongTaxNumberError:
             return False
 
+    @token_bound
     def decrypt_data(self, data):
-        fun_decrypt_data = self.eric.EricMtDekodiereDaten
-        fun_decrypt_data.argtypes = [c_void_p, c_int, c_char_p, c_char_p, c_void_p]
-        fun_decrypt_data.restype = int
-
-        try:
-            cert_handle = self.get_cert_handle()
+        fun_decrypt_data = self.functions.EricMtDekodiereDaten
 
+        with self.cached_cert_handle() as cert_handle:
             return self._call_and_return_buffer_contents_and_decode(
                 fun_decrypt_data,
                 cert_handle,
                 EricWrapper.cert_pin.encode(),
                 data.encode())
-        finally:
-            if cert_handle:
-                self.close_cert_handle(cert_handle)
 
     def get_tax_offices(self, state_id):
         """
@@ -361,9 +562,7 @@ class EricWrapper(object):
         :param state_id: A valid state id for which the tax office list is provided
         """
 
-        fun_get_tax_offices = self.eric.EricMtHoleFinanzaemter
-        fun_get_tax_offices.argtypes = [c_void_p, c_char_p, c_void_p]
-        fun_get_tax_offices.restype = int
+        fun_get_tax_offices = self.functions.EricMtHoleFinanzaemter
 
         return self._call_and_return_buffer_contents_and_decode(
             fun_get_tax_offices,
@@ -374,18 +573,14 @@ class EricWrapper(object):
         Get a list of all the state codes
         """
 
-        fun_get_tax_offices = self.eric.EricMtHoleFinanzamtLandNummern
-        fun_get_tax_offices.argtypes = [c_void_p, c_void_p]
-        fun_get_tax_offices.restype = int
+        fun_get_tax_offices = self.functions.EricMtHoleFinanzamtLandNummern
 
         return self._call_and_return_buffer_contents_and_decode(
             fun_get_tax_offices)
 
     def get_electronic_aktenzeichen(self, aktenzeichen, bundesland):
         """ Make the elster format out of the given aktenzeichen """
-        fun_make_elster_ewaz = self.eric.EricMtMakeElsterEWAz
-        fun_make_elster_ewaz.argtypes = [c_void_p, c_char_p, c_char_p, c_void_p]
-        fun_make_elster_ewaz.restype = int
+        fun_make_elster_ewaz = self.functions.EricMtMakeElsterEWAz
 
         return self._call_and_return_buffer_contents_no_xml(
             fun_make_elster_ewaz,
@@ -435,9 +630,7 @@ class EricWrapper(object):
 
     def get_error_message_from_xml_response(self, xml_response):
         """Extract error message from server response"""
-        fun_get_error_message = self.eric.EricMtGetErrormessagesFromXMLAnswer
-        fun_get_error_message.argtypes = [c_void_p, c_void_p, c_void_p, c_void_p, c_void_p, c_void_p]
-        fun_get_error_message.restypes = int
+        fun_get_error_message = self.functions.EricMtGetErrormessagesFromXMLAnswer
 
         transferticket_buffer = self.create_buffer()
         th_res_code_buffer = self.create_buffer()
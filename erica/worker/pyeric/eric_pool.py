@@ -0,0 +1,204 @@
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from threading import Condition
+from typing import Callable, Generic, TypeVar
+
+from prometheus_client import Gauge, Histogram
+
+logger = logging.getLogger('eric')
+
+InstanceT = TypeVar('InstanceT')
+
+ERIC_POOL_SIZE = Gauge('erica_eric_pool_instances', 'Number of initialised ERiC instances in the pool', ['state'])
+ERIC_POOL_WAIT_TIME = Histogram('erica_eric_pool_wait_seconds',
+                                'Time spent waiting for an initialised ERiC instance from the pool')
+
+
+class EricWrapperPoolTimeoutError(Exception):
+    """Raised in case no ERiC instance became available within the checkout timeout"""
+    pass
+
+
+class EricWrapperPoolClosedError(Exception):
+    """Raised in case an ERiC instance is requested from a pool that has already been closed"""
+    pass
+
+
+class _PoolEntry(Generic[InstanceT]):
+
+    def __init__(self, instance: InstanceT):
+        self.instance = instance
+        self.uses = 0
+        self.broken = False
+
+
+class EricWrapperPool(Generic[InstanceT]):
+    """
+    A bounded, thread-safe pool of initialised ERiC instances.
+
+    Creating an ERiC instance loads and initialises the native library, which is far more expensive than any single
+    call into it. The pool therefore keeps instances alive between calls and hands each one out to at most one thread
+    at a time. Instances are recycled after `max_uses` checkouts, when they fail the health check or when a call
+    raised an error that `should_recycle` considers fatal for the instance.
+
+    :param create_instance: returns a new, initialised instance
+    :param destroy_instance: shuts down the given instance and releases its resources
+    :param max_size: upper bound of instances in the pool (idle and checked out)
+    :param max_uses: number of checkouts after which an instance is replaced by a fresh one
+    :param checkout_timeout: seconds to wait for an instance before giving up
+    :param health_check: returns False if an idle instance must not be handed out anymore
+    :param should_recycle: returns True if the given exception leaves the instance in an unusable state
+    """
+
+    def __init__(self,
+                 create_instance: Callable[[], InstanceT],
+                 destroy_instance: Callable[[InstanceT], None],
+                 max_size: int,
+                 max_uses: int,
+                 checkout_timeout: float,
+                 health_check: Callable[[InstanceT], bool] = lambda instance: True,
+                 should_recycle: Callable[[Exception], bool] = lambda exception: False):
+        if max_size < 1:
+            raise ValueError("The ERiC pool needs to hold at least one instance")
+        self._create_instance = create_instance
+        self._destroy_instance = destroy_instance
+        self._max_size = max_size
+        self._max_uses = max_uses
+        self._checkout_timeout = checkout_timeout
+        self._health_check = health_check
+        self._should_recycle = should_recycle
+
+        self._condition = Condition()
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+
+    @contextmanager
+    def checkout(self):
+        """Context manager that lends an initialised instance to the caller and hands it back afterwards."""
+        entry = self._acquire()
+        try:
+            yield entry.instance
+        except Exception as e:
+            if self._should_recycle(e):
+                logger.warning(f"Recycling ERiC instance after error: {e}")
+                entry.broken = True
+            raise
+        finally:
+            self._release(entry)
+
+    def add_idle_instance(self):
+        """
+        Creates one additional idle instance if the pool has not reached its maximum size yet.
+        Use this to initialise instances up front instead of during the first request.
+
+        :return: True if an instance was added
+        """
+        with self._condition:
+            if self._closed or self._size >= self._max_size:
+                return False
+            self._size += 1
+        try:
+            entry = self._create_entry()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._idle.append(entry)
+            self._condition.notify()
+        self._update_size_metrics()
+        return True
+
+    def close(self):
+        """Shuts down all idle instances. Instances that are checked out are shut down when they are handed back."""
+        with self._condition:
+            self._closed = True
+            entries = list(self._idle)
+            self._idle.clear()
+            self._size -= len(entries)
+            self._condition.notify_all()
+        for entry in entries:
+            self._destroy_entry(entry)
+        self._update_size_metrics()
+
+    def stats(self):
+        with self._condition:
+            return {'size': self._size, 'idle': len(self._idle), 'in_use': self._size - len(self._idle),
+                    'max_size': self._max_size}
+
+    def _acquire(self) -> _PoolEntry:
+        start_time = time.monotonic()
+        deadline = start_time + self._checkout_timeout
+        unhealthy_entries = []
+        entry = None
+        try:
+            with self._condition:
+                while entry is None:
+                    if self._closed:
+                        raise EricWrapperPoolClosedError()
+                    while self._idle:
+                        candidate = self._idle.pop()
+                        if self._health_check(candidate.instance):
+                            entry = candidate
+                            break
+                        self._size -= 1
+                        unhealthy_entries.append(candidate)
+                    if entry is not None:
+                        break
+                    if self._size < self._max_size:
+                        # Reserve the slot now, but create the instance outside the lock
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise EricWrapperPoolTimeoutError(
+                            f"No ERiC instance available after {self._checkout_timeout} seconds")
+                    self._condition.wait(remaining)
+        finally:
+            for unhealthy_entry in unhealthy_entries:
+                logger.warning("Discarding ERiC instance that failed the health check")
+                self._destroy_entry(unhealthy_entry)
+
+        if entry is None:
+            try:
+                entry = self._create_entry()
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+
+        ERIC_POOL_WAIT_TIME.observe(time.monotonic() - start_time)
+        self._update_size_metrics()
+        return entry
+
+    def _release(self, entry: _PoolEntry):
+        entry.uses += 1
+        with self._condition:
+            retire = entry.broken or self._closed or entry.uses >= self._max_uses
+            if retire:
+                self._size -= 1
+            else:
+                self._idle.append(entry)
+            self._condition.notify()
+        if retire:
+            self._destroy_entry(entry)
+        self._update_size_metrics()
+
+    def _create_entry(self) -> _PoolEntry:
+        return _PoolEntry(self._create_instance())
+
+    def _destroy_entry(self, entry: _PoolEntry):
+        try:
+            self._destroy_instance(entry.instance)
+        except Exception as e:
+            logger.warning(f"Shutting down pooled ERiC instance failed: {e}", exc_info=True)
+
+    def _update_size_metrics(self):
+        stats = self.stats()
+        ERIC_POOL_SIZE.labels(state='idle').set(stats['idle'])
+        ERIC_POOL_SIZE.labels(state='in_use').set(stats['in_use'])
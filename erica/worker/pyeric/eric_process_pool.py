@@ -0,0 +1,200 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from ctypes import c_int, pointer
+from functools import lru_cache
+from multiprocessing.util import Finalize
+from threading import Lock
+from typing import Callable, Optional
+
+from erica.config import get_settings
+from erica.worker.pyeric.eric import EricResponse, _create_pooled_eric_wrapper, _destroy_pooled_eric_wrapper
+from erica.worker.pyeric.eric_pool import EricWrapperPoolClosedError
+from erica.worker.pyeric.token_scheduler import token_bound
+
+logger = logging.getLogger('eric')
+
+# These calls use the certificate. There is only one hardware token, so they are serialised in a dedicated process,
+# which also keeps the cached certificate handle open between calls.
+TOKEN_BOUND_METHODS = frozenset({'validate_and_send', 'process_verfahren', 'decrypt_data', 'get_cert_properties'})
+
+# The ERiC instance owned by the current worker process
+_process_eric_wrapper = None
+
+
+def _init_worker_process():
+    global _process_eric_wrapper
+    _process_eric_wrapper = _create_pooled_eric_wrapper()
+    Finalize(None, _shutdown_worker_process, exitpriority=10)
+
+
+def _shutdown_worker_process():
+    global _process_eric_wrapper
+    eric_wrapper = _process_eric_wrapper
+    _process_eric_wrapper = None
+    if eric_wrapper is not None:
+        _destroy_pooled_eric_wrapper(eric_wrapper)
+
+
+def _call_in_worker_process(method_name, args, kwargs):
+    return getattr(_process_eric_wrapper, method_name)(*args, **kwargs)
+
+
+def _process_verfahren_in_worker_process(xml_string, verfahren, abruf_code, transfer_handle_value):
+    # ctypes pointers cannot cross the process boundary, so only the value of the transfer handle is exchanged
+    transfer_handle = pointer(c_int(transfer_handle_value)) if transfer_handle_value is not None else None
+    response = _process_eric_wrapper.process_verfahren(xml_string, verfahren, abruf_code=abruf_code,
+                                                       transfer_handle=transfer_handle)
+    return response, transfer_handle.contents.value if transfer_handle is not None else None
+
+
+def _warm_up_worker_process():
+    return _process_eric_wrapper is not None
+
+
+class EricProcessPool(object):
+    """
+    Runs ERiC calls in pre-warmed worker processes, each of which owns one initialised ERiC instance. Calls that do
+    not need the certificate are spread over `number_of_processes` processes and therefore are not limited by the GIL
+    or by a single loaded library. Certificate-bound calls all go to one separate process, so they stay serialised.
+
+    Arguments and results (XML strings, EricResponse with PDF bytes, ERiC errors) are pickled across the process
+    boundary.
+
+    :param number_of_processes: number of processes for calls that do not need the certificate
+    :param max_tasks_per_process: number of calls after which a worker process is replaced by a fresh one
+    :param initializer: runs once in every new worker process and creates its ERiC instance
+    :param start_method: multiprocessing start method of the worker processes
+    """
+
+    def __init__(self,
+                 number_of_processes: int,
+                 max_tasks_per_process: Optional[int] = None,
+                 initializer: Callable[[], None] = _init_worker_process,
+                 start_method: str = 'spawn'):
+        if number_of_processes < 1:
+            raise ValueError("The ERiC process pool needs at least one process")
+        self._number_of_processes = number_of_processes
+        self._max_tasks_per_process = max_tasks_per_process
+        self._initializer = initializer
+        self._mp_context = multiprocessing.get_context(start_method)
+        self._lock = Lock()
+        self._executors = {}
+        self._closed = False
+
+    def run(self, uses_token: bool, function, *args):
+        """Runs the function in a worker process and returns its result or raises its exception."""
+        executor = self._get_executor(uses_token)
+        try:
+            return executor.submit(function, *args).result()
+        except BrokenProcessPool:
+            logger.warning("ERiC worker process terminated abruptly, restarting the worker processes")
+            self._discard_executor(uses_token, executor)
+            raise
+
+    def warm_up(self):
+        """Starts the worker processes and initialises their ERiC instances before the first call needs them."""
+        for uses_token, number_of_processes in ((True, 1), (False, self._number_of_processes)):
+            executor = self._get_executor(uses_token)
+            futures = [executor.submit(_warm_up_worker_process) for _ in range(number_of_processes)]
+            for future in futures:
+                future.result()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=True)
+
+    def _get_executor(self, uses_token: bool) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._closed:
+                raise EricWrapperPoolClosedError()
+            executor = self._executors.get(uses_token)
+            if executor is None:
+                executor = ProcessPoolExecutor(max_workers=1 if uses_token else self._number_of_processes,
+                                               mp_context=self._mp_context,
+                                               initializer=self._initializer,
+                                               max_tasks_per_child=self._max_tasks_per_process)
+                self._executors[uses_token] = executor
+            return executor
+
+    def _discard_executor(self, uses_token: bool, executor: ProcessPoolExecutor):
+        with self._lock:
+            if self._executors.get(uses_token) is executor:
+                del self._executors[uses_token]
+        executor.shutdown(wait=False)
+
+
+class EricProcessPoolWrapper(object):
+    """Offers the API of the EricWrapper, but runs every call in a worker process of the given EricProcessPool."""
+
+    def __init__(self, process_pool: EricProcessPool):
+        self.process_pool = process_pool
+
+    def validate(self, xml, data_type_version) -> EricResponse:
+        return self._call('validate', xml, data_type_version)
+
+    def validate_and_send(self, xml, data_type_version) -> EricResponse:
+        return self._call('validate_and_send', xml, data_type_version)
+
+    @token_bound
+    def process_verfahren(self, xml_string, verfahren, abruf_code=None, transfer_handle=None) -> EricResponse:
+        transfer_handle_value = transfer_handle.contents.value if transfer_handle is not None else None
+        response, new_transfer_handle_value = self.process_pool.run(
+            True, _process_verfahren_in_worker_process, xml_string, verfahren, abruf_code, transfer_handle_value)
+        if transfer_handle is not None:
+            transfer_handle.contents.value = new_transfer_handle_value
+        return response
+
+    def create_th(self, xml, **kwargs):
+        return self._call('create_th', xml, **kwargs)
+
+    def check_tax_number(self, tax_number):
+        return self._call('check_tax_number', tax_number)
+
+    def decrypt_data(self, data):
+        return self._call('decrypt_data', data)
+
+    def get_cert_properties(self):
+        return self._call('get_cert_properties')
+
+    def get_tax_offices(self, state_id):
+        return self._call('get_tax_offices', state_id)
+
+    def get_state_id_list(self):
+        return self._call('get_state_id_list')
+
+    def get_electronic_aktenzeichen(self, aktenzeichen, bundesland):
+        return self._call('get_electronic_aktenzeichen', aktenzeichen, bundesland)
+
+    def get_error_message_from_xml_response(self, xml_response):
+        return self._call('get_error_message_from_xml_response', xml_response)
+
+    def get_version(self):
+        return self._call('get_version')
+
+    def _call(self, method_name, *args, **kwargs):
+        if method_name in TOKEN_BOUND_METHODS:
+            return self._call_token_bound(method_name, *args, **kwargs)
+        return self.process_pool.run(False, _call_in_worker_process, method_name, args, kwargs)
+
+    @token_bound
+    def _call_token_bound(self, method_name, *args, **kwargs):
+        # Waiting for the token happens here, where the request type and creator of the job are known
+        return self.process_pool.run(True, _call_in_worker_process, method_name, args, kwargs)
+
+
+@lru_cache()
+def get_eric_process_pool() -> EricProcessPool:
+    """Returns the process-wide pool of ERiC worker processes used if `eric_execution_mode` is 'process'."""
+    settings = get_settings()
+    return EricProcessPool(number_of_processes=settings.eric_process_pool_size,
+                           max_tasks_per_process=settings.eric_pool_max_uses)
+
+
+def get_eric_process_pool_wrapper() -> EricProcessPoolWrapper:
+    return EricProcessPoolWrapper(get_eric_process_pool())
@@ -0,0 +1,50 @@
+import os
+import tempfile
+
+_SHARED_MEMORY_DIR = '/dev/shm'
+
+
+class InMemoryPdfFile(object):
+    """
+    A file that ERiC can print a PDF into by path, but that is kept in memory instead of on disk. On Linux it is an
+    anonymous memfd, addressed via /proc/self/fd. Where memfds are not available, it falls back to a temporary file in
+    /dev/shm and, as a last resort, to a regular temporary file.
+
+    `read` returns the content in one buffer that is allocated with the final size up front, so the PDF is copied
+    exactly once from the kernel into Python.
+    """
+
+    def __init__(self):
+        self._file = None
+        self.name = None
+
+    def __enter__(self):
+        if hasattr(os, 'memfd_create') and os.path.isdir('/proc/self/fd'):
+            fd = os.memfd_create('eric_pdf', os.MFD_CLOEXEC)
+            self._file = open(fd, 'w+b', buffering=0)
+            self.name = f'/proc/self/fd/{fd}'
+        else:
+            directory = _SHARED_MEMORY_DIR if os.path.isdir(_SHARED_MEMORY_DIR) else None
+            self._file = tempfile.NamedTemporaryFile(dir=directory, buffering=0)
+            self.name = self._file.name
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._file.close()
+
+    def read(self) -> bytearray:
+        # ERiC writes through its own file descriptor, so neither size nor position of our file object are up to date
+        size = os.fstat(self._file.fileno()).st_size
+        content = bytearray(size)
+        view = memoryview(content)
+        self._file.seek(0)
+        read = 0
+        while read < size:
+            number_of_bytes = self._file.readinto(view[read:])
+            if not number_of_bytes:
+                break
+            read += number_of_bytes
+        view.release()
+        if read < size:
+            del content[read:]
+        return content
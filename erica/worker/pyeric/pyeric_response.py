@@ -1,9 +1,17 @@
 from dataclasses import dataclass
+from functools import cached_property
 from typing import ByteString
 
+from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import ParsedEricResponse
+
 
 @dataclass
 class PyericResponse:
     eric_response: str
     server_response: str
     pdf: ByteString = None
+
+    @cached_property
+    def parsed_server_response(self) -> ParsedEricResponse:
+        """The server response, parsed once for all values that are extracted from it."""
+        return ParsedEricResponse(self.server_response)
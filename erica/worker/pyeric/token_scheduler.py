@@ -0,0 +1,187 @@
+import itertools
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from threading import Condition, get_ident
+from typing import Optional, Tuple
+
+from prometheus_client import Histogram, Gauge
+
+from erica.config import get_settings
+from erica.domain.model.erica_request import RequestType
+
+logger = logging.getLogger('eric')
+
+TOKEN_WAIT_TIME = Histogram('erica_token_wait_seconds', 'Time spent waiting for the signature token',
+                            ['request_type'])
+TOKEN_QUEUE_DEPTH = Gauge('erica_token_queue_depth', 'Number of operations waiting for the signature token')
+
+# Lower values are served first. Unlock code requests are short and a user is waiting for them, whereas tax
+# declarations are large sends.
+REQUEST_TYPE_PRIORITIES = {
+    RequestType.freischalt_code_request: 0,
+    RequestType.freischalt_code_activate: 0,
+    RequestType.freischalt_code_revocate: 0,
+    RequestType.check_tax_number: 0,
+    RequestType.send_ustva: 1,
+    RequestType.send_est: 1,
+    RequestType.grundsteuer: 1,
+}
+DEFAULT_PRIORITY = 1
+
+# The request type and creator of the job that is executed in the current context
+_current_token_request: ContextVar[Tuple[Optional[RequestType], Optional[str]]] = \
+    ContextVar('token_request', default=(None, None))
+
+
+class TokenQueueFullError(Exception):
+    """Raised in case too many operations are already waiting for the signature token"""
+    pass
+
+
+class TokenWaitTimeoutError(Exception):
+    """Raised in case the signature token did not become available within the wait timeout"""
+    pass
+
+
+class _Waiter(object):
+
+    def __init__(self, priority, creator_id, sequence_number):
+        self.priority = priority
+        self.creator_id = creator_id
+        self.sequence_number = sequence_number
+
+
+class TokenScheduler(object):
+    """
+    Grants exclusive access to the signature token. Operations that wait for the token are served by the priority of
+    their request type first. Among equal priorities the creator that got the token the fewest times while others
+    were waiting goes first, so one client cannot starve the others with many requests. Remaining ties are served in
+    arrival order.
+
+    The token is reentrant for the thread that holds it.
+
+    :param max_queue_depth: number of waiting operations from which on new operations are rejected
+    :param wait_timeout: seconds an operation waits for the token before giving up
+    """
+
+    def __init__(self, max_queue_depth: int, wait_timeout: float):
+        self._max_queue_depth = max_queue_depth
+        self._wait_timeout = wait_timeout
+        self._condition = Condition()
+        self._waiters = []
+        self._served = Counter()
+        self._sequence = itertools.count()
+        self._owner = None
+        self._depth = 0
+
+    @contextmanager
+    def acquire(self, request_type: Optional[RequestType] = None, creator_id: Optional[str] = None):
+        """Context manager that holds the signature token for the caller."""
+        self._acquire(request_type, creator_id)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def queue_depth(self):
+        with self._condition:
+            return len(self._waiters)
+
+    def _acquire(self, request_type, creator_id):
+        with self._condition:
+            if self._owner == get_ident():
+                self._depth += 1
+                return
+            if self._owner is None and not self._waiters:
+                self._grant(creator_id)
+                TOKEN_WAIT_TIME.labels(request_type=_label(request_type)).observe(0)
+                return
+            if len(self._waiters) >= self._max_queue_depth:
+                raise TokenQueueFullError(f"{len(self._waiters)} operations are already waiting for the token")
+
+            waiter = _Waiter(REQUEST_TYPE_PRIORITIES.get(request_type, DEFAULT_PRIORITY), creator_id,
+                             next(self._sequence))
+            self._waiters.append(waiter)
+            TOKEN_QUEUE_DEPTH.set(len(self._waiters))
+            start_time = time.monotonic()
+            deadline = start_time + self._wait_timeout
+            try:
+                while self._owner is not None or self._next_waiter() is not waiter:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TokenWaitTimeoutError(f"Token not available after {self._wait_timeout} seconds")
+                    self._condition.wait(remaining)
+            finally:
+                self._waiters.remove(waiter)
+                TOKEN_QUEUE_DEPTH.set(len(self._waiters))
+                # Another waiter might be next now
+                self._condition.notify_all()
+            self._grant(creator_id)
+            TOKEN_WAIT_TIME.labels(request_type=_label(request_type)).observe(time.monotonic() - start_time)
+
+    def _release(self):
+        with self._condition:
+            self._depth -= 1
+            if self._depth > 0:
+                return
+            self._owner = None
+            if not self._waiters:
+                # Shares only matter among operations that compete for the token
+                self._served.clear()
+            self._condition.notify_all()
+
+    def _grant(self, creator_id):
+        self._owner = get_ident()
+        self._depth = 1
+        self._served[creator_id] += 1
+
+    def _next_waiter(self):
+        return min(self._waiters,
+                   key=lambda waiter: (waiter.priority, self._served[waiter.creator_id], waiter.sequence_number))
+
+
+def _label(request_type):
+    return request_type.name if isinstance(request_type, RequestType) else 'unknown'
+
+
+@lru_cache()
+def get_token_scheduler() -> TokenScheduler:
+    """Returns the process-wide scheduler of the signature token."""
+    settings = get_settings()
+    return TokenScheduler(max_queue_depth=settings.token_queue_max_depth,
+                          wait_timeout=settings.token_wait_timeout_in_sec)
+
+
+@contextmanager
+def token_request_context(request_type: RequestType, creator_id: str):
+    """Marks all token-bound operations in this context as belonging to a job of the given type and creator."""
+    token = _current_token_request.set((request_type, creator_id))
+    try:
+        yield
+    finally:
+        _current_token_request.reset(token)
+
+
+@contextmanager
+def token_access():
+    """Holds the signature token for the job of the current context. If no stick is used, there is no token to
+    schedule and the operation runs right away."""
+    if not get_settings().using_stick:
+        yield
+        return
+    request_type, creator_id = _current_token_request.get()
+    with get_token_scheduler().acquire(request_type, creator_id):
+        yield
+
+
+def token_bound(method):
+    """Decorator for operations that use the certificate on the signature token."""
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with token_access():
+            return method(*args, **kwargs)
+    return wrapper
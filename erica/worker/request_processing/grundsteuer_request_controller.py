@@ -1,5 +1,3 @@
-import base64
-
 from erica.config import get_settings
 from erica.worker.pyeric.check_elster_request_id import tax_id_number_is_test_id_number
 from erica.worker.pyeric.pyeric_controller import GrundsteuerPyericProcessController
@@ -8,7 +6,8 @@ from erica.worker.elster_xml.common.transfer_header import add_transfer_header
 from erica.worker.elster_xml.common.xml_conversion import convert_object_to_xml
 from erica.worker.elster_xml.grundsteuer.elster_data_representation import get_full_grundsteuer_data_representation
 from erica.worker.elster_xml.transfer_header_fields import get_grundsteuer_th_fields
-from erica.worker.request_processing.requests_controller import TransferticketRequestController
+from erica.worker.request_processing.requests_controller import TransferticketRequestController, \
+    add_pdf_to_response
 
 
 class GrundsteuerRequestController(TransferticketRequestController):
@@ -29,5 +28,5 @@ class GrundsteuerRequestController(TransferticketRequestController):
 
     def generate_json(self, pyeric_response: PyericResponse):
         response = super().generate_json(pyeric_response)
-        response['pdf'] = base64.b64encode(pyeric_response.pdf).decode('utf-8')
+        add_pdf_to_response(response, pyeric_response)
         return response
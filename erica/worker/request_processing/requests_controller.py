@@ -1,11 +1,16 @@
 import base64
+from uuid import uuid4
 
 from erica.config import get_settings
+from erica.domain.blob_store.blob_store_factory import get_blob_store
+from erica.domain.result_cache.tax_number_validity_cache import get_tax_number_validity_cache
 from erica.worker.elster_xml.common.electronic_steuernummer import generate_electronic_steuernummer
+from erica.worker.elster_xml.common.tax_number_precheck import tax_number_is_certainly_invalid
 from erica.worker.elster_xml.elster_xml_generator import get_belege_xml, generate_vorsatz_without_tax_number, \
     generate_vorsatz_with_tax_number
 from erica.worker.elster_xml.xml_parsing.elster_specifics_xml_parsing import get_antrag_id_from_xml, \
     get_transferticket_from_xml, get_address_from_xml, get_relevant_beleg_ids
+from erica.worker.pyeric.eric import get_eric_version
 from erica.worker.pyeric.eric_errors import InvalidBufaNumberError
 from erica.worker.pyeric.pyeric_response import PyericResponse
 from erica.worker.elster_xml import est_mapping, elster_xml_generator
@@ -25,6 +30,27 @@ from erica.worker.request_processing.eric_mapper import EstEricMapping, UnlockCo
 from erica.worker.request_processing.erica_input.v1.erica_input import UnlockCodeRequestData, EstData
 
 
+def encode_pdf(pyeric_response: PyericResponse) -> str:
+    """Base64-encodes the PDF of the response for the JSON result. The raw PDF is released from the response before
+    the encoded string is built, so a job never holds the PDF in three representations at once."""
+    encoded_pdf = base64.b64encode(pyeric_response.pdf)
+    pyeric_response.pdf = None
+    return encoded_pdf.decode('ascii')
+
+
+def add_pdf_to_response(response: dict, pyeric_response: PyericResponse):
+    """Adds the PDF of the response to the JSON result. If a blob store is configured, the PDF is stored there and
+    only its key is added, so the result row stays small. Otherwise the PDF is added base64-encoded."""
+    blob_store = get_blob_store()
+    if blob_store is None:
+        response['pdf'] = encode_pdf(pyeric_response)
+        return
+    pdf_key = f"pdf/{uuid4()}.pdf"
+    blob_store.put(pdf_key, pyeric_response.pdf, content_type='application/pdf')
+    pyeric_response.pdf = None
+    response['pdf_key'] = pdf_key
+
+
 class EricaRequestController(object):
     """
     Generic class to handle any request to the eric api. That is processing the input data,
@@ -68,7 +94,7 @@ class TransferticketRequestController(EricaRequestController):
     def generate_json(self, pyeric_response: PyericResponse):
         response = super().generate_json(pyeric_response)
         if pyeric_response.server_response:
-            response['transferticket'] = get_transferticket_from_xml(pyeric_response.server_response)
+            response['transferticket'] = get_transferticket_from_xml(pyeric_response.parsed_server_response)
         return response
 
 
@@ -123,7 +149,7 @@ class EstRequestController(EstValidationRequestController):
 
     def generate_json(self, pyeric_response: PyericResponse):
         response = super().generate_json(pyeric_response)
-        response['pdf'] = (base64.b64encode(pyeric_response.pdf)).decode('utf-8')
+        add_pdf_to_response(response, pyeric_response)
         return response
 
 
@@ -146,7 +172,7 @@ class UnlockCodeRequestController(TransferticketRequestController):
     def generate_json(self, pyeric_response: PyericResponse):
         response = super().generate_json(pyeric_response)
 
-        response["elster_request_id"] = get_antrag_id_from_xml(pyeric_response.server_response)
+        response["elster_request_id"] = get_antrag_id_from_xml(pyeric_response.parsed_server_response)
         response["idnr"] = self.input_data.tax_id_number
 
         return response
@@ -167,7 +193,7 @@ class UnlockCodeActivationRequestController(TransferticketRequestController):
 
     def generate_json(self, pyeric_response: PyericResponse):
         response = super().generate_json(pyeric_response)
-        response["elster_request_id"] = get_antrag_id_from_xml(pyeric_response.server_response)
+        response["elster_request_id"] = get_antrag_id_from_xml(pyeric_response.parsed_server_response)
         response["idnr"] = self.input_data.tax_id_number
         return response
 
@@ -187,7 +213,7 @@ class UnlockCodeRevocationRequestController(TransferticketRequestController):
 
     def generate_json(self, pyeric_response: PyericResponse):
         response = super().generate_json(pyeric_response)
-        response["elster_request_id"] = get_antrag_id_from_xml(pyeric_response.server_response)
+        response["elster_request_id"] = get_antrag_id_from_xml(pyeric_response.parsed_server_response)
         return response
 
 
@@ -195,14 +221,49 @@ class CheckTaxNumberRequestController(EricaRequestController):
     """This handles any request that wants to check if a tax number is valid"""
 
     def process(self):
+        if CheckTaxNumberRequestController._is_certainly_invalid(self.input_data):
+            return CheckTaxNumberRequestController.generate_json(False)
         try:
             full_tax_number = CheckTaxNumberRequestController._generate_tax_number(
                 self.input_data.state_abbreviation.upper(), self.input_data.tax_number)
         except InvalidBufaNumberError:
             return CheckTaxNumberRequestController.generate_json(False)
-        result = CheckTaxNumberPyericController.get_eric_response(full_tax_number)
+        result = CheckTaxNumberRequestController._check_with_eric(full_tax_number)
         return CheckTaxNumberRequestController.generate_json(result)
 
+    @staticmethod
+    def get_result_without_eric(input_data):
+        """Returns the result if it is known without asking ERiC, else None. This is the case if the tax number is
+        certainly invalid or if the worker already checked it with the ERiC version it published last."""
+        if CheckTaxNumberRequestController._is_certainly_invalid(input_data):
+            return CheckTaxNumberRequestController.generate_json(False)
+        validity_cache = get_tax_number_validity_cache()
+        eric_version = validity_cache.get_published_eric_version() if validity_cache is not None else None
+        if eric_version is None:
+            return None
+        full_tax_number = CheckTaxNumberRequestController._generate_tax_number(
+            input_data.state_abbreviation.upper(), input_data.tax_number)
+        result = validity_cache.get(full_tax_number, eric_version)
+        return CheckTaxNumberRequestController.generate_json(result) if result is not None else None
+
+    @staticmethod
+    def _is_certainly_invalid(input_data):
+        return tax_number_is_certainly_invalid(input_data.tax_number, input_data.state_abbreviation.upper(),
+                                               use_testmerker=get_settings().use_testmerker)
+
+    @staticmethod
+    def _check_with_eric(full_tax_number):
+        """Asks ERiC, unless the result for the tax number with the loaded ERiC version is cached."""
+        validity_cache = get_tax_number_validity_cache()
+        if validity_cache is None:
+            return CheckTaxNumberPyericController.get_eric_response(full_tax_number)
+        eric_version = get_eric_version()
+        result = validity_cache.get(full_tax_number, eric_version)
+        if result is None:
+            result = CheckTaxNumberPyericController.get_eric_response(full_tax_number)
+            validity_cache.put(full_tax_number, eric_version, result)
+        return result
+
     @staticmethod
     def _generate_tax_number(state_abbreviation, tax_number):
         return generate_electronic_steuernummer(
@@ -258,7 +319,7 @@ class GetAddressRequestController(GetBelegeRequestController):
 
     def generate_json(self, pyeric_response: PyericResponse):
         response = super().generate_json(pyeric_response)
-        response['address'] = get_address_from_xml(pyeric_response.server_response)
+        response['address'] = get_address_from_xml(pyeric_response.parsed_server_response)
         return response
 
 
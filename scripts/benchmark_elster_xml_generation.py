@@ -0,0 +1,94 @@
+"""
+Measures the generation of the XML of EST and VaSt beleg requests, once with the pretty printing through minidom, as
+it was done before, and once with the pretty printing that writes the tree directly. For both the time per request
+and the peak memory of one request are reported, and both have to return the same XML.
+
+ERiC is replaced by a stub that returns the XML unchanged, so the script runs without the ERiC binaries and measures
+the work of Erica only:
+
+    ERICA_ENV=development python scripts/benchmark_elster_xml_generation.py --repetitions 200
+"""
+import statistics
+import time
+import tracemalloc
+from unittest.mock import MagicMock, patch
+from xml.dom import minidom
+from xml.etree.ElementTree import tostring
+
+import click
+
+from erica.worker.elster_xml.elster_xml_generator import generate_full_est_xml, generate_vorsatz_with_tax_number, \
+    generate_full_vast_beleg_request_xml
+
+_VORSATZ = generate_vorsatz_with_tax_number(
+    steuernummer='9198011310010', year='2021', person_a_idnr='04452397687', person_b_idnr=None, first_name='Manfred',
+    last_name='Mustername', street='Musterstraße', street_nr='42', plz='12345', town='Hamburg')
+
+
+def _pretty_print_with_minidom(xml, remove_decl):
+    xml = minidom.parseString(tostring(xml))
+    if remove_decl:
+        xml = xml.childNodes[0]
+    return xml.toprettyxml(indent=" " * 4)
+
+
+def _get_est_form_data():
+    return {
+        'E0100201': 'Maier', 'E0100301': 'Hans', 'E0100401': '05.05.1955', 'E0100602': 'Musterort',
+        'E0102402': 'X', 'E0107206': '1', 'E0107207': '2', 'E0107208': '2', 'E0111217': '3', 'E0170601': '4',
+        'E0111214': '5', 'E0111215': '5', 'E0107606': '6', 'E0104706': ['7a', '7b'], 'E0161304': '101',
+        'E0161305': '102', 'E0161404': '103', 'E0161405': '104', 'E0161504': '105', 'E0161505': '105',
+    }
+
+
+def _generate_est_xml():
+    return generate_full_est_xml(_get_est_form_data(), _VORSATZ, '2021', '9198', th_fields=MagicMock())
+
+
+def _generate_vast_beleg_request_xml(number_of_belege):
+    beleg_ids = [f'vk{index:05}' for index in range(number_of_belege)]
+    return generate_full_vast_beleg_request_xml({'idnr': '04452397687'}, beleg_ids, th_fields=MagicMock())
+
+
+def _measure(function, repetitions):
+    tracemalloc.start()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1e3, peak_memory / 1024
+
+
+@click.command()
+@click.option('--repetitions', default=100, show_default=True, help='Number of requests per measurement.')
+def main(repetitions):
+    eric_wrapper = MagicMock()
+    eric_wrapper.create_th.side_effect = lambda xml_string, **kwargs: xml_string.encode()
+    get_eric_wrapper = MagicMock()
+    get_eric_wrapper.return_value.__enter__.return_value = eric_wrapper
+
+    requests = {'EST': _generate_est_xml}
+    for number_of_belege in (1, 20, 200):
+        requests[f'VaSt belege ({number_of_belege})'] = \
+            lambda number_of_belege=number_of_belege: _generate_vast_beleg_request_xml(number_of_belege)
+
+    click.echo(f"{'request':<20}{'minidom':>26}{'direct':>26}")
+    with patch('erica.worker.elster_xml.common.transfer_header.get_eric_wrapper', get_eric_wrapper):
+        for name, generate in requests.items():
+            with patch('erica.worker.elster_xml.elster_xml_generator.pretty_print', _pretty_print_with_minidom):
+                expected_xml = generate()
+                time_minidom, memory_minidom = _measure(generate, repetitions)
+            if generate() != expected_xml:
+                raise click.ClickException(f"The XML of {name} differs")
+            time_direct, memory_direct = _measure(generate, repetitions)
+            click.echo(f"{name:<20}{time_minidom:>9.3f} ms{memory_minidom:>11.1f} KiB"
+                       f"{time_direct:>9.3f} ms{memory_direct:>11.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
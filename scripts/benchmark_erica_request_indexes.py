@@ -0,0 +1,146 @@
+"""
+Measures the latency of the queries on erica_request that run most often, once without and once with the indexes of
+the table: the poll of a job by its request_id and the two cron jobs that scan by status and updated_at.
+
+The synthetic rows are loaded into a separate schema of a local PostgreSQL (>= 13) database, so that the erica_request
+table of the application is not touched. The schema is dropped afterwards.
+
+    ERICA_ENV=development python scripts/benchmark_erica_request_indexes.py --rows 1000000
+"""
+import random
+import statistics
+import time
+
+import click
+from sqlalchemy import create_engine, text, select
+from sqlalchemy.orm import Session
+
+from erica.config import get_settings
+from erica.domain.sqlalchemy.database import engine_args
+from erica.domain.sqlalchemy.erica_request_schema import EricaRequestSchema
+from erica.domain.sqlalchemy.repositories.erica_request_repository import EricaRequestRepository
+
+BENCHMARK_SCHEMA = 'erica_benchmark'
+
+# Most rows of a running system are finished; a small share is still waiting for or in processing.
+# The TTLs of the cron jobs are applied to rows that were updated up to two days ago.
+_LOAD_ROWS_STATEMENT = text("""
+    INSERT INTO erica_request (created_at, updated_at, creator_id, type, payload, result, request_id, status)
+    SELECT updated_at, updated_at, 'creator_' || (n % 50), 'grundsteuer', '{}'::jsonb, '{}'::jsonb,
+           gen_random_uuid(),
+           (CASE WHEN n % 1000 < 5 THEN 'new'
+                 WHEN n % 1000 < 10 THEN 'scheduled'
+                 WHEN n % 1000 < 15 THEN 'processing'
+                 WHEN n % 1000 < 100 THEN 'failed'
+                 ELSE 'success' END)::status
+    FROM (SELECT n, now() - random() * interval '2 days' AS updated_at
+          FROM generate_series(1, :rows) AS n) AS rows
+""")
+
+
+def _create_engine(database_url):
+    return create_engine(database_url, connect_args={'options': f'-csearch_path={BENCHMARK_SCHEMA}'},
+                         **engine_args)
+
+
+def _load_rows(engine, rows):
+    with engine.begin() as connection:
+        connection.execute(text(f'DROP SCHEMA IF EXISTS {BENCHMARK_SCHEMA} CASCADE'))
+        connection.execute(text(f'CREATE SCHEMA {BENCHMARK_SCHEMA}'))
+        EricaRequestSchema.__table__.create(connection)
+        for index in EricaRequestSchema.__table__.indexes:
+            index.drop(connection)
+        connection.execute(_LOAD_ROWS_STATEMENT, {'rows': rows})
+        connection.execute(text('ANALYZE erica_request'))
+
+
+def _create_indexes(engine):
+    with engine.begin() as connection:
+        for index in EricaRequestSchema.__table__.indexes:
+            index.create(connection)
+        connection.execute(text('ANALYZE erica_request'))
+
+
+def _measure(engine, request_ids, cron_repetitions, ttl_processing, ttl_finished):
+    """Runs the queries through the repository, so exactly the statements of the application are measured. Every
+    cron job runs in a savepoint that is rolled back, so that each repetition finds the same rows."""
+    latencies = {'poll': [], 'set_not_processed_entities_to_failed': [], 'delete_success_fail_old_entities': []}
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        session = Session(bind=connection, join_transaction_mode='create_savepoint')
+        repository = EricaRequestRepository(session)
+        try:
+            for request_id in request_ids:
+                start = time.perf_counter()
+                repository.get_by_job_request_id(request_id)
+                latencies['poll'].append(time.perf_counter() - start)
+                session.expunge_all()
+            # End the savepoint of the polls, so that the cron jobs start their own one within ours
+            session.rollback()
+
+            for _ in range(cron_repetitions):
+                for name, run_cron_job in (
+                        ('set_not_processed_entities_to_failed',
+                         lambda: repository.set_not_processed_entities_to_failed(ttl_processing)),
+                        ('delete_success_fail_old_entities',
+                         lambda: repository.delete_success_fail_old_entities(ttl_finished))):
+                    savepoint = connection.begin_nested()
+                    start = time.perf_counter()
+                    run_cron_job()
+                    latencies[name].append(time.perf_counter() - start)
+                    savepoint.rollback()
+        finally:
+            session.close()
+            transaction.rollback()
+    return latencies
+
+
+def _summarise(latencies):
+    ordered = sorted(latencies)
+    return {'median': statistics.median(ordered) * 1000,
+            'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000}
+
+
+def _report(before, after):
+    click.echo(f"{'query':<40}{'median before':>15}{'median after':>15}{'p95 before':>15}{'p95 after':>15}")
+    for name in before:
+        summary_before, summary_after = _summarise(before[name]), _summarise(after[name])
+        click.echo(f"{name:<40}"
+                   f"{summary_before['median']:>12.3f} ms{summary_after['median']:>12.3f} ms"
+                   f"{summary_before['p95']:>12.3f} ms{summary_after['p95']:>12.3f} ms")
+
+
+@click.command()
+@click.option('--database_url', default=None, help='Database to benchmark in. Defaults to the configured database.')
+@click.option('--rows', default=1_000_000, show_default=True, help='Number of synthetic requests.')
+@click.option('--polls', default=1000, show_default=True, help='Number of polls by request_id.')
+@click.option('--cron_repetitions', default=5, show_default=True, help='Number of runs of each cron job.')
+@click.option('--keep_data', is_flag=True, help='Do not drop the benchmark schema afterwards.')
+def main(database_url, rows, polls, cron_repetitions, keep_data):
+    settings = get_settings()
+    engine = _create_engine(database_url or settings.database_url)
+    try:
+        click.echo(f"Loading {rows} requests into the schema {BENCHMARK_SCHEMA}")
+        _load_rows(engine, rows)
+        with engine.connect() as connection:
+            request_ids = list(connection.execute(select(EricaRequestSchema.request_id)
+                                                  .order_by(text('random()')).limit(polls)).scalars())
+        random.shuffle(request_ids)
+        measure_arguments = (request_ids, cron_repetitions, settings.ttl_processing_request_entities_in_min,
+                             settings.ttl_finished_request_entities_in_min)
+
+        before = _measure(engine, *measure_arguments)
+        click.echo("Creating indexes")
+        _create_indexes(engine)
+        after = _measure(engine, *measure_arguments)
+
+        _report(before, after)
+    finally:
+        if not keep_data:
+            with engine.begin() as connection:
+                connection.execute(text(f'DROP SCHEMA IF EXISTS {BENCHMARK_SCHEMA} CASCADE'))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
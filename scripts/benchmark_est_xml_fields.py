@@ -0,0 +1,125 @@
+"""
+Measures adding the EST fields to the XML, once by walking the ElsterXmlTreeNode trees recursively, as it was done
+before, and once with the plan the trees are compiled into. Both have to return the same XML. The recursion is kept in
+this script only, the generator uses the plan.
+
+The payloads are built from the tree: a small one with a few fields, one with all fields of the tree filled, and the
+full one with more and more repeated entries (e.g. Handwerkerleistungen):
+
+    ERICA_ENV=development python scripts/benchmark_est_xml_fields.py --repetitions 1000
+"""
+import copy
+import statistics
+import time
+from xml.etree.ElementTree import Element, SubElement, tostring
+
+import click
+
+from erica.worker.elster_xml.elster_xml_generator import _SUPPORTED_STERKL, _SUPPORTED_STERKL_PLAN, PERSONS
+from erica.worker.elster_xml.elster_xml_tree import ElsterXmlTreeNode
+from erica.worker.elster_xml.est_mapping import PersonSpecificFieldId
+
+
+def _add_sterkl_fields(xml_parent, fields, sterkl):
+    if isinstance(sterkl, ElsterXmlTreeNode):
+        for repetition in range(sterkl.repetitions):
+            sterkl_xml = Element(sterkl.name)
+            if sterkl.is_person_specific:
+                person = PERSONS[repetition]
+                SubElement(sterkl_xml, 'Person').text = person
+                for sub_element in sterkl.sub_elements:
+                    _add_person_specific_sterkl_fields(sterkl_xml, fields, sub_element, person)
+            elif sterkl.is_repeatable and \
+                    any([isinstance(fields[sub_element], list) and len(fields[sub_element]) > 1
+                         if sub_element in fields.keys() else False for sub_element in sterkl.sub_elements]):
+                for sub_element in sterkl.sub_elements:
+                    _add_sterkl_fields(sterkl_xml, fields, sub_element)
+                _add_sterkl_fields(xml_parent, fields, sterkl)
+            else:
+                for sub_element in sterkl.sub_elements:
+                    _add_sterkl_fields(sterkl_xml, fields, sub_element)
+            _add_if_not_empty(xml_parent, sterkl_xml)
+    elif isinstance(sterkl, str):
+        if sterkl in fields.keys():
+            if isinstance(fields[sterkl], list):
+                SubElement(xml_parent, sterkl).text = fields[sterkl].pop()
+            else:
+                SubElement(xml_parent, sterkl).text = fields[sterkl]
+
+
+def _add_person_specific_sterkl_fields(xml_parent, fields, sterkl, person):
+    if isinstance(sterkl, ElsterXmlTreeNode):
+        sterkl_xml = Element(sterkl.name)
+        for sub_element in sterkl.sub_elements:
+            _add_person_specific_sterkl_fields(sterkl_xml, fields, sub_element, person)
+        _add_if_not_empty(xml_parent, sterkl_xml)
+    elif isinstance(sterkl, str):
+        for field_id in fields.keys():
+            if isinstance(field_id, PersonSpecificFieldId) and field_id.identifier == sterkl \
+                    and field_id.person == person:
+                SubElement(xml_parent, sterkl).text = fields[PersonSpecificFieldId(sterkl, person)]
+
+
+def _add_if_not_empty(xml_parent, sterkl_xml):
+    if [elem.tag for elem in sterkl_xml.iter() if elem is not sterkl_xml and elem.tag != 'Person']:
+        xml_parent.append(sterkl_xml)
+
+
+def _get_small_fields():
+    return {'E0100201': 'Maier', 'E0100301': 'Hans', 'E0100401': '05.05.1955', 'E0100602': 'Musterort',
+            'E0107206': '1', 'E0111214': '5', 'E0104706': ['7a', '7b']}
+
+
+def _get_full_fields(repeated_values):
+    fields = {}
+    for field_id, leaf in _SUPPORTED_STERKL_PLAN._leaves.items():
+        if leaf.repeat_group:
+            fields[field_id] = [f'{index}' for index in range(repeated_values)]
+        else:
+            fields[field_id] = '1'
+    return fields
+
+
+def _add_fields_recursively(fields):
+    xml_top = Element('E10')
+    for sterkl in _SUPPORTED_STERKL:
+        _add_sterkl_fields(xml_top, fields, sterkl)
+    return xml_top
+
+
+def _add_fields_with_plan(fields):
+    xml_top = Element('E10')
+    _SUPPORTED_STERKL_PLAN.add_fields(xml_top, fields)
+    return xml_top
+
+
+def _measure(function, fields, repetitions):
+    latencies = []
+    for _ in range(repetitions):
+        # The recursion empties the lists in the fields, so every run gets its own copy
+        fields_copy = copy.deepcopy(fields)
+        start = time.perf_counter()
+        function(fields_copy)
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1e6
+
+
+@click.command()
+@click.option('--repetitions', default=500, show_default=True, help='Number of runs per measurement.')
+def main(repetitions):
+    payloads = {'small': _get_small_fields()}
+    for repeated_values in (1, 10, 100):
+        payloads[f'full ({repeated_values} repeated)'] = _get_full_fields(repeated_values)
+
+    click.echo(f"{'payload':<24}{'fields':>8}{'recursion':>14}{'plan':>14}")
+    for name, fields in payloads.items():
+        expected_xml = tostring(_add_fields_recursively(copy.deepcopy(fields)))
+        if tostring(_add_fields_with_plan(copy.deepcopy(fields))) != expected_xml:
+            raise click.ClickException(f"The XML of {name} differs")
+        time_recursion = _measure(_add_fields_recursively, fields, repetitions)
+        time_plan = _measure(_add_fields_with_plan, fields, repetitions)
+        click.echo(f"{name:<24}{len(fields):>8}{time_recursion:>11.1f} us{time_plan:>11.1f} us")
+
+
+if __name__ == "__main__":
+    main()
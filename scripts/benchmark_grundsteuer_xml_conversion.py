@@ -0,0 +1,66 @@
+"""
+Measures the conversion of the Grundsteuer data representation to XML, once with `asdict`, `CustomDictParser` and
+`xmltodict`, as it was done before, and once with the conversion driven by the field plans of the dataclasses. The
+payloads are based on tests/worker/samples/grundsteuer_sample_input.json with its owner repeated, both conversions are
+checked to return the same XML for every size.
+
+The aktenzeichen is not generated by ERiC here, so the script runs without the ERiC binaries:
+
+    ERICA_ENV=development python scripts/benchmark_grundsteuer_xml_conversion.py --repetitions 100
+"""
+import json
+import statistics
+import time
+from unittest.mock import MagicMock, patch
+
+import click
+
+from erica.api.dto.grundsteuer_dto import GrundsteuerPayload
+from erica.worker.elster_xml.common.xml_conversion import _convert_object_to_xml_with_xmltodict, \
+    convert_object_to_xml
+from erica.worker.elster_xml.grundsteuer.elster_data_representation import get_full_grundsteuer_data_representation
+
+_SAMPLE_FILE_NAME = 'tests/worker/samples/grundsteuer_sample_input.json'
+
+
+def _get_grundsteuer_object(number_of_owners):
+    with open(_SAMPLE_FILE_NAME) as sample_file:
+        payload = json.load(sample_file)
+    payload['eigentuemer']['person'] = payload['eigentuemer']['person'][:1] * number_of_owners
+    with patch('erica.worker.elster_xml.grundsteuer.elster_data_representation.generate_electronic_aktenzeichen',
+               MagicMock(return_value='2181008000100001')), \
+            patch('erica.worker.elster_xml.grundsteuer.elster_data_representation.get_bufa_nr_from_aktenzeichen',
+                  MagicMock(return_value='2181')):
+        return get_full_grundsteuer_data_representation(GrundsteuerPayload.parse_obj(payload))
+
+
+def _time_calls(function, repetitions):
+    latencies = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+@click.command()
+@click.option('--repetitions', default=50, show_default=True, help='Number of conversions per measurement.')
+@click.option('--owners', default=[1, 50, 500], multiple=True, show_default=True,
+              help='Number of owners of the payloads.')
+def main(repetitions, owners):
+    click.echo(f"{'owners':<10}{'xmltodict':>17}{'field plans':>17}{'speedup':>10}")
+    for number_of_owners in owners:
+        grundsteuer_object = _get_grundsteuer_object(number_of_owners)
+        if convert_object_to_xml(grundsteuer_object) != _convert_object_to_xml_with_xmltodict(grundsteuer_object):
+            raise click.ClickException(f"The conversions differ for {number_of_owners} owners")
+
+        median_xmltodict = statistics.median(
+            _time_calls(lambda: _convert_object_to_xml_with_xmltodict(grundsteuer_object), repetitions)) * 1e3
+        median_field_plans = statistics.median(
+            _time_calls(lambda: convert_object_to_xml(grundsteuer_object), repetitions)) * 1e3
+        click.echo(f"{number_of_owners:<10}{median_xmltodict:>14.2f} ms{median_field_plans:>14.2f} ms"
+                   f"{median_xmltodict / median_field_plans:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
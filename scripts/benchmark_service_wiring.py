@@ -0,0 +1,93 @@
+"""
+Measures the time the API spends on wiring its services per request, once with an injector built for every call, as
+it was done before the services were cached, and once with the cached services.
+
+Besides the wiring alone, a poll of a Grundsteuer job is sent through the whole ASGI app. The job is read from memory
+instead of the database, so that the difference between both runs is the wiring only.
+
+    ERICA_ENV=development python scripts/benchmark_service_wiring.py --repetitions 2000
+"""
+import asyncio
+import statistics
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import click
+import httpx
+from opyoid import Injector
+
+from erica import app
+from erica.api.service.service_injector import get_service, service_interfaces
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.job_service import job_service_factory
+from erica.job_service.application_module import ApplicationModule
+from erica.job_service.job_service import JobServiceInterface
+from erica.job_service.job_service_factory import get_job_service
+
+
+def _get_service_per_call(request_type):
+    injector = Injector([ApplicationModule()])
+    services = {key: injector.inject(service_interface) for key, service_interface in service_interfaces.items()}
+    return services.get(request_type)
+
+
+def _get_job_service_per_call(request_type):
+    return job_service_factory.injectors[request_type]().inject(JobServiceInterface)
+
+
+def _time_calls(function, repetitions):
+    latencies = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def _time_polls(repetitions):
+    request_id = uuid4()
+    erica_request = EricaRequest(request_id=request_id, payload={}, creator_id='benchmark',
+                                 type=RequestType.grundsteuer, status=Status.processing)
+    latencies = []
+    with patch('erica.domain.sqlalchemy.repositories.async_erica_request_repository.AsyncEricaRequestRepository'
+               '.get_by_job_request_id', AsyncMock(return_value=erica_request)):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://erica') as client:
+            for _ in range(repetitions):
+                start = time.perf_counter()
+                response = await client.get(f'/v2/grundsteuer/{request_id}')
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+    return latencies
+
+
+def _report(name, per_call, cached):
+    median_per_call, median_cached = statistics.median(per_call) * 1e6, statistics.median(cached) * 1e6
+    click.echo(f"{name:<32}{median_per_call:>14.1f} µs{median_cached:>14.1f} µs"
+               f"{median_per_call - median_cached:>14.1f} µs")
+
+
+@click.command()
+@click.option('--repetitions', default=1000, show_default=True, help='Number of calls per measurement.')
+def main(repetitions):
+    # The wiring is measured without a database connection; the session maker of the async engine is not used here
+    with patch('erica.domain.sqlalchemy.async_database.AsyncSessionMakerProvider.get', MagicMock()):
+        get_service(RequestType.grundsteuer)
+        get_job_service(RequestType.grundsteuer)
+
+        click.echo(f"{'median of':<32}{'per call':>17}{'cached':>17}{'saved':>17}")
+        _report('get_service',
+                _time_calls(lambda: _get_service_per_call(RequestType.grundsteuer), repetitions),
+                _time_calls(lambda: get_service(RequestType.grundsteuer), repetitions))
+        _report('get_job_service',
+                _time_calls(lambda: _get_job_service_per_call(RequestType.grundsteuer), repetitions),
+                _time_calls(lambda: get_job_service(RequestType.grundsteuer), repetitions))
+
+        with patch('erica.api.v2.endpoints.grundsteuer.get_service', _get_service_per_call):
+            polls_per_call = asyncio.run(_time_polls(repetitions))
+        polls_cached = asyncio.run(_time_polls(repetitions))
+        _report('GET /v2/grundsteuer/{id}', polls_per_call, polls_cached)
+
+
+if __name__ == "__main__":
+    main()
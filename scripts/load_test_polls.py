@@ -0,0 +1,117 @@
+"""
+Load test for the status polls of the API. Polls of random Grundsteuer jobs are sent open-loop at increasing rates,
+i.e. independently of how fast the previous polls were answered, and the latencies per rate are reported. The
+result is the highest rate at which the p99 latency stays within the given bound.
+
+Run the API (e.g. `python -m erica`) against the configured database first, then
+
+    ERICA_ENV=development python scripts/load_test_polls.py --base_url http://localhost:8000 --p99_ms 50
+
+The jobs to poll are created in the configured database before the test and deleted afterwards.
+"""
+import asyncio
+import random
+import time
+from uuid import uuid4
+
+import click
+import httpx
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.domain.sqlalchemy.database import get_engine
+from erica.domain.sqlalchemy.erica_request_schema import EricaRequestSchema
+from erica.domain.sqlalchemy.repositories.erica_request_repository import EricaRequestRepository
+
+LOAD_TEST_CREATOR_ID = 'load_test_polls'
+
+
+def _create_requests(number_of_requests):
+    with Session(get_engine()) as session:
+        repository = EricaRequestRepository(session)
+        request_ids = [uuid4() for _ in range(number_of_requests)]
+        for request_id in request_ids:
+            repository.create(EricaRequest(request_id=request_id, payload={}, creator_id=LOAD_TEST_CREATOR_ID,
+                                           type=RequestType.grundsteuer, status=Status.processing))
+    return request_ids
+
+
+def _delete_requests():
+    with Session(get_engine()) as session:
+        session.execute(delete(EricaRequestSchema).where(EricaRequestSchema.creator_id == LOAD_TEST_CREATOR_ID))
+        session.commit()
+
+
+async def _poll(client, request_id, latencies, errors):
+    start = time.perf_counter()
+    try:
+        response = await client.get(f'/v2/grundsteuer/{request_id}')
+        response.raise_for_status()
+    except httpx.HTTPError:
+        errors.append(request_id)
+    else:
+        latencies.append(time.perf_counter() - start)
+
+
+async def _run_at_rate(client, request_ids, rate, duration):
+    """Starts `rate` polls per second for `duration` seconds and waits until all of them are answered."""
+    latencies, errors, polls = [], [], []
+    start = time.perf_counter()
+    for number in range(int(rate * duration)):
+        # Keep the schedule even if starting the polls falls behind, so that a slow API does not slow down the load
+        delay = start + number / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        polls.append(asyncio.create_task(_poll(client, random.choice(request_ids), latencies, errors)))
+    await asyncio.gather(*polls)
+    return sorted(latencies), errors, time.perf_counter() - start
+
+
+def _percentile(ordered_latencies, percentile):
+    if not ordered_latencies:
+        return float('inf')
+    return ordered_latencies[min(len(ordered_latencies) - 1, int(len(ordered_latencies) * percentile))] * 1000
+
+
+async def _run(base_url, request_ids, rates, duration, p99_ms, max_connections):
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    best_rate = None
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        click.echo(f"{'rate/s':>8}{'throughput/s':>14}{'p50':>12}{'p99':>12}{'errors':>8}")
+        for rate in rates:
+            latencies, errors, elapsed = await _run_at_rate(client, request_ids, rate, duration)
+            p99 = _percentile(latencies, 0.99)
+            click.echo(f"{rate:>8}{len(latencies) / elapsed:>14.1f}{_percentile(latencies, 0.5):>9.1f} ms"
+                       f"{p99:>9.1f} ms{len(errors):>8}")
+            if errors or p99 > p99_ms:
+                break
+            best_rate = rate
+    return best_rate
+
+
+@click.command()
+@click.option('--base_url', default='http://localhost:8000', show_default=True, help='URL of the running API.')
+@click.option('--p99_ms', default=50.0, show_default=True, help='Upper bound for the p99 latency of a poll.')
+@click.option('--start_rate', default=50, show_default=True, help='Polls per second of the first step.')
+@click.option('--rate_step', default=50, show_default=True, help='Increase of the polls per second per step.')
+@click.option('--max_rate', default=2000, show_default=True, help='Polls per second of the last step.')
+@click.option('--duration', default=10, show_default=True, help='Seconds per step.')
+@click.option('--jobs', default=1000, show_default=True, help='Number of jobs that are polled.')
+@click.option('--max_connections', default=200, show_default=True, help='Maximum number of open connections.')
+def main(base_url, p99_ms, start_rate, rate_step, max_rate, duration, jobs, max_connections):
+    request_ids = _create_requests(jobs)
+    try:
+        rates = range(start_rate, max_rate + 1, rate_step)
+        best_rate = asyncio.run(_run(base_url, request_ids, rates, duration, p99_ms, max_connections))
+    finally:
+        _delete_requests()
+
+    if best_rate is None:
+        click.echo(f"The p99 latency exceeds {p99_ms} ms already at {start_rate} polls per second")
+    else:
+        click.echo(f"Highest rate with a p99 latency within {p99_ms} ms: {best_rate} polls per second")
+
+
+if __name__ == "__main__":
+    main()
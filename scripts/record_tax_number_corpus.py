@@ -0,0 +1,51 @@
+"""
+Records the results of ERiC for tax numbers in the corpus the checks without ERiC are tested against: none of the
+tax numbers ERiC accepts may be rejected by them. The check digit is only checked for the states whose method the
+results in the corpus confirm, a state may only be added to `_CHECK_DIGIT_METHODS` in tax_number_precheck.py once
+tax numbers of it have been recorded. The input file contains one
+`STATE,TAX_NUMBER` per line, e.g. `BY,19811310010`. Run it from the root of the repository with the ERiC binaries in
+place:
+
+    python scripts/record_tax_number_corpus.py tax_numbers.csv
+
+Tax numbers with a bufa that does not exist are skipped, they never reach ERiC.
+"""
+import json
+
+import click
+
+from erica.worker.elster_xml.common.electronic_steuernummer import generate_electronic_steuernummer
+from erica.worker.pyeric.eric_errors import InvalidBufaNumberError
+from erica.worker.pyeric.pyeric_controller import CheckTaxNumberPyericController
+
+_CORPUS_FILE_NAME = "tests/worker/samples/tax_number_corpus.json"
+
+
+@click.command()
+@click.argument('tax_numbers_file', type=click.File())
+def main(tax_numbers_file):
+    with open(_CORPUS_FILE_NAME) as corpus_file:
+        corpus = json.load(corpus_file)
+    recorded = {(entry['state'], entry['taxNumber']) for entry in corpus}
+
+    for line in tax_numbers_file:
+        if not line.strip():
+            continue
+        state, tax_number = (value.strip() for value in line.split(','))
+        if (state, tax_number) in recorded:
+            continue
+        try:
+            electronic_tax_number = generate_electronic_steuernummer(tax_number, state, use_testmerker=True)
+        except InvalidBufaNumberError:
+            click.secho(f"Skipping {state} {tax_number}: the bufa does not exist", fg="yellow", err=True)
+            continue
+        is_valid = CheckTaxNumberPyericController.get_eric_response(electronic_tax_number)
+        corpus.append({'state': state, 'taxNumber': tax_number, 'isValid': is_valid, 'source': "ERiC"})
+        recorded.add((state, tax_number))
+
+    with open(_CORPUS_FILE_NAME, 'w') as corpus_file:
+        corpus_file.write('[\n' + ',\n'.join(f"  {json.dumps(entry)}" for entry in corpus) + '\n]\n')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Records the XML ERiC creates when it adds the TransferHeader to an XML, for the corpus the local TransferHeader is
+tested against. The input file is the XML as it is passed to ERiC, e.g. the result of `_pretty` of the generator.
+The transfer header fields are those returned by the given function of
+erica/worker/elster_xml/transfer_header_fields.py. Run it from the root of the repository with the ERiC binaries in
+place:
+
+    python scripts/record_transfer_header_corpus.py est_without_th.xml get_est_th_fields --use-testmerker
+
+The input and the output of ERiC are stored in tests/worker/samples/transfer_header_corpus/ under the given name,
+which defaults to the datenart. `add_transfer_header` of erica/worker/elster_xml/common/transfer_header.py may only
+build the TransferHeader of a Verfahren with `insert_transfer_header` once it is recorded, for every federal state
+it is sent to.
+"""
+import json
+import os
+import re
+
+import click
+
+from erica.worker.elster_xml import transfer_header_fields
+from erica.worker.pyeric.eric import get_eric_wrapper
+
+_CORPUS_FILE_NAME = "tests/worker/samples/transfer_header_corpus.json"
+_CORPUS_DIRECTORY = "samples/transfer_header_corpus"
+_ERIC_VERSION = re.compile(r'<Erstellung>\s*<Eric>\s*<Version>(.*?)</Version>', re.DOTALL)
+
+
+@click.command()
+@click.argument('input_file', type=click.File())
+@click.argument('th_fields_function')
+@click.option('--use-testmerker', is_flag=True, help='Records the transfer header with testmerker.')
+@click.option('--name', help='Name of the files of the entry, the datenart by default.')
+def main(input_file, th_fields_function, use_testmerker, name):
+    th_fields = getattr(transfer_header_fields, th_fields_function)(use_testmerker)
+    name = name or f"{th_fields.datenart.lower()}{'_testmerker' if use_testmerker else ''}"
+    base_xml = input_file.read()
+
+    with get_eric_wrapper() as eric_wrapper:
+        xml_with_th = eric_wrapper.create_th(
+            base_xml,
+            datenart=th_fields.datenart, testmerker=th_fields.testmerker,
+            hersteller_id=th_fields.herstellerId, verfahren=th_fields.verfahren,
+            daten_lieferant=th_fields.datenLieferant).decode()
+
+    input_path = f"{_CORPUS_DIRECTORY}/{name}_input.xml"
+    output_path = f"{_CORPUS_DIRECTORY}/{name}_output.xml"
+    for path, content in ((input_path, base_xml), (output_path, xml_with_th)):
+        with open(os.path.join('tests/worker', path), 'w') as corpus_xml_file:
+            corpus_xml_file.write(content)
+
+    eric_version = _ERIC_VERSION.search(xml_with_th)
+    with open(_CORPUS_FILE_NAME) as corpus_file:
+        corpus = [entry for entry in json.load(corpus_file) if entry['input'] != input_path]
+    corpus.append({'input': input_path, 'output': output_path, 'thFields': th_fields._asdict(),
+                   'ericVersion': eric_version.group(1) if eric_version else None, 'source': "ERiC"})
+    with open(_CORPUS_FILE_NAME, 'w') as corpus_file:
+        corpus_file.write('[\n' + ',\n'.join(f"  {json.dumps(entry)}" for entry in corpus) + '\n]\n')
+
+
+if __name__ == "__main__":
+    main()
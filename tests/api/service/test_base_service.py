@@ -0,0 +1,177 @@
+import asyncio
+import time
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from erica.api.dto.response_dto import JobState
+from erica.api.errors import RequestTypeDoesNotMatchEndpointError
+from erica.api.service.base_service import BaseService
+from erica.config import get_settings
+from erica.domain.job_completion.job_completion_listener import JobCompletionListener
+from erica.domain.job_completion.job_completion_notifier import JobCompletionNotifier
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.domain.sqlalchemy.repositories.base_repository import EntityNotFoundError
+
+CHANNEL = 'erica-job-completed-test'
+
+
+class FakeEricaRequestService:
+    """Returns a request that is processing until the job finishes after `duration` seconds, and counts the reads."""
+
+    def __init__(self, duration, notifier=None):
+        self.erica_request = EricaRequest(type=RequestType.grundsteuer, status=Status.processing, payload={},
+                                          request_id=uuid.uuid4(), creator_id="test")
+        self.reads = 0
+        asyncio.get_running_loop().call_later(duration, self._finish, notifier)
+
+    def _finish(self, notifier):
+        self.erica_request = self.erica_request.copy(update={'status': Status.success})
+        if notifier is not None:
+            notifier.notify(self.erica_request.request_id)
+
+    async def get_request_by_request_id(self, request_id):
+        self.reads += 1
+        return self.erica_request
+
+
+@pytest.fixture
+async def job_completion_channel():
+    redis_server = fakeredis.FakeServer()
+    listener = JobCompletionListener(lambda: fakeredis.aioredis.FakeRedis(server=redis_server), CHANNEL)
+    notifier = JobCompletionNotifier(fakeredis.FakeRedis(server=redis_server), CHANNEL)
+    with patch('erica.api.service.base_service.get_job_completion_listener', return_value=listener), \
+            patch('erica.domain.job_completion.job_completion_listener.get_job_completion_listener',
+                  return_value=listener):
+        # Subscribe before the first job starts
+        with listener.waiter(uuid.uuid4()):
+            await asyncio.sleep(0.05)
+        yield notifier
+    await listener.close()
+
+
+class TestBaseServiceGetEricaRequest:
+
+    async def test_if_no_wait_then_read_request_once(self):
+        erica_request_service = FakeEricaRequestService(duration=10)
+
+        erica_request = await BaseService(erica_request_service).get_erica_request(
+            erica_request_service.erica_request.request_id, RequestType.grundsteuer)
+
+        assert erica_request.status == Status.processing
+        assert erica_request_service.reads == 1
+
+    async def test_if_wrong_request_type_then_raise_error_also_when_waiting(self):
+        erica_request_service = FakeEricaRequestService(duration=10)
+
+        with pytest.raises(RequestTypeDoesNotMatchEndpointError):
+            await BaseService(erica_request_service).get_erica_request(
+                erica_request_service.erica_request.request_id, RequestType.send_est, wait=1)
+
+    async def test_if_job_completion_notified_then_return_finished_request_right_away(self, job_completion_channel):
+        erica_request_service = FakeEricaRequestService(duration=0.1, notifier=job_completion_channel)
+
+        start = time.perf_counter()
+        erica_request = await BaseService(erica_request_service).get_erica_request(
+            erica_request_service.erica_request.request_id, RequestType.grundsteuer, wait=5)
+
+        assert erica_request.status == Status.success
+        assert erica_request_service.reads == 2
+        assert time.perf_counter() - start < 1
+
+    async def test_if_job_not_finished_within_wait_then_return_processing_request(self, job_completion_channel):
+        erica_request_service = FakeEricaRequestService(duration=10, notifier=job_completion_channel)
+
+        erica_request = await BaseService(erica_request_service).get_erica_request(
+            erica_request_service.erica_request.request_id, RequestType.grundsteuer, wait=0.1)
+
+        assert erica_request.status == Status.processing
+
+    async def test_if_wait_exceeds_maximum_then_wait_at_most_maximum(self):
+        erica_request_service = FakeEricaRequestService(duration=10)
+
+        with patch.object(get_settings(), 'job_max_wait_in_sec', 0.05):
+            start = time.perf_counter()
+            await BaseService(erica_request_service).get_erica_request(
+                erica_request_service.erica_request.request_id, RequestType.grundsteuer, wait=60)
+
+        assert time.perf_counter() - start < 1
+
+    async def test_if_notifications_disabled_then_recheck_request_in_interval(self):
+        erica_request_service = FakeEricaRequestService(duration=0.1)
+
+        with patch.object(get_settings(), 'notify_job_completion', False), \
+                patch.object(get_settings(), 'job_wait_recheck_interval_without_notifications_in_sec', 0.02):
+            erica_request = await BaseService(erica_request_service).get_erica_request(
+                erica_request_service.erica_request.request_id, RequestType.grundsteuer, wait=5)
+
+        assert erica_request.status == Status.success
+
+
+class TestLongPollReadsDatabaseLess:
+    """Compares the reads of a job that takes 12 seconds by a client that polls in a loop like the contract tests, every
+    0.5 seconds until the job is finished, with a client that long polls. Durations are scaled down by 20."""
+
+    JOB_DURATION = 0.6
+    POLL_STEP = 0.025
+
+    async def _poll_in_loop(self, erica_request_service):
+        service = BaseService(erica_request_service)
+        while (await service.get_erica_request(erica_request_service.erica_request.request_id,
+                                               RequestType.grundsteuer)).status == Status.processing:
+            await asyncio.sleep(self.POLL_STEP)
+
+    async def _long_poll(self, erica_request_service):
+        service = BaseService(erica_request_service)
+        while (await service.get_erica_request(erica_request_service.erica_request.request_id,
+                                               RequestType.grundsteuer, wait=1.5)).status == Status.processing:
+            pass
+
+    async def test_if_client_long_polls_then_read_job_an_order_of_magnitude_less(self, job_completion_channel):
+        polled_service = FakeEricaRequestService(self.JOB_DURATION, notifier=job_completion_channel)
+        long_polled_service = FakeEricaRequestService(self.JOB_DURATION, notifier=job_completion_channel)
+
+        await asyncio.gather(self._poll_in_loop(polled_service), self._long_poll(long_polled_service))
+
+        assert long_polled_service.reads * 10 <= polled_service.reads
+
+
+class TestBaseServiceGetResponseBatch:
+
+    @staticmethod
+    def _service(statuses):
+        return BaseService(MagicMock(get_statuses_by_batch_id=AsyncMock(return_value=statuses)))
+
+    async def test_if_requests_in_batch_then_count_them_by_job_state(self):
+        request_ids = [uuid.uuid4() for _ in range(4)]
+        statuses = [(request_ids[0], Status.new), (request_ids[1], Status.processing),
+                    (request_ids[2], Status.success), (request_ids[3], Status.failed)]
+        batch_id = uuid.uuid4()
+
+        response = await self._service(statuses).get_response_batch(batch_id, RequestType.send_ustva)
+
+        assert response.batch_id == batch_id
+        assert (response.total, response.processing, response.success, response.failure) == (4, 2, 1, 1)
+        assert [request.request_id for request in response.requests] == request_ids
+        assert [request.process_status for request in response.requests] == \
+               [JobState.PROCESSING, JobState.PROCESSING, JobState.SUCCESS, JobState.FAILURE]
+
+    @pytest.mark.parametrize("statuses, process_status",
+                             [([Status.success, Status.processing], JobState.PROCESSING),
+                              ([Status.success, Status.failed], JobState.FAILURE),
+                              ([Status.success, Status.success], JobState.SUCCESS)],
+                             ids=["processing", "failure", "success"])
+    async def test_if_requests_in_batch_then_aggregate_process_status(self, statuses, process_status):
+        service = self._service([(uuid.uuid4(), status) for status in statuses])
+
+        response = await service.get_response_batch(uuid.uuid4(), RequestType.send_ustva)
+
+        assert response.process_status == process_status
+
+    async def test_if_no_requests_in_batch_then_raise_error(self):
+        with pytest.raises(EntityNotFoundError):
+            await self._service([]).get_response_batch(uuid.uuid4(), RequestType.send_ustva)
+
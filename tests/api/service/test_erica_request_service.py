@@ -0,0 +1,74 @@
+import uuid
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from erica.api.service.erica_request_service import EricaRequestService
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.domain.result_cache.result_cache import ResultCache, CachedRequest
+
+
+def _erica_request(status, result=None):
+    return EricaRequest(type=RequestType.grundsteuer, status=status, payload={}, result=result,
+                        request_id=uuid.uuid4(), creator_id="test")
+
+
+def _repository(erica_request):
+    pdf = erica_request.result.get('pdf') if isinstance(erica_request.result, dict) else None
+    return MagicMock(get_by_job_request_id=AsyncMock(return_value=erica_request),
+                     get_pdf_by_job_request_id=AsyncMock(return_value=pdf))
+
+
+class TestEricaRequestServiceGetRequestByRequestId:
+
+    @pytest.fixture(autouse=True)
+    def result_cache(self):
+        result_cache = ResultCache(10, timedelta(minutes=20))
+        with patch('erica.api.service.erica_request_service.get_result_cache', MagicMock(return_value=result_cache)):
+            yield result_cache
+
+    @pytest.mark.parametrize("status", [Status.success, Status.failed])
+    async def test_if_request_finished_then_read_it_from_database_only_once(self, status):
+        erica_request = _erica_request(status)
+        repository = _repository(erica_request)
+        service = EricaRequestService(repository)
+
+        assert await service.get_request_by_request_id(erica_request.request_id) == erica_request
+        assert await service.get_request_by_request_id(erica_request.request_id) == \
+               CachedRequest.from_erica_request(erica_request)
+
+        repository.get_by_job_request_id.assert_awaited_once_with(erica_request.request_id)
+
+    @pytest.mark.parametrize("status", [Status.new, Status.scheduled, Status.processing])
+    async def test_if_request_not_finished_then_read_it_from_database_every_time(self, status):
+        erica_request = _erica_request(status)
+        repository = _repository(erica_request)
+        service = EricaRequestService(repository)
+
+        await service.get_request_by_request_id(erica_request.request_id)
+        await service.get_request_by_request_id(erica_request.request_id)
+
+        assert repository.get_by_job_request_id.await_count == 2
+
+    async def test_if_request_finished_in_other_service_then_read_it_from_cache(self):
+        erica_request = _erica_request(Status.success)
+        await EricaRequestService(_repository(erica_request)).get_request_by_request_id(erica_request.request_id)
+        repository = _repository(erica_request)
+
+        await EricaRequestService(repository).get_request_by_request_id(erica_request.request_id)
+
+        repository.get_by_job_request_id.assert_not_awaited()
+
+    async def test_if_cached_request_has_inline_pdf_then_read_only_pdf_from_database(self, result_cache):
+        erica_request = _erica_request(Status.success, result={'transferticket': 'Atlantis', 'pdf': 'SGVsbG8='})
+        repository = _repository(erica_request)
+        service = EricaRequestService(repository)
+        await service.get_request_by_request_id(erica_request.request_id)
+
+        cached_request = await service.get_request_by_request_id(erica_request.request_id)
+
+        assert cached_request.result == {'transferticket': 'Atlantis', 'pdf': 'SGVsbG8='}
+        repository.get_by_job_request_id.assert_awaited_once_with(erica_request.request_id)
+        repository.get_pdf_by_job_request_id.assert_awaited_once_with(erica_request.request_id)
+        assert (await result_cache.get(erica_request.request_id)).result == {'transferticket': 'Atlantis'}
@@ -1,5 +1,5 @@
 from datetime import datetime
-from unittest.mock import Mock, MagicMock, call
+from unittest.mock import Mock, MagicMock, call, patch
 from uuid import UUID
 
 import pytest
@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 
 from erica.job_service.job_service import JobService
 from erica.domain.model.base_domain_model import BasePayload
-from erica.domain.model.erica_request import EricaRequest, RequestType
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
 from erica.worker.request_processing.requests_controller import CheckTaxNumberRequestController
 from erica.domain.sqlalchemy.repositories.erica_request_repository import EricaRequestRepository
 
@@ -24,6 +24,11 @@ class MockEricaRequestRepository(EricaRequestRepository, list):
         model.id = "1234"
         return model
 
+    def create_many(self, models):
+        for model in models:
+            self.create(model)
+        return models
+
     def get(self, skip: int = 0, limit: int = 100):
         return self
 
@@ -98,6 +103,79 @@ class TestJobServiceQueue:
         assert mock_call.args[0] == UUID('00000000-0000-0000-0000-000000000000')
 
 
+class TestJobServiceFinishedRequest:
+
+    def test_if_result_provided_then_add_finished_request_to_repository_without_job(self):
+        mock_job = PickableMock()
+        service = JobService(job_repository=MockEricaRequestRepository(),
+                             request_controller=MockRequestController, payload_type=MockDto, job_method=mock_job)
+        input_data = MockDto.parse_obj({'name': 'Batman', 'friend': 'Joker'})
+
+        result = service.add_finished_request(input_data, "steuerlotse", RequestType.check_tax_number,
+                                              {'is_valid': False})
+
+        assert [entity.request_id for entity in service.repository] == [result.request_id]
+        assert service.repository[0].status == Status.success
+        assert service.repository[0].result == {'is_valid': False}
+        mock_job.assert_not_called()
+
+    def test_if_result_cache_shared_then_add_finished_request_to_repository_and_result_cache(self):
+        service = JobService(job_repository=MockEricaRequestRepository(),
+                             request_controller=MockRequestController, payload_type=MockDto, job_method=PickableMock())
+        input_data = MockDto.parse_obj({'name': 'Batman', 'friend': 'Joker'})
+
+        with patch('erica.job_service.job_service.cache_finished_request',
+                   MagicMock(return_value=True)) as cache_finished_request:
+            result = service.add_finished_request(input_data, "steuerlotse", RequestType.check_tax_number,
+                                                  {'is_valid': True})
+
+        assert [entity.request_id for entity in service.repository] == [result.request_id]
+        cached_request = cache_finished_request.call_args.args[0]
+        assert cached_request.request_id == result.request_id
+        assert cached_request.status == Status.success
+        assert cached_request.result == {'is_valid': True}
+
+
+class TestJobServiceBatchQueue:
+
+    def test_if_payloads_provided_then_add_requests_in_same_batch_to_repository(self):
+        service = JobService(job_repository=MockEricaRequestRepository(),
+                             request_controller=MockRequestController, payload_type=MockDto, job_method=PickableMock())
+        input_data = [MockDto.parse_obj({'name': 'Batman', 'friend': 'Joker'}),
+                      MockDto.parse_obj({'name': 'Robin', 'friend': 'Batgirl'})]
+
+        result = service.add_batch_to_queue(input_data, "steuerlotse", job_type=RequestType.send_ustva)
+
+        assert [entity.payload for entity in service.repository] == input_data
+        assert [entity.request_id for entity in service.repository] == result.request_ids
+        assert {entity.batch_id for entity in service.repository} == {result.batch_id}
+        assert {entity.creator_id for entity in service.repository} == {"steuerlotse"}
+        assert {entity.type for entity in service.repository} == {RequestType.send_ustva}
+
+    def test_if_payloads_provided_then_enqueue_job_for_each_request(self):
+        mock_job = PickableMock()
+        service = JobService(job_repository=MockEricaRequestRepository(),
+                             request_controller=MockRequestController, payload_type=MockDto, job_method=mock_job)
+        input_data = [MockDto.parse_obj({'name': 'Batman', 'friend': 'Joker'}),
+                      MockDto.parse_obj({'name': 'Robin', 'friend': 'Batgirl'})]
+
+        with patch('erica.job_service.job_service.enqueue_for_each') as enqueue_for_each:
+            result = service.add_batch_to_queue(input_data, "steuerlotse", job_type=RequestType.send_ustva)
+
+        enqueue_for_each.assert_called_once_with(mock_job, result.request_ids)
+
+    def test_if_batch_id_provided_then_add_requests_to_that_batch(self):
+        service = JobService(job_repository=MockEricaRequestRepository(),
+                             request_controller=MockRequestController, payload_type=MockDto, job_method=PickableMock())
+        batch_id = UUID('00000000-0000-0000-0000-000000000001')
+
+        result = service.add_batch_to_queue([MockDto.parse_obj({'name': 'Batman', 'friend': 'Joker'})], "steuerlotse",
+                                            job_type=RequestType.send_ustva, batch_id=batch_id)
+
+        assert result.batch_id == batch_id
+        assert {entity.batch_id for entity in service.repository} == {batch_id}
+
+
 class TestJobServiceRun:
 
     def test_if_input_data_provided_then_call_init_of_request_controller_with_correct_data(self):
@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock, patch
+
 import pytest
 
 from erica.worker.jobs.freischaltcode_jobs import activate_freischalt_code, revocate_freischalt_code, \
@@ -93,3 +95,18 @@ class TestJobServiceFactory:
         assert issubclass(job_service.payload_type, UstvaPayload)
         assert issubclass(job_service.request_controller, UstvaRequestController)
         assert job_service.job_method == send_ustva
+
+    def test_if_requested_twice_then_return_same_service(self):
+        assert get_job_service(RequestType.grundsteuer) is get_job_service(RequestType.grundsteuer)
+
+    def test_if_service_reused_then_repository_uses_session_of_current_scope(self):
+        job_service = get_job_service(RequestType.grundsteuer)
+        first_session, second_session = MagicMock(), MagicMock()
+
+        with patch('erica.domain.sqlalchemy.database.db', MagicMock(session=first_session)):
+            job_service.repository.db_connection.commit()
+        with patch('erica.domain.sqlalchemy.database.db', MagicMock(session=second_session)):
+            job_service.repository.db_connection.commit()
+
+        first_session.commit.assert_called_once()
+        second_session.commit.assert_called_once()
@@ -0,0 +1,30 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from erica.api.service.grundsteuer_service import GrundsteuerService
+from erica.api.service.service_injector import get_service
+from erica.domain.model.erica_request import RequestType
+
+
+@pytest.fixture(autouse=True)
+def fresh_services():
+    get_service.cache_clear()
+    with patch('erica.domain.sqlalchemy.async_database.AsyncSessionMakerProvider.get', MagicMock()):
+        yield
+    get_service.cache_clear()
+
+
+class TestGetService:
+
+    def test_if_grundsteuer_type_then_return_grundsteuer_service(self):
+        assert isinstance(get_service(RequestType.grundsteuer), GrundsteuerService)
+
+    def test_if_requested_twice_then_return_same_service(self):
+        assert get_service(RequestType.send_est) is get_service(RequestType.send_est)
+
+    def test_if_types_share_service_interface_then_return_same_service(self):
+        assert get_service(RequestType.freischalt_code_request) is get_service(RequestType.freischalt_code_activate)
+
+    def test_if_unknown_type_then_return_none(self):
+        assert get_service('unknown') is None
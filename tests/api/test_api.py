@@ -1,19 +1,27 @@
+import json
+import threading
 import uuid
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
 from erica import app
-from erica.api.v2.endpoints.est import send_est, get_send_est_job
+from erica.api.dto.freischaltcode import FreischaltCodeRequestBatchDto, FreischaltCodeActivateBatchDto, \
+    FreischaltCodeRevocateBatchDto
+from erica.api.dto.grundsteuer_dto import GrundsteuerBatchDto
+from erica.api.dto.tax_declaration_dto import TaxDeclarationBatchDto
+from erica.api.dto.tax_number_validation_dto import CheckTaxNumberBatchDto
+from erica.api.dto.ustva_dto import UstvaBatchDto
+from erica.api.v2.endpoints.est import send_est, get_send_est_job, send_est_batch
 from erica.api.v2.endpoints.fsc import request_fsc, get_fsc_request_job, activate_fsc, get_fsc_activation_job, \
-    revocate_fsc, get_fsc_revocation_job
-from erica.api.v2.endpoints.grundsteuer import send_grundsteuer, get_grundsteuer_job
-from erica.api.v2.endpoints.ustva import send_ustva, get_send_ustva_job
-from erica.api.v2.endpoints.tax import is_valid_tax_number, get_valid_tax_number_job
+    revocate_fsc, get_fsc_revocation_job, request_fsc_batch, activate_fsc_batch, revocate_fsc_batch
+from erica.api.v2.endpoints.grundsteuer import send_grundsteuer, get_grundsteuer_job, send_grundsteuer_batch
+from erica.api.v2.endpoints.ustva import send_ustva, get_send_ustva_job, send_ustva_batch, get_send_ustva_batch
+from erica.api.v2.endpoints.tax import is_valid_tax_number, get_valid_tax_number_job, is_valid_tax_number_batch
 from erica.api.service.freischaltcode_service import FreischaltCodeService
 from erica.job_service.job_service import JobService
 from erica.api.dto.response_dto import JobState
-from erica.api.dto.erica_request_dto import EricaRequestDto
+from erica.api.dto.erica_request_dto import EricaRequestDto, EricaRequestBatchDto
 from erica.api.service.grundsteuer_service import GrundsteuerService
 from erica.api.service.tax_declaration_service import TaxDeclarationService
 from erica.api.service.tax_number_validition_service import TaxNumberValidityService
@@ -58,6 +66,95 @@ async def test_if_post_job_returns_location_with_uuid(api_method, input_data, re
         assert response.headers['Location'] == mock_url
 
 
+@pytest.mark.asyncio
+async def test_if_tax_number_certainly_invalid_then_add_finished_request_instead_of_job():
+    request_id = uuid.uuid4()
+    job_service_mock = MagicMock(add_finished_request=Mock(
+        return_value=EricaRequestDto(type=RequestType.check_tax_number, status=Status.success, payload="{}",
+                                     request_id=request_id)))
+    mock_url = app.url_path_for("get_valid_tax_number_job", request_id=str(request_id))
+    mock_request_object = MagicMock(url_for=MagicMock(return_value=str(mock_url)), base_url="lorem")
+    input_data = create_tax_number_validity(correct=False)
+
+    with patch(get_job_service_patch_string("tax"), MagicMock(return_value=job_service_mock)):
+        response = await is_valid_tax_number(input_data, mock_request_object)
+
+    assert response.headers['Location'] == mock_url
+    job_service_mock.add_finished_request.assert_called_once_with(
+        input_data.payload, input_data.client_identifier, RequestType.check_tax_number, {'is_valid': False})
+    job_service_mock.add_to_queue.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_if_tax_number_checked_without_eric_then_check_and_store_result_outside_of_event_loop():
+    request_id = uuid.uuid4()
+    accessing_threads = []
+    job_service_mock = MagicMock(add_finished_request=Mock(side_effect=lambda *args: accessing_threads.append(
+        threading.get_ident()) or EricaRequestDto(type=RequestType.check_tax_number, status=Status.success,
+                                                 payload="{}", request_id=request_id)))
+    mock_request_object = MagicMock(url_for=MagicMock(return_value=f"/{request_id}"), base_url="lorem")
+
+    with patch(get_job_service_patch_string("tax"), MagicMock(return_value=job_service_mock)), \
+            patch('erica.api.v2.endpoints.tax.CheckTaxNumberRequestController.get_result_without_eric',
+                  MagicMock(side_effect=lambda *args: accessing_threads.append(threading.get_ident()) or
+                            {'is_valid': True})):
+        await is_valid_tax_number(create_tax_number_validity(), mock_request_object)
+
+    assert len(accessing_threads) == 2
+    assert threading.get_ident() not in accessing_threads
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("api_method, single_input_data, batch_dto, request_type, endpoint_to_patch, expected_location",
+                         [(request_fsc_batch, create_unlock_code_request(), FreischaltCodeRequestBatchDto,
+                           RequestType.freischalt_code_request, "fsc", "get_fsc_request_batch"),
+                          (activate_fsc_batch, create_unlock_code_activation(), FreischaltCodeActivateBatchDto,
+                           RequestType.freischalt_code_activate, "fsc", "get_fsc_activation_batch"),
+                          (revocate_fsc_batch, create_unlock_code_revocation(), FreischaltCodeRevocateBatchDto,
+                           RequestType.freischalt_code_revocate, "fsc", "get_fsc_revocation_batch"),
+                          (is_valid_tax_number_batch, create_tax_number_validity(), CheckTaxNumberBatchDto,
+                           RequestType.check_tax_number, "tax", "get_valid_tax_number_batch"),
+                          (send_est_batch, create_send_est(), TaxDeclarationBatchDto, RequestType.send_est, "est",
+                           "get_send_est_batch"),
+                          (send_grundsteuer_batch, create_send_grundsteuer(), GrundsteuerBatchDto,
+                           RequestType.grundsteuer, "grundsteuer", "get_grundsteuer_batch"),
+                          (send_ustva_batch, create_send_ustva(), UstvaBatchDto, RequestType.send_ustva, "ustva",
+                           "get_send_ustva_batch")],
+                         ids=["request_fsc", "activate_fsc", "revocate_fsc", "is_valid_tax_number", "send_est",
+                              "grundsteuer", "ustva"])
+async def test_if_post_batch_returns_batch_id_and_request_ids_with_location_of_batch(
+        api_method, single_input_data, batch_dto, request_type, endpoint_to_patch, expected_location):
+    batch = EricaRequestBatchDto(batch_id=uuid.uuid4(), request_ids=[uuid.uuid4(), uuid.uuid4()])
+    job_service_mock = MagicMock(add_batch_to_queue=Mock(return_value=batch))
+    input_data = batch_dto(payloads=[single_input_data.payload, single_input_data.payload],
+                           client_identifier=single_input_data.client_identifier)
+    mock_url = app.url_path_for(expected_location, batch_id=str(batch.batch_id))
+    mock_request_object = MagicMock(url_for=MagicMock(return_value=str(mock_url)), base_url="lorem")
+    with patch(get_job_service_patch_string(endpoint_to_patch), MagicMock(return_value=job_service_mock)):
+        response = await api_method(input_data, mock_request_object)
+
+    job_service_mock.add_batch_to_queue.assert_called_once_with(
+        input_data.payloads, single_input_data.client_identifier, request_type)
+    assert response.status_code == 201
+    assert response.headers['Location'] == mock_url
+    assert json.loads(response.body) == {"batchId": str(batch.batch_id),
+                                         "requestIds": [str(request_id) for request_id in batch.request_ids]}
+
+
+@pytest.mark.asyncio
+async def test_if_get_batch_then_return_progress_of_requests_of_batch():
+    batch_id = uuid.uuid4()
+    request_ids = [uuid.uuid4(), uuid.uuid4()]
+    mock_service = MagicMock(get_statuses_by_batch_id=AsyncMock(
+        return_value=[(request_ids[0], Status.success), (request_ids[1], Status.processing)]))
+    with patch("erica.api.v2.endpoints.ustva.get_service", MagicMock(return_value=UstvaService(service=mock_service))):
+        response = await get_send_ustva_batch(batch_id)
+
+    mock_service.get_statuses_by_batch_id.assert_awaited_once_with(batch_id, RequestType.send_ustva)
+    assert response.process_status == JobState.PROCESSING
+    assert (response.total, response.processing, response.success, response.failure) == (2, 1, 1, 0)
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("api_method, request_type", [(get_fsc_request_job, RequestType.freischalt_code_request),
                                                       (get_fsc_activation_job, RequestType.freischalt_code_activate)],
@@ -73,7 +170,7 @@ async def test_if_get_fsc_request_or_activation_job_returns_success_status_with_
                                          "transferticket": transferticket},
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.fsc.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = FreischaltCodeService(service=mock_service)
         response = await api_method(request_id)
         assert response.process_status == JobState.SUCCESS
@@ -94,7 +191,7 @@ async def test_if_get_fsc_revocation_job_returns_success_status_with_result():
                                  result={"transferticket": transferticket, "idnr": tax_id_number},
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.fsc.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = FreischaltCodeService(service=mock_service)
         response = await get_fsc_revocation_job(request_id)
         assert response.process_status == JobState.SUCCESS
@@ -113,7 +210,7 @@ async def test_if_get_tax_validity_job_returns_success_status_with_result():
                                  result={"is_valid": is_valid},
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.tax.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = TaxNumberValidityService(service=mock_service)
         response = await get_valid_tax_number_job(request_id)
         assert response.process_status == JobState.SUCCESS
@@ -132,7 +229,7 @@ async def test_if_get_send_est_job_returns_success_status_with_result():
                                  result={"transferticket": transferticket, "pdf": pdf},
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.est.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = TaxDeclarationService(service=mock_service)
         response = await get_send_est_job(request_id)
         assert response.process_status == JobState.SUCCESS
@@ -152,7 +249,7 @@ async def test_if_get_grundsteuer_job_returns_success_status_with_result():
                                  result={"transferticket": transferticket, "pdf": pdf},
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.grundsteuer.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = GrundsteuerService(service=mock_service)
         response = await get_grundsteuer_job(request_id)
         assert response.process_status == JobState.SUCCESS
@@ -171,7 +268,7 @@ async def test_if_get_ustva_job_returns_success_status_with_result():
                                  result={"transferticket": transferticket},
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.ustva.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = UstvaService(service=mock_service)
         response = await get_send_ustva_job(request_id)
         assert response.process_status == JobState.SUCCESS
@@ -195,7 +292,7 @@ async def test_if_get_fsc_job_returns_failure_status(api_method, request_type):
                                  error_message=error_message,
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.fsc.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = FreischaltCodeService(service=mock_service)
         response = await api_method(request_id)
         assert response.process_status == JobState.FAILURE
@@ -214,7 +311,7 @@ async def test_if_get_tax_validity_job_returns_failure_status():
                                  error_message=error_message,
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.tax.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = TaxNumberValidityService(service=mock_service)
         response = await get_valid_tax_number_job(request_id)
         assert response.process_status == JobState.FAILURE
@@ -233,7 +330,7 @@ async def test_if_get_est_job_returns_failure_status():
                                  error_message=error_message,
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.est.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = TaxDeclarationService(service=mock_service)
         response = await get_send_est_job(request_id)
         assert response.process_status == JobState.FAILURE
@@ -252,7 +349,7 @@ async def test_if_get_grundsteuer_job_returns_failure_status():
                                  error_message=error_message,
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.grundsteuer.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = GrundsteuerService(service=mock_service)
         response = await get_grundsteuer_job(request_id)
         assert response.process_status == JobState.FAILURE
@@ -271,7 +368,7 @@ async def test_if_get_ustva_job_returns_failure_status():
                                  error_message=error_message,
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.ustva.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = UstvaService(service=mock_service)
         response = await get_send_ustva_job(request_id)
         assert response.process_status == JobState.FAILURE
@@ -292,7 +389,7 @@ async def test_if_get_fsc_job_returns_processing_status(mock_job_state, api_meth
     erica_request = EricaRequest(type=request_type, status=mock_job_state,
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.fsc.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = FreischaltCodeService(service=mock_service)
         response = await api_method(request_id)
         assert response.process_status == JobState.PROCESSING
@@ -309,7 +406,7 @@ async def test_if_get_tax_validity_job_returns_processing_status(mock_job_state,
     erica_request = EricaRequest(type=request_type, status=mock_job_state,
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.tax.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = TaxNumberValidityService(service=mock_service)
         response = await api_method(request_id)
         assert response.process_status == JobState.PROCESSING
@@ -326,7 +423,7 @@ async def test_if_get_est_job_returns_processing_status(mock_job_state, api_meth
     erica_request = EricaRequest(type=request_type, status=mock_job_state,
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.est.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = TaxDeclarationService(service=mock_service)
         response = await api_method(request_id)
         assert response.process_status == JobState.PROCESSING
@@ -343,7 +440,7 @@ async def test_if_get_ustva_job_returns_processing_status(mock_job_state, api_me
     erica_request = EricaRequest(type=request_type, status=mock_job_state,
                                  request_id=request_id, creator_id="test")
     with patch("erica.api.v2.endpoints.ustva.get_service", MagicMock()) as get_service_mock:
-        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
         get_service_mock.return_value = UstvaService(service=mock_service)
         response = await api_method(request_id)
         assert response.process_status == JobState.PROCESSING
@@ -0,0 +1,132 @@
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from erica.api.service.grundsteuer_service import GrundsteuerService
+from erica.api.v2.endpoints.grundsteuer import get_grundsteuer_job_events
+from erica.api.v2.responses.job_events import EVENT_STREAM_MEDIA_TYPE
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.domain.sqlalchemy.repositories.base_repository import EntityNotFoundError
+
+
+def _erica_request(request_id, status, result=None):
+    return EricaRequest(type=RequestType.grundsteuer, status=status, payload={}, result=result,
+                        request_id=request_id, creator_id="test")
+
+
+async def _read_events(response):
+    body = b''.join([chunk async for chunk in response.body_iterator]).decode()
+    return [block for block in body.split('\n\n') if block]
+
+
+def _event_data(event):
+    lines = event.split('\n')
+    assert lines[0] == 'event: status'
+    return json.loads(lines[1].removeprefix('data: '))
+
+
+def _patch_service(erica_requests):
+    mock_service = MagicMock(get_request_by_request_id=AsyncMock(side_effect=erica_requests))
+    return patch("erica.api.v2.endpoints.grundsteuer.get_service",
+                 MagicMock(return_value=GrundsteuerService(service=mock_service)))
+
+
+def _patch_job_wait():
+    return patch('erica.api.service.base_service.get_settings',
+                 MagicMock(return_value=MagicMock(job_max_wait_in_sec=0, job_wait_recheck_interval_in_sec=0,
+                                                  job_wait_recheck_interval_without_notifications_in_sec=0)))
+
+
+def _spying_blob_store(session_states):
+    """Returns a blob store that records every read in session_states, next to the opening and closing of sessions."""
+    def read_chunks(*args, **kwargs):
+        session_states.append('read')
+        return iter([b'Hello'])
+    return MagicMock(read_chunks=MagicMock(side_effect=read_chunks))
+
+
+def _mock_request():
+    return MagicMock(is_disconnected=AsyncMock(return_value=False))
+
+
+class TestGetGrundsteuerJobEvents:
+
+    async def test_if_job_finished_then_send_final_state_and_end_stream(self):
+        request_id = uuid.uuid4()
+        result = {'transferticket': 'Atlantis', 'pdf': 'SGVsbG8='}
+
+        with _patch_service([_erica_request(request_id, Status.success, result)]):
+            response = await get_grundsteuer_job_events(request_id, _mock_request())
+            events = await _read_events(response)
+
+        assert response.media_type == EVENT_STREAM_MEDIA_TYPE
+        assert len(events) == 1
+        assert _event_data(events[0])['processStatus'] == 'Success'
+        assert _event_data(events[0])['result']['transferticket'] == 'Atlantis'
+
+    async def test_if_job_finishes_later_then_send_processing_keep_alive_and_final_state(self):
+        request_id = uuid.uuid4()
+        erica_requests = [_erica_request(request_id, Status.processing),
+                          _erica_request(request_id, Status.processing),
+                          _erica_request(request_id, Status.processing),
+                          _erica_request(request_id, Status.failed)]
+
+        with _patch_service(erica_requests), _patch_job_wait():
+            response = await get_grundsteuer_job_events(request_id, _mock_request())
+            events = await _read_events(response)
+
+        assert _event_data(events[0])['processStatus'] == 'Processing'
+        assert ': keep-alive' in events[1:-1]
+        assert _event_data(events[-1])['processStatus'] == 'Failure'
+
+    async def test_if_client_disconnected_then_end_stream(self):
+        request_id = uuid.uuid4()
+        request = MagicMock(is_disconnected=AsyncMock(return_value=True))
+
+        with _patch_service([_erica_request(request_id, Status.processing)]):
+            response = await get_grundsteuer_job_events(request_id, request)
+            events = await _read_events(response)
+
+        assert len(events) == 1
+        assert _event_data(events[0])['processStatus'] == 'Processing'
+
+    async def test_if_job_not_found_then_raise_before_stream_starts(self):
+        with _patch_service(EntityNotFoundError), pytest.raises(EntityNotFoundError):
+            await get_grundsteuer_job_events(uuid.uuid4(), _mock_request())
+
+    async def test_if_job_finished_with_pdf_in_blob_store_then_read_blob_before_response_is_returned(self):
+        request_id = uuid.uuid4()
+        result = {'transferticket': 'Atlantis', 'pdf_key': 'pdf/atlantis.pdf'}
+        reads = []
+
+        with _patch_service([_erica_request(request_id, Status.success, result)]), \
+                patch('erica.api.v2.responses.pdf_streaming.get_blob_store',
+                      MagicMock(return_value=_spying_blob_store(reads))):
+            response = await get_grundsteuer_job_events(request_id, _mock_request())
+            assert reads == ['read']
+            events = await _read_events(response)
+
+        assert reads == ['read']
+        assert _event_data(events[0])['result']['pdf'] == 'SGVsbG8='
+
+    async def test_if_job_finishes_later_with_pdf_in_blob_store_then_read_blob_in_own_session(self):
+        request_id = uuid.uuid4()
+        result = {'transferticket': 'Atlantis', 'pdf_key': 'pdf/atlantis.pdf'}
+        erica_requests = [_erica_request(request_id, Status.processing),
+                          _erica_request(request_id, Status.success, result)]
+        session_states = []
+        session_scope = MagicMock()
+        session_scope.return_value.__enter__.side_effect = lambda: session_states.append('open')
+        session_scope.return_value.__exit__.side_effect = lambda *args: session_states.append('closed')
+
+        with _patch_service(erica_requests), _patch_job_wait(), \
+                patch('erica.api.v2.responses.job_events.session_scope', session_scope), \
+                patch('erica.api.v2.responses.pdf_streaming.get_blob_store',
+                      MagicMock(return_value=_spying_blob_store(session_states))):
+            response = await get_grundsteuer_job_events(request_id, _mock_request())
+            events = await _read_events(response)
+
+        assert session_states == ['open', 'read', 'closed']
+        assert _event_data(events[-1])['result']['pdf'] == 'SGVsbG8='
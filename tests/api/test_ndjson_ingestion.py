@@ -0,0 +1,137 @@
+import json
+import uuid
+from unittest.mock import MagicMock, patch
+
+from erica import app
+from erica.api.dto.erica_request_dto import EricaRequestBatchDto
+from erica.api.dto.tax_number_validation_dto import CheckTaxNumberDto
+from erica.api.v2.endpoints.tax import is_valid_tax_number_stream
+from erica.api.v2.responses.ndjson_ingestion import NDJSON_MEDIA_TYPE, _read_lines
+from erica.config import get_settings
+from erica.domain.model.erica_request import RequestType
+
+
+def _line(client_identifier="steuerlotse", tax_number="04531972802"):
+    return json.dumps({'payload': {'stateAbbreviation': 'by', 'taxNumber': tax_number},
+                       'clientIdentifier': client_identifier}).encode()
+
+
+def _mock_request(*chunks):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    request = MagicMock(stream=stream, base_url='http://erica/')
+    request.url_for = MagicMock(side_effect=lambda name, batch_id: f'http://erica/v2/{name}/{batch_id}')
+    return request
+
+
+def _mock_job_service():
+    def add_batch_to_queue(payload_dtos, client_identifier, job_type, batch_id=None):
+        return EricaRequestBatchDto(batch_id=batch_id, request_ids=[uuid.uuid4() for _ in payload_dtos])
+
+    return MagicMock(add_batch_to_queue=MagicMock(side_effect=add_batch_to_queue))
+
+
+async def _read_acks(response):
+    body = b''.join([chunk async for chunk in response.body_iterator])
+    return [json.loads(line) for line in body.decode().splitlines()]
+
+
+async def _upload(*chunks, job_service=None):
+    job_service = job_service or _mock_job_service()
+    with patch('erica.api.v2.endpoints.tax.get_job_service', MagicMock(return_value=job_service)):
+        response = await is_valid_tax_number_stream(_mock_request(*chunks))
+    return response, await _read_acks(response)
+
+
+class TestReadLines:
+
+    async def test_if_lines_split_across_chunks_then_join_them(self):
+        request = _mock_request(b'{"a"', b': 1}\r\n{"b": 2}\n', b'{"c"', b': 3}')
+
+        lines = [line async for line in _read_lines(request, 100)]
+
+        assert lines == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+
+    async def test_if_line_too_long_then_yield_none_and_continue_with_next_line(self):
+        request = _mock_request(b'{"a": 1}\n{"b": ', b'"too long"}\n{"c": 3}\n')
+
+        lines = [line async for line in _read_lines(request, 10)]
+
+        assert lines == [b'{"a": 1}', None, b'{"c": 3}']
+
+
+class TestNdjsonIngestionResponse:
+
+    async def test_if_lines_valid_then_acknowledge_each_line_and_summarise_batch(self):
+        job_service = _mock_job_service()
+
+        response, acks = await _upload(_line() + b'\n' + _line() + b'\n', job_service=job_service)
+
+        assert response.status_code == 200
+        assert response.media_type == NDJSON_MEDIA_TYPE
+        summary = acks[-1]
+        assert [ack['line'] for ack in acks[:-1]] == [1, 2]
+        assert all('requestId' in ack and 'errorCode' not in ack for ack in acks[:-1])
+        assert summary == {'batchId': summary['batchId'], 'accepted': 2, 'rejected': 0}
+        assert response.headers['Location'] == f"v2/get_valid_tax_number_batch/{summary['batchId']}"
+        payloads, client_identifier, request_type = job_service.add_batch_to_queue.call_args.args
+        assert payloads == [CheckTaxNumberDto.parse_raw(_line()).payload] * 2
+        assert client_identifier == "steuerlotse"
+        assert request_type == RequestType.check_tax_number
+
+    async def test_if_line_invalid_then_reject_only_that_line(self):
+        response, acks = await _upload(_line() + b'\n{"payload": {}}\n\n' + _line())
+
+        assert [ack['line'] for ack in acks[:-1]] == [1, 2, 4]
+        assert 'requestId' in acks[0] and 'requestId' in acks[2]
+        assert acks[1]['errorCode'] == 'ValidationError'
+        assert 'requestId' not in acks[1]
+        assert acks[-1]['accepted'] == 2
+        assert acks[-1]['rejected'] == 1
+
+    async def test_if_no_line_valid_then_do_not_return_location(self):
+        response, acks = await _upload(b'no json\n')
+
+        assert acks[-1]['accepted'] == 0
+        assert 'Location' not in response.headers
+
+    async def test_if_more_lines_than_chunk_size_then_add_each_chunk_to_same_batch(self):
+        job_service = _mock_job_service()
+
+        with patch.object(get_settings(), 'ndjson_chunk_size', 2):
+            _, acks = await _upload(b'\n'.join([_line()] * 5), job_service=job_service)
+
+        batch_sizes = [len(call.args[0]) for call in job_service.add_batch_to_queue.call_args_list]
+        assert batch_sizes == [2, 2, 1]
+        assert {call.kwargs['batch_id'] for call in job_service.add_batch_to_queue.call_args_list} == \
+               {uuid.UUID(acks[-1]['batchId'])}
+        assert len({ack['requestId'] for ack in acks[:-1]}) == 5
+
+    async def test_if_lines_of_different_clients_then_keep_client_identifier_of_each_line(self):
+        job_service = _mock_job_service()
+
+        _, acks = await _upload(_line("steuerlotse") + b'\n' + _line("grundsteuer") + b'\n' + _line("steuerlotse"),
+                                job_service=job_service)
+
+        client_identifiers = {call.args[1]: len(call.args[0])
+                              for call in job_service.add_batch_to_queue.call_args_list}
+        assert client_identifiers == {"steuerlotse": 2, "grundsteuer": 1}
+        assert [ack['line'] for ack in acks[:-1]] == [1, 2, 3]
+
+    async def test_if_response_returned_then_all_chunks_already_processed(self):
+        job_service = _mock_job_service()
+
+        with patch.object(get_settings(), 'ndjson_chunk_size', 1), \
+                patch('erica.api.v2.endpoints.tax.get_job_service', MagicMock(return_value=job_service)):
+            response = await is_valid_tax_number_stream(_mock_request(_line() + b'\n', _line() + b'\n', _line()))
+
+        assert job_service.add_batch_to_queue.call_count == 3
+        assert len(await _read_acks(response)) == 4
+
+    def test_if_openapi_generated_then_describe_that_acks_follow_the_upload(self):
+        operation = app.openapi()['paths']['/v2/fsc/request/stream']['post']
+
+        assert NDJSON_MEDIA_TYPE in operation['responses']['200']['content']
+        assert "after the whole upload has been read" in operation['responses']['200']['description']
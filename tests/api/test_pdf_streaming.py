@@ -0,0 +1,211 @@
+import base64
+import json
+import os
+import tempfile
+import threading
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from erica.api.dto.response_dto import JobState
+from erica.api.errors import PdfNotAvailableError
+from erica.api.service.grundsteuer_service import GrundsteuerService
+from erica.api.service.tax_declaration_service import TaxDeclarationService
+from erica.api.v2.endpoints.est import get_send_est_pdf, get_send_est_job
+from erica.api.v2.endpoints.grundsteuer import get_grundsteuer_job, get_grundsteuer_pdf
+from erica.api.v2.responses.pdf_streaming import _preferred_media_type
+from erica.domain.blob_store.local_blob_store import LocalBlobStore
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+
+
+async def _read_body(response):
+    return b''.join([chunk async for chunk in response.body_iterator])
+
+
+def _get_service_patch(endpoint, erica_request, service_class):
+    mock_service = MagicMock(get_request_by_request_id=AsyncMock(return_value=erica_request))
+    return patch(f"erica.api.v2.endpoints.{endpoint}.get_service",
+                 MagicMock(return_value=service_class(service=mock_service)))
+
+
+@pytest.fixture
+def blob_store():
+    with tempfile.TemporaryDirectory() as directory:
+        blob_store = LocalBlobStore(directory)
+        with patch('erica.api.v2.responses.pdf_streaming.get_blob_store', MagicMock(return_value=blob_store)):
+            yield blob_store
+
+
+@pytest.fixture
+def pdf():
+    # Not a multiple of the chunk size, so that the last chunk needs base64 padding
+    return os.urandom(3 * 64 * 1024 * 2 + 1)
+
+
+def _create_request(request_type, result, status=Status.success):
+    return EricaRequest(type=request_type, status=status, payload={}, result=result, request_id=uuid.uuid4(),
+                        creator_id="test")
+
+
+@pytest.mark.asyncio
+async def test_if_pdf_in_blob_store_then_streamed_body_equals_inline_body(blob_store, pdf):
+    blob_store.put('pdf/1.pdf', pdf)
+    inline_request = _create_request(RequestType.grundsteuer, {"transferticket": "ticket",
+                                                                "pdf": base64.b64encode(pdf).decode()})
+    blob_request = _create_request(RequestType.grundsteuer, {"transferticket": "ticket", "pdf_key": 'pdf/1.pdf'})
+
+    with _get_service_patch("grundsteuer", inline_request, GrundsteuerService):
+        inline_response = await get_grundsteuer_job(inline_request.request_id)
+    with _get_service_patch("grundsteuer", blob_request, GrundsteuerService):
+        streamed_response = await get_grundsteuer_job(blob_request.request_id)
+    streamed_body = await _read_body(streamed_response)
+
+    assert json.loads(streamed_body) == jsonable_encoder(inline_response)
+    assert int(streamed_response.headers['content-length']) == len(streamed_body)
+
+
+@pytest.mark.asyncio
+async def test_if_pdf_requested_without_range_then_return_whole_pdf(blob_store, pdf):
+    blob_store.put('pdf/1.pdf', pdf)
+    erica_request = _create_request(RequestType.send_est, {"transferticket": "ticket", "pdf_key": 'pdf/1.pdf'})
+
+    with _get_service_patch("est", erica_request, TaxDeclarationService):
+        response = await get_send_est_pdf(erica_request.request_id, MagicMock(headers={}))
+
+    assert response.status_code == 200
+    assert response.media_type == 'application/pdf'
+    assert response.headers['accept-ranges'] == 'bytes'
+    assert await _read_body(response) == pdf
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("range_header, expected_first, expected_last",
+                         [("bytes=10-19", 10, 19), ("bytes=-10", -10, None), ("bytes=100-", 100, None)])
+async def test_if_pdf_requested_with_range_then_return_partial_content(blob_store, pdf, range_header,
+                                                                       expected_first, expected_last):
+    blob_store.put('pdf/1.pdf', pdf)
+    erica_request = _create_request(RequestType.grundsteuer, {"transferticket": "ticket", "pdf_key": 'pdf/1.pdf'})
+    expected_content = pdf[expected_first:expected_last + 1 if expected_last is not None else None]
+
+    with _get_service_patch("grundsteuer", erica_request, GrundsteuerService):
+        response = await get_grundsteuer_pdf(erica_request.request_id, MagicMock(headers={'range': range_header}))
+
+    assert response.status_code == 206
+    assert response.headers['content-range'].endswith(f"/{len(pdf)}")
+    assert int(response.headers['content-length']) == len(expected_content)
+    assert await _read_body(response) == expected_content
+
+
+@pytest.mark.asyncio
+async def test_if_inline_pdf_requested_with_range_then_return_partial_content():
+    erica_request = _create_request(RequestType.grundsteuer, {"transferticket": "ticket",
+                                                               "pdf": base64.b64encode(b'0123456789').decode()})
+
+    with _get_service_patch("grundsteuer", erica_request, GrundsteuerService):
+        response = await get_grundsteuer_pdf(erica_request.request_id, MagicMock(headers={'range': 'bytes=2-5'}))
+
+    assert response.status_code == 206
+    assert response.headers['content-range'] == 'bytes 2-5/10'
+    assert await _read_body(response) == b'2345'
+
+
+@pytest.mark.asyncio
+async def test_if_range_not_satisfiable_then_return_416(blob_store):
+    blob_store.put('pdf/1.pdf', b'0123456789')
+    erica_request = _create_request(RequestType.grundsteuer, {"transferticket": "ticket", "pdf_key": 'pdf/1.pdf'})
+
+    with _get_service_patch("grundsteuer", erica_request, GrundsteuerService):
+        response = await get_grundsteuer_pdf(erica_request.request_id, MagicMock(headers={'range': 'bytes=10-'}))
+
+    assert response.status_code == 416
+    assert response.headers['content-range'] == 'bytes */10'
+
+
+@pytest.mark.asyncio
+async def test_if_job_not_successful_then_pdf_is_not_available():
+    erica_request = _create_request(RequestType.grundsteuer, None, status=Status.processing)
+
+    with _get_service_patch("grundsteuer", erica_request, GrundsteuerService), \
+            pytest.raises(PdfNotAvailableError):
+        await get_grundsteuer_pdf(erica_request.request_id, MagicMock(headers={}))
+
+
+@pytest.mark.parametrize("accept_header, expected_media_type",
+                         [(None, 'application/json'),
+                          ('*/*', 'application/json'),
+                          ('application/pdf', 'application/pdf'),
+                          ('application/json;q=0.5, application/pdf', 'application/pdf'),
+                          ('application/pdf;q=0.5, application/json', 'application/json'),
+                          ('multipart/mixed, application/json;q=0.9', 'multipart/mixed'),
+                          ('application/pdf;q=0', 'application/json'),
+                          ('text/html', 'application/json')])
+def test_if_accept_header_given_then_return_preferred_media_type(accept_header, expected_media_type):
+    assert _preferred_media_type(accept_header) == expected_media_type
+
+
+@pytest.mark.asyncio
+async def test_if_job_requested_as_pdf_then_return_pdf_binary(blob_store, pdf):
+    blob_store.put('pdf/1.pdf', pdf)
+    erica_request = _create_request(RequestType.send_est, {"transferticket": "ticket", "pdf_key": 'pdf/1.pdf'})
+
+    with _get_service_patch("est", erica_request, TaxDeclarationService):
+        response = await get_send_est_job(erica_request.request_id, MagicMock(headers={'accept': 'application/pdf'}))
+
+    assert response.media_type == 'application/pdf'
+    assert await _read_body(response) == pdf
+
+
+@pytest.mark.asyncio
+async def test_if_inline_job_requested_as_multipart_then_return_json_and_pdf_binary_parts():
+    erica_request = _create_request(RequestType.grundsteuer, {"transferticket": "ticket",
+                                                               "pdf": base64.b64encode(b'%PDF-1.4').decode()})
+
+    with _get_service_patch("grundsteuer", erica_request, GrundsteuerService):
+        response = await get_grundsteuer_job(erica_request.request_id,
+                                             MagicMock(headers={'accept': 'multipart/mixed'}))
+    body = await _read_body(response)
+
+    boundary = response.media_type.split('boundary=')[1]
+    parts = body.split(f"--{boundary}".encode())
+    assert parts[0] == b''
+    assert parts[-1] == b'--\r\n'
+    json_headers, json_body = parts[1].split(b'\r\n\r\n', 1)
+    assert b'Content-Type: application/json' in json_headers
+    assert json.loads(json_body) == {"processStatus": "Success", "result": {"transferticket": "ticket"},
+                                     "errorCode": None, "errorMessage": None}
+    pdf_headers, pdf_body = parts[2].split(b'\r\n\r\n', 1)
+    assert b'Content-Type: application/pdf' in pdf_headers
+    assert pdf_body == b'%PDF-1.4\r\n'
+
+
+@pytest.mark.asyncio
+async def test_if_unfinished_job_requested_as_pdf_then_return_json_response():
+    erica_request = _create_request(RequestType.grundsteuer, None, status=Status.processing)
+
+    with _get_service_patch("grundsteuer", erica_request, GrundsteuerService):
+        response = await get_grundsteuer_job(erica_request.request_id, MagicMock(headers={'accept': 'application/pdf'}))
+
+    assert response.process_status == JobState.PROCESSING
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('accept_header', ['application/json', 'multipart/mixed', 'application/pdf'])
+async def test_if_job_with_pdf_in_blob_store_requested_then_blob_is_read_in_threadpool_before_response_is_returned(
+        blob_store, pdf, accept_header):
+    blob_store.put('pdf/1.pdf', pdf)
+    erica_request = _create_request(RequestType.send_est, {"transferticket": "ticket", "pdf_key": 'pdf/1.pdf'})
+    accessing_threads = []
+    spying_blob_store = MagicMock(wraps=blob_store)
+    spying_blob_store.read_chunks.side_effect = lambda *args, **kwargs: \
+        accessing_threads.append(threading.get_ident()) or blob_store.read_chunks(*args, **kwargs)
+
+    with _get_service_patch("est", erica_request, TaxDeclarationService), \
+            patch('erica.api.v2.responses.pdf_streaming.get_blob_store', MagicMock(return_value=spying_blob_store)):
+        response = await get_send_est_job(erica_request.request_id, MagicMock(headers={'accept': accept_header}))
+
+    assert len(accessing_threads) == 1
+    assert accessing_threads[0] != threading.get_ident()
+    assert await _read_body(response)
+    assert len(accessing_threads) == 1
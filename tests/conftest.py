@@ -22,7 +22,7 @@ from opyoid import Injector
 from sqlalchemy.orm import sessionmaker
 
 from erica.api.api_module import ApiModule
-from erica.api.service.erica_request_service import EricaRequestServiceInterface, EricaRequestService
+from erica.domain.sqlalchemy.repositories.erica_request_repository import EricaRequestRepository
 from erica.config import get_settings
 from erica.worker.request_processing.erica_input.v1.erica_input import FormDataEst
 from erica.domain.sqlalchemy.database import get_engine, session_scope
@@ -132,9 +132,9 @@ def fake_db_connection_with_erica_table_in_settings(database_uri):
         yield postgresql_url
 
         with session_scope():
-            erica_request_service: EricaRequestService = Injector([ApiModule()]).inject(EricaRequestServiceInterface)
-            entities = erica_request_service.erica_request_repository.get()
+            erica_request_repository = Injector([ApiModule()]).inject(EricaRequestRepository)
+            entities = erica_request_repository.get()
 
             for entity in entities:
-                erica_request_service.erica_request_repository.db_connection.delete(entity)
+                erica_request_repository.db_connection.delete(entity)
     get_settings().database_url = original_db_url
@@ -0,0 +1,66 @@
+import datetime as dt
+import unittest
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from erica.domain.blob_store.blob_store_interface import BlobNotFoundError
+from erica.domain.blob_store.database_blob_store import DatabaseBlobStore
+from erica.domain.sqlalchemy.erica_request_artifact_schema import EricaRequestArtifactSchema
+
+
+class TestDatabaseBlobStore(unittest.TestCase):
+
+    def setUp(self):
+        # Only the artifact table is created, which does not use any PostgreSQL specific types
+        engine = create_engine('sqlite://')
+        EricaRequestArtifactSchema.__table__.create(engine)
+        self.session = sessionmaker(bind=engine)()
+        self.blob_store = DatabaseBlobStore(lambda: self.session)
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_if_blob_put_then_raw_bytes_are_stored(self):
+        self.blob_store.put('pdf/1.pdf', bytearray(b'%PDF-1.4 \x00\xff'), content_type='application/pdf')
+
+        artifact = self.session.query(EricaRequestArtifactSchema).one()
+        self.assertEqual(b'%PDF-1.4 \x00\xff', artifact.content)
+        self.assertEqual('application/pdf', artifact.content_type)
+
+    def test_if_blob_put_then_size_and_content_are_returned(self):
+        self.blob_store.put('pdf/1.pdf', b'0123456789')
+
+        self.assertEqual(10, self.blob_store.size('pdf/1.pdf'))
+        self.assertEqual([b'0123', b'4567', b'89'], list(self.blob_store.read_chunks('pdf/1.pdf', chunk_size=4)))
+
+    def test_if_range_read_then_return_bytes_from_start_to_end_inclusive(self):
+        self.blob_store.put('pdf/1.pdf', b'0123456789')
+
+        self.assertEqual(b'2345', b''.join(self.blob_store.read_chunks('pdf/1.pdf', start=2, end=5)))
+        self.assertEqual(b'789', b''.join(self.blob_store.read_chunks('pdf/1.pdf', start=7)))
+
+    def test_if_blob_missing_then_raise_blob_not_found_error(self):
+        self.assertRaises(BlobNotFoundError, self.blob_store.size, 'pdf/missing.pdf')
+        self.assertRaises(BlobNotFoundError, self.blob_store.read_chunks, 'pdf/missing.pdf')
+
+    def test_if_blob_deleted_then_it_is_gone(self):
+        self.blob_store.put('pdf/1.pdf', b'content')
+
+        self.blob_store.delete('pdf/1.pdf')
+
+        self.assertRaises(BlobNotFoundError, self.blob_store.size, 'pdf/1.pdf')
+
+    def test_if_delete_older_than_then_only_old_blobs_are_deleted(self):
+        self.blob_store.put('pdf/old.pdf', b'old')
+        self.blob_store.put('pdf/new.pdf', b'new')
+        self.session.execute(update(EricaRequestArtifactSchema)
+                             .where(EricaRequestArtifactSchema.key == 'pdf/old.pdf')
+                             .values(created_at=dt.datetime.now(dt.timezone.utc) - dt.timedelta(hours=2)))
+        self.session.commit()
+
+        deleted = self.blob_store.delete_older_than(dt.timedelta(hours=1))
+
+        self.assertEqual(1, deleted)
+        self.assertRaises(BlobNotFoundError, self.blob_store.size, 'pdf/old.pdf')
+        self.assertEqual(3, self.blob_store.size('pdf/new.pdf'))
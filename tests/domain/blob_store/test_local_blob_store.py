@@ -0,0 +1,62 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+
+from erica.domain.blob_store.blob_store_interface import BlobNotFoundError
+from erica.domain.blob_store.local_blob_store import LocalBlobStore
+
+
+class TestLocalBlobStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.blob_store = LocalBlobStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_if_blob_put_then_size_and_content_are_returned(self):
+        self.blob_store.put('pdf/1.pdf', b'%PDF-1.4 content')
+
+        self.assertEqual(16, self.blob_store.size('pdf/1.pdf'))
+        self.assertEqual(b'%PDF-1.4 content', b''.join(self.blob_store.read_chunks('pdf/1.pdf')))
+
+    def test_if_chunks_read_then_chunks_have_at_most_chunk_size(self):
+        self.blob_store.put('pdf/1.pdf', b'0123456789')
+
+        chunks = list(self.blob_store.read_chunks('pdf/1.pdf', chunk_size=4))
+
+        self.assertEqual([b'0123', b'4567', b'89'], chunks)
+
+    def test_if_range_read_then_return_bytes_from_start_to_end_inclusive(self):
+        self.blob_store.put('pdf/1.pdf', b'0123456789')
+
+        self.assertEqual(b'2345', b''.join(self.blob_store.read_chunks('pdf/1.pdf', start=2, end=5, chunk_size=3)))
+
+    def test_if_blob_missing_then_raise_blob_not_found_error(self):
+        self.assertRaises(BlobNotFoundError, self.blob_store.size, 'pdf/missing.pdf')
+        self.assertRaises(BlobNotFoundError, self.blob_store.read_chunks, 'pdf/missing.pdf')
+
+    def test_if_key_leaves_directory_then_raise_value_error(self):
+        self.assertRaises(ValueError, self.blob_store.put, '../outside.pdf', b'content')
+
+    def test_if_blob_deleted_then_it_is_gone(self):
+        self.blob_store.put('pdf/1.pdf', b'content')
+
+        self.blob_store.delete('pdf/1.pdf')
+
+        self.assertRaises(BlobNotFoundError, self.blob_store.size, 'pdf/1.pdf')
+
+    def test_if_delete_older_than_then_only_old_blobs_are_deleted(self):
+        self.blob_store.put('pdf/old.pdf', b'old')
+        self.blob_store.put('pdf/new.pdf', b'new')
+        two_hours_ago = time.time() - 2 * 60 * 60
+        os.utime(os.path.join(self.directory.name, 'pdf/old.pdf'), (two_hours_ago, two_hours_ago))
+
+        deleted = self.blob_store.delete_older_than(timedelta(hours=1))
+
+        self.assertEqual(1, deleted)
+        self.assertRaises(BlobNotFoundError, self.blob_store.size, 'pdf/old.pdf')
+        self.assertEqual(3, self.blob_store.size('pdf/new.pdf'))
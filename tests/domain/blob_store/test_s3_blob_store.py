@@ -0,0 +1,82 @@
+import os
+import unittest
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from erica.domain.blob_store.blob_store_interface import BlobNotFoundError
+from erica.domain.blob_store.s3_blob_store import S3BlobStore
+
+
+def _not_found_error(operation_name):
+    return ClientError({'Error': {'Code': '404', 'Message': 'Not Found'}}, operation_name)
+
+
+class TestS3BlobStore(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.blob_store = S3BlobStore('bucket', client=self.client)
+
+    def test_if_blob_put_then_put_object_with_content_type(self):
+        self.blob_store.put('pdf/1.pdf', bytearray(b'content'), content_type='application/pdf')
+
+        self.client.put_object.assert_called_once_with(Bucket='bucket', Key='pdf/1.pdf', Body=b'content',
+                                                       ContentType='application/pdf')
+
+    def test_if_range_read_then_request_range_from_storage(self):
+        self.client.get_object.return_value = {'Body': MagicMock(iter_chunks=MagicMock(return_value=iter([b'23'])))}
+
+        chunks = list(self.blob_store.read_chunks('pdf/1.pdf', start=2, end=3))
+
+        self.client.get_object.assert_called_once_with(Bucket='bucket', Key='pdf/1.pdf', Range='bytes=2-3')
+        self.assertEqual([b'23'], chunks)
+
+    def test_if_whole_blob_read_then_do_not_request_range(self):
+        self.client.get_object.return_value = {'Body': MagicMock(iter_chunks=MagicMock(return_value=iter([])))}
+
+        list(self.blob_store.read_chunks('pdf/1.pdf'))
+
+        self.client.get_object.assert_called_once_with(Bucket='bucket', Key='pdf/1.pdf')
+
+    def test_if_blob_missing_then_raise_blob_not_found_error(self):
+        self.client.head_object.side_effect = _not_found_error('HeadObject')
+        self.client.get_object.side_effect = _not_found_error('GetObject')
+
+        self.assertRaises(BlobNotFoundError, self.blob_store.size, 'pdf/missing.pdf')
+        self.assertRaises(BlobNotFoundError, self.blob_store.read_chunks, 'pdf/missing.pdf')
+
+    def test_if_delete_older_than_then_only_old_blobs_are_deleted(self):
+        now = datetime.now(timezone.utc)
+        self.client.get_paginator.return_value.paginate.return_value = [
+            {'Contents': [{'Key': 'pdf/old.pdf', 'LastModified': now - timedelta(hours=2)},
+                          {'Key': 'pdf/new.pdf', 'LastModified': now}]},
+            {}]
+
+        deleted = self.blob_store.delete_older_than(timedelta(hours=1))
+
+        self.assertEqual(1, deleted)
+        self.client.delete_objects.assert_called_once_with(
+            Bucket='bucket', Delete={'Objects': [{'Key': 'pdf/old.pdf'}], 'Quiet': True})
+
+
+@unittest.skipIf(not os.environ.get('ERICA_TEST_S3_ENDPOINT_URL'),
+                 "Set ERICA_TEST_S3_ENDPOINT_URL to an S3-compatible storage, e.g. MinIO, to run this test")
+class TestS3BlobStoreIntegration(unittest.TestCase):
+
+    def setUp(self):
+        self.blob_store = S3BlobStore(os.environ.get('ERICA_TEST_S3_BUCKET_NAME', 'erica-test'),
+                                      os.environ['ERICA_TEST_S3_ENDPOINT_URL'])
+        self.key = f"pdf/{uuid.uuid4()}.pdf"
+
+    def tearDown(self):
+        self.blob_store.delete(self.key)
+
+    def test_if_blob_put_then_it_can_be_read_in_ranges(self):
+        self.blob_store.put(self.key, b'0123456789', content_type='application/pdf')
+
+        self.assertEqual(10, self.blob_store.size(self.key))
+        self.assertEqual(b'0123456789', b''.join(self.blob_store.read_chunks(self.key)))
+        self.assertEqual(b'2345', b''.join(self.blob_store.read_chunks(self.key, start=2, end=5)))
@@ -0,0 +1,115 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+from redis import RedisError
+
+from erica.config import get_settings
+from erica.domain.job_completion.job_completion_listener import JobCompletionListener, job_completion_waiter, \
+    get_job_completion_listener
+from erica.domain.job_completion.job_completion_notifier import JobCompletionNotifier, notify_job_completion, \
+    get_job_completion_notifier
+
+CHANNEL = 'erica-job-completed-test'
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+async def listener(redis_server):
+    listener = JobCompletionListener(lambda: fakeredis.aioredis.FakeRedis(server=redis_server), CHANNEL)
+    yield listener
+    await listener.close()
+
+
+@pytest.fixture
+def notifier(redis_server):
+    return JobCompletionNotifier(fakeredis.FakeRedis(server=redis_server), CHANNEL)
+
+
+async def _wait_for_subscription(redis_server):
+    client = fakeredis.FakeRedis(server=redis_server)
+    for _ in range(100):
+        if client.pubsub_numsub(CHANNEL)[0][1]:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Listener never subscribed")
+
+
+class TestJobCompletionNotifier:
+
+    def test_if_job_completed_then_publish_request_id(self, redis_server, notifier):
+        pubsub = fakeredis.FakeRedis(server=redis_server).pubsub()
+        pubsub.subscribe(CHANNEL)
+        pubsub.get_message()
+        request_id = uuid4()
+
+        notifier.notify(request_id)
+
+        assert pubsub.get_message()['data'] == str(request_id).encode()
+
+    def test_if_redis_not_available_then_do_not_raise(self):
+        notifier = JobCompletionNotifier(MagicMock(publish=MagicMock(side_effect=RedisError)), CHANNEL)
+
+        notifier.notify(uuid4())
+
+    def test_if_notifications_disabled_then_do_not_publish(self):
+        get_job_completion_notifier.cache_clear()
+        try:
+            with patch.object(get_settings(), 'notify_job_completion', False), \
+                    patch('erica.domain.job_completion.job_completion_notifier.redis.Redis.from_url') as from_url:
+                notify_job_completion(uuid4())
+        finally:
+            get_job_completion_notifier.cache_clear()
+
+        from_url.assert_not_called()
+
+
+class TestJobCompletionListener:
+
+    async def test_if_job_completion_published_then_wake_up_waiter(self, redis_server, listener, notifier):
+        request_id = uuid4()
+
+        with listener.waiter(request_id) as waiter:
+            await _wait_for_subscription(redis_server)
+            notifier.notify(request_id)
+
+            assert await waiter.wait(timeout=1) is True
+
+    async def test_if_other_job_completed_then_do_not_wake_up_waiter(self, redis_server, listener, notifier):
+        with listener.waiter(uuid4()) as waiter:
+            await _wait_for_subscription(redis_server)
+            notifier.notify(uuid4())
+
+            assert await waiter.wait(timeout=0.05) is False
+
+    async def test_if_several_waiters_for_job_then_wake_up_all(self, redis_server, listener, notifier):
+        request_id = uuid4()
+
+        with listener.waiter(request_id) as first_waiter, listener.waiter(request_id) as second_waiter:
+            await _wait_for_subscription(redis_server)
+            notifier.notify(request_id)
+
+            assert await first_waiter.wait(timeout=1) is True
+            assert await second_waiter.wait(timeout=1) is True
+
+    async def test_if_waiter_done_then_remove_it(self, listener):
+        with listener.waiter(uuid4()):
+            pass
+
+        assert listener._waiters == {}
+
+    async def test_if_notifications_disabled_then_waiter_only_times_out(self):
+        get_job_completion_listener.cache_clear()
+        try:
+            with patch.object(get_settings(), 'notify_job_completion', False), \
+                    job_completion_waiter(uuid4()) as waiter:
+                assert await waiter.wait(timeout=0.01) is False
+        finally:
+            get_job_completion_listener.cache_clear()
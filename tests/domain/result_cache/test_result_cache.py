@@ -0,0 +1,241 @@
+import datetime
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+from prometheus_client import REGISTRY
+from redis import RedisError
+
+from erica.config import get_settings
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.domain.result_cache.result_cache import ResultCache, ResultCacheWriter, get_result_cache, \
+    get_result_cache_writer, cache_finished_request, CachedRequest
+
+TTL = timedelta(minutes=20)
+
+
+def _erica_request(status=Status.success, updated_at=None, request_type=RequestType.grundsteuer,
+                   result=None):
+    return EricaRequest(type=request_type, status=status, payload={'endboss': 'Melkor'},
+                        result=result or {'transferticket': 'Atlantis', 'pdf_key': 'pdf/atlantis.pdf'},
+                        request_id=uuid4(), creator_id="test", updated_at=updated_at)
+
+
+def _now_in_database():
+    # updated_at is a column with time zone, so the database returns it with its time zone
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _cached(erica_request):
+    return CachedRequest.from_erica_request(erica_request)
+
+
+def _sample_value(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {}) or 0
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_cache(redis_server):
+    return ResultCache(10, TTL, fakeredis.aioredis.FakeRedis(server=redis_server))
+
+
+@pytest.fixture
+def writer(redis_server):
+    return ResultCacheWriter(fakeredis.FakeRedis(server=redis_server), TTL)
+
+
+class TestResultCache:
+
+    async def test_if_request_not_cached_then_return_none_and_count_miss(self):
+        misses = _sample_value('erica_result_cache_misses_total')
+
+        assert await ResultCache(10, TTL).get(uuid4()) is None
+        assert _sample_value('erica_result_cache_misses_total') == misses + 1
+
+    async def test_if_finished_request_put_then_return_it_from_memory_and_count_hit(self):
+        result_cache = ResultCache(10, TTL)
+        erica_request = _erica_request()
+        hits = _sample_value('erica_result_cache_hits_total', {'tier': 'memory'})
+
+        await result_cache.put(erica_request)
+
+        assert await result_cache.get(erica_request.request_id) == _cached(erica_request)
+        assert _sample_value('erica_result_cache_hits_total', {'tier': 'memory'}) == hits + 1
+
+    @pytest.mark.parametrize("status", [Status.new, Status.scheduled, Status.processing])
+    async def test_if_unfinished_request_put_then_do_not_cache_it(self, redis_cache, status):
+        erica_request = _erica_request(status)
+
+        await redis_cache.put(erica_request)
+
+        assert await redis_cache.get(erica_request.request_id) is None
+
+    async def test_if_more_requests_than_max_entries_then_evict_least_recently_used(self):
+        result_cache = ResultCache(2, TTL)
+        first, second, third = _erica_request(), _erica_request(), _erica_request()
+        await result_cache.put(first)
+        await result_cache.put(second)
+        await result_cache.get(first.request_id)
+
+        await result_cache.put(third)
+
+        assert await result_cache.get(first.request_id) == _cached(first)
+        assert await result_cache.get(second.request_id) is None
+        assert await result_cache.get(third.request_id) == _cached(third)
+
+    async def test_if_request_older_than_ttl_then_do_not_cache_it(self):
+        result_cache = ResultCache(10, TTL)
+        erica_request = _erica_request(updated_at=_now_in_database() - TTL - timedelta(seconds=1))
+
+        await result_cache.put(erica_request)
+
+        assert await result_cache.get(erica_request.request_id) is None
+
+    async def test_if_request_updated_within_ttl_then_cache_it_until_ttl_passed(self, redis_server, redis_cache):
+        erica_request = _erica_request(updated_at=_now_in_database() - timedelta(minutes=5))
+
+        await redis_cache.put(erica_request)
+
+        assert await redis_cache.get(erica_request.request_id) == _cached(erica_request)
+        ttl = fakeredis.FakeRedis(server=redis_server).ttl(f"erica-finished-request:{erica_request.request_id}")
+        assert 0 < ttl <= (TTL - timedelta(minutes=5)).total_seconds()
+
+    async def test_if_result_contains_pdf_then_cache_it_without_pdf(self, redis_server, redis_cache):
+        erica_request = _erica_request(result={'transferticket': 'Atlantis', 'pdf': 'SGVsbG8='})
+
+        await redis_cache.put(erica_request)
+
+        other_process_cache = ResultCache(10, TTL, fakeredis.aioredis.FakeRedis(server=redis_server))
+        for result_cache in (redis_cache, other_process_cache):
+            cached_request = await result_cache.get(erica_request.request_id)
+            assert cached_request.result == {'transferticket': 'Atlantis'}
+            assert cached_request.has_inline_pdf is True
+        assert erica_request.result == {'transferticket': 'Atlantis', 'pdf': 'SGVsbG8='}
+
+    @pytest.mark.parametrize("request_type", [RequestType.freischalt_code_request,
+                                              RequestType.freischalt_code_activate,
+                                              RequestType.freischalt_code_revocate])
+    async def test_if_response_contains_payload_then_only_cache_failed_request(self, redis_cache, request_type):
+        succeeded = _erica_request(request_type=request_type)
+        failed = _erica_request(Status.failed, request_type=request_type)
+
+        await redis_cache.put(succeeded)
+        await redis_cache.put(failed)
+
+        assert await redis_cache.get(succeeded.request_id) is None
+        assert await redis_cache.get(failed.request_id) == _cached(failed)
+
+    async def test_if_ttl_passed_then_expire_request_in_memory(self):
+        result_cache = ResultCache(10, TTL)
+        erica_request = _erica_request()
+        await result_cache.put(erica_request)
+
+        with patch('erica.domain.result_cache.expiring_lru_cache.time.monotonic',
+                   MagicMock(return_value=10 ** 9)):
+            assert await result_cache.get(erica_request.request_id) is None
+
+    async def test_if_request_written_by_worker_then_return_it_from_redis_and_keep_it_in_memory(self, redis_cache,
+                                                                                                writer):
+        erica_request = _erica_request()
+        redis_hits = _sample_value('erica_result_cache_hits_total', {'tier': 'redis'})
+        memory_hits = _sample_value('erica_result_cache_hits_total', {'tier': 'memory'})
+
+        writer.add(erica_request)
+
+        assert await redis_cache.get(erica_request.request_id) == _cached(erica_request)
+        assert await redis_cache.get(erica_request.request_id) == _cached(erica_request)
+        assert _sample_value('erica_result_cache_hits_total', {'tier': 'redis'}) == redis_hits + 1
+        assert _sample_value('erica_result_cache_hits_total', {'tier': 'memory'}) == memory_hits + 1
+
+    async def test_if_request_put_then_write_it_to_redis_for_other_processes(self, redis_server, redis_cache):
+        erica_request = _erica_request()
+
+        await redis_cache.put(erica_request)
+
+        other_process_cache = ResultCache(10, TTL, fakeredis.aioredis.FakeRedis(server=redis_server))
+        assert await other_process_cache.get(erica_request.request_id) == _cached(erica_request)
+
+    async def test_if_redis_not_available_then_fall_back_to_miss(self):
+        redis_client = MagicMock(get=MagicMock(side_effect=RedisError))
+
+        assert await ResultCache(0, TTL, redis_client).get(uuid4()) is None
+
+
+class TestResultCacheWriter:
+
+    def test_if_request_added_then_expire_it_with_ttl(self, redis_server, writer):
+        erica_request = _erica_request()
+
+        assert writer.add(erica_request) is True
+
+        ttl = fakeredis.FakeRedis(server=redis_server).ttl(f"erica-finished-request:{erica_request.request_id}")
+        assert 0 < ttl <= TTL.total_seconds()
+
+    def test_if_request_added_then_do_not_write_payload(self, redis_server, writer):
+        erica_request = _erica_request()
+
+        writer.add(erica_request)
+
+        serialised_request = fakeredis.FakeRedis(server=redis_server).get(
+            f"erica-finished-request:{erica_request.request_id}")
+        assert b'Melkor' not in serialised_request
+        assert CachedRequest.parse_raw(serialised_request) == _cached(erica_request)
+
+    def test_if_result_contains_pdf_then_add_request_without_pdf(self, redis_server, writer):
+        erica_request = _erica_request(result={'transferticket': 'Atlantis', 'pdf': 'SGVsbG8='})
+
+        assert writer.add(erica_request) is True
+
+        serialised_request = fakeredis.FakeRedis(server=redis_server).get(
+            f"erica-finished-request:{erica_request.request_id}")
+        assert b'SGVsbG8=' not in serialised_request
+        assert CachedRequest.parse_raw(serialised_request).has_inline_pdf is True
+
+    async def test_if_requests_removed_then_do_not_return_them_anymore(self, redis_cache, writer):
+        erica_request = _erica_request()
+        writer.add(erica_request)
+
+        writer.remove([erica_request.request_id])
+
+        assert await ResultCache(0, TTL, redis_cache.redis_client).get(erica_request.request_id) is None
+
+    def test_if_redis_not_available_then_do_not_raise(self):
+        writer = ResultCacheWriter(MagicMock(set=MagicMock(side_effect=RedisError),
+                                             delete=MagicMock(side_effect=RedisError)), TTL)
+
+        assert writer.add(_erica_request()) is False
+        writer.remove([uuid4()])
+
+
+class TestGetResultCache:
+
+    def test_if_redis_tier_disabled_then_only_cache_in_memory_and_do_not_write_from_worker(self):
+        get_result_cache.cache_clear()
+        get_result_cache_writer.cache_clear()
+        try:
+            with patch.object(get_settings(), 'result_cache_redis', False), \
+                    patch('erica.domain.result_cache.result_cache.redis.Redis.from_url') as from_url:
+                assert get_result_cache().redis_client is None
+                cache_finished_request(_erica_request())
+        finally:
+            get_result_cache.cache_clear()
+            get_result_cache_writer.cache_clear()
+
+        from_url.assert_not_called()
+
+    def test_if_cache_disabled_then_return_none(self):
+        get_result_cache.cache_clear()
+        try:
+            with patch.object(get_settings(), 'result_cache_redis', False), \
+                    patch.object(get_settings(), 'result_cache_max_entries', 0):
+                assert get_result_cache() is None
+        finally:
+            get_result_cache.cache_clear()
@@ -0,0 +1,133 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import pytest
+from prometheus_client import REGISTRY
+from redis import RedisError
+
+from erica.config import get_settings
+from erica.domain.result_cache.tax_number_validity_cache import TaxNumberValidityCache, \
+    get_tax_number_validity_cache
+
+TTL = timedelta(hours=24)
+TAX_NUMBER = '9198011310010'
+ERIC_VERSION = '<EricVersion>39.1.4</EricVersion>'
+
+
+def _sample_value(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {}) or 0
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_cache(redis_server):
+    return TaxNumberValidityCache(10, TTL, fakeredis.FakeRedis(server=redis_server))
+
+
+class TestTaxNumberValidityCache:
+
+    def test_if_tax_number_not_cached_then_return_none_and_count_miss(self):
+        misses = _sample_value('erica_tax_number_validity_cache_misses_total')
+
+        assert TaxNumberValidityCache(10, TTL).get(TAX_NUMBER, ERIC_VERSION) is None
+        assert _sample_value('erica_tax_number_validity_cache_misses_total') == misses + 1
+
+    @pytest.mark.parametrize("is_valid", [True, False])
+    def test_if_result_put_then_return_it_from_memory_and_count_hit(self, is_valid):
+        validity_cache = TaxNumberValidityCache(10, TTL)
+        hits = _sample_value('erica_tax_number_validity_cache_hits_total', {'tier': 'memory'})
+
+        validity_cache.put(TAX_NUMBER, ERIC_VERSION, is_valid)
+
+        assert validity_cache.get(TAX_NUMBER, ERIC_VERSION) is is_valid
+        assert _sample_value('erica_tax_number_validity_cache_hits_total', {'tier': 'memory'}) == hits + 1
+
+    def test_if_result_put_with_other_eric_version_then_return_none(self, redis_cache):
+        redis_cache.put(TAX_NUMBER, ERIC_VERSION, True)
+
+        assert redis_cache.get(TAX_NUMBER, '<EricVersion>40.0.0</EricVersion>') is None
+
+    def test_if_more_results_than_max_entries_then_evict_least_recently_used(self):
+        validity_cache = TaxNumberValidityCache(1, TTL)
+        validity_cache.put(TAX_NUMBER, ERIC_VERSION, True)
+
+        validity_cache.put('9198011310028', ERIC_VERSION, True)
+
+        assert validity_cache.get(TAX_NUMBER, ERIC_VERSION) is None
+
+    def test_if_ttl_passed_then_expire_result_in_memory(self):
+        validity_cache = TaxNumberValidityCache(10, TTL)
+        validity_cache.put(TAX_NUMBER, ERIC_VERSION, True)
+
+        with patch('erica.domain.result_cache.expiring_lru_cache.time.monotonic', MagicMock(return_value=10 ** 9)):
+            assert validity_cache.get(TAX_NUMBER, ERIC_VERSION) is None
+
+    @pytest.mark.parametrize("is_valid", [True, False])
+    def test_if_result_put_by_other_process_then_return_it_from_redis(self, redis_server, redis_cache, is_valid):
+        redis_hits = _sample_value('erica_tax_number_validity_cache_hits_total', {'tier': 'redis'})
+
+        redis_cache.put(TAX_NUMBER, ERIC_VERSION, is_valid)
+
+        other_process_cache = TaxNumberValidityCache(10, TTL, fakeredis.FakeRedis(server=redis_server))
+        assert other_process_cache.get(TAX_NUMBER, ERIC_VERSION) is is_valid
+        assert _sample_value('erica_tax_number_validity_cache_hits_total', {'tier': 'redis'}) == redis_hits + 1
+
+    def test_if_result_put_then_store_only_hashed_tax_number_with_ttl(self, redis_server, redis_cache):
+        redis_cache.put(TAX_NUMBER, ERIC_VERSION, True)
+
+        redis_client = fakeredis.FakeRedis(server=redis_server)
+        keys = [key.decode() for key in redis_client.keys('erica-tax-number-validity:*')]
+        assert len(keys) == 1
+        assert TAX_NUMBER not in keys[0]
+        assert 0 < redis_client.ttl(keys[0]) <= TTL.total_seconds()
+
+    def test_if_result_put_then_publish_eric_version(self, redis_server, redis_cache):
+        redis_cache.put(TAX_NUMBER, ERIC_VERSION, True)
+
+        other_process_cache = TaxNumberValidityCache(10, TTL, fakeredis.FakeRedis(server=redis_server))
+        assert other_process_cache.get_published_eric_version() == ERIC_VERSION
+
+    def test_if_eric_version_read_recently_then_do_not_read_it_again(self, redis_server, redis_cache):
+        redis_cache.put(TAX_NUMBER, ERIC_VERSION, True)
+        other_process_cache = TaxNumberValidityCache(10, TTL, fakeredis.FakeRedis(server=redis_server))
+        other_process_cache.get_published_eric_version()
+
+        redis_cache.put(TAX_NUMBER, '<EricVersion>40.0.0</EricVersion>', True)
+
+        assert other_process_cache.get_published_eric_version() == ERIC_VERSION
+        with patch('erica.domain.result_cache.tax_number_validity_cache.time.monotonic',
+                   MagicMock(return_value=10 ** 9)):
+            assert other_process_cache.get_published_eric_version() == '<EricVersion>40.0.0</EricVersion>'
+
+    def test_if_no_redis_then_no_eric_version_published(self):
+        validity_cache = TaxNumberValidityCache(10, TTL)
+        validity_cache.put(TAX_NUMBER, ERIC_VERSION, True)
+
+        assert validity_cache.get_published_eric_version() is None
+
+    def test_if_redis_not_available_then_fall_back_to_miss(self):
+        redis_client = MagicMock(get=MagicMock(side_effect=RedisError),
+                                 pipeline=MagicMock(side_effect=RedisError))
+        validity_cache = TaxNumberValidityCache(0, TTL, redis_client)
+
+        validity_cache.put(TAX_NUMBER, ERIC_VERSION, True)
+
+        assert validity_cache.get(TAX_NUMBER, ERIC_VERSION) is None
+        assert validity_cache.get_published_eric_version() is None
+
+
+class TestGetTaxNumberValidityCache:
+
+    def test_if_cache_disabled_then_return_none(self):
+        get_tax_number_validity_cache.cache_clear()
+        try:
+            with patch.object(get_settings(), 'result_cache_redis', False), \
+                    patch.object(get_settings(), 'tax_number_validity_cache_max_entries', 0):
+                assert get_tax_number_validity_cache() is None
+        finally:
+            get_tax_number_validity_cache.cache_clear()
@@ -134,14 +134,12 @@ class TestBaseRepositoryUpdate:
         # We need a mock object to be able to intercept the call to the update function
         repo = MockBaseRepository(db_connection=setup_database)
         update_mock = MagicMock()
-        mocked_get_by_id = MagicMock(side_effect=lambda request_id: MagicMock(
-            first=MagicMock(return_value=MockBaseRepository(db_connection=setup_database)._get_by_id(request_id).first()),
-            update=update_mock))
-        repo._get_by_id = mocked_get_by_id
+        repo.update_columns = update_mock
 
         repo.update(schema_object.id, updated_object)
 
-        assert update_mock.mock_calls == [call({'request_id': UUID('00000000-0000-0000-0000-000000000000')})]
+        assert update_mock.mock_calls == [call(schema_object.id,
+                                               {'request_id': UUID('00000000-0000-0000-0000-000000000000')})]
 
 
 class TestBaseRepositoryDelete:
@@ -160,14 +160,12 @@ class TestEricaRepositoryUpdateByJobId:
         # We need a mock object to be able to intercept the call to the update function
         repo = MockEricaRequestRepository(db_connection=setup_database)
         update_mock = MagicMock()
-        mocked_get_by_job_request_id = MagicMock(side_effect=lambda request_id: MagicMock(
-            first=MagicMock(return_value=MockEricaRequestRepository(db_connection=setup_database)._get_by_job_request_id(request_id).first()),
-            update=update_mock))
-        repo._get_by_job_request_id = mocked_get_by_job_request_id
+        repo.update_columns_by_job_request_id = update_mock
 
         repo.update_by_job_request_id(mock_object.request_id, updated_object)
 
-        assert update_mock.mock_calls == [call({'request_id': UUID('00000000-0000-0000-0000-000000000000')})]
+        assert update_mock.mock_calls == [call(mock_object.request_id,
+                                               {'request_id': UUID('00000000-0000-0000-0000-000000000000')})]
 
 
 class TestEricaRepositoryDeleteByJobId:
@@ -301,3 +299,41 @@ class TestEricaRepositoryUpdateProcessing:
             EricaRequestSchema.request_id == request_id).first()
         assert entity_found is not None
         assert entity_found.status == status
+
+
+class TestEricaRepositoryBulkUpdateStatus:
+
+    def test_if_request_ids_given_then_update_status_of_only_these_entities(self, setup_database):
+        repository = EricaRequestRepository(db_connection=setup_database)
+        request_ids = [uuid.uuid4() for _ in range(3)]
+        for request_id in request_ids:
+            repository.create(EricaRequest(request_id=request_id, payload={'endboss': 'Melkor'}, creator_id="api",
+                                           type=RequestType.grundsteuer, status=Status.new))
+
+        updated = repository.bulk_update_status(request_ids[:2], Status.scheduled)
+
+        assert updated == 2
+        assert [repository.get_by_job_request_id(request_id).status for request_id in request_ids] == \
+               [Status.scheduled, Status.scheduled, Status.new]
+
+    def test_if_no_request_ids_given_then_update_nothing(self, setup_database):
+        assert EricaRequestRepository(db_connection=setup_database).bulk_update_status([], Status.scheduled) == 0
+
+
+class TestEricaRepositoryCreateMany:
+
+    def test_if_requests_given_then_create_all_and_return_them_in_given_order(self, setup_database):
+        batch_id = uuid.uuid4()
+        requests = [EricaRequest(request_id=uuid.uuid4(), payload={'endboss': 'Melkor'}, creator_id="api",
+                                 type=RequestType.send_ustva, status=Status.new, batch_id=batch_id)
+                    for _ in range(3)]
+
+        created = EricaRequestRepository(db_connection=setup_database).create_many(requests)
+
+        assert [entity.request_id for entity in created] == [request.request_id for request in requests]
+        assert all(entity.id is not None and entity.created_at is not None for entity in created)
+        assert setup_database.query(EricaRequestSchema).filter(EricaRequestSchema.batch_id == batch_id).count() == 3
+
+    def test_if_no_requests_given_then_create_nothing(self, setup_database):
+        assert EricaRequestRepository(db_connection=setup_database).create_many([]) == []
+
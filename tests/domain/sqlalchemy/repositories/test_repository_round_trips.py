@@ -0,0 +1,113 @@
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.domain.sqlalchemy.erica_request_schema import EricaRequestSchema
+from erica.domain.sqlalchemy.repositories.erica_request_repository import EricaRequestRepository
+
+
+@compiles(JSONB, 'sqlite')
+def _compile_jsonb_for_sqlite(element, compiler, **kwargs):
+    return 'JSON'
+
+
+class RoundTripCounter:
+    """Counts the statements sent to the database and the commits, i.e. the round trips of a repository call."""
+
+    def __init__(self, engine):
+        self.statements = []
+        self.commits = 0
+        event.listen(engine, 'before_cursor_execute', self._count_statement)
+        event.listen(engine, 'commit', self._count_commit)
+
+    def _count_statement(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _count_commit(self, conn):
+        self.commits += 1
+
+    @property
+    def round_trips(self):
+        return len(self.statements) + self.commits
+
+    def reset(self):
+        self.statements.clear()
+        self.commits = 0
+
+
+@pytest.fixture
+def sqlite_session():
+    # SQLite supports UPDATE ... RETURNING, so the statements of the repository can be counted without a PostgreSQL
+    engine = create_engine('sqlite://')
+    EricaRequestSchema.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session, RoundTripCounter(engine)
+    session.close()
+
+
+def _create_request(repository, payload_size=1000):
+    request_id = uuid.uuid4()
+    repository.create(EricaRequest(request_id=request_id, creator_id="api", type=RequestType.grundsteuer,
+                                   payload={'fields': [{'value': str(i)} for i in range(payload_size)]}))
+    return request_id
+
+
+class TestRepositoryRoundTrips:
+
+    def test_if_columns_updated_then_update_returning_in_one_statement(self, sqlite_session):
+        session, counter = sqlite_session
+        repository = EricaRequestRepository(session)
+        entity = repository.get_by_job_request_id(_create_request(repository))
+        counter.reset()
+
+        updated = repository.update_columns(entity.id, {'status': Status.success, 'result': {'pdf': 'pdf'}})
+
+        assert updated.status == Status.success
+        assert updated.result == {'pdf': 'pdf'}
+        assert len(counter.statements) == 1
+        assert 'RETURNING' in counter.statements[0]
+        assert counter.commits == 1
+
+    def test_if_job_performed_then_state_change_needs_two_statements_and_one_commit(self, sqlite_session):
+        session, counter = sqlite_session
+        repository = EricaRequestRepository(session)
+        request_id = _create_request(repository)
+        counter.reset()
+
+        # The flow of a job: load the request, then write its result
+        entity = repository.get_by_job_request_id(request_id)
+        repository.update_columns(entity.id, {'status': Status.success, 'result': {'transferticket': 'ticket'}})
+
+        assert counter.round_trips == 3
+        assert len(counter.statements) == 2
+        assert counter.commits == 1
+        assert repository.get_by_job_request_id(request_id).status == Status.success
+
+    def test_if_model_updated_then_payload_is_not_written(self, sqlite_session):
+        session, counter = sqlite_session
+        repository = EricaRequestRepository(session)
+        entity = repository.get_by_job_request_id(_create_request(repository))
+        entity.status = Status.failed
+        counter.reset()
+
+        repository.update_by_job_request_id(entity.request_id, entity)
+
+        assert len(counter.statements) == 2
+        assert 'payload=' not in counter.statements[1]
+
+    def test_if_bulk_status_updated_then_use_one_statement(self, sqlite_session):
+        session, counter = sqlite_session
+        repository = EricaRequestRepository(session)
+        request_ids = [_create_request(repository, payload_size=1) for _ in range(10)]
+        counter.reset()
+
+        updated = repository.bulk_update_status(request_ids, Status.scheduled)
+
+        assert updated == 10
+        assert len(counter.statements) == 1
+        assert counter.commits == 1
@@ -0,0 +1,83 @@
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from erica.api_server import prepare_prometheus_multiprocess_mode, clear_prometheus_multiprocess_dir, \
+    get_gunicorn_options, run_api_server, child_exit, PROMETHEUS_MULTIPROC_DIR_VARIABLE
+from erica.config import get_settings
+from erica.domain.sqlalchemy import async_database
+
+
+class TestPreparePrometheusMultiprocessMode:
+
+    def test_if_single_worker_then_do_not_set_multiprocess_dir(self):
+        with patch.object(get_settings(), 'api_workers', 1), patch.dict(os.environ, clear=False) as environ:
+            environ.pop(PROMETHEUS_MULTIPROC_DIR_VARIABLE, None)
+            prepare_prometheus_multiprocess_mode()
+
+            assert PROMETHEUS_MULTIPROC_DIR_VARIABLE not in os.environ
+
+    def test_if_multiple_workers_then_create_and_set_multiprocess_dir(self):
+        with tempfile.TemporaryDirectory() as directory:
+            multiproc_dir = os.path.join(directory, 'prometheus')
+            with patch.object(get_settings(), 'api_workers', 4), \
+                    patch.object(get_settings(), 'prometheus_multiproc_dir', multiproc_dir), \
+                    patch.dict(os.environ, clear=False) as environ:
+                environ.pop(PROMETHEUS_MULTIPROC_DIR_VARIABLE, None)
+                prepare_prometheus_multiprocess_mode()
+
+                assert os.environ[PROMETHEUS_MULTIPROC_DIR_VARIABLE] == multiproc_dir
+                assert os.path.isdir(multiproc_dir)
+
+    def test_if_multiprocess_dir_cleared_then_remove_metric_files_of_previous_run(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.dict(os.environ, {PROMETHEUS_MULTIPROC_DIR_VARIABLE: directory}):
+            open(os.path.join(directory, 'counter_1234.db'), 'wb').close()
+
+            clear_prometheus_multiprocess_dir()
+
+            assert os.listdir(directory) == []
+
+
+class TestRunApiServer:
+
+    def test_if_single_worker_then_run_uvicorn_in_current_process(self):
+        with patch.object(get_settings(), 'api_workers', 1), \
+                patch('erica.api_server.uvicorn.run') as uvicorn_run:
+            run_api_server()
+
+        uvicorn_run.assert_called_once_with("erica:app", host=get_settings().api_host, port=get_settings().api_port,
+                                            log_config=None)
+
+    def test_if_multiple_workers_then_run_preloaded_uvicorn_workers_with_gunicorn(self):
+        settings = get_settings()
+        with patch.object(settings, 'api_workers', 4):
+            options = get_gunicorn_options(settings)
+
+        assert options['workers'] == 4
+        assert options['worker_class'] == 'uvicorn.workers.UvicornWorker'
+        assert options['preload_app'] is True
+        assert options['bind'] == f"{settings.api_host}:{settings.api_port}"
+
+    def test_if_worker_exits_then_mark_its_metrics_as_dead(self):
+        with patch('prometheus_client.multiprocess.mark_process_dead') as mark_process_dead:
+            child_exit(MagicMock(), MagicMock(pid=1234))
+
+        mark_process_dead.assert_called_once_with(1234)
+
+
+class TestResetAsyncEngineAfterFork:
+
+    def test_if_engine_created_before_fork_then_create_new_engine_without_closing_inherited_connections(self):
+        inherited_engine = MagicMock()
+        with patch('erica.domain.sqlalchemy.async_database.create_async_engine',
+                   MagicMock(side_effect=[inherited_engine, MagicMock()])):
+            async_database.get_async_engine.cache_clear()
+            async_database.get_async_engine()
+
+            async_database.reset_async_engine_after_fork()
+            new_engine = async_database.get_async_engine()
+            async_database.get_async_engine.cache_clear()
+
+        inherited_engine.sync_engine.dispose.assert_called_once_with(close=False)
+        assert new_engine is not inherited_engine
@@ -61,7 +61,7 @@ def create_unlock_code_revocation(correct=True):
 
 def create_tax_number_validity(correct=True):
     if correct:
-        payload = CheckTaxNumberPayload(state_abbreviation="BY", tax_number="04531972802")
+        payload = CheckTaxNumberPayload(state_abbreviation="BY", tax_number="19811310010")
     else:
         payload = CheckTaxNumberPayload(state_abbreviation="BY", tax_number="123456789")
 
@@ -0,0 +1,141 @@
+import glob
+from unittest.mock import MagicMock, patch
+from xml.dom import minidom
+from xml.etree.ElementTree import Comment, Element, SubElement, XML, parse, tostring
+
+import pytest
+
+from erica.worker.elster_xml.common.pretty_xml import pretty_print, XmlNotSupportedError
+from erica.worker.elster_xml.elster_xml_generator import generate_full_est_xml, generate_vorsatz_with_tax_number, \
+    generate_full_vast_beleg_request_xml
+
+_SAMPLE_FILES = sorted(file_name for file_name in glob.glob('tests/worker/samples/*.xml') +
+                       glob.glob('tests/worker/elster_xml/*.xml')
+                       # The encrypted beleg is no valid XML on its own
+                       if not file_name.endswith('sample_encrypted_beleg.xml'))
+
+
+def _pretty_print_with_minidom(xml, remove_decl):
+    """The pretty printing the direct one replaced, which it has to match."""
+    xml = minidom.parseString(tostring(xml))
+    if remove_decl:
+        xml = xml.childNodes[0]
+    return xml.toprettyxml(indent=" " * 4)
+
+
+def _get_eric_wrapper_returning_input():
+    eric_wrapper = MagicMock()
+    eric_wrapper.create_th.side_effect = lambda xml_string, **kwargs: xml_string.encode()
+    get_eric_wrapper = MagicMock()
+    get_eric_wrapper.return_value.__enter__.return_value = eric_wrapper
+    return get_eric_wrapper
+
+
+class TestPrettyPrint:
+    @pytest.mark.parametrize('file_name', _SAMPLE_FILES)
+    @pytest.mark.parametrize('remove_decl', [True, False])
+    def test_if_sample_xml_then_returns_same_result_as_minidom(self, file_name, remove_decl):
+        xml = parse(file_name).getroot()
+        assert pretty_print(xml, remove_decl) == _pretty_print_with_minidom(xml, remove_decl)
+
+    def test_if_mixed_content_and_special_characters_then_returns_same_result_as_minidom(self):
+        xml = XML('<data id="a&amp;b &quot;c&quot;&#10;">text &lt;1&gt;<info>ü &amp; ä</info>tail\r\n'
+                  '<empty/>  <info lang="de">\'x\'</info></data>')
+        assert pretty_print(xml) == _pretty_print_with_minidom(xml, True)
+
+    def test_if_text_with_carriage_returns_then_returns_same_result_as_minidom(self):
+        xml = Element('data')
+        SubElement(xml, 'info').text = 'first\r\nsecond\rthird'
+        SubElement(xml, 'info').set('value', 'first\r\nsecond\tthird')
+        assert pretty_print(xml) == _pretty_print_with_minidom(xml, True)
+
+    def test_if_namespaces_then_returns_same_result_as_minidom(self):
+        xml = Element('{http://www.elster.de/elsterxml/schema/v11}Elster')
+        SubElement(xml, 'DatenTeil').set('{urn:other}version', '1')
+        SubElement(xml, '{urn:other}Nutzdaten').text = 'text'
+        assert pretty_print(xml) == _pretty_print_with_minidom(xml, True)
+
+    def test_if_xmlns_attribute_then_returns_same_result_as_minidom(self):
+        xml = Element('{http://www.elster.de/elsterxml/schema/v11}Elster')
+        SubElement(xml, 'E10', version='2021', xmlns='http://finkonsens.de/elster/elsteresteuer/est/v2021')
+        assert pretty_print(xml) == _pretty_print_with_minidom(xml, True)
+
+    def test_if_namespace_not_registered_then_uses_numbered_prefix_as_minidom(self):
+        xml = Element('{urn:first}data')
+        SubElement(xml, '{urn:second}info').set('{urn:first}version', '1')
+        assert pretty_print(xml) == _pretty_print_with_minidom(xml, True)
+        assert pretty_print(xml).startswith('<ns0:data xmlns:ns0="urn:first" xmlns:ns1="urn:second">')
+
+    def test_if_namespace_registered_by_elementtree_or_xml_namespace_then_returns_same_result_as_minidom(self):
+        xml = Element('data')
+        SubElement(xml, 'info').set('{http://www.w3.org/2001/XMLSchema-instance}type', 'text')
+        SubElement(xml, 'info').set('{http://www.w3.org/XML/1998/namespace}lang', 'de')
+        assert pretty_print(xml) == _pretty_print_with_minidom(xml, True)
+        assert 'xsi:type="text"' in pretty_print(xml)
+
+    def test_if_element_name_invalid_then_raises_error_as_minidom(self):
+        xml = Element('data')
+        SubElement(xml, 'prefix:info').text = 'text'
+        with pytest.raises(Exception):
+            _pretty_print_with_minidom(xml, True)
+        with pytest.raises(XmlNotSupportedError):
+            pretty_print(xml)
+
+    def test_if_invalid_character_then_raises_error_as_minidom(self):
+        xml = Element('data')
+        SubElement(xml, 'info').text = 'text\x00'
+        with pytest.raises(Exception):
+            _pretty_print_with_minidom(xml, True)
+        with pytest.raises(XmlNotSupportedError):
+            pretty_print(xml)
+
+    def test_if_text_not_str_then_raises_error_as_tostring(self):
+        xml = Element('data')
+        SubElement(xml, 'info').text = 1
+        with pytest.raises(TypeError):
+            _pretty_print_with_minidom(xml, True)
+        with pytest.raises(XmlNotSupportedError):
+            pretty_print(xml)
+
+    def test_if_comment_then_raises_error(self):
+        xml = Element('data')
+        xml.append(Comment('comment'))
+        with pytest.raises(XmlNotSupportedError):
+            pretty_print(xml)
+
+    @pytest.mark.parametrize('uri', ['urn:with space', 'http://www.w3.org/2000/xmlns/'])
+    def test_if_namespace_cannot_be_declared_then_raises_error(self, uri):
+        xml = Element(f'{{{uri}}}data')
+        with pytest.raises(XmlNotSupportedError):
+            pretty_print(xml)
+
+    def test_if_full_est_xml_then_returns_same_result_as_minidom(self):
+        vorsatz = generate_vorsatz_with_tax_number(
+            steuernummer='9198011310010', year='2021', person_a_idnr='04452397687', person_b_idnr=None,
+            first_name='Manfred', last_name='Mustername', street='Musterstraße', street_nr='42', plz='12345',
+            town='Hamburg')
+
+        def get_form_data():
+            return {'E0100201': 'Maier', 'E0100301': 'Hans', 'E0100401': '05.05.1955', 'E0100602': 'Musterort',
+                    'E0107206': '1', 'E0111214': '5', 'E0104706': ['7a', '7b']}
+
+        with patch('erica.worker.elster_xml.common.transfer_header.get_eric_wrapper',
+                   _get_eric_wrapper_returning_input()):
+            xml_string = generate_full_est_xml(get_form_data(), vorsatz, '2021', '9198', th_fields=MagicMock())
+            with patch('erica.worker.elster_xml.elster_xml_generator.pretty_print', _pretty_print_with_minidom):
+                expected_xml_string = generate_full_est_xml(get_form_data(), vorsatz, '2021', '9198',
+                                                            th_fields=MagicMock())
+
+        assert xml_string == expected_xml_string
+
+    def test_if_full_vast_beleg_request_xml_then_returns_same_result_as_minidom(self):
+        form_data = {'idnr': '04452397687'}
+        beleg_ids = ['vk2345', 'vk3456', 'vk4567']
+        with patch('erica.worker.elster_xml.common.transfer_header.get_eric_wrapper',
+                   _get_eric_wrapper_returning_input()):
+            xml_string = generate_full_vast_beleg_request_xml(form_data, beleg_ids, th_fields=MagicMock())
+            with patch('erica.worker.elster_xml.elster_xml_generator.pretty_print', _pretty_print_with_minidom):
+                expected_xml_string = generate_full_vast_beleg_request_xml(form_data, beleg_ids,
+                                                                           th_fields=MagicMock())
+
+        assert xml_string == expected_xml_string
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from erica.worker.elster_xml.common.tax_number_precheck import tax_number_is_certainly_invalid, _CHECK_DIGIT_METHODS
+from utils import read_text_from_sample
+
+CORPUS = json.loads(read_text_from_sample('tax_number_corpus.json'))
+VALID_ENTRIES = [entry for entry in CORPUS if entry['isValid']]
+INVALID_ENTRIES = [entry for entry in CORPUS if not entry['isValid']]
+CHECKED_ENTRIES = [entry for entry in VALID_ENTRIES if entry['state'] in _CHECK_DIGIT_METHODS]
+UNCHECKED_ENTRIES = [entry for entry in VALID_ENTRIES if entry['state'] not in _CHECK_DIGIT_METHODS]
+
+
+def _with_other_check_digit(tax_number):
+    return tax_number[:-1] + str((int(tax_number[-1]) + 1) % 10)
+
+
+class TestTaxNumberIsCertainlyInvalid:
+
+    @pytest.mark.parametrize("entry", VALID_ENTRIES, ids=[entry['taxNumber'] for entry in VALID_ENTRIES])
+    def test_if_tax_number_valid_in_corpus_then_return_false(self, entry):
+        assert tax_number_is_certainly_invalid(entry['taxNumber'], entry['state'], use_testmerker=True) is False
+
+    @pytest.mark.parametrize("entry", INVALID_ENTRIES, ids=[entry['taxNumber'] for entry in INVALID_ENTRIES])
+    def test_if_tax_number_invalid_in_corpus_then_return_true(self, entry):
+        assert tax_number_is_certainly_invalid(entry['taxNumber'], entry['state'], use_testmerker=True) is True
+
+    @pytest.mark.parametrize("entry", CHECKED_ENTRIES, ids=[entry['taxNumber'] for entry in CHECKED_ENTRIES])
+    def test_if_check_digit_of_valid_tax_number_changed_then_return_true(self, entry):
+        tax_number = _with_other_check_digit(entry['taxNumber'])
+
+        assert tax_number_is_certainly_invalid(tax_number, entry['state'], use_testmerker=True) is True
+
+    @pytest.mark.parametrize("entry", UNCHECKED_ENTRIES, ids=[entry['taxNumber'] for entry in UNCHECKED_ENTRIES])
+    def test_if_check_digit_method_of_state_not_confirmed_then_leave_check_digit_to_eric(self, entry):
+        tax_number = _with_other_check_digit(entry['taxNumber'])
+
+        assert tax_number_is_certainly_invalid(tax_number, entry['state'], use_testmerker=True) is False
+
+    @pytest.mark.parametrize("tax_number", ["18181500090", "18181500095"])
+    def test_if_no_check_digit_matches_then_leave_tax_number_to_eric(self, tax_number):
+        assert tax_number_is_certainly_invalid(tax_number, "BY", use_testmerker=True) is False
+
+    @pytest.mark.parametrize("tax_number", ["1981131001", "198113100100", "198/113/10010", "19811310O10"])
+    def test_if_tax_number_not_in_format_of_state_then_return_true(self, tax_number):
+        assert tax_number_is_certainly_invalid(tax_number, "BY", use_testmerker=True) is True
+
+    def test_if_bufa_does_not_exist_then_return_true(self):
+        assert tax_number_is_certainly_invalid("99999999999", "BY", use_testmerker=True) is True
+
+    @pytest.mark.parametrize("state", ["XX", "by", ""])
+    def test_if_state_unknown_then_leave_tax_number_to_eric(self, state):
+        assert tax_number_is_certainly_invalid("19811310010", state, use_testmerker=True) is False
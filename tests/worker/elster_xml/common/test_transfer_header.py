@@ -1,9 +1,14 @@
 import copy
+import json
+import os
+import re
 from unittest.mock import patch, MagicMock
 
 import pytest as pytest
+from xmldiff import main
 
-from erica.worker.elster_xml.common.transfer_header import add_transfer_header
+from erica.worker.elster_xml.common.transfer_header import add_transfer_header, insert_transfer_header, \
+    build_transfer_header, get_ziel
 from erica.worker.elster_xml.transfer_header_fields import TransferHeaderFields
 from erica.worker.pyeric.eric_errors import EricProcessNotSuccessful
 from worker.utils import missing_cert, missing_pyeric_lib, remove_declaration_and_namespace
@@ -76,3 +81,106 @@ class TestGenerateTransferHeader:
             res = add_transfer_header(xml, th_fields)
 
             assert res == xml_with_th_binary
+
+
+# Recorded with scripts/record_transfer_header_corpus.py, every entry has to be ERiC output
+CORPUS = json.loads(read_text_from_sample('transfer_header_corpus.json'))
+
+
+_NUTZDATEN_HEADER = '<NutzdatenHeader version="11"><Empfaenger id="F">9198</Empfaenger></NutzdatenHeader>'
+
+
+def _read_corpus_file(path):
+    with open(os.path.join('tests/worker', path)) as corpus_xml_file:
+        return corpus_xml_file.read()
+
+
+class TestInsertTransferHeader:
+
+    @pytest.fixture
+    def th_fields(self):
+        return TransferHeaderFields(
+            datenart='ESt',
+            testmerker='700000004',
+            herstellerId='74931',
+            verfahren='ElsterErklaerung',
+            datenLieferant='Softwaretester ERiC',
+        )
+
+    @pytest.mark.parametrize("entry", CORPUS, ids=[entry['output'] for entry in CORPUS])
+    def test_if_input_in_corpus_then_return_output_of_eric(self, entry):
+        result = insert_transfer_header(_read_corpus_file(entry['input']), TransferHeaderFields(**entry['thFields']),
+                                        entry['ericVersion'])
+
+        assert result == _read_corpus_file(entry['output'])
+
+    def test_if_grundsteuer_xml_then_return_xml_equal_to_sample_except_for_ziel_and_version(self, th_fields):
+        sample_xml = read_text_from_sample('grundsteuer_sample_xml.xml')
+        base_xml = re.sub(r'\s*<TransferHeader.*</TransferHeader>', '', sample_xml, flags=re.DOTALL)
+        # The sample is no ERiC output, its TransferHeader was edited by hand
+        expected_xml = sample_xml.replace('<Ziel>CS</Ziel>', '<Ziel>NW</Ziel>')
+
+        result = insert_transfer_header(base_xml, th_fields._replace(datenart='Grundsteuerwert',
+                                                                     datenLieferant='PLACEHOLDER_DATENLIEFERANT'), '')
+
+        assert main.diff_texts(result.encode(), expected_xml.encode()) == []
+
+    def test_if_no_elster_root_then_wrap_in_elster_root(self, th_fields):
+        result = insert_transfer_header(f'<DatenTeil>\n    {_NUTZDATEN_HEADER}\n</DatenTeil>\n', th_fields, '1.2.3')
+
+        assert result.startswith('<?xml version="1.0" encoding="UTF-8"?>\n'
+                                  '<Elster xmlns="http://www.elster.de/elsterxml/schema/v11">\n'
+                                  '\t<TransferHeader version="11">\n')
+        assert result.endswith(f'</TransferHeader>\n\t<DatenTeil>\n    {_NUTZDATEN_HEADER}\n</DatenTeil>\n</Elster>\n')
+
+    def test_if_declaration_then_replace_declaration(self, th_fields):
+        result = insert_transfer_header('<?xml version="1.0" encoding="utf-8"?>\n<Elster xmlns="x"><DatenTeil>'
+                                        f'{_NUTZDATEN_HEADER}</DatenTeil></Elster>', th_fields, '1.2.3')
+
+        assert result.startswith('<?xml version="1.0" encoding="UTF-8"?>\n<Elster xmlns="x">\n\t<TransferHeader ')
+        assert result.endswith(f'</TransferHeader>\n\t<DatenTeil>{_NUTZDATEN_HEADER}</DatenTeil></Elster>')
+        assert result.count('<?xml') == 1
+
+    def test_if_no_testmerker_then_leave_out_testmerker(self, th_fields):
+        result = insert_transfer_header(_NUTZDATEN_HEADER, th_fields._replace(testmerker=''), '1.2.3')
+
+        assert '<Testmerker>' not in result
+
+    def test_if_eric_version_then_add_it_to_erstellung(self, th_fields):
+        result = insert_transfer_header(_NUTZDATEN_HEADER, th_fields, '1.2.3')
+
+        assert '<Erstellung>\n\t\t\t\t<Eric>\n\t\t\t\t\t<Version>1.2.3</Version>' in result
+
+    def test_if_empfaenger_is_bufa_then_ziel_is_its_federal_state(self, th_fields):
+        assert '<Ziel>BY</Ziel>' in insert_transfer_header(_NUTZDATEN_HEADER, th_fields, '1.2.3')
+
+    def test_if_no_empfaenger_then_raise_value_error(self, th_fields):
+        with pytest.raises(ValueError):
+            insert_transfer_header('<DatenTeil/>', th_fields, '1.2.3')
+
+    def test_if_special_characters_in_fields_then_escape_them(self, th_fields):
+        result = insert_transfer_header(_NUTZDATEN_HEADER, th_fields._replace(datenLieferant='Lieferant & <Sohn>'),
+                                        '1.2.3')
+
+        assert '<DatenLieferant>Lieferant &amp; &lt;Sohn&gt;</DatenLieferant>' in result
+
+    def test_if_other_vorgang_then_raise_value_error(self, th_fields):
+        with pytest.raises(ValueError):
+            build_transfer_header(th_fields, 'BY', '1.2.3', vorgang='send-NoSig')
+
+
+class TestGetZiel:
+
+    @pytest.mark.parametrize("empfaenger, ziel", [('<Empfaenger id="F">9198</Empfaenger>', 'BY'),
+                                                  ('<Empfaenger id="F">5208</Empfaenger>', 'NW'),
+                                                  ('<Empfaenger id="F">2324</Empfaenger>', 'NI'),
+                                                  ('<Empfaenger id="F">1113</Empfaenger>', 'BE'),
+                                                  ('<Empfaenger id="L">CS</Empfaenger>', 'CS')])
+    def test_if_empfaenger_in_nutzdaten_header_then_return_ziel(self, empfaenger, ziel):
+        assert get_ziel(f'<NutzdatenHeader version="11"><NutzdatenTicket>1</NutzdatenTicket>{empfaenger}'
+                        '</NutzdatenHeader>') == ziel
+
+    @pytest.mark.parametrize("base_xml", ['<DatenTeil/>', '<NutzdatenHeader version="11"/>',
+                                          '<NutzdatenHeader><Empfaenger id="F">0000</Empfaenger></NutzdatenHeader>'])
+    def test_if_no_empfaenger_of_federal_state_then_return_none(self, base_xml):
+        assert get_ziel(base_xml) is None
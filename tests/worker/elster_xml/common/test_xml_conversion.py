@@ -1,8 +1,13 @@
+import json
 from dataclasses import asdict, dataclass
 from typing import List
+from unittest.mock import MagicMock, patch
 
 import pytest
+import xmltodict
 
+from erica.api.dto.grundsteuer_dto import GrundsteuerPayload
+from erica.worker.elster_xml.grundsteuer.elster_data_representation import get_full_grundsteuer_data_representation
 from erica.worker.elster_xml.common.xml_conversion import CustomDictParser, convert_object_to_xml
 
 
@@ -286,3 +291,127 @@ class TestConvertObjectToXml:
         input_object = RootObject(SimpleObject("TEXT"))
         resulting_xml = convert_object_to_xml(input_object)
         assert resulting_xml.replace(encoding_element, "") == '<root>TEXT</root>'
+
+
+def _convert_with_xmltodict(input_object):
+    return xmltodict.unparse(asdict(input_object, dict_factory=CustomDictParser))
+
+
+class TestConvertObjectToXmlMatchesXmltodict:
+    def test_if_special_characters_then_returns_same_xml_as_xmltodict(self):
+        @dataclass
+        class SimpleObject:
+            xml_attr_id: str
+            attr1: str
+            xml_text: str
+
+        @dataclass
+        class RootObject:
+            root: SimpleObject
+
+        input_object = RootObject(SimpleObject('"a" & \'b\'', "<c> & d", "e > f"))
+        assert convert_object_to_xml(input_object) == _convert_with_xmltodict(input_object)
+
+    def test_if_text_and_children_then_returns_same_xml_as_xmltodict(self):
+        @dataclass
+        class SimpleObject:
+            xml_text: str
+            attr1: str
+
+        @dataclass
+        class RootObject:
+            root: SimpleObject
+
+        input_object = RootObject(SimpleObject("TEXT", "attrValue1"))
+        assert convert_object_to_xml(input_object) == _convert_with_xmltodict(input_object)
+
+    def test_if_bool_and_number_values_then_returns_same_xml_as_xmltodict(self):
+        @dataclass
+        class SimpleObject:
+            xml_attr_flag: bool
+            xml_attr_count: int
+            attr1: bool
+            attr2: bool
+            attr3: int
+            attr4: float
+
+        @dataclass
+        class RootObject:
+            root: SimpleObject
+
+        input_object = RootObject(SimpleObject(True, 3, True, False, 0, 2.5))
+        assert convert_object_to_xml(input_object) == _convert_with_xmltodict(input_object)
+
+    def test_if_array_with_empty_items_then_returns_same_xml_as_xmltodict(self):
+        @dataclass
+        class SimpleNestedObject:
+            attr1: str = None
+
+        @dataclass
+        class SimpleObject:
+            nested: List[SimpleNestedObject]
+            values: List[str]
+
+        @dataclass
+        class RootObject:
+            root: SimpleObject
+
+        input_object = RootObject(SimpleObject([SimpleNestedObject("1"), SimpleNestedObject(), None], ["a", "", "b"]))
+        assert convert_object_to_xml(input_object) == _convert_with_xmltodict(input_object)
+
+    def test_if_only_empty_nested_objects_then_returns_same_xml_as_xmltodict(self):
+        @dataclass
+        class SimpleNestedObject:
+            attr1: str = None
+
+        @dataclass
+        class SimpleObject:
+            nested: SimpleNestedObject
+            values: list
+
+        @dataclass
+        class RootObject:
+            root: SimpleObject
+
+        input_object = RootObject(SimpleObject(SimpleNestedObject(), []))
+        assert convert_object_to_xml(input_object) == _convert_with_xmltodict(input_object)
+
+    def test_if_xml_attribute_after_empty_attribute_then_returns_same_xml_as_xmltodict(self):
+        @dataclass
+        class SimpleObject:
+            attr1: str
+            attr2: str
+            xml_attr_id: str
+            attr3: str
+
+        @dataclass
+        class RootObject:
+            root: SimpleObject
+
+        input_object = RootObject(SimpleObject("attrValue1", None, "ID", "attrValue3"))
+        assert convert_object_to_xml(input_object) == _convert_with_xmltodict(input_object)
+
+    def test_if_dict_value_then_returns_same_xml_as_xmltodict(self):
+        @dataclass
+        class SimpleObject:
+            attr1: dict
+
+        @dataclass
+        class RootObject:
+            root: SimpleObject
+
+        input_object = RootObject(SimpleObject({"key": "value", "@id": "ID"}))
+        assert convert_object_to_xml(input_object) == _convert_with_xmltodict(input_object)
+
+    @pytest.mark.parametrize('sample_file_name', ['grundsteuer_sample_input.json',
+                                                  'grundsteuer_sample_input_bruchteilsgemeinschaft.json'])
+    def test_if_grundsteuer_data_then_returns_same_xml_as_xmltodict(self, sample_file_name):
+        with open(f'tests/worker/samples/{sample_file_name}') as json_file:
+            payload = GrundsteuerPayload.parse_obj(json.load(json_file))
+        with patch('erica.worker.elster_xml.grundsteuer.elster_data_representation.generate_electronic_aktenzeichen',
+                   MagicMock(return_value='2181008000100001')), \
+                patch('erica.worker.elster_xml.grundsteuer.elster_data_representation.get_bufa_nr_from_aktenzeichen',
+                      MagicMock(return_value='2181')):
+            grundsteuer_object = get_full_grundsteuer_data_representation(payload)
+
+        assert convert_object_to_xml(grundsteuer_object) == _convert_with_xmltodict(grundsteuer_object)
@@ -1,16 +1,15 @@
 import copy
 import datetime
 import unittest
-from unittest.mock import patch, MagicMock, call
-from xml.etree.ElementTree import XML, ParseError, Element, SubElement, tostring
+from unittest.mock import patch, MagicMock
+from xml.etree.ElementTree import XML, ParseError, Element, tostring
 
 import pytest
 from freezegun import freeze_time
 
 from erica.config import get_settings
 from erica.worker.elster_xml.elster_xml_generator import _pretty, _add_xml_nutzdaten_header, get_belege_xml, \
-    _generate_transfer_header, _add_if_not_empty, _add_sterkl_fields, \
-    _add_person_specific_sterkl_fields, Vorsatz, _add_xml_vorsatz, _add_xml_fields, _add_est_xml_nutzdaten, \
+    _generate_transfer_header, Vorsatz, _add_xml_vorsatz, _add_xml_fields, _add_est_xml_nutzdaten, \
     generate_full_est_xml, generate_full_vast_request_xml, _add_vast_xml_nutzdaten_header, \
     _add_vast_request_xml_nutzdaten, _add_vast_activation_xml_nutzdaten, generate_full_vast_activation_xml, \
     _add_vast_beleg_ids_request_nutzdaten, generate_full_vast_beleg_ids_request_xml, \
@@ -18,7 +17,6 @@ from erica.worker.elster_xml.elster_xml_generator import _pretty, _add_xml_nutzd
     generate_full_vast_beleg_request_xml, _add_vast_revocation_xml_nutzdaten, generate_full_vast_revocation_xml, \
     generate_vorsatz_with_tax_number, _compute_valid_until_date, generate_vorsatz_without_tax_number
 from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import remove_declaration_and_namespace
-from erica.worker.elster_xml.elster_xml_tree import ElsterXmlTreeNode
 from erica.worker.elster_xml.est_mapping import PersonSpecificFieldId
 from erica.worker.pyeric.eric import get_eric_wrapper
 from erica.worker.pyeric.eric_errors import EricProcessNotSuccessful
@@ -273,323 +271,6 @@ class TestGenerateTransferHeader(unittest.TestCase):
             self.assertEqual(self.xml_with_th_binary.decode(), res)
 
 
-class TestAddIfNotEmpty(unittest.TestCase):
-    def test_non_empty_is_added_to_xml(self):
-        xml_top = Element('top')
-        sterkl_xml = Element('sterkl')
-        SubElement(sterkl_xml, 'child')
-
-        _add_if_not_empty(xml_top, sterkl_xml)
-
-        self.assertEqual(1, len(xml_top.findall('sterkl')))
-        self.assertEqual(sterkl_xml, xml_top.findall('sterkl')[0])
-
-    def test_empty_element_is_not_added_to_xml(self):
-        xml_top = Element('top')
-        sterkl_xml = Element('sterkl')
-
-        _add_if_not_empty(xml_top, sterkl_xml)
-
-        self.assertEqual(0, len(xml_top.findall('sterkl')))
-
-    def test_element_not_added_if_only_person_tag(self):
-        xml_top = Element('top')
-        sterkl_xml = Element('sterkl')
-        SubElement(sterkl_xml, 'Person')
-
-        _add_if_not_empty(xml_top, sterkl_xml)
-
-        self.assertEqual(0, len(xml_top.findall('sterkl')))
-
-    def test_element_not_added_if_only_top_element_non_empty(self):
-        xml_top = Element('top')
-        sterkl_xml = Element('sterkl')
-        sterkl_xml.text = 'tests are fun'
-
-        _add_if_not_empty(xml_top, sterkl_xml)
-
-        self.assertEqual(0, len(xml_top.findall('sterkl')))
-
-
-class TestAddSterklFields(unittest.TestCase):
-    def setUp(self):
-        self.fields = {'field1': 'a', 'field2': 'b'}
-
-    def test_adds_leaf_nodes_to_xml(self):
-        xml_top = Element('top')
-        sterkl_tree = 'field1'
-
-        _add_sterkl_fields(xml_top, self.fields, sterkl_tree)
-
-        self.assertEqual(1, len(xml_top.findall('field1')))
-        self.assertEqual('a', xml_top.findall('field1')[0].text)
-
-    def test_adds_all_child_nodes_to_xml(self):
-        xml_top = Element('top')
-        sterkl_tree = ElsterXmlTreeNode('parent', ['field1', 'field2'])
-
-        _add_sterkl_fields(xml_top, self.fields, sterkl_tree)
-
-        self.assertEqual(1, len(xml_top.findall('parent')))
-        self.assertEqual(1, len(xml_top.findall('parent/field1')))
-        self.assertEqual('a', xml_top.findall('parent/field1')[0].text)
-        self.assertEqual(1, len(xml_top.findall('parent/field2')))
-        self.assertEqual('b', xml_top.findall('parent/field2')[0].text)
-
-    def test_adds_child_nodes_from_different_branches_to_xml(self):
-        xml_top = Element('top')
-        sterkl_tree = ElsterXmlTreeNode('parent1',
-                                        [ElsterXmlTreeNode('parent11', ['field1']),
-                                         ElsterXmlTreeNode('parent12', ['field2'])])
-
-        _add_sterkl_fields(xml_top, self.fields, sterkl_tree)
-
-        self.assertEqual(1, len(xml_top.findall('parent1')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent11')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent11/field1')))
-        self.assertEqual('a', xml_top.findall('parent1/parent11/field1')[0].text)
-        self.assertEqual(1, len(xml_top.findall('parent1/parent12')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent12/field2')))
-        self.assertEqual('b', xml_top.findall('parent1/parent12/field2')[0].text)
-
-    def test_adds_child_nodes_from_different_branches_to_xml_twice_if_in_different_branches(self):
-        xml_top = Element('top')
-        sterkl_tree = ElsterXmlTreeNode('parent1',
-                                        [ElsterXmlTreeNode('parent11', ['field1']),
-                                         ElsterXmlTreeNode('parent12', ['field1', 'field2'])])
-
-        _add_sterkl_fields(xml_top, self.fields, sterkl_tree)
-
-        self.assertEqual(1, len(xml_top.findall('parent1')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent11')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent11/field1')))
-        self.assertEqual('a', xml_top.findall('parent1/parent11/field1')[0].text)
-        self.assertEqual(1, len(xml_top.findall('parent1/parent12')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent12/field1')))
-        self.assertEqual('a', xml_top.findall('parent1/parent12/field1')[0].text)
-        self.assertEqual(1, len(xml_top.findall('parent1/parent12/field2')))
-        self.assertEqual('b', xml_top.findall('parent1/parent12/field2')[0].text)
-
-    def test_does_not_add_nodes_without_field_representation(self):
-        xml_top = Element('top')
-        sterkl_tree = ['this-is-not-the-field-youre-looking-for']
-
-        _add_sterkl_fields(xml_top, self.fields, sterkl_tree)
-
-        self.assertEqual(0, len(xml_top.findall('this-is-not-the-field-youre-looking-for')))
-
-    def test_does_not_add_nodes_with_only_empty_child_nodes(self):
-        xml_top = Element('top')
-        sterkl_tree = ElsterXmlTreeNode('parent1',
-                                        [ElsterXmlTreeNode('parent11', []),
-                                         ElsterXmlTreeNode('parent12', [])])
-
-        _add_sterkl_fields(xml_top, self.fields, sterkl_tree)
-
-        self.assertEqual(0, len(xml_top.findall('parent1')))
-
-    def test_does_not_add_nodes_with_only_child_nodes_without_field_representation(self):
-        xml_top = Element('top')
-        sterkl_tree = ElsterXmlTreeNode('parent1',
-                                        [ElsterXmlTreeNode('parent11', ['not-there']),
-                                         ElsterXmlTreeNode('parent12', ['nope'])])
-
-        _add_sterkl_fields(xml_top, self.fields, sterkl_tree)
-
-        self.assertEqual(0, len(xml_top.findall('parent1')))
-
-    def test_calls_person_specific_method_if_person_specific_tree_node(self):
-        with patch('erica.worker.elster_xml.elster_xml_generator._add_person_specific_sterkl_fields') as fun_pers_spec:
-            with patch('erica.worker.elster_xml.elster_xml_generator.Element') as fun_element:
-                sterkl_xml = Element('parent1')
-                self.mock_function = MagicMock()
-                self.mock_function.side_effect = lambda arg, *args: sterkl_xml
-                fun_element.side_effect = self.mock_function
-
-                xml_top = Element('top')
-                tree_node_1 = ElsterXmlTreeNode('parent11', ['field1'])
-                tree_node_2 = ElsterXmlTreeNode('parent12', ['field2'])
-                sterkl_tree = ElsterXmlTreeNode('parent1',
-                                                [tree_node_1, tree_node_2],
-                                                is_person_specific=True,
-                                                repetitions=2)
-
-                _add_sterkl_fields(xml_top, self.fields, sterkl_tree)
-
-                expected_calls = [call(sterkl_xml, self.fields, tree_node_1, 'PersonA'),
-                                  call(sterkl_xml, self.fields, tree_node_2, 'PersonA'),
-                                  call(sterkl_xml, self.fields, tree_node_1, 'PersonB'),
-                                  call(sterkl_xml, self.fields, tree_node_2, 'PersonB')]
-                fun_pers_spec.assert_has_calls(expected_calls, any_order=True)
-
-    def test_adds_person_xml_element_if_node_is_person_specific(self):
-        xml_top = Element('top')
-
-        pers_spec_field_id = PersonSpecificFieldId('field1', 'PersonA')
-        pers_spec_fields = {pers_spec_field_id: 'a'}
-        sterkl_tree = ElsterXmlTreeNode('parent1',
-                                        ['field1'],
-                                        is_person_specific=True,
-                                        repetitions=1)
-
-        _add_sterkl_fields(xml_top, pers_spec_fields, sterkl_tree)
-
-        self.assertEqual(1, len(xml_top.findall('parent1/Person')))
-        self.assertEqual('PersonA', xml_top.findall('parent1/Person')[0].text)
-
-    def test_adds_repeated_element_if_element_is_repatable(self):
-        xml_top = Element('top')
-        fields = fields = {'field_repeat_1': ['a', 'b'], 'field1': 'a', 'field_repeat_2': ['c', 'd'],
-                           'field_repeat_3': ['e', 'f']}
-        sterkl_tree = ElsterXmlTreeNode('parent1',
-                                        [ElsterXmlTreeNode('parent11', ['field_repeat_1'], is_repeatable=True),
-                                         ElsterXmlTreeNode('parent12', ['field1']),
-                                         ElsterXmlTreeNode('parent13', ['field_repeat_2', 'field_repeat_3'],
-                                                           is_repeatable=True)])
-
-        _add_sterkl_fields(xml_top, fields, sterkl_tree)
-
-        # Test non-repeated elements
-        self.assertEqual(1, len(xml_top.findall('parent1')))
-        self.assertEqual(2, len(xml_top.findall('parent1/parent11')))
-        self.assertEqual(2, len(xml_top.findall('parent1/parent11/field_repeat_1')))
-        self.assertEqual('a', xml_top.findall('parent1/parent11/field_repeat_1')[0].text)
-        self.assertEqual('b', xml_top.findall('parent1/parent11/field_repeat_1')[1].text)
-        self.assertEqual(1, len(xml_top.findall('parent1/parent12')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent12/field1')))
-        self.assertEqual('a', xml_top.findall('parent1/parent12/field1')[0].text)
-
-        # Test repeated elements
-        self.assertEqual(2, len(xml_top.findall('parent1/parent13')))
-        self.assertEqual(2, len(xml_top.findall('parent1/parent13/field_repeat_2')))
-        self.assertEqual('c', xml_top.findall('parent1/parent13/field_repeat_2')[0].text)
-        self.assertEqual('d', xml_top.findall('parent1/parent13/field_repeat_2')[1].text)
-        self.assertEqual(2, len(xml_top.findall('parent1/parent13/field_repeat_3')))
-        self.assertEqual('e', xml_top.findall('parent1/parent13/field_repeat_3')[0].text)
-        self.assertEqual('f', xml_top.findall('parent1/parent13/field_repeat_3')[1].text)
-
-
-class TestAddPersonSpecificSterklFields(unittest.TestCase):
-    def setUp(self):
-        self.fields = {PersonSpecificFieldId('field1', 'PersonA'): 'a',
-                       PersonSpecificFieldId('field1', 'PersonB'): 'b',
-                       PersonSpecificFieldId('field2', 'PersonA'): 'A'}
-
-    def test_adds_leaf_nodes_to_xml(self):
-        xml_top = Element('top')
-        sterkl_tree = 'field1'
-
-        _add_person_specific_sterkl_fields(xml_top, self.fields, sterkl_tree, 'PersonA')
-
-        self.assertEqual(1, len(xml_top.findall('field1')))
-        self.assertEqual('a', xml_top.findall('field1')[0].text)
-
-    def test_adds_all_child_nodes_to_xml(self):
-        xml_top = Element('top')
-        sterkl_tree = ElsterXmlTreeNode('parent', ['field1', 'field2'])
-
-        _add_person_specific_sterkl_fields(xml_top, self.fields, sterkl_tree, 'PersonA')
-
-        self.assertEqual(1, len(xml_top.findall('parent')))
-        self.assertEqual(1, len(xml_top.findall('parent/field1')))
-        self.assertEqual('a', xml_top.findall('parent/field1')[0].text)
-        self.assertEqual(1, len(xml_top.findall('parent/field2')))
-        self.assertEqual('A', xml_top.findall('parent/field2')[0].text)
-
-    def test_adds_child_nodes_from_different_branches_to_xml(self):
-        xml_top = Element('top')
-        sterkl_tree = ElsterXmlTreeNode('parent1',
-                                        [ElsterXmlTreeNode('parent11', ['field1']),
-                                         ElsterXmlTreeNode('parent12', ['field2'])])
-
-        _add_person_specific_sterkl_fields(xml_top, self.fields, sterkl_tree, 'PersonA')
-
-        self.assertEqual(1, len(xml_top.findall('parent1')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent11')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent11/field1')))
-        self.assertEqual('a', xml_top.findall('parent1/parent11/field1')[0].text)
-        self.assertEqual(1, len(xml_top.findall('parent1/parent12')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent12/field2')))
-        self.assertEqual('A', xml_top.findall('parent1/parent12/field2')[0].text)
-
-    def test_adds_child_nodes_from_different_branches_to_xml_twice_if_in_different_branches(self):
-        xml_top = Element('top')
-        sterkl_tree = ElsterXmlTreeNode('parent1',
-                                        [ElsterXmlTreeNode('parent11', ['field1']),
-                                         ElsterXmlTreeNode('parent12', ['field1', 'field2'])])
-
-        _add_person_specific_sterkl_fields(xml_top, self.fields, sterkl_tree, 'PersonA')
-
-        self.assertEqual(1, len(xml_top.findall('parent1')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent11')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent11/field1')))
-        self.assertEqual('a', xml_top.findall('parent1/parent11/field1')[0].text)
-        self.assertEqual(1, len(xml_top.findall('parent1/parent12')))
-        self.assertEqual(1, len(xml_top.findall('parent1/parent12/field1')))
-        self.assertEqual('a', xml_top.findall('parent1/parent12/field1')[0].text)
-        self.assertEqual(1, len(xml_top.findall('parent1/parent12/field2')))
-        self.assertEqual('A', xml_top.findall('parent1/parent12/field2')[0].text)
-
-    def test_does_not_add_nodes_without_field_representation(self):
-        xml_top = Element('top')
-        sterkl_tree = ['this-is-not-the-field-youre-looking-for']
-
-        _add_person_specific_sterkl_fields(xml_top, self.fields, sterkl_tree, 'PersonA')
-
-        self.assertEqual(0, len(xml_top.findall('this-is-not-the-field-youre-looking-for')))
-
-    def test_does_not_add_nodes_with_only_empty_child_nodes(self):
-        xml_top = Element('top')
-        sterkl_tree = ElsterXmlTreeNode('parent1',
-                                        [ElsterXmlTreeNode('parent11', []),
-                                         ElsterXmlTreeNode('parent12', [])])
-
-        _add_person_specific_sterkl_fields(xml_top, self.fields, sterkl_tree, 'PersonA')
-
-        self.assertEqual(0, len(xml_top.findall('parent1')))
-
-    def test_does_not_add_nodes_with_only_child_nodes_without_field_representation(self):
-        xml_top = Element('top')
-        sterkl_tree = ElsterXmlTreeNode('parent1',
-                                        [ElsterXmlTreeNode('parent11', ['not-there']),
-                                         ElsterXmlTreeNode('parent12', ['nope'])])
-
-        _add_person_specific_sterkl_fields(xml_top, self.fields, sterkl_tree, 'PersonA')
-
-        self.assertEqual(0, len(xml_top.findall('parent1')))
-
-    def test_only_adds_fields_that_are_person_specific(self):
-        xml_top = Element('top')
-        sterkl_tree = 'field1'
-        non_person_fields = {'field1': 'a'}
-
-        _add_person_specific_sterkl_fields(xml_top, non_person_fields, sterkl_tree, 'PersonA')
-
-        self.assertEqual(0, len(xml_top.findall('field1')))
-
-    def test_does_not_add_fields_for_person_that_are_unfilled(self):
-        xml_top = Element('top')
-        sterkl_tree = 'field2'
-
-        _add_person_specific_sterkl_fields(xml_top, self.fields, sterkl_tree, 'PersonA')
-        self.assertEqual(1, len(xml_top.findall('field2')))
-        self.assertEqual('A', xml_top.findall('field2')[0].text)
-
-        _add_person_specific_sterkl_fields(xml_top, self.fields, sterkl_tree, 'PersonB')
-        self.assertEqual(1, len(xml_top.findall('field2')))  # still 1 because field2 is not filled for PersonB
-        self.assertEqual('A', xml_top.findall('field2')[0].text)
-
-    def test_does_not_add_fields_of_different_person(self):
-        non_existent_person_fields = {PersonSpecificFieldId('field1', 'Dumbledore'): 'a'}
-
-        xml_top = Element('top')
-        sterkl_tree = 'field1'
-
-        _add_person_specific_sterkl_fields(xml_top, non_existent_person_fields, sterkl_tree, 'Harry')
-
-        self.assertEqual(0, len(xml_top.findall('field1')))
-
-
 class TestElsterXml(unittest.TestCase):
     def setUp(self):
         self.dummy_fields = {
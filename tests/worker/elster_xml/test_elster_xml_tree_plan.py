@@ -0,0 +1,230 @@
+import copy
+from xml.etree.ElementTree import Element, SubElement, tostring
+
+import pytest
+
+from erica.worker.elster_xml.elster_xml_generator import _SUPPORTED_STERKL, _SUPPORTED_STERKL_PLAN, PERSONS
+from erica.worker.elster_xml.elster_xml_tree import ElsterXmlTreeNode
+from erica.worker.elster_xml.elster_xml_tree_plan import ElsterXmlTreePlan
+from erica.worker.elster_xml.est_mapping import PersonSpecificFieldId
+
+
+def _add_sterkl_fields(xml_parent, fields, sterkl):
+    """
+        The recursive walk through the tree that was used to add the fields before the plan. It is kept as the
+        reference the XML of the plan is compared with. Other than the plan, it empties the lists in the fields.
+    """
+    if isinstance(sterkl, ElsterXmlTreeNode):
+        for repetition in range(sterkl.repetitions):
+            sterkl_xml = Element(sterkl.name)
+            if sterkl.is_person_specific:
+                person = PERSONS[repetition]
+                SubElement(sterkl_xml, 'Person').text = person
+                for sub_element in sterkl.sub_elements:
+                    _add_person_specific_sterkl_fields(sterkl_xml, fields, sub_element, person)
+            elif sterkl.is_repeatable and \
+                    any([isinstance(fields[sub_element], list) and len(fields[sub_element]) > 1
+                         if sub_element in fields.keys() else False for sub_element in sterkl.sub_elements]):
+                for sub_element in sterkl.sub_elements:
+                    _add_sterkl_fields(sterkl_xml, fields, sub_element)
+                _add_sterkl_fields(xml_parent, fields, sterkl)
+            else:
+                for sub_element in sterkl.sub_elements:
+                    _add_sterkl_fields(sterkl_xml, fields, sub_element)
+            _add_if_not_empty(xml_parent, sterkl_xml)
+    elif isinstance(sterkl, str):  # Reached a leaf node of the tree
+        if sterkl in fields.keys():
+            if isinstance(fields[sterkl], list):
+                SubElement(xml_parent, sterkl).text = fields[sterkl].pop()
+            else:
+                SubElement(xml_parent, sterkl).text = fields[sterkl]
+
+
+def _add_person_specific_sterkl_fields(xml_parent, fields, sterkl, person):
+    """
+        Adds the sub-elements of a person-specific node. Only the fields with a PersonSpecificFieldId of the given
+        person are added, fields that are not person-specific are ignored.
+    """
+    if isinstance(sterkl, ElsterXmlTreeNode):
+        sterkl_xml = Element(sterkl.name)
+        for sub_element in sterkl.sub_elements:
+            _add_person_specific_sterkl_fields(sterkl_xml, fields, sub_element, person)
+        _add_if_not_empty(xml_parent, sterkl_xml)
+    elif isinstance(sterkl, str):  # Reached a leaf node of the tree
+        for field_id in fields.keys():
+            if isinstance(field_id, PersonSpecificFieldId) \
+                    and field_id.identifier == sterkl \
+                    and field_id.person == person:
+                SubElement(xml_parent, sterkl).text = fields[PersonSpecificFieldId(sterkl, person)]
+
+
+def _add_if_not_empty(xml_parent, sterkl_xml):
+    """ Adds sterkl_xml to xml_parent only if it has sub-elements other than 'Person'. """
+    if [elem.tag for elem in sterkl_xml.iter() if elem is not sterkl_xml and elem.tag != 'Person']:
+        xml_parent.append(sterkl_xml)
+
+
+def _get_xml_of_plan(fields, plan=_SUPPORTED_STERKL_PLAN):
+    xml_top = Element('top')
+    plan.add_fields(xml_top, fields)
+    return tostring(xml_top)
+
+
+def _get_xml_of_recursion(fields, top_elements=_SUPPORTED_STERKL):
+    xml_top = Element('top')
+    # The recursion empties the lists in the fields
+    fields = copy.deepcopy(fields)
+    for top_element in top_elements:
+        _add_sterkl_fields(xml_top, fields, top_element)
+    return tostring(xml_top)
+
+
+def _get_all_fields(repeated_values=3):
+    fields = {}
+    for field_id, leaf in _SUPPORTED_STERKL_PLAN._leaves.items():
+        if leaf.repeat_group:
+            fields[field_id] = [f'{leaf.name}-{index}' for index in range(repeated_values)]
+        else:
+            fields[field_id] = f'{field_id}-value'
+    return fields
+
+
+class TestElsterXmlTreePlan:
+    def test_if_all_fields_filled_then_returns_same_xml_as_recursion(self):
+        fields = _get_all_fields()
+        assert _get_xml_of_plan(fields) == _get_xml_of_recursion(fields)
+
+    @pytest.mark.parametrize('repeated_values', [1, 2, 10])
+    def test_if_repeated_fields_then_returns_same_xml_as_recursion(self, repeated_values):
+        fields = {'E0100201': 'Maier', 'E0111217': [str(index) for index in range(repeated_values)],
+                  'E0170601': 'scalar', 'E0104706': [str(index) for index in range(repeated_values)]}
+        assert _get_xml_of_plan(fields) == _get_xml_of_recursion(fields)
+
+    def test_if_list_in_not_repeatable_field_then_returns_same_xml_as_recursion(self):
+        fields = {'E0100201': ['Maier', 'Müller'], 'E0100301': 'Hans'}
+        assert _get_xml_of_plan(fields) == _get_xml_of_recursion(fields)
+
+    @pytest.mark.parametrize('person', PERSONS)
+    def test_if_person_specific_fields_of_one_person_then_returns_same_xml_as_recursion(self, person):
+        fields = {field_id: 'value' for field_id in _SUPPORTED_STERKL_PLAN._leaves
+                  if isinstance(field_id, PersonSpecificFieldId) and field_id.person == person}
+        fields['E0100201'] = 'Maier'
+        assert _get_xml_of_plan(fields) == _get_xml_of_recursion(fields)
+
+    def test_if_fields_in_reverse_order_then_returns_same_xml_as_recursion(self):
+        fields = dict(reversed(_get_all_fields().items()))
+        assert _get_xml_of_plan(fields) == _get_xml_of_recursion(fields)
+
+    def test_if_field_values_none_then_returns_same_xml_as_recursion(self):
+        fields = {'E0100201': None, PersonSpecificFieldId('E0109706', 'PersonB'): None}
+        assert _get_xml_of_plan(fields) == _get_xml_of_recursion(fields)
+
+    def test_if_no_fields_of_tree_then_adds_nothing(self):
+        fields = {'unknown': 'value', ('E0100201', 'PersonA'): 'value',
+                  PersonSpecificFieldId('E0100201', 'PersonA'): 'value'}
+        assert _get_xml_of_plan(fields) == _get_xml_of_recursion(fields) == b'<top />'
+
+    def test_if_lists_of_repeatable_node_differ_in_length_then_raises_index_error_as_recursion(self):
+        fields = {'E0111217': ['1', '2', '3'], 'E0170601': ['1', '2']}
+        with pytest.raises(IndexError):
+            _get_xml_of_recursion(fields)
+        with pytest.raises(IndexError):
+            _get_xml_of_plan(fields)
+
+    def test_if_fields_added_then_lists_are_not_emptied(self):
+        fields = {'E0100201': ['Maier'], 'E0104706': ['7a', '7b']}
+        _get_xml_of_plan(fields)
+        assert fields == {'E0100201': ['Maier'], 'E0104706': ['7a', '7b']}
+
+    def test_if_custom_tree_then_returns_same_xml_as_recursion(self):
+        top_elements = [ElsterXmlTreeNode('parent1', [
+            ElsterXmlTreeNode('parent11', ['field_repeat_1'], is_repeatable=True),
+            'field1',
+            ElsterXmlTreeNode('parent12', [ElsterXmlTreeNode('parent121', ['field2']), 'field3']),
+            ElsterXmlTreeNode('parent13', ['field4', ElsterXmlTreeNode('parent131', ['field5'])],
+                              is_person_specific=True, repetitions=2)])]
+        plan = ElsterXmlTreePlan(top_elements, PERSONS)
+        fields = {'field_repeat_1': ['a', 'b'], 'field1': 'c', 'field3': 'd',
+                  PersonSpecificFieldId('field5', 'PersonB'): 'e', PersonSpecificFieldId('field4', 'PersonA'): 'f'}
+
+        assert _get_xml_of_plan(fields, plan) == _get_xml_of_recursion(fields, top_elements)
+
+    def test_if_leaf_in_tree_twice_then_raises_value_error(self):
+        top_elements = [ElsterXmlTreeNode('parent1', ['field1']), ElsterXmlTreeNode('parent2', ['field1'])]
+        with pytest.raises(ValueError):
+            ElsterXmlTreePlan(top_elements, PERSONS)
+
+    def test_if_repeatable_node_contains_node_then_raises_value_error(self):
+        top_elements = [ElsterXmlTreeNode('parent1', [ElsterXmlTreeNode('parent11', ['field1'])], is_repeatable=True)]
+        with pytest.raises(ValueError):
+            ElsterXmlTreePlan(top_elements, PERSONS)
+
+
+class TestElsterXmlTreePlanAddFields:
+    def test_if_node_with_leaves_then_adds_all_leaves_to_node(self):
+        plan = ElsterXmlTreePlan([ElsterXmlTreeNode('parent', ['field1', 'field2'])], PERSONS)
+        fields = {'field1': 'a', 'field2': 'b'}
+
+        assert _get_xml_of_plan(fields, plan) == b'<top><parent><field1>a</field1><field2>b</field2></parent></top>'
+
+    def test_if_leaves_in_different_branches_then_adds_them_to_their_branch(self):
+        plan = ElsterXmlTreePlan([ElsterXmlTreeNode('parent1', [ElsterXmlTreeNode('parent11', ['field1']),
+                                                                ElsterXmlTreeNode('parent12', ['field2'])])], PERSONS)
+        fields = {'field2': 'b', 'field1': 'a'}
+
+        assert _get_xml_of_plan(fields, plan) == \
+            b'<top><parent1><parent11><field1>a</field1></parent11><parent12><field2>b</field2></parent12></parent1></top>'
+
+    def test_if_fields_not_part_of_tree_then_adds_nothing(self):
+        plan = ElsterXmlTreePlan([ElsterXmlTreeNode('parent1', [ElsterXmlTreeNode('parent11', []),
+                                                                ElsterXmlTreeNode('parent12', ['not-there'])])],
+                                 PERSONS)
+        fields = {'field1': 'a', 'field2': 'b'}
+
+        assert _get_xml_of_plan(fields, plan) == b'<top />'
+
+    def test_if_person_specific_node_then_adds_node_with_person_for_each_filled_person(self):
+        plan = ElsterXmlTreePlan([ElsterXmlTreeNode('parent1', [ElsterXmlTreeNode('parent11', ['field1']),
+                                                                ElsterXmlTreeNode('parent12', ['field2'])],
+                                                    is_person_specific=True, repetitions=2)], PERSONS)
+        fields = {PersonSpecificFieldId('field1', 'PersonA'): 'a', PersonSpecificFieldId('field1', 'PersonB'): 'b',
+                  PersonSpecificFieldId('field2', 'PersonA'): 'A'}
+
+        assert _get_xml_of_plan(fields, plan) == \
+            b'<top>' \
+            b'<parent1><Person>PersonA</Person>' \
+            b'<parent11><field1>a</field1></parent11><parent12><field2>A</field2></parent12></parent1>' \
+            b'<parent1><Person>PersonB</Person><parent11><field1>b</field1></parent11></parent1>' \
+            b'</top>'
+
+    def test_if_person_specific_node_without_fields_of_person_then_does_not_add_node(self):
+        plan = ElsterXmlTreePlan([ElsterXmlTreeNode('parent1', ['field1'], is_person_specific=True, repetitions=2)],
+                                 PERSONS)
+        fields = {PersonSpecificFieldId('field1', 'PersonB'): 'b'}
+
+        assert _get_xml_of_plan(fields, plan) == \
+            b'<top><parent1><Person>PersonB</Person><field1>b</field1></parent1></top>'
+
+    @pytest.mark.parametrize('field_id', ['field1', PersonSpecificFieldId('field1', 'Dumbledore')])
+    def test_if_no_person_specific_field_of_person_then_does_not_add_it_to_person_specific_node(self, field_id):
+        plan = ElsterXmlTreePlan([ElsterXmlTreeNode('parent1', ['field1'], is_person_specific=True, repetitions=2)],
+                                 PERSONS)
+
+        assert _get_xml_of_plan({field_id: 'a'}, plan) == b'<top />'
+
+    def test_if_repeatable_nodes_then_adds_node_once_for_each_value(self):
+        plan = ElsterXmlTreePlan([ElsterXmlTreeNode('parent1', [
+            ElsterXmlTreeNode('parent11', ['field_repeat_1'], is_repeatable=True),
+            ElsterXmlTreeNode('parent12', ['field1']),
+            ElsterXmlTreeNode('parent13', ['field_repeat_2', 'field_repeat_3'], is_repeatable=True)])], PERSONS)
+        fields = {'field_repeat_1': ['a', 'b'], 'field1': 'a', 'field_repeat_2': ['c', 'd'],
+                  'field_repeat_3': ['e', 'f']}
+
+        assert _get_xml_of_plan(fields, plan) == \
+            b'<top><parent1>' \
+            b'<parent11><field_repeat_1>a</field_repeat_1></parent11>' \
+            b'<parent11><field_repeat_1>b</field_repeat_1></parent11>' \
+            b'<parent12><field1>a</field1></parent12>' \
+            b'<parent13><field_repeat_2>c</field_repeat_2><field_repeat_3>e</field_repeat_3></parent13>' \
+            b'<parent13><field_repeat_2>d</field_repeat_2><field_repeat_3>f</field_repeat_3></parent13>' \
+            b'</parent1></top>'
@@ -5,7 +5,7 @@ from xml.etree.ElementTree import tostring, ParseError, Element, SubElement
 
 from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import remove_declaration_and_namespace, \
     get_elements_from_xml_element, get_elements_from_xml, get_elements_text_from_xml, \
-    get_elements_text_from_xml_element, get_elements_key_value_from_xml
+    get_elements_text_from_xml_element, get_elements_key_value_from_xml, ParsedEricResponse, parse_eric_response
 from utils import read_text_from_sample
 
 
@@ -255,4 +255,53 @@ class TestGetElementKeyValueFromXml(unittest.TestCase):
         xml_element.set(self.key, self.value_1)
 
         returned_values = get_elements_key_value_from_xml(xml_top, 'element', self.key)
-        self.assertEqual([self.value_1], returned_values)
\ No newline at end of file
+        self.assertEqual([self.value_1], returned_values)
+
+    def test_if_element_has_namespace_then_value_is_returned_correctly(self):
+        xml_top = Element('{some-namespace}parent')
+        xml_element = SubElement(xml_top, '{some-namespace}element')
+        xml_element.set(self.key, self.value_1)
+
+        returned_values = get_elements_key_value_from_xml(xml_top, 'element', self.key)
+        self.assertEqual([self.value_1], returned_values)
+
+
+class TestParsedEricResponse(unittest.TestCase):
+    def setUp(self):
+        self.xml_string = read_text_from_sample('sample_vast_request_response.xml')
+
+    def test_if_created_then_xml_is_not_parsed(self):
+        with patch('erica.worker.elster_xml.xml_parsing.erica_xml_parsing.ET.fromstring') as fromstring:
+            ParsedEricResponse(self.xml_string)
+        fromstring.assert_not_called()
+
+    def test_if_values_extracted_then_xml_is_parsed_once(self):
+        with patch('erica.worker.elster_xml.xml_parsing.erica_xml_parsing.ET.fromstring',
+                   MagicMock(wraps=ET.fromstring)) as fromstring:
+            parsed_response = ParsedEricResponse(self.xml_string)
+            parsed_response.get_element('AntragsID')
+            parsed_response.get_element('TransferTicket')
+            get_elements_text_from_xml(parsed_response, 'Code')
+        self.assertEqual(1, fromstring.call_count)
+
+    def test_if_created_then_tree_is_same_as_with_removed_declaration_and_namespace(self):
+        parsed_response = ParsedEricResponse(self.xml_string)
+        self.assertEqual(tostring(remove_declaration_and_namespace(self.xml_string)),
+                         tostring(parsed_response.xml_tree))
+
+    def test_if_element_with_text_then_return_text(self):
+        parsed_response = ParsedEricResponse('<Elster xmlns="some-namespace"><Id>42</Id></Elster>')
+        self.assertEqual('42', parsed_response.get_element('Id'))
+
+    def test_if_element_with_children_then_return_serialised_element(self):
+        parsed_response = ParsedEricResponse('<Elster xmlns="some-namespace"><Adr><Str>Weg</Str></Adr></Elster>')
+        self.assertEqual(b'<Adr><Str>Weg</Str></Adr>', parsed_response.get_element('Adr'))
+
+    def test_if_elements_text_requested_then_return_same_as_for_string(self):
+        parsed_response = ParsedEricResponse(self.xml_string)
+        self.assertEqual(get_elements_text_from_xml(self.xml_string, 'Code'),
+                         parsed_response.get_elements_text('Code'))
+
+    def test_if_parsed_response_given_then_parse_eric_response_returns_it(self):
+        parsed_response = ParsedEricResponse(self.xml_string)
+        self.assertIs(parsed_response, parse_eric_response(parsed_response))
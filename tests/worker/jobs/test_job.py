@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, call, patch
 from uuid import uuid4
 
@@ -6,10 +6,11 @@ import pytest
 from freezegun import freeze_time
 
 from erica.worker.jobs.job import perform_job
-from erica.domain.model.erica_request import Status
+from erica.domain.model.erica_request import EricaRequest, Status, RequestType
 from erica.worker.pyeric.eric_errors import EricProcessNotSuccessful, EricGlobalValidationError, \
     EricTransferError, EricAlreadyRequestedError
 from erica.domain.sqlalchemy.repositories.base_repository import EntityNotFoundError
+from erica.worker.pyeric.token_scheduler import _current_token_request
 
 
 class TestJob:
@@ -59,11 +60,24 @@ class TestJob:
         assert any("Job failed" in logged_msg[1][0] for logged_msg in warning_logger.mock_calls)
         assert any("1234" not in logged_msg[1][0] for logged_msg in warning_logger.mock_calls)
 
+    def test_if_job_performed_then_apply_to_elster_in_token_request_context_of_entity(self):
+        mock_entity = MagicMock(id="R2-D2", request_id="C3PO", type=RequestType.grundsteuer, creator_id="tester")
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=mock_entity))
+        token_requests = []
+        mock_service = MagicMock(apply_to_elster=MagicMock(
+            side_effect=lambda *args: token_requests.append(_current_token_request.get()) or {}))
+
+        perform_job(request_id=uuid4(), repository=mock_repository, service=mock_service,
+                    payload_type=MagicMock(), logger=MagicMock())
+
+        assert token_requests == [(RequestType.grundsteuer, "tester")]
+        assert _current_token_request.get() == (None, None)
+
     def test_if_service_raises_error_then_update_entity_in_database_with_correct_values(self):
         mock_entity = MagicMock(id="R2-D2", request_id="C3PO")
         mock_get_by_job_request_id = MagicMock(return_value=mock_entity)
-        mock_update = MagicMock()
-        mock_repository = MagicMock(get_by_job_request_id=mock_get_by_job_request_id, update=mock_update)
+        mock_update_columns = MagicMock()
+        mock_repository = MagicMock(get_by_job_request_id=mock_get_by_job_request_id, update_columns=mock_update_columns)
         mock_service = MagicMock(apply_to_elster=MagicMock(side_effect=EricTransferError(
             eric_response=f"<xml>Eric Response</xml>".encode(),
             server_response=f"<xml>Server Response</xml>".encode())))
@@ -75,14 +89,16 @@ class TestJob:
         assert mock_entity.error_message == EricProcessNotSuccessful().generate_error_response().get('message')
         assert mock_entity.result is None
         assert mock_entity.status == Status.failed
-        assert mock_update.mock_calls == [call(mock_entity.id, mock_entity)]
+        assert mock_update_columns.call_args_list == [call(mock_entity.id, {
+            'error_code': mock_entity.error_code, 'error_message': mock_entity.error_message,
+            'result': mock_entity.result, 'status': Status.failed})]
 
     def test_if_service_raises_error_with_validation_problems_then_update_entity_in_database_with_correct_values(self):
         validation_problems = "These are not the Ericas you are looking for"
         mock_entity = MagicMock(id="R2-D2", request_id="C3PO")
         mock_get_by_job_request_id = MagicMock(return_value=mock_entity)
-        mock_update = MagicMock()
-        mock_repository = MagicMock(get_by_job_request_id=mock_get_by_job_request_id, update=mock_update)
+        mock_update_columns = MagicMock()
+        mock_repository = MagicMock(get_by_job_request_id=mock_get_by_job_request_id, update_columns=mock_update_columns)
         mock_service = MagicMock(apply_to_elster=MagicMock(side_effect=EricGlobalValidationError(
             eric_response=f"<xml><Text>{validation_problems}</Text></xml>".encode())))
 
@@ -93,7 +109,9 @@ class TestJob:
         assert mock_entity.error_message == EricProcessNotSuccessful().generate_error_response().get('message')
         assert mock_entity.result == {'validation_errors': [validation_problems]}
         assert mock_entity.status == Status.failed
-        assert mock_update.mock_calls == [call(mock_entity.id, mock_entity)]
+        assert mock_update_columns.call_args_list == [call(mock_entity.id, {
+            'error_code': mock_entity.error_code, 'error_message': mock_entity.error_message,
+            'result': mock_entity.result, 'status': Status.failed})]
 
     @freeze_time("Jan 3th, 1892", auto_tick_seconds=15)
     def test_if_service_raises_error_then_log_runtime_of_job(self):
@@ -154,8 +172,8 @@ class TestJob:
     def test_if_job_ran_successful_then_update_entity_in_database_with_correct_values(self):
         mock_entity = MagicMock(id="R2-D2", request_id="C3PO")
         mock_get_by_job_request_id = MagicMock(return_value=mock_entity)
-        mock_update = MagicMock()
-        mock_repository = MagicMock(get_by_job_request_id=mock_get_by_job_request_id, update=mock_update)
+        mock_update_columns = MagicMock()
+        mock_repository = MagicMock(get_by_job_request_id=mock_get_by_job_request_id, update_columns=mock_update_columns)
         mock_result = {'msg': "These are not the mocks you are looking for"}
         service = MagicMock(apply_to_elster=MagicMock(return_value=mock_result))
 
@@ -164,7 +182,25 @@ class TestJob:
 
         assert mock_entity.result == {**mock_result}
         assert mock_entity.status == Status.success
-        assert mock_update.mock_calls == [call(mock_entity.id, mock_entity)]
+        assert mock_update_columns.call_args_list == [call(mock_entity.id, {'result': mock_result,
+                                                                            'status': Status.success})]
+
+    def test_if_job_ran_successful_then_entity_takes_over_updated_row(self):
+        mock_entity = MagicMock(id="R2-D2", request_id="C3PO")
+        updated_at = datetime(2022, 7, 6, 12, 0, tzinfo=timezone.utc)
+        updated_entity = EricaRequest(id="R2-D2", request_id=uuid4(), type=RequestType.grundsteuer, payload={},
+                                      creator_id="tester", status=Status.success, updated_at=updated_at)
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=mock_entity),
+                                    update_columns=MagicMock(return_value=updated_entity))
+        service = MagicMock(apply_to_elster=MagicMock(return_value={}))
+
+        with patch("erica.worker.jobs.job.cache_finished_request") as cache_finished_request, \
+                patch("erica.worker.jobs.job.notify_job_completion"):
+            perform_job(request_id=uuid4(), repository=mock_repository, service=service, payload_type=MagicMock(),
+                        logger=MagicMock())
+
+        assert mock_entity.updated_at == updated_at
+        assert cache_finished_request.call_args.args[0].updated_at == updated_at
 
     def test_if_job_ran_successful_then_ids_type_and_payload_of_entity_not_changed(self):
         original_id = "R2-D2"
@@ -172,8 +208,8 @@ class TestJob:
         original_type = "droid"
         mock_entity = MagicMock(id=original_id, request_id=original_request_id, type=original_type)
         mock_get_by_job_request_id = MagicMock(return_value=mock_entity)
-        mock_update = MagicMock()
-        mock_repository = MagicMock(get_by_job_request_id=mock_get_by_job_request_id, update=mock_update)
+        mock_update_columns = MagicMock()
+        mock_repository = MagicMock(get_by_job_request_id=mock_get_by_job_request_id, update_columns=mock_update_columns)
         mock_result = {'msg': "These are not the mocks you are looking for"}
         service = MagicMock(apply_to_elster=MagicMock(return_value=mock_result))
 
@@ -203,3 +239,46 @@ class TestJob:
 
         assert any("Job running time" in logged_msg[1][0] for logged_msg in info_logger.mock_calls)
         assert any(f"{timedelta(seconds=15)}" in logged_msg[1][0] for logged_msg in info_logger.mock_calls)
+
+    def test_if_job_finished_then_notify_completion(self):
+        mock_entity = MagicMock(id="R2-D2", request_id="C3PO")
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=mock_entity))
+
+        with patch("erica.worker.jobs.job.notify_job_completion") as notify_job_completion:
+            perform_job(request_id=uuid4(), repository=mock_repository, service=MagicMock(),
+                        payload_type=MagicMock(), logger=MagicMock())
+
+        notify_job_completion.assert_called_once_with("C3PO")
+
+    def test_if_job_failed_then_notify_completion(self):
+        mock_entity = MagicMock(id="R2-D2", request_id="C3PO")
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=mock_entity))
+        service = MagicMock(apply_to_elster=MagicMock(side_effect=EricProcessNotSuccessful(3)))
+
+        with patch("erica.worker.jobs.job.notify_job_completion") as notify_job_completion:
+            perform_job(request_id=uuid4(), repository=mock_repository, service=service,
+                        payload_type=MagicMock(), logger=MagicMock())
+
+        notify_job_completion.assert_called_once_with("C3PO")
+
+    def test_if_entity_not_found_then_do_not_notify_completion(self):
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(side_effect=EntityNotFoundError))
+
+        with patch("erica.worker.jobs.job.notify_job_completion") as notify_job_completion, \
+                pytest.raises(EntityNotFoundError):
+            perform_job(request_id=uuid4(), repository=mock_repository, service=MagicMock(),
+                        payload_type=MagicMock(), logger=MagicMock())
+
+        notify_job_completion.assert_not_called()
+
+    def test_if_job_finished_then_cache_request_before_notifying_completion(self):
+        mock_entity = MagicMock(id="R2-D2", request_id="C3PO")
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=mock_entity))
+        report = MagicMock()
+
+        with patch("erica.worker.jobs.job.cache_finished_request", report.cache_finished_request), \
+                patch("erica.worker.jobs.job.notify_job_completion", report.notify_job_completion):
+            perform_job(request_id=uuid4(), repository=mock_repository, service=MagicMock(),
+                        payload_type=MagicMock(), logger=MagicMock())
+
+        assert report.mock_calls == [call.cache_finished_request(mock_entity), call.notify_job_completion("C3PO")]
@@ -60,7 +60,7 @@ class TestIntegrationWithDatabaseAndCheckTaxNumber:
     def test_if_entity_in_data_base_then_set_correct_result_in_database(self, standard_est_input_data):
         payload = CheckTaxNumberPayload(
             state_abbreviation=StateAbbreviation.bw,
-            tax_number='04531972802')
+            tax_number='0453197280')
         # Necessary due to async db fixture. See fixture definition for details.
         with session_scope():
             service = get_job_service(RequestType.check_tax_number)
@@ -8,7 +8,8 @@ from erica.config import get_settings
 from worker.utils import gen_random_key, missing_cert, missing_pyeric_lib
 from erica.worker.pyeric.eric import EricWrapper, EricDruckParameterT, EricVerschluesselungsParameterT, EricResponse, \
     get_eric_wrapper
-from erica.worker.pyeric.eric_errors import EricProcessNotSuccessful, EricNullReturnedError, EricGlobalError
+from erica.worker.pyeric.eric_errors import EricProcessNotSuccessful, EricNullReturnedError, EricGlobalError, \
+    EricCryptError
 from utils import read_text_from_sample
 
 TEST_CERTIFICATE_PATH = 'erica/worker/instances/blueprint/cert.pfx'
@@ -195,7 +196,7 @@ class TestValidateAndSend(unittest.TestCase):
         enter_object.name = self.print_path
         temporary_file_object = MagicMock(__enter__=lambda _: enter_object)
         with patch('erica.worker.pyeric.eric.pointer') as pointer, \
-                patch('erica.worker.pyeric.eric.tempfile.NamedTemporaryFile', MagicMock(return_value=temporary_file_object)):
+                patch('erica.worker.pyeric.eric.InMemoryPdfFile', MagicMock(return_value=temporary_file_object)):
             pointer.side_effect = self.mock_function
             self.eric_api_with_mocked_binaries.validate_and_send(self.xml, self.data_type_version)
 
@@ -210,11 +211,11 @@ class TestValidateAndSend(unittest.TestCase):
     def test_correct_pdf_set_in_return_value(self):
         self.mock_fun_process_successful.reset_mock()
         self.eric_api_with_mocked_binaries.process = self.mock_fun_process_successful
-        enter_object = MagicMock()
+        enter_object = MagicMock(read=MagicMock(return_value=self.eric_response.pdf))
         enter_object.name = self.print_path
         temporary_file_object = MagicMock(__enter__=lambda _: enter_object)
         with patch('erica.worker.pyeric.eric.pointer') as pointer, \
-                patch('erica.worker.pyeric.eric.tempfile.NamedTemporaryFile', MagicMock(return_value=temporary_file_object)):
+                patch('erica.worker.pyeric.eric.InMemoryPdfFile', MagicMock(return_value=temporary_file_object)):
             pointer.side_effect = self.mock_function
             response = self.eric_api_with_mocked_binaries.validate_and_send(self.xml, self.data_type_version)
 
@@ -889,9 +890,10 @@ class TestCheckTaxNumber:
         tax_number = "9198011310010"
 
         # Raise ERIC_GLOBAL_STEUERNUMMER_UNGUELTIG error
-        eric_wrapper.eric.EricMtPruefeSteuernummer = MagicMock(__name__="EricMtPruefeSteuernummer", return_value=610001034)
+        mock_check_tax_number = MagicMock(__name__="EricMtPruefeSteuernummer", return_value=610001034)
 
-        result = eric_wrapper.check_tax_number(tax_number)
+        with patch.object(eric_wrapper.functions, 'EricMtPruefeSteuernummer', mock_check_tax_number):
+            result = eric_wrapper.check_tax_number(tax_number)
 
         assert result is False
 
@@ -903,9 +905,10 @@ class TestCheckTaxNumber:
         tax_number = "9198011310010"
 
         # Raise ERIC_GLOBAL_UNKNOWN error
-        eric_wrapper.eric.EricMtPruefeSteuernummer = MagicMock(__name__="EricMtPruefeSteuernummer", return_value=610001001)
+        mock_check_tax_number = MagicMock(__name__="EricMtPruefeSteuernummer", return_value=610001001)
 
-        with pytest.raises(EricGlobalError):
+        with patch.object(eric_wrapper.functions, 'EricMtPruefeSteuernummer', mock_check_tax_number), \
+                pytest.raises(EricGlobalError):
             eric_wrapper.check_tax_number(tax_number)
 
 
@@ -1226,4 +1229,105 @@ class TestGetCertProperties(unittest.TestCase):
         self.eric_wrapper_with_mock_eric_binaries.get_cert_properties()
 
         self.eric_wrapper_with_mock_eric_binaries.close_buffer.assert_called()
+        self.eric_wrapper_with_mock_eric_binaries.close_cert_handle.assert_not_called()
+
+        self.eric_wrapper_with_mock_eric_binaries.release_cert_handle()
+
         self.eric_wrapper_with_mock_eric_binaries.close_cert_handle.assert_called()
+
+
+class TestCachedCertHandle(unittest.TestCase):
+    def setUp(self):
+        mock_eric = MagicMock()
+        mock_eric.EricMtInstanzFreigeben = MagicMock(return_value=0)
+        with patch('erica.worker.pyeric.eric.load_eric_library', MagicMock(return_value=mock_eric)):
+            self.eric_wrapper = EricWrapper()
+        self.eric_wrapper.get_cert_handle = MagicMock(side_effect=lambda: c_int())
+        self.eric_wrapper.close_cert_handle = MagicMock()
+
+    def test_if_cert_handle_used_twice_then_open_handle_once(self):
+        with self.eric_wrapper.cached_cert_handle() as first_handle:
+            pass
+        with self.eric_wrapper.cached_cert_handle() as second_handle:
+            pass
+
+        self.assertIs(first_handle, second_handle)
+        self.eric_wrapper.get_cert_handle.assert_called_once()
+        self.eric_wrapper.close_cert_handle.assert_not_called()
+
+    def test_if_ttl_expired_then_close_handle_and_open_new_one(self):
+        with self.eric_wrapper.cached_cert_handle() as first_handle:
+            pass
+        with patch('erica.worker.pyeric.eric.time.monotonic',
+                   MagicMock(return_value=self.eric_wrapper._cert_handle_opened_at
+                             + get_settings().cert_handle_ttl_in_sec)):
+            with self.eric_wrapper.cached_cert_handle() as second_handle:
+                pass
+
+        self.assertIsNot(first_handle, second_handle)
+        self.eric_wrapper.close_cert_handle.assert_called_once_with(first_handle)
+
+    def test_if_ttl_is_zero_then_close_handle_after_every_use(self):
+        with patch.object(get_settings(), 'cert_handle_ttl_in_sec', 0):
+            with self.eric_wrapper.cached_cert_handle() as first_handle:
+                pass
+            with self.eric_wrapper.cached_cert_handle():
+                pass
+
+        self.assertEqual(2, self.eric_wrapper.get_cert_handle.call_count)
+        self.eric_wrapper.close_cert_handle.assert_any_call(first_handle)
+        self.assertEqual(2, self.eric_wrapper.close_cert_handle.call_count)
+
+    def test_if_ttl_is_zero_and_other_error_raised_then_close_handle(self):
+        with patch.object(get_settings(), 'cert_handle_ttl_in_sec', 0):
+            with self.assertRaises(EricGlobalError):
+                with self.eric_wrapper.cached_cert_handle() as cert_handle:
+                    raise EricGlobalError(610001001)
+
+        self.eric_wrapper.close_cert_handle.assert_called_once_with(cert_handle)
+        self.assertIsNone(self.eric_wrapper._cert_handle)
+
+    def test_if_crypt_error_raised_then_drop_handle(self):
+        with self.assertRaises(EricCryptError):
+            with self.eric_wrapper.cached_cert_handle() as first_handle:
+                raise EricCryptError(610201101)
+        with self.eric_wrapper.cached_cert_handle():
+            pass
+
+        self.eric_wrapper.close_cert_handle.assert_called_once_with(first_handle)
+        self.assertEqual(2, self.eric_wrapper.get_cert_handle.call_count)
+
+    def test_if_other_error_raised_then_keep_handle(self):
+        with self.assertRaises(EricGlobalError):
+            with self.eric_wrapper.cached_cert_handle():
+                raise EricGlobalError(610001001)
+        with self.eric_wrapper.cached_cert_handle():
+            pass
+
+        self.eric_wrapper.get_cert_handle.assert_called_once()
+        self.eric_wrapper.close_cert_handle.assert_not_called()
+
+    def test_if_closing_handle_fails_then_handle_is_dropped_anyway(self):
+        self.eric_wrapper.close_cert_handle.side_effect = EricCryptError(610201101)
+        with self.eric_wrapper.cached_cert_handle():
+            pass
+
+        self.eric_wrapper.release_cert_handle()
+
+        self.assertIsNone(self.eric_wrapper._cert_handle)
+
+    def test_if_shutdown_then_close_cached_handle(self):
+        with self.eric_wrapper.cached_cert_handle() as cert_handle:
+            pass
+
+        self.eric_wrapper.shutdown()
+
+        self.eric_wrapper.close_cert_handle.assert_called_once_with(cert_handle)
+
+    def test_if_data_decrypted_multiple_times_then_open_handle_once(self):
+        self.eric_wrapper._call_and_return_buffer_contents_and_decode = MagicMock(return_value="decrypted")
+
+        for _ in range(3):
+            self.eric_wrapper.decrypt_data("encrypted")
+
+        self.eric_wrapper.get_cert_handle.assert_called_once()
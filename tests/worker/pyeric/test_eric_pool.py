@@ -0,0 +1,197 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from erica.worker.pyeric.eric import get_eric_wrapper, _is_instance_error
+from erica.worker.pyeric.eric_errors import EricGlobalError, EricGlobalValidationError, EricTransferError, \
+    EricGlobalInitialisationError, EricWrongTaxNumberError
+from erica.worker.pyeric.eric_pool import EricWrapperPool, EricWrapperPoolTimeoutError, EricWrapperPoolClosedError
+
+
+class _FakeEricInstance:
+    def __init__(self):
+        self.healthy = True
+
+
+def _create_pool(max_size=2, max_uses=10, checkout_timeout=1, should_recycle=lambda exception: False):
+    created = []
+    destroyed = []
+
+    def create_instance():
+        instance = _FakeEricInstance()
+        created.append(instance)
+        return instance
+
+    pool = EricWrapperPool(create_instance=create_instance,
+                           destroy_instance=destroyed.append,
+                           max_size=max_size,
+                           max_uses=max_uses,
+                           checkout_timeout=checkout_timeout,
+                           health_check=lambda instance: instance.healthy,
+                           should_recycle=should_recycle)
+    return pool, created, destroyed
+
+
+class TestEricWrapperPoolCheckout(unittest.TestCase):
+
+    def test_if_instance_checked_out_twice_sequentially_then_instance_is_reused(self):
+        pool, created, _ = _create_pool()
+
+        with pool.checkout() as first:
+            pass
+        with pool.checkout() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(1, len(created))
+
+    def test_if_instances_checked_out_concurrently_then_different_instances_returned(self):
+        pool, created, _ = _create_pool()
+
+        with pool.checkout() as first, pool.checkout() as second:
+            self.assertIsNot(first, second)
+
+        self.assertEqual(2, len(created))
+
+    def test_if_pool_exhausted_then_raise_timeout_error(self):
+        pool, _, _ = _create_pool(max_size=1, checkout_timeout=0.05)
+
+        with pool.checkout():
+            with self.assertRaises(EricWrapperPoolTimeoutError):
+                with pool.checkout():
+                    pass
+
+    def test_if_pool_exhausted_then_wait_for_checked_in_instance(self):
+        pool, created, _ = _create_pool(max_size=1, checkout_timeout=5)
+        checked_out = threading.Event()
+        release = threading.Event()
+
+        def hold_instance():
+            with pool.checkout():
+                checked_out.set()
+                release.wait()
+
+        holder = threading.Thread(target=hold_instance)
+        holder.start()
+        checked_out.wait()
+        threading.Timer(0.05, release.set).start()
+
+        with pool.checkout():
+            pass
+        holder.join()
+
+        self.assertEqual(1, len(created))
+
+    def test_if_creating_instance_fails_then_slot_is_freed(self):
+        pool = EricWrapperPool(create_instance=MagicMock(side_effect=[OSError, _FakeEricInstance()]),
+                               destroy_instance=MagicMock(), max_size=1, max_uses=10, checkout_timeout=0.05)
+
+        with self.assertRaises(OSError):
+            with pool.checkout():
+                pass
+        with pool.checkout() as instance:
+            self.assertIsInstance(instance, _FakeEricInstance)
+
+    def test_if_pool_closed_then_raise_error_on_checkout(self):
+        pool, _, _ = _create_pool()
+        pool.close()
+
+        with self.assertRaises(EricWrapperPoolClosedError):
+            with pool.checkout():
+                pass
+
+
+class TestEricWrapperPoolRecycling(unittest.TestCase):
+
+    def test_if_max_uses_reached_then_instance_is_destroyed_and_replaced(self):
+        pool, created, destroyed = _create_pool(max_uses=2)
+
+        for _ in range(3):
+            with pool.checkout():
+                pass
+
+        self.assertEqual([created[0]], destroyed)
+        self.assertEqual(2, len(created))
+
+    def test_if_idle_instance_unhealthy_then_instance_is_destroyed_and_replaced(self):
+        pool, created, destroyed = _create_pool()
+        with pool.checkout() as instance:
+            instance.healthy = False
+
+        with pool.checkout() as replacement:
+            self.assertIsNot(instance, replacement)
+
+        self.assertEqual([instance], destroyed)
+
+    def test_if_error_should_recycle_then_instance_is_destroyed(self):
+        pool, created, destroyed = _create_pool(should_recycle=lambda exception: True)
+
+        with self.assertRaises(ValueError):
+            with pool.checkout():
+                raise ValueError()
+
+        self.assertEqual(created, destroyed)
+        self.assertEqual(0, pool.stats()['size'])
+
+    def test_if_error_should_not_recycle_then_instance_is_kept(self):
+        pool, _, destroyed = _create_pool(should_recycle=lambda exception: False)
+
+        with self.assertRaises(ValueError):
+            with pool.checkout():
+                raise ValueError()
+
+        self.assertEqual([], destroyed)
+        self.assertEqual(1, pool.stats()['idle'])
+
+    def test_if_pool_closed_while_instance_checked_out_then_destroy_instance_on_checkin(self):
+        pool, created, destroyed = _create_pool()
+
+        with pool.checkout():
+            pool.close()
+            self.assertEqual([], destroyed)
+
+        self.assertEqual(created, destroyed)
+
+
+class TestEricWrapperPoolAddIdleInstance(unittest.TestCase):
+
+    def test_if_below_max_size_then_add_idle_instance(self):
+        pool, created, _ = _create_pool(max_size=1)
+
+        self.assertTrue(pool.add_idle_instance())
+        self.assertEqual({'size': 1, 'idle': 1, 'in_use': 0, 'max_size': 1}, pool.stats())
+
+    def test_if_max_size_reached_then_do_not_add_idle_instance(self):
+        pool, created, _ = _create_pool(max_size=1)
+        pool.add_idle_instance()
+
+        self.assertFalse(pool.add_idle_instance())
+        self.assertEqual(1, len(created))
+
+
+class TestIsInstanceError:
+
+    @pytest.mark.parametrize("exception", [EricGlobalError(610001080), EricGlobalInitialisationError(610001081)])
+    def test_if_instance_related_eric_error_then_return_true(self, exception):
+        assert _is_instance_error(exception)
+
+    @pytest.mark.parametrize("exception", [EricGlobalValidationError(610001002), EricWrongTaxNumberError(),
+                                           EricTransferError(610101200), ValueError()])
+    def test_if_data_or_server_related_error_then_return_false(self, exception):
+        assert not _is_instance_error(exception)
+
+
+class TestGetEricWrapper(unittest.TestCase):
+
+    def test_if_called_then_yield_instance_from_pool(self):
+        pool, created, _ = _create_pool()
+
+        with patch('erica.worker.pyeric.eric.get_eric_wrapper_pool', MagicMock(return_value=pool)):
+            with get_eric_wrapper() as eric_wrapper:
+                self.assertIs(created[0], eric_wrapper)
+            with get_eric_wrapper():
+                pass
+
+        self.assertEqual(1, len(created))
@@ -0,0 +1,129 @@
+import os
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from ctypes import c_int, pointer
+from unittest.mock import MagicMock, patch
+
+from erica.config import get_settings
+from erica.worker.pyeric import eric_process_pool
+from erica.worker.pyeric.eric import EricResponse, get_eric_wrapper
+from erica.worker.pyeric.eric_errors import EricGlobalError
+from erica.worker.pyeric.eric_pool import EricWrapperPoolClosedError
+from erica.worker.pyeric.eric_process_pool import EricProcessPool, EricProcessPoolWrapper
+
+
+class _FakeEricWrapper:
+    """Stands in for the ERiC instance of a worker process and reports the process it runs in."""
+
+    def validate(self, xml, data_type_version):
+        return EricResponse(0, xml.encode(), str(os.getpid()).encode())
+
+    def validate_and_send(self, xml, data_type_version):
+        return EricResponse(0, xml.encode(), str(os.getpid()).encode(), b'%PDF-1.4')
+
+    def process_verfahren(self, xml_string, verfahren, abruf_code=None, transfer_handle=None):
+        transfer_handle.contents.value += 1
+        return EricResponse(0, abruf_code.encode(), str(os.getpid()).encode())
+
+    def check_tax_number(self, tax_number):
+        raise EricGlobalError(610001001)
+
+    def get_version(self):
+        os._exit(1)
+
+
+def _init_fake_worker_process():
+    eric_process_pool._process_eric_wrapper = _FakeEricWrapper()
+
+
+class TestEricProcessPool(unittest.TestCase):
+
+    def setUp(self):
+        self.process_pool = EricProcessPool(number_of_processes=2, max_tasks_per_process=100,
+                                            initializer=_init_fake_worker_process)
+        self.addCleanup(self.process_pool.close)
+        self.eric_wrapper = EricProcessPoolWrapper(self.process_pool)
+
+    def test_if_validate_called_then_run_in_worker_process(self):
+        response = self.eric_wrapper.validate('<xml></xml>', 'ESt_2021')
+
+        self.assertEqual(b'<xml></xml>', response.eric_response)
+        self.assertNotEqual(str(os.getpid()).encode(), response.server_response)
+
+    def test_if_token_bound_calls_made_then_run_in_the_same_process(self):
+        first = self.eric_wrapper.validate_and_send('<xml></xml>', 'ESt_2021')
+        second = self.eric_wrapper.validate_and_send('<xml></xml>', 'ESt_2021')
+
+        self.assertEqual(first.server_response, second.server_response)
+        self.assertEqual(b'%PDF-1.4', second.pdf)
+
+    def test_if_eric_error_raised_in_worker_process_then_raise_error_with_res_code(self):
+        with self.assertRaises(EricGlobalError) as context:
+            self.eric_wrapper.check_tax_number('9198011310010')
+
+        self.assertEqual(610001001, context.exception.res_code)
+
+    def test_if_transfer_handle_given_then_copy_new_value_back(self):
+        transfer_handle = pointer(c_int(0))
+
+        response = self.eric_wrapper.process_verfahren('<xml></xml>', 'ElsterVaStDaten', abruf_code='ABRUF',
+                                                       transfer_handle=transfer_handle)
+
+        self.assertEqual(1, transfer_handle.contents.value)
+        self.assertEqual(b'ABRUF', response.eric_response)
+
+    def test_if_worker_process_dies_then_raise_error_and_restart_processes(self):
+        with self.assertRaises(BrokenProcessPool):
+            self.eric_wrapper.get_version()
+
+        response = self.eric_wrapper.validate('<xml></xml>', 'ESt_2021')
+
+        self.assertEqual(b'<xml></xml>', response.eric_response)
+
+    def test_if_warmed_up_then_worker_processes_are_initialised(self):
+        self.process_pool.warm_up()
+
+        self.assertTrue(self.process_pool.run(False, eric_process_pool._warm_up_worker_process))
+        self.assertTrue(self.process_pool.run(True, eric_process_pool._warm_up_worker_process))
+
+    def test_if_closed_then_raise_error_on_call(self):
+        self.process_pool.close()
+
+        with self.assertRaises(EricWrapperPoolClosedError):
+            self.eric_wrapper.validate('<xml></xml>', 'ESt_2021')
+
+
+class TestEricProcessPoolWrapper(unittest.TestCase):
+
+    def setUp(self):
+        self.process_pool = MagicMock()
+        self.eric_wrapper = EricProcessPoolWrapper(self.process_pool)
+
+    def test_if_certificate_bound_method_called_then_run_token_bound(self):
+        self.eric_wrapper.decrypt_data('encrypted')
+        self.eric_wrapper.get_cert_properties()
+
+        for call in self.process_pool.run.call_args_list:
+            self.assertTrue(call.args[0])
+
+    def test_if_method_without_certificate_called_then_do_not_run_token_bound(self):
+        self.eric_wrapper.create_th('<xml></xml>', datenart='ESt')
+        self.eric_wrapper.get_tax_offices('28')
+
+        for call in self.process_pool.run.call_args_list:
+            self.assertFalse(call.args[0])
+
+    def test_if_create_th_called_then_pass_keyword_arguments(self):
+        self.eric_wrapper.create_th('<xml></xml>', datenart='ESt')
+
+        self.process_pool.run.assert_called_once_with(False, eric_process_pool._call_in_worker_process, 'create_th',
+                                                      ('<xml></xml>',), {'datenart': 'ESt'})
+
+
+class TestGetEricWrapperInProcessMode(unittest.TestCase):
+
+    def test_if_execution_mode_is_process_then_yield_process_pool_wrapper(self):
+        with patch.object(get_settings(), 'eric_execution_mode', 'process'), \
+                patch('erica.worker.pyeric.eric_process_pool.get_eric_process_pool', MagicMock()):
+            with get_eric_wrapper() as eric_wrapper:
+                self.assertIsInstance(eric_wrapper, EricProcessPoolWrapper)
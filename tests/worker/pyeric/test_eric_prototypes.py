@@ -0,0 +1,112 @@
+import shutil
+import subprocess
+import tempfile
+import timeit
+import unittest
+from ctypes import CDLL, c_char_p, c_int, c_void_p
+from os import path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from erica.worker.pyeric.eric import EricWrapper, EricPrototypes, get_eric_prototypes, _ERIC_PROTOTYPES
+
+_STUB_LIBRARY_SOURCE = """
+int EricMtPruefeSteuernummer(void *instance, const char *steuernummer) { return 0; }
+"""
+
+
+def _create_eric_wrapper(library):
+    with patch('erica.worker.pyeric.eric.load_eric_library', MagicMock(return_value=library)):
+        return EricWrapper()
+
+
+class TestEricPrototypes(unittest.TestCase):
+
+    def test_if_function_accessed_then_set_declared_argtypes_and_restype(self):
+        library = MagicMock()
+
+        function = EricPrototypes(library).EricMtPruefeSteuernummer
+
+        self.assertIs(library.EricMtPruefeSteuernummer, function)
+        self.assertEqual([c_void_p, c_char_p], function.argtypes)
+        self.assertEqual(c_int, function.restype)
+
+    def test_if_function_accessed_twice_then_bind_prototype_only_once(self):
+        library = MagicMock()
+        prototypes = EricPrototypes(library)
+        first = prototypes.EricMtPruefeSteuernummer
+
+        with patch.object(EricPrototypes, '__getattr__') as bind_prototype:
+            second = prototypes.EricMtPruefeSteuernummer
+
+        bind_prototype.assert_not_called()
+        self.assertIs(first, second)
+
+    def test_if_function_without_prototype_accessed_then_raise_attribute_error(self):
+        with self.assertRaises(AttributeError):
+            EricPrototypes(MagicMock()).EricMtUnknownFunction
+
+    def test_if_prototypes_requested_twice_for_same_library_then_return_same_table(self):
+        library = MagicMock()
+
+        self.assertIs(get_eric_prototypes(library), get_eric_prototypes(library))
+
+    def test_if_wrappers_use_same_library_then_share_prototypes(self):
+        library = MagicMock()
+
+        self.assertIs(_create_eric_wrapper(library).functions, _create_eric_wrapper(library).functions)
+
+    def test_if_library_of_wrapper_replaced_then_use_functions_of_new_library(self):
+        eric_wrapper = _create_eric_wrapper(MagicMock())
+        new_library = MagicMock()
+        new_library.EricMtPruefeSteuernummer = MagicMock(return_value=0)
+
+        eric_wrapper.eric = new_library
+        eric_wrapper.check_tax_number("9198011310010")
+
+        new_library.EricMtPruefeSteuernummer.assert_called_once()
+
+
+def _compile_stub_library(directory):
+    source_path = path.join(directory, 'stub_ericapi.c')
+    library_path = path.join(directory, 'libstub_ericapi.so')
+    with open(source_path, 'w') as source_file:
+        source_file.write(_STUB_LIBRARY_SOURCE)
+    subprocess.run(['cc', '-shared', '-fPIC', '-o', library_path, source_path], check=True, capture_output=True)
+    return CDLL(library_path)
+
+
+@pytest.mark.skipif(shutil.which('cc') is None, reason="skipped because no C compiler is available")
+class TestEricPrototypesBenchmark(unittest.TestCase):
+    """Compares a cheap ERiC call through the prototype table with setting argtypes and restype on every call."""
+
+    NUMBER_OF_CALLS = 20000
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.library = _compile_stub_library(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_if_prototypes_cached_then_calls_are_faster_than_with_binding_per_call(self):
+        library = self.library
+        prototypes = get_eric_prototypes(library)
+        argtypes, restype = _ERIC_PROTOTYPES['EricMtPruefeSteuernummer']
+
+        def call_with_binding_per_call():
+            fun_check_tax_number = library.EricMtPruefeSteuernummer
+            fun_check_tax_number.argtypes = argtypes
+            fun_check_tax_number.restype = restype
+            fun_check_tax_number(None, b"9198011310010")
+
+        def call_with_cached_prototype():
+            fun_check_tax_number = prototypes.EricMtPruefeSteuernummer
+            fun_check_tax_number(None, b"9198011310010")
+
+        per_call = min(timeit.repeat(call_with_binding_per_call, number=self.NUMBER_OF_CALLS, repeat=5))
+        cached = min(timeit.repeat(call_with_cached_prototype, number=self.NUMBER_OF_CALLS, repeat=5))
+        print(f"{self.NUMBER_OF_CALLS} calls: binding per call {per_call:.4f}s, cached prototypes {cached:.4f}s")
+
+        self.assertLess(cached, per_call)
@@ -0,0 +1,153 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from prometheus_client import REGISTRY
+
+from erica.job_service.job_service import JobService
+from erica.worker.pyeric.eric import EricWrapper, get_eric_wrapper, eric_session
+from erica.worker.pyeric.eric_errors import EricGlobalError, EricGlobalValidationError
+from erica.worker.pyeric.eric_pool import EricWrapperPool
+
+
+class _FakeEricWrapper:
+    pass
+
+
+def _lifecycle_count(event):
+    return REGISTRY.get_sample_value('erica_eric_lifecycle_events_total', {'event': event}) or 0
+
+
+class _ControllerWithSeveralSteps:
+    """Enters get_eric_wrapper once per step, like generating the transfer header, the aktenzeichen and sending."""
+
+    def __init__(self, payload, include_elster_responses):
+        self.used_wrappers = []
+
+    def process(self):
+        for _ in range(3):
+            with get_eric_wrapper() as eric_wrapper:
+                self.used_wrappers.append(eric_wrapper)
+        return self.used_wrappers
+
+
+class TestEricSession(unittest.TestCase):
+
+    def setUp(self):
+        self.created = []
+        self.destroyed = []
+
+        def create_instance():
+            instance = _FakeEricWrapper()
+            self.created.append(instance)
+            return instance
+
+        self.pool = EricWrapperPool(create_instance=create_instance, destroy_instance=self.destroyed.append,
+                                    max_size=2, max_uses=10, checkout_timeout=0.05,
+                                    should_recycle=lambda exception: isinstance(exception, EricGlobalError)
+                                    and not isinstance(exception, EricGlobalValidationError))
+        patcher = patch('erica.worker.pyeric.eric.get_eric_wrapper_pool', MagicMock(return_value=self.pool))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_if_get_eric_wrapper_called_several_times_in_session_then_check_out_once(self):
+        checkouts_before = _lifecycle_count('checkout')
+
+        with eric_session():
+            with get_eric_wrapper() as first:
+                pass
+            with get_eric_wrapper() as second:
+                pass
+
+        self.assertIs(first, second)
+        self.assertEqual(1, _lifecycle_count('checkout') - checkouts_before)
+
+    def test_if_get_eric_wrapper_nested_in_session_then_return_same_wrapper(self):
+        with eric_session():
+            with get_eric_wrapper() as outer, get_eric_wrapper() as inner:
+                self.assertIs(outer, inner)
+
+    def test_if_session_ends_then_hand_wrapper_back_to_pool(self):
+        with eric_session():
+            with get_eric_wrapper():
+                self.assertEqual(1, self.pool.stats()['in_use'])
+            self.assertEqual(1, self.pool.stats()['in_use'])
+
+        self.assertEqual({'size': 1, 'idle': 1, 'in_use': 0, 'max_size': 2}, self.pool.stats())
+
+    def test_if_session_never_uses_wrapper_then_do_not_check_out(self):
+        checkouts_before = _lifecycle_count('checkout')
+
+        with eric_session():
+            pass
+
+        self.assertEqual(0, _lifecycle_count('checkout') - checkouts_before)
+        self.assertEqual([], self.created)
+
+    def test_if_sessions_nested_then_inner_session_joins_outer_session(self):
+        with eric_session() as outer_session:
+            with eric_session() as inner_session:
+                with get_eric_wrapper():
+                    pass
+            self.assertIs(outer_session, inner_session)
+            self.assertEqual(1, self.pool.stats()['in_use'])
+
+    def test_if_instance_error_raised_in_session_then_following_step_gets_fresh_wrapper(self):
+        with eric_session():
+            with self.assertRaises(EricGlobalError):
+                with get_eric_wrapper() as broken:
+                    raise EricGlobalError(610001001)
+            with get_eric_wrapper() as replacement:
+                pass
+
+        self.assertIsNot(broken, replacement)
+        self.assertEqual([broken], self.destroyed)
+
+    def test_if_data_error_raised_in_session_then_keep_wrapper(self):
+        with eric_session():
+            with self.assertRaises(EricGlobalValidationError):
+                with get_eric_wrapper() as first:
+                    raise EricGlobalValidationError(610001002)
+            with get_eric_wrapper() as second:
+                pass
+
+        self.assertIs(first, second)
+        self.assertEqual([], self.destroyed)
+
+    def test_if_outside_session_then_check_out_per_call(self):
+        checkouts_before = _lifecycle_count('checkout')
+
+        with get_eric_wrapper():
+            pass
+        with get_eric_wrapper():
+            pass
+
+        self.assertEqual(2, _lifecycle_count('checkout') - checkouts_before)
+
+    def test_if_job_applied_to_elster_then_check_out_one_wrapper_for_the_whole_job(self):
+        job_service = JobService(job_repository=MagicMock(), payload_type=MagicMock(),
+                                 request_controller=_ControllerWithSeveralSteps, job_method=MagicMock())
+        checkouts_before = _lifecycle_count('checkout')
+
+        used_wrappers = job_service.apply_to_elster(MagicMock(), True)
+
+        self.assertEqual(3, len(used_wrappers))
+        self.assertEqual(1, len(set(map(id, used_wrappers))))
+        self.assertEqual(1, _lifecycle_count('checkout') - checkouts_before)
+        self.assertEqual(1, len(self.created))
+
+
+class TestEricLifecycleEvents(unittest.TestCase):
+
+    def test_if_wrapper_initialised_and_shut_down_then_count_each_call(self):
+        mock_eric = MagicMock()
+        mock_eric.EricMtInstanzFreigeben = MagicMock(return_value=0)
+        with patch('erica.worker.pyeric.eric.load_eric_library', MagicMock(return_value=mock_eric)):
+            eric_wrapper = EricWrapper()
+        initialisations_before = _lifecycle_count('initialise')
+        shutdowns_before = _lifecycle_count('shutdown')
+
+        eric_wrapper.initialise()
+        eric_wrapper.shutdown()
+
+        self.assertEqual(1, _lifecycle_count('initialise') - initialisations_before)
+        self.assertEqual(1, _lifecycle_count('shutdown') - shutdowns_before)
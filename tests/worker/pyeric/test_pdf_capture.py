@@ -0,0 +1,110 @@
+import base64
+import os
+import tempfile
+import tracemalloc
+import unittest
+from unittest.mock import MagicMock, patch
+
+from erica.worker.pyeric.eric import EricWrapper, EricResponse
+from erica.worker.pyeric.pdf_capture import InMemoryPdfFile
+from erica.worker.pyeric.pyeric_response import PyericResponse
+from erica.worker.request_processing.requests_controller import encode_pdf
+
+
+def _print_like_eric(path, content):
+    # ERiC opens the print path itself, independently of any file object of the caller
+    with open(path, 'wb') as pdf_file:
+        pdf_file.write(content)
+
+
+class TestInMemoryPdfFile(unittest.TestCase):
+
+    def test_if_pdf_printed_to_path_then_read_returns_content(self):
+        with InMemoryPdfFile() as pdf_file:
+            _print_like_eric(pdf_file.name, b'%PDF-1.4 content')
+
+            self.assertEqual(b'%PDF-1.4 content', pdf_file.read())
+
+    def test_if_nothing_printed_then_read_returns_empty_content(self):
+        with InMemoryPdfFile() as pdf_file:
+            self.assertEqual(b'', pdf_file.read())
+
+    def test_if_memfd_is_available_then_file_is_not_on_disk(self):
+        if not hasattr(os, 'memfd_create'):
+            self.skipTest("memfd is not available on this platform")
+
+        with InMemoryPdfFile() as pdf_file:
+            self.assertTrue(pdf_file.name.startswith('/proc/self/fd/'))
+
+    def test_if_memfd_is_not_available_then_fall_back_to_temporary_file(self):
+        with patch('erica.worker.pyeric.pdf_capture.os.path.isdir', MagicMock(return_value=False)):
+            with InMemoryPdfFile() as pdf_file:
+                _print_like_eric(pdf_file.name, b'%PDF-1.4 content')
+                self.assertEqual(b'%PDF-1.4 content', pdf_file.read())
+
+            self.assertFalse(os.path.exists(pdf_file.name))
+
+
+class TestEncodePdf(unittest.TestCase):
+
+    def test_if_pdf_encoded_then_return_base64_and_release_raw_pdf(self):
+        pyeric_response = PyericResponse('eric', 'server', bytearray(b'%PDF-1.4 content'))
+
+        encoded_pdf = encode_pdf(pyeric_response)
+
+        self.assertEqual(base64.b64encode(b'%PDF-1.4 content').decode('utf-8'), encoded_pdf)
+        self.assertIsNone(pyeric_response.pdf)
+
+
+class TestPdfCaptureBenchmark(unittest.TestCase):
+    """Compares the peak Python memory of a job from printing the PDF to its base64-encoded result, for capturing
+    the PDF in memory and for the previous capture via a temporary file on disk."""
+
+    PDF_SIZE = 8 * 1024 * 1024
+
+    def setUp(self):
+        self.pdf_content = os.urandom(self.PDF_SIZE)
+        with patch('erica.worker.pyeric.eric.load_eric_library', MagicMock(return_value=MagicMock())):
+            self.eric_wrapper = EricWrapper()
+        self.eric_wrapper.get_cert_handle = MagicMock(return_value=1)
+        self.eric_wrapper.process = self._process_and_print
+
+    def _process_and_print(self, xml, data_type_version, flags, cert_params, print_params):
+        _print_like_eric(print_params.contents.pdfName.decode(), self.pdf_content)
+        return EricResponse(0, b'eric', b'server')
+
+    def _send_with_temporary_file_on_disk(self):
+        with tempfile.NamedTemporaryFile() as temporary_pdf_file:
+            _print_like_eric(temporary_pdf_file.name, self.pdf_content)
+            temporary_pdf_file.seek(0)
+            return PyericResponse('eric', 'server', temporary_pdf_file.read())
+
+    def _send_with_in_memory_file(self):
+        return PyericResponse('eric', 'server', self.eric_wrapper.validate_and_send('<xml></xml>', 'ESt_2021').pdf)
+
+    @staticmethod
+    def _measure_peak_memory(job):
+        tracemalloc.start()
+        try:
+            job()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_if_pdf_captured_in_memory_then_peak_memory_per_job_is_lower(self):
+        def previous_job():
+            pyeric_response = self._send_with_temporary_file_on_disk()
+            return base64.b64encode(pyeric_response.pdf).decode('utf-8')
+
+        def current_job():
+            pyeric_response = self._send_with_in_memory_file()
+            return encode_pdf(pyeric_response)
+
+        self.assertEqual(previous_job(), current_job())
+
+        previous_peak = self._measure_peak_memory(previous_job)
+        current_peak = self._measure_peak_memory(current_job)
+        print(f"Peak memory per job for a {self.PDF_SIZE // 1024} KiB PDF: "
+              f"temporary file {previous_peak // 1024} KiB, in memory {current_peak // 1024} KiB")
+
+        self.assertLess(current_peak, previous_peak)
@@ -0,0 +1,155 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from erica.config import get_settings
+from erica.domain.model.erica_request import RequestType
+from erica.worker.pyeric.token_scheduler import TokenScheduler, TokenQueueFullError, TokenWaitTimeoutError, \
+    token_bound, token_request_context
+
+
+def _wait_for_queue_depth(scheduler, depth):
+    deadline = time.monotonic() + 5
+    while scheduler.queue_depth() < depth:
+        if time.monotonic() > deadline:
+            raise AssertionError(f"Queue never reached depth {depth}")
+        time.sleep(0.001)
+
+
+class TestTokenScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = TokenScheduler(max_queue_depth=10, wait_timeout=5)
+        self.served = []
+
+    def _start_waiter(self, request_type, creator_id, name):
+        def acquire_token():
+            with self.scheduler.acquire(request_type, creator_id):
+                self.served.append(name)
+
+        thread = threading.Thread(target=acquire_token)
+        thread.start()
+        _wait_for_queue_depth(self.scheduler, len(self.threads) + 1)
+        self.threads.append(thread)
+        return thread
+
+    def _serve_waiters_in_order(self, holder_creator_id, waiters):
+        self.threads = []
+        with self.scheduler.acquire(RequestType.send_est, holder_creator_id):
+            for request_type, creator_id, name in waiters:
+                self._start_waiter(request_type, creator_id, name)
+        for thread in self.threads:
+            thread.join()
+        return self.served
+
+    def test_if_token_held_then_other_thread_waits_until_released(self):
+        events = []
+
+        def acquire_token():
+            with self.scheduler.acquire():
+                events.append('second')
+
+        with self.scheduler.acquire():
+            thread = threading.Thread(target=acquire_token)
+            thread.start()
+            _wait_for_queue_depth(self.scheduler, 1)
+            events.append('first')
+        thread.join()
+
+        self.assertEqual(['first', 'second'], events)
+
+    def test_if_waiters_have_different_priorities_then_serve_higher_priority_first(self):
+        served = self._serve_waiters_in_order('holder', [
+            (RequestType.grundsteuer, 'client_a', 'grundsteuer'),
+            (RequestType.send_est, 'client_b', 'est'),
+            (RequestType.freischalt_code_request, 'client_c', 'unlock_code'),
+        ])
+
+        self.assertEqual(['unlock_code', 'grundsteuer', 'est'], served)
+
+    def test_if_waiters_have_same_priority_then_serve_creator_with_fewer_grants_first(self):
+        served = self._serve_waiters_in_order('client_a', [
+            (RequestType.grundsteuer, 'client_a', 'a_1'),
+            (RequestType.grundsteuer, 'client_a', 'a_2'),
+            (RequestType.grundsteuer, 'client_b', 'b_1'),
+        ])
+
+        self.assertEqual(['b_1', 'a_1', 'a_2'], served)
+
+    def test_if_token_acquired_again_by_holder_then_do_not_block(self):
+        with self.scheduler.acquire():
+            with self.scheduler.acquire():
+                pass
+            self.assertEqual(0, self.scheduler.queue_depth())
+
+    def test_if_queue_is_full_then_raise_error(self):
+        scheduler = TokenScheduler(max_queue_depth=1, wait_timeout=5)
+
+        def wait_for_token():
+            with scheduler.acquire():
+                pass
+
+        with scheduler.acquire():
+            thread = threading.Thread(target=wait_for_token)
+            thread.start()
+            _wait_for_queue_depth(scheduler, 1)
+            result = {}
+
+            def try_to_queue():
+                try:
+                    with scheduler.acquire():
+                        pass
+                except TokenQueueFullError as e:
+                    result['error'] = e
+
+            other_thread = threading.Thread(target=try_to_queue)
+            other_thread.start()
+            other_thread.join()
+        thread.join()
+
+        self.assertIsInstance(result['error'], TokenQueueFullError)
+
+    def test_if_token_not_released_within_timeout_then_raise_error(self):
+        scheduler = TokenScheduler(max_queue_depth=1, wait_timeout=0.05)
+        result = {}
+
+        def wait_for_token():
+            try:
+                with scheduler.acquire():
+                    pass
+            except TokenWaitTimeoutError as e:
+                result['error'] = e
+
+        with scheduler.acquire():
+            thread = threading.Thread(target=wait_for_token)
+            thread.start()
+            thread.join()
+
+        self.assertIsInstance(result['error'], TokenWaitTimeoutError)
+        self.assertEqual(0, scheduler.queue_depth())
+
+
+class TestTokenBound(unittest.TestCase):
+
+    def test_if_no_stick_used_then_do_not_acquire_token(self):
+        scheduler = MagicMock()
+
+        with patch.object(get_settings(), 'using_stick', False), \
+                patch('erica.worker.pyeric.token_scheduler.get_token_scheduler', MagicMock(return_value=scheduler)):
+            token_bound(MagicMock())()
+
+        scheduler.acquire.assert_not_called()
+
+    def test_if_stick_used_then_acquire_token_for_request_of_current_context(self):
+        scheduler = MagicMock()
+        operation = MagicMock(return_value='result')
+
+        with patch.object(get_settings(), 'using_stick', True), \
+                patch('erica.worker.pyeric.token_scheduler.get_token_scheduler', MagicMock(return_value=scheduler)), \
+                token_request_context(RequestType.grundsteuer, 'client_a'):
+            result = token_bound(operation)('xml')
+
+        scheduler.acquire.assert_called_once_with(RequestType.grundsteuer, 'client_a')
+        operation.assert_called_once_with('xml')
+        self.assertEqual('result', result)
@@ -107,3 +107,18 @@ class TestGenerateJson:
             assert result['transferticket'] == 'transferticket'
             assert result['eric_response'] == 'eric response'
             assert result['server_response'] == 'server response'
+
+    def test_if_blob_store_configured_then_result_includes_pdf_key_instead_of_pdf(
+            self, valid_grundsteuer_request_controller):
+        blob_store = MagicMock()
+        example_pyeric_response = PyericResponse("eric response", "server response", "pdf content".encode())
+        with patch('erica.worker.request_processing.requests_controller.get_transferticket_from_xml',
+                   MagicMock(return_value='transferticket')), \
+                patch('erica.worker.request_processing.requests_controller.get_blob_store',
+                      MagicMock(return_value=blob_store)):
+            result = valid_grundsteuer_request_controller.generate_json(example_pyeric_response)
+
+        assert 'pdf' not in result
+        assert result['pdf_key'].startswith('pdf/')
+        blob_store.put.assert_called_once_with(result['pdf_key'], b"pdf content", content_type='application/pdf')
+        assert example_pyeric_response.pdf is None
@@ -1,12 +1,15 @@
 import base64
 import unittest
-from datetime import date
+from datetime import date, timedelta
 from unittest.mock import patch, MagicMock, call
+from xml.etree import ElementTree as ET
 
+import fakeredis
 import pytest
 
 from erica.domain.payload.freischaltcode import FreischaltCodeActivatePayload, FreischaltCodeRevocatePayload
 from erica.domain.payload.tax_number_validation import CheckTaxNumberPayload
+from erica.domain.result_cache.tax_number_validity_cache import TaxNumberValidityCache
 from erica.worker.pyeric.eric_errors import InvalidBufaNumberError
 from erica.worker.pyeric.pyeric_response import PyericResponse
 from erica.worker.request_processing.eric_mapper import EstEricMapping, UnlockCodeRequestEricMapper
@@ -430,6 +433,20 @@ class TestUnlockCodeRequestGenerateJson(unittest.TestCase):
         self.assertEqual(expected_transferticket, actual_response['transferticket'])
 
 
+    def test_if_json_generated_then_server_response_is_parsed_once(self):
+        unlock_code_request = UnlockCodeRequestController(UnlockCodeRequestData(
+            idnr=self.expected_idnr,
+            dob=date(1985, 1, 1)), include_elster_responses=False)
+
+        pyeric_response = PyericResponse('eric_response', self.expected_server_response)
+        with patch('erica.worker.elster_xml.xml_parsing.erica_xml_parsing.ET.fromstring',
+                   MagicMock(wraps=ET.fromstring)) as fromstring:
+            actual_response = unlock_code_request.generate_json(pyeric_response)
+
+        self.assertEqual(1, fromstring.call_count)
+        self.assertEqual(self.expected_transferticket, actual_response['transferticket'])
+
+
 class TestUnlockCodeActivationProcess(unittest.TestCase):
     def setUp(self):
         self.known_real_idnr = '19327675747'
@@ -600,6 +617,21 @@ class TestUnlockCodeActivationGenerateJson(unittest.TestCase):
         self.assertEqual(expected_transferticket, actual_response['transferticket'])
 
 
+    def test_if_json_generated_then_server_response_is_parsed_once(self):
+        unlock_code_activation = UnlockCodeActivationRequestController(UnlockCodeActivationData(
+            idnr=self.expected_idnr,
+            unlock_code='1985-T67D-K89O',
+            elster_request_id='42'), include_elster_responses=False)
+
+        pyeric_response = PyericResponse('eric_response', self.expected_server_response)
+        with patch('erica.worker.elster_xml.xml_parsing.erica_xml_parsing.ET.fromstring',
+                   MagicMock(wraps=ET.fromstring)) as fromstring:
+            actual_response = unlock_code_activation.generate_json(pyeric_response)
+
+        self.assertEqual(1, fromstring.call_count)
+        self.assertEqual(self.expected_transferticket, actual_response['transferticket'])
+
+
 class TestUnlockCodeRevocationProcess(unittest.TestCase):
     def setUp(self):
         self.known_real_idnr = '19327675747'
@@ -799,6 +831,82 @@ class TestCheckTaxNumberRequestControllerProcess:
         assert result == {'is_valid': False}
 
 
+    @pytest.mark.parametrize("tax_number", ["1981131001", "19811310011"])
+    def test_if_tax_number_certainly_invalid_then_return_json_with_is_valid_false_without_eric(self, tax_number):
+        input_data = CheckTaxNumberPayload(state_abbreviation="by", tax_number=tax_number)
+
+        with patch('erica.worker.request_processing.requests_controller.CheckTaxNumberPyericController.'
+                   'get_eric_response') as get_eric_response:
+            result = CheckTaxNumberRequestController(input_data).process()
+
+        assert result == {'is_valid': False}
+        get_eric_response.assert_not_called()
+
+    def test_if_tax_number_not_certainly_invalid_then_return_json_with_eric_result(self):
+        input_data = CheckTaxNumberPayload(state_abbreviation="by", tax_number="19811310010")
+
+        with patch('erica.worker.request_processing.requests_controller.get_tax_number_validity_cache',
+                   MagicMock(return_value=None)), \
+                patch('erica.worker.request_processing.requests_controller.CheckTaxNumberPyericController.'
+                      'get_eric_response', MagicMock(return_value=True)) as get_eric_response:
+            result = CheckTaxNumberRequestController(input_data).process()
+
+        assert result == {'is_valid': True}
+        get_eric_response.assert_called_once_with('9198011310010')
+
+    def test_if_tax_number_checked_before_with_same_eric_version_then_return_cached_result_without_eric(self):
+        input_data = CheckTaxNumberPayload(state_abbreviation="by", tax_number="19811310010")
+        validity_cache = TaxNumberValidityCache(10, timedelta(hours=1))
+
+        with patch('erica.worker.request_processing.requests_controller.get_tax_number_validity_cache',
+                   MagicMock(return_value=validity_cache)), \
+                patch('erica.worker.request_processing.requests_controller.get_eric_version',
+                      MagicMock(return_value='39.1.4')), \
+                patch('erica.worker.request_processing.requests_controller.CheckTaxNumberPyericController.'
+                      'get_eric_response', MagicMock(return_value=False)) as get_eric_response:
+            first_result = CheckTaxNumberRequestController(input_data).process()
+            second_result = CheckTaxNumberRequestController(input_data).process()
+
+        assert first_result == second_result == {'is_valid': False}
+        get_eric_response.assert_called_once_with('9198011310010')
+
+
+class TestCheckTaxNumberRequestControllerGetResultWithoutEric:
+
+    @pytest.fixture
+    def validity_cache(self):
+        validity_cache = TaxNumberValidityCache(10, timedelta(hours=1), fakeredis.FakeRedis())
+        with patch('erica.worker.request_processing.requests_controller.get_tax_number_validity_cache',
+                   MagicMock(return_value=validity_cache)):
+            yield validity_cache
+
+    def test_if_tax_number_certainly_invalid_then_return_json_with_is_valid_false(self, validity_cache):
+        input_data = CheckTaxNumberPayload(state_abbreviation="by", tax_number="1981131001")
+
+        assert CheckTaxNumberRequestController.get_result_without_eric(input_data) == {'is_valid': False}
+
+    def test_if_tax_number_checked_with_published_eric_version_then_return_cached_result(self, validity_cache):
+        input_data = CheckTaxNumberPayload(state_abbreviation="by", tax_number="19811310010")
+        validity_cache.put('9198011310010', '39.1.4', True)
+
+        assert CheckTaxNumberRequestController.get_result_without_eric(input_data) == {'is_valid': True}
+
+    def test_if_tax_number_only_checked_with_other_eric_version_then_return_none(self, validity_cache):
+        input_data = CheckTaxNumberPayload(state_abbreviation="by", tax_number="19811310010")
+        validity_cache.put('9198011310010', '39.1.4', True)
+        validity_cache.get_published_eric_version()
+        validity_cache.put('9198011310028', '40.0.0', True)
+
+        with patch('erica.domain.result_cache.tax_number_validity_cache.time.monotonic',
+                   MagicMock(return_value=10 ** 9)):
+            assert CheckTaxNumberRequestController.get_result_without_eric(input_data) is None
+
+    def test_if_no_eric_version_published_then_return_none(self, validity_cache):
+        input_data = CheckTaxNumberPayload(state_abbreviation="by", tax_number="19811310010")
+
+        assert CheckTaxNumberRequestController.get_result_without_eric(input_data) is None
+
+
 class TestGetBelegeRequestController(unittest.TestCase):
     def setUp(self):
         self.idnr = '04452397687'
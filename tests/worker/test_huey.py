@@ -1,11 +1,60 @@
-from erica.worker.huey import eric_wrapper_init, get_initialised_eric_wrapper, shutdown_eric_wrapper
+from unittest.mock import MagicMock, call
+from uuid import uuid4
+
+import fakeredis
+import pytest
+from huey import RedisHuey
+
+from erica.worker.huey import eric_wrapper_init, shutdown_eric_wrapper, enqueue_for_each
+from erica.worker.pyeric.eric import get_eric_wrapper_pool
+from worker.utils import missing_pyeric_lib
 
 
 class TestEricWrapperInitialize:
 
-    def test_if_eric_wrapper_initialized_get_init_eric_wrapper_returns_not_none(self):
+    @pytest.mark.skipif(missing_pyeric_lib(), reason="skipped because of missing eric lib; see pyeric/README.md")
+    def test_if_eric_wrapper_initialized_then_pool_holds_idle_instance(self):
+        get_eric_wrapper_pool.cache_clear()
         eric_wrapper_init()
         try:
-            assert get_initialised_eric_wrapper() is not None
+            assert get_eric_wrapper_pool().stats()['idle'] == 1
         finally:
             shutdown_eric_wrapper()
+            get_eric_wrapper_pool.cache_clear()
+
+
+class TestEnqueueForEach:
+
+    @pytest.fixture
+    def redis_huey(self):
+        return RedisHuey('erica-huey-test-queue', connection_pool=fakeredis.FakeRedis().connection_pool)
+
+    def test_if_request_ids_given_then_enqueue_one_task_each_in_order(self, redis_huey):
+        task = redis_huey.task(expires=480)(lambda request_id: request_id)
+        request_ids = [uuid4() for _ in range(3)]
+
+        enqueue_for_each(task, request_ids)
+
+        assert redis_huey.pending_count() == 3
+        dequeued_tasks = [redis_huey.dequeue() for _ in request_ids]
+        assert [dequeued_task.args for dequeued_task in dequeued_tasks] == [(request_id,) for request_id in request_ids]
+        assert all(dequeued_task.expires_resolved is not None for dequeued_task in dequeued_tasks)
+
+    def test_if_request_ids_given_then_push_tasks_in_one_round_trip(self, redis_huey):
+        task = redis_huey.task()(lambda request_id: request_id)
+        pipeline = MagicMock(wraps=redis_huey.storage.conn.pipeline(transaction=False))
+        redis_huey.storage.conn = MagicMock(pipeline=MagicMock(return_value=pipeline))
+
+        enqueue_for_each(task, [uuid4() for _ in range(3)])
+
+        pipeline.execute.assert_called_once()
+        assert pipeline.lpush.call_count == 3
+
+    def test_if_immediate_mode_then_call_task_for_each_request_id(self):
+        task = MagicMock(huey=MagicMock(immediate=True))
+        request_ids = [uuid4(), uuid4()]
+
+        enqueue_for_each(task, request_ids)
+
+        assert task.mock_calls == [call(request_ids[0]), call(request_ids[1])]
+